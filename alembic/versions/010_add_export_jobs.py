@@ -0,0 +1,74 @@
+"""Add export jobs table
+
+Revision ID: 010_add_export_jobs
+Revises: 009_add_event_sourcing
+Create Date: 2026-10-18
+
+Persists data export jobs, which were previously held in process
+memory. The table is also the work queue, claimed with
+SELECT ... FOR UPDATE SKIP LOCKED. It has no row-level security policy
+because workers claim jobs across tenants; tenant-facing queries filter
+on tenant_id explicitly.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '010_add_export_jobs'
+down_revision = '009_add_event_sourcing'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add export_jobs table."""
+
+    op.create_table(
+        'export_jobs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('data_type', sa.String(length=50), nullable=False),
+        sa.Column('format', sa.String(length=20), nullable=False),
+        sa.Column('filters', sa.JSON(), nullable=False, server_default='{}'),
+        sa.Column('date_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('date_end', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('partition_by_date', sa.Boolean(), nullable=False, server_default='false'),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('priority', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('worker_id', sa.String(length=255), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('cancel_requested', sa.Boolean(), nullable=False, server_default='false'),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('total_rows', sa.Integer(), nullable=True),
+        sa.Column('rows_exported', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('bytes_encoded', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('checkpoint_offset', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('resume_key', sa.JSON(), nullable=True),
+        sa.Column('file_path', sa.String(length=500), nullable=True),
+        sa.Column('file_size', sa.BigInteger(), nullable=True),
+        sa.Column('content_type', sa.String(length=100), nullable=True),
+        sa.Column('compressed', sa.Boolean(), nullable=False, server_default='false'),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('NOW()')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('NOW()')),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_index('ix_export_jobs_tenant_id', 'export_jobs', ['tenant_id'])
+    op.create_index('idx_export_jobs_claim', 'export_jobs', ['status', 'priority', 'created_at'])
+    op.create_index('idx_export_jobs_tenant_created', 'export_jobs', ['tenant_id', 'created_at'])
+
+
+def downgrade() -> None:
+    """Remove export_jobs table."""
+
+    op.drop_index('idx_export_jobs_tenant_created', table_name='export_jobs')
+    op.drop_index('idx_export_jobs_claim', table_name='export_jobs')
+    op.drop_index('ix_export_jobs_tenant_id', table_name='export_jobs')
+    op.drop_table('export_jobs')
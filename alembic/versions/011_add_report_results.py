@@ -0,0 +1,99 @@
+"""Add materialized report results
+
+Revision ID: 011_add_report_results
+Revises: 010_add_export_jobs
+Create Date: 2026-10-18
+
+Stores per-day report result partitions and scheduled report runs.
+Also indexes calls on (tenant_id, updated_at), which the report
+materializer uses to find days whose calls changed after their
+partitions were computed.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '011_add_report_results'
+down_revision = '010_add_export_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add report result tables and the calls update index."""
+
+    op.create_table(
+        'report_result_partitions',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('definition_hash', sa.String(length=64), nullable=False),
+        sa.Column('partition_date', sa.Date(), nullable=False),
+        sa.Column('rows', sa.JSON(), nullable=False),
+        sa.Column('row_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('computed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('NOW()')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('NOW()')),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('tenant_id', 'definition_hash', 'partition_date', name='uq_report_result_partitions_key')
+    )
+    op.create_index('ix_report_result_partitions_tenant_id', 'report_result_partitions', ['tenant_id'])
+
+    op.create_table(
+        'report_runs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('schedule_id', sa.String(length=100), nullable=False),
+        sa.Column('report_id', sa.String(length=100), nullable=False),
+        sa.Column('definition_hash', sa.String(length=64), nullable=True),
+        sa.Column('start_date', sa.Date(), nullable=False),
+        sa.Column('end_date', sa.Date(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('rows', sa.JSON(), nullable=True),
+        sa.Column('row_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('partitions_reused', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('partitions_computed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('duration_ms', sa.Float(), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('NOW()')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('NOW()')),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_report_runs_tenant_id', 'report_runs', ['tenant_id'])
+    op.create_index('idx_report_runs_schedule', 'report_runs', ['tenant_id', 'schedule_id', 'created_at'])
+
+    op.create_index('idx_calls_tenant_updated', 'calls', ['tenant_id', 'updated_at'])
+
+    # Enable RLS on the new tables
+    op.execute("ALTER TABLE report_result_partitions ENABLE ROW LEVEL SECURITY")
+    op.execute("ALTER TABLE report_runs ENABLE ROW LEVEL SECURITY")
+
+    op.execute("""
+        CREATE POLICY report_result_partitions_tenant_isolation ON report_result_partitions
+        FOR ALL USING (tenant_id = current_setting('app.current_tenant_id')::uuid)
+    """)
+
+    op.execute("""
+        CREATE POLICY report_runs_tenant_isolation ON report_runs
+        FOR ALL USING (tenant_id = current_setting('app.current_tenant_id')::uuid)
+    """)
+
+
+def downgrade() -> None:
+    """Remove report result tables and the calls update index."""
+
+    op.execute("DROP POLICY IF EXISTS report_runs_tenant_isolation ON report_runs")
+    op.execute("DROP POLICY IF EXISTS report_result_partitions_tenant_isolation ON report_result_partitions")
+
+    op.drop_index('idx_calls_tenant_updated', table_name='calls')
+
+    op.drop_index('idx_report_runs_schedule', table_name='report_runs')
+    op.drop_index('ix_report_runs_tenant_id', table_name='report_runs')
+    op.drop_table('report_runs')
+
+    op.drop_index('ix_report_result_partitions_tenant_id', table_name='report_result_partitions')
+    op.drop_table('report_result_partitions')
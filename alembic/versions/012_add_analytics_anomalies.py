@@ -0,0 +1,65 @@
+"""Add analytics anomalies
+
+Revision ID: 012_add_analytics_anomalies
+Revises: 011_add_report_results
+Create Date: 2026-10-18
+
+Stores anomalies found in tenants' call analytics series by the batch
+anomaly detection job, so BI insights read them instead of detecting
+anomalies per request.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '012_add_analytics_anomalies'
+down_revision = '011_add_report_results'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add the analytics anomalies table."""
+
+    op.create_table(
+        'analytics_anomalies',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('metric', sa.String(length=50), nullable=False),
+        sa.Column('granularity', sa.String(length=10), nullable=False),
+        sa.Column('detector', sa.String(length=20), nullable=False),
+        sa.Column('period_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('value', sa.Float(), nullable=False),
+        sa.Column('expected', sa.Float(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('severity', sa.String(length=20), nullable=False),
+        sa.Column('detected_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('NOW()')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('NOW()')),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('tenant_id', 'metric', 'detector', 'period_start', name='uq_analytics_anomalies_point')
+    )
+    op.create_index('ix_analytics_anomalies_tenant_id', 'analytics_anomalies', ['tenant_id'])
+    op.create_index('idx_analytics_anomalies_period', 'analytics_anomalies', ['tenant_id', 'period_start'])
+
+    # Enable RLS on the new table
+    op.execute("ALTER TABLE analytics_anomalies ENABLE ROW LEVEL SECURITY")
+
+    op.execute("""
+        CREATE POLICY analytics_anomalies_tenant_isolation ON analytics_anomalies
+        FOR ALL USING (tenant_id = current_setting('app.current_tenant_id')::uuid)
+    """)
+
+
+def downgrade() -> None:
+    """Remove the analytics anomalies table."""
+
+    op.execute("DROP POLICY IF EXISTS analytics_anomalies_tenant_isolation ON analytics_anomalies")
+
+    op.drop_index('idx_analytics_anomalies_period', table_name='analytics_anomalies')
+    op.drop_index('ix_analytics_anomalies_tenant_id', table_name='analytics_anomalies')
+    op.drop_table('analytics_anomalies')
@@ -0,0 +1,183 @@
+"""Add per-tenant statistics
+
+Revision ID: 013_add_tenant_stats
+Revises: 012_add_analytics_anomalies
+Create Date: 2026-10-18
+
+Adds tenant_stats (agent counters) and tenant_daily_call_stats (call
+counters per tenant, UTC day and slot), kept current by triggers on
+agents and calls, and backfills them. Each call change lands in one of
+8 slots at random, so a tenant's concurrent calls do not all queue on
+one counter row; readers sum the slots. The super admin tenant summary and
+system metrics read these instead of scanning agents and calls per
+tenant.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '013_add_tenant_stats'
+down_revision = '012_add_analytics_anomalies'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add tenant statistics tables, their triggers and backfill them."""
+
+    op.create_table(
+        'tenant_stats',
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('total_agents', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('active_agents', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('NOW()')),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('tenant_id')
+    )
+
+    op.create_table(
+        'tenant_daily_call_stats',
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('slot', sa.SmallInteger(), nullable=False, server_default='0'),
+        sa.Column('calls', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('duration_total', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('last_call_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('tenant_id', 'day', 'slot')
+    )
+
+    # Block writers until the triggers exist and the backfill is done, so
+    # no row is counted twice or missed
+    op.execute("LOCK TABLE agents, calls IN SHARE MODE")
+
+    # Agent counters: remove the old row's contribution, add the new one's
+    op.execute("""
+        CREATE OR REPLACE FUNCTION track_agent_stats()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE'
+                AND NEW.tenant_id = OLD.tenant_id
+                AND NEW.is_active = OLD.is_active THEN
+                RETURN NULL;
+            END IF;
+
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE tenant_stats SET
+                    total_agents = total_agents - 1,
+                    active_agents = active_agents - OLD.is_active::int,
+                    updated_at = NOW()
+                WHERE tenant_id = OLD.tenant_id;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO tenant_stats (tenant_id, total_agents, active_agents, updated_at)
+                VALUES (NEW.tenant_id, 1, NEW.is_active::int, NOW())
+                ON CONFLICT (tenant_id) DO UPDATE SET
+                    total_agents = tenant_stats.total_agents + 1,
+                    active_agents = tenant_stats.active_agents + EXCLUDED.active_agents,
+                    updated_at = NOW();
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER track_agent_stats
+            AFTER INSERT OR DELETE OR UPDATE OF tenant_id, is_active ON agents
+            FOR EACH ROW
+            EXECUTE FUNCTION track_agent_stats();
+    """)
+
+    # Call counters, on the UTC day of the call's created_at. Removing a
+    # call adds its negative contribution to a random slot like adding one
+    # does, so no slot row is updated by every writer
+    op.execute("""
+        CREATE OR REPLACE FUNCTION track_call_stats()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE'
+                AND NEW.tenant_id = OLD.tenant_id
+                AND NEW.created_at = OLD.created_at
+                AND NEW.duration = OLD.duration THEN
+                RETURN NULL;
+            END IF;
+
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                INSERT INTO tenant_daily_call_stats (tenant_id, day, slot, calls, duration_total, last_call_at)
+                VALUES (
+                    OLD.tenant_id, (OLD.created_at AT TIME ZONE 'UTC')::date, floor(random() * 8)::int,
+                    -1, -OLD.duration, NULL
+                )
+                ON CONFLICT (tenant_id, day, slot) DO UPDATE SET
+                    calls = tenant_daily_call_stats.calls - 1,
+                    duration_total = tenant_daily_call_stats.duration_total + EXCLUDED.duration_total;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO tenant_daily_call_stats (tenant_id, day, slot, calls, duration_total, last_call_at)
+                VALUES (
+                    NEW.tenant_id, (NEW.created_at AT TIME ZONE 'UTC')::date, floor(random() * 8)::int,
+                    1, NEW.duration, NEW.created_at
+                )
+                ON CONFLICT (tenant_id, day, slot) DO UPDATE SET
+                    calls = tenant_daily_call_stats.calls + 1,
+                    duration_total = tenant_daily_call_stats.duration_total + EXCLUDED.duration_total,
+                    last_call_at = GREATEST(tenant_daily_call_stats.last_call_at, EXCLUDED.last_call_at);
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER track_call_stats
+            AFTER INSERT OR DELETE OR UPDATE OF tenant_id, created_at, duration ON calls
+            FOR EACH ROW
+            EXECUTE FUNCTION track_call_stats();
+    """)
+
+    # Backfill
+    op.execute("""
+        INSERT INTO tenant_stats (tenant_id, total_agents, active_agents)
+        SELECT tenant_id, COUNT(*), COUNT(*) FILTER (WHERE is_active)
+        FROM agents
+        GROUP BY tenant_id
+    """)
+    op.execute("""
+        INSERT INTO tenant_daily_call_stats (tenant_id, day, calls, duration_total, last_call_at)
+        SELECT tenant_id, (created_at AT TIME ZONE 'UTC')::date, COUNT(*), SUM(duration), MAX(created_at)
+        FROM calls
+        GROUP BY tenant_id, (created_at AT TIME ZONE 'UTC')::date
+    """)
+
+    # Enable RLS on the new tables
+    op.execute("ALTER TABLE tenant_stats ENABLE ROW LEVEL SECURITY")
+    op.execute("ALTER TABLE tenant_daily_call_stats ENABLE ROW LEVEL SECURITY")
+
+    op.execute("""
+        CREATE POLICY tenant_stats_tenant_isolation ON tenant_stats
+        FOR ALL USING (tenant_id = current_setting('app.current_tenant_id')::uuid)
+    """)
+
+    op.execute("""
+        CREATE POLICY tenant_daily_call_stats_tenant_isolation ON tenant_daily_call_stats
+        FOR ALL USING (tenant_id = current_setting('app.current_tenant_id')::uuid)
+    """)
+
+
+def downgrade() -> None:
+    """Remove tenant statistics tables and their triggers."""
+
+    op.execute("DROP TRIGGER IF EXISTS track_call_stats ON calls")
+    op.execute("DROP TRIGGER IF EXISTS track_agent_stats ON agents")
+    op.execute("DROP FUNCTION IF EXISTS track_call_stats()")
+    op.execute("DROP FUNCTION IF EXISTS track_agent_stats()")
+
+    op.execute("DROP POLICY IF EXISTS tenant_daily_call_stats_tenant_isolation ON tenant_daily_call_stats")
+    op.execute("DROP POLICY IF EXISTS tenant_stats_tenant_isolation ON tenant_stats")
+
+    op.drop_table('tenant_daily_call_stats')
+    op.drop_table('tenant_stats')
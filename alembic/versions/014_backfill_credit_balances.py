@@ -0,0 +1,59 @@
+"""Backfill credit balances for active subscriptions
+
+Revision ID: 014_backfill_credit_balances
+Revises: 013_add_tenant_stats
+Create Date: 2026-10-18
+
+Credits are charged atomically against each tenant's credit_balances
+row. Subscriptions created before balance rows were maintained get one
+for their current period, with the usage already recorded in it.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '014_backfill_credit_balances'
+down_revision = '013_add_tenant_stats'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create missing credit balance rows for active subscriptions."""
+
+    op.execute("""
+        INSERT INTO credit_balances (
+            id, tenant_id, subscription_id,
+            allocated_credits, used_credits, remaining_credits, overage_credits,
+            period_start, period_end
+        )
+        SELECT
+            gen_random_uuid(), s.tenant_id, s.id,
+            s.allocated, s.used, GREATEST(s.allocated - s.used, 0), GREATEST(s.used - s.allocated, 0),
+            s.period_start, s.next_billing_date
+        FROM (
+            SELECT DISTINCT ON (ts.tenant_id)
+                ts.tenant_id,
+                ts.id,
+                ts.next_billing_date,
+                ts.next_billing_date - INTERVAL '30 days' AS period_start,
+                COALESCE(ts.custom_monthly_credits, cp.monthly_credits) AS allocated,
+                COALESCE((
+                    SELECT SUM(cu.credits_consumed)
+                    FROM credit_usage cu
+                    WHERE cu.subscription_id = ts.id
+                        AND cu.usage_date >= ts.next_billing_date - INTERVAL '30 days'
+                ), 0) AS used
+            FROM tenant_subscriptions ts
+            JOIN credit_plans cp ON cp.id = ts.credit_plan_id
+            WHERE ts.status = 'active'
+            ORDER BY ts.tenant_id, ts.started_at DESC
+        ) s
+        ON CONFLICT (tenant_id) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    """Backfilled rows are indistinguishable from maintained ones; nothing to undo."""
+    pass
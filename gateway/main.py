@@ -5,42 +5,53 @@ Central gateway for all microservices with load balancing and authentication
 
 from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
 from contextlib import asynccontextmanager
 import uvicorn
 import os
 import httpx
 import asyncio
+import hmac
 from typing import List, Optional, Dict, Any
 import logging
 import time
 from datetime import datetime
 
+from response_cache import CachedResponse, ResponseCache, parse_cache_control
+from service_registry import ServiceRegistry
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Service registry
-SERVICES = {
-    "tenant": {"url": "http://localhost:8001", "health": True},
-    "call": {"url": "http://localhost:8002", "health": True},
-    "ai": {"url": "http://localhost:8003", "health": True},
-    "crm": {"url": "http://localhost:8004", "health": True},
-    "analytics": {"url": "http://localhost:8005", "health": True},
-    "integration": {"url": "http://localhost:8006", "health": True},
-    "billing": {"url": "http://localhost:8007", "health": True},
-}
+registry = ServiceRegistry.from_env()
+REGISTRATION_TOKEN = os.getenv("GATEWAY_REGISTRATION_TOKEN")
+
+# Edge cache for idempotent GETs
+response_cache = ResponseCache.from_env()
+
+# Shared HTTP client so proxied requests and health probes reuse connections
+http_client: Optional[httpx.AsyncClient] = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan management"""
+    global http_client
     logger.info("🚀 VoiceCore AI 2.0 - API Gateway Starting...")
     
-    # Start health check task
-    asyncio.create_task(health_check_services())
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=50)
+    )
+    
+    # Start health probing
+    await registry.start(http_client)
     
     yield
     logger.info("🚀 API Gateway Shutting Down...")
+    await registry.stop()
+    await http_client.aclose()
 
 # Create FastAPI app
 app = FastAPI(
@@ -59,56 +70,115 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-async def health_check_services():
-    """Periodically check service health"""
-    while True:
-        async with httpx.AsyncClient() as client:
-            for service_name, service_info in SERVICES.items():
-                try:
-                    response = await client.get(f"{service_info['url']}/health", timeout=5.0)
-                    SERVICES[service_name]["health"] = response.status_code == 200
-                    SERVICES[service_name]["last_check"] = datetime.now().isoformat()
-                except Exception as e:
-                    SERVICES[service_name]["health"] = False
-                    SERVICES[service_name]["last_check"] = datetime.now().isoformat()
-                    SERVICES[service_name]["error"] = str(e)
-        
-        await asyncio.sleep(30)  # Check every 30 seconds
+class ServiceRegistration(BaseModel):
+    """Self-registration payload sent by service instances"""
+    service: str
+    url: str
+    instance_id: Optional[str] = None
 
-async def proxy_request(service_name: str, path: str, request: Request):
-    """Proxy request to appropriate microservice"""
-    if service_name not in SERVICES:
-        raise HTTPException(status_code=404, detail=f"Service {service_name} not found")
-    
-    service_info = SERVICES[service_name]
-    if not service_info["health"]:
+def _check_registration_token(request: Request):
+    """Only callers holding the registration token may change the registry"""
+    if not REGISTRATION_TOKEN:
+        # Fail closed: without a configured token anyone could hijack routing
+        raise HTTPException(status_code=403, detail="Service registration is disabled")
+    supplied = request.headers.get("X-Registration-Token", "")
+    if not hmac.compare_digest(supplied.encode(), REGISTRATION_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid registration token")
+
+async def forward_request(
+    service_name: str,
+    path: str,
+    request: Request,
+    body: Optional[bytes] = None,
+    extra_headers: Optional[Dict[str, str]] = None,
+) -> httpx.Response:
+    """Send a request to a healthy instance, failing over on connection errors"""
+    instance = registry.choose_instance(service_name)
+    if not instance:
         raise HTTPException(status_code=503, detail=f"Service {service_name} is unavailable")
     
-    # Build target URL
-    target_url = f"{service_info['url']}{path}"
+    headers = dict(request.headers)
+    if extra_headers is not None:
+        # The cache manages its own validators, so drop the client's
+        for name in ("if-none-match", "if-modified-since", "cache-control", "pragma"):
+            headers.pop(name, None)
+        headers.update(extra_headers)
     
-    # Forward request
-    async with httpx.AsyncClient() as client:
+    tried = set()
+    while instance:
+        tried.add(instance.instance_id)
+        target_url = f"{instance.url}{path}"
+        
         try:
-            # Get request body if present
-            body = await request.body() if request.method in ["POST", "PUT", "PATCH"] else None
-            
-            response = await client.request(
+            response = await http_client.request(
                 method=request.method,
                 url=target_url,
-                headers=dict(request.headers),
+                params=request.query_params,
+                headers=headers,
                 content=body,
                 timeout=30.0
             )
-            
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else response.text,
-                status_code=response.status_code,
-                headers=dict(response.headers)
-            )
+        except httpx.ConnectError as e:
+            # Nothing reached the backend, so any method can fail over safely
+            registry.record_failure(instance, str(e))
+            logger.warning(f"Instance {instance.instance_id} of {service_name} unreachable: {e}")
+            instance = registry.choose_instance(service_name, exclude=tried)
+            continue
         except Exception as e:
+            registry.record_failure(instance, str(e))
             logger.error(f"Error proxying request to {service_name}: {e}")
             raise HTTPException(status_code=502, detail=f"Bad gateway: {str(e)}")
+        
+        if response.status_code in (502, 503, 504):
+            registry.record_failure(instance, f"HTTP {response.status_code}")
+        else:
+            registry.record_success(instance)
+        return response
+    
+    raise HTTPException(status_code=502, detail=f"Bad gateway: no reachable instance of {service_name}")
+
+def build_response(entry: CachedResponse, request: Request, cache_status: Optional[str] = None) -> Response:
+    """Turn an upstream or cached response into a client response"""
+    headers = {name: value for name, value in entry.headers}
+    if cache_status:
+        headers["X-Cache"] = cache_status
+        headers["Age"] = str(entry.age)
+        
+        # Answer the client's own conditional request from the cache
+        if entry.etag and request.headers.get("if-none-match") == entry.etag:
+            return Response(status_code=304, headers={
+                k: v for k, v in headers.items()
+                if k.lower() in ("etag", "cache-control", "last-modified", "x-cache", "age")
+            })
+    
+    return Response(content=entry.body, status_code=entry.status_code, headers=headers)
+
+async def proxy_request(service_name: str, path: str, request: Request):
+    """Proxy request to a healthy instance of the target microservice"""
+    if not registry.has_service(service_name):
+        raise HTTPException(status_code=404, detail=f"Service {service_name} not found")
+    
+    cache_key = response_cache.cache_key(request, service_name, path)
+    if cache_key:
+        directives = parse_cache_control(request.headers.get("cache-control"))
+        revalidate = "no-cache" in directives or request.headers.get("pragma") == "no-cache"
+        entry, cache_status = await response_cache.fetch(
+            cache_key,
+            lambda conditional: forward_request(
+                service_name, path, request, extra_headers=conditional
+            ),
+            revalidate=revalidate,
+        )
+        return build_response(entry, request, cache_status)
+    
+    # Get request body if present
+    body = await request.body() if request.method in ["POST", "PUT", "PATCH"] else None
+    response = await forward_request(service_name, path, request, body=body)
+    
+    if request.method != "GET" and response.status_code < 400:
+        response_cache.invalidate(ResponseCache.tenant_of(request), service_name)
+    
+    return build_response(CachedResponse.from_upstream(response, 0), request)
 
 @app.get("/health")
 async def health_check():
@@ -118,7 +188,7 @@ async def health_check():
         "service": "api-gateway",
         "version": "2.0.0",
         "timestamp": datetime.now().isoformat(),
-        "services": SERVICES
+        "services": registry.snapshot()
     }
 
 @app.get("/")
@@ -128,19 +198,44 @@ async def root():
         "service": "VoiceCore AI 2.0 - API Gateway",
         "version": "2.0.0",
         "status": "running",
-        "available_services": list(SERVICES.keys()),
+        "available_services": list(registry.services.keys()),
         "documentation": "/docs"
     }
 
 @app.get("/services")
 async def list_services():
     """List all available services and their status"""
+    services = registry.snapshot()
     return {
-        "services": SERVICES,
-        "total_services": len(SERVICES),
-        "healthy_services": sum(1 for s in SERVICES.values() if s["health"])
+        "services": services,
+        "total_services": len(services),
+        "healthy_services": sum(1 for s in services.values() if s["health"])
     }
 
+@app.get("/cache/stats")
+async def cache_stats():
+    """Edge response cache statistics"""
+    return response_cache.snapshot()
+
+@app.post("/services/register")
+async def register_service(registration: ServiceRegistration, request: Request):
+    """Register (or heartbeat) a service instance"""
+    _check_registration_token(request)
+    instance = registry.register(
+        registration.service,
+        registration.url,
+        instance_id=registration.instance_id,
+    )
+    return {"service": registration.service, "instance": instance.to_dict()}
+
+@app.delete("/services/{service_name}/instances/{instance_id}")
+async def deregister_service(service_name: str, instance_id: str, request: Request):
+    """Remove a service instance from the registry"""
+    _check_registration_token(request)
+    if not registry.deregister(service_name, instance_id):
+        raise HTTPException(status_code=404, detail=f"Instance {instance_id} of {service_name} not found")
+    return {"service": service_name, "instance_id": instance_id, "deregistered": True}
+
 # Dynamic routing for all services
 @app.api_route("/api/{service_name}/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
 async def route_to_service(service_name: str, path: str, request: Request):
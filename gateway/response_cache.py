@@ -0,0 +1,329 @@
+"""
+VoiceCore AI 2.0 - Gateway Response Cache
+Tenant-scoped HTTP cache for idempotent GETs with conditional revalidation
+and coalescing of identical in-flight requests
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import httpx
+from fastapi import Request
+
+logger = logging.getLogger(__name__)
+
+# Headers that describe the upstream connection or encoding rather than the resource
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade",
+    "content-length", "content-encoding",
+}
+
+# Request headers that identify the caller to the backends
+CREDENTIAL_HEADERS = ("authorization", "x-api-key", "cookie")
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parse a Cache-Control header into a directive -> argument map"""
+    directives: Dict[str, Optional[str]] = {}
+    if not value:
+        return directives
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, arg = part.partition("=")
+        directives[name.strip().lower()] = arg.strip().strip('"') if arg else None
+    return directives
+
+
+def _int_directive(directives: Dict[str, Optional[str]], name: str) -> Optional[int]:
+    try:
+        return int(directives[name]) if directives.get(name) is not None else None
+    except ValueError:
+        return None
+
+
+@dataclass
+class CachedResponse:
+    """An upstream response body plus the metadata needed to reuse it"""
+    status_code: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stored_at: float = field(default_factory=time.monotonic)
+    expires_at: float = 0.0
+    index_key: Optional[Tuple[str, str]] = None
+
+    @classmethod
+    def from_upstream(cls, response: httpx.Response, default_ttl: float) -> "CachedResponse":
+        headers = [
+            (name, value) for name, value in response.headers.multi_items()
+            if name.lower() not in HOP_BY_HOP_HEADERS
+        ]
+        entry = cls(
+            status_code=response.status_code,
+            headers=headers,
+            body=response.content,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+        )
+        entry.refresh(response.headers, default_ttl)
+        return entry
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    @property
+    def age(self) -> int:
+        return int(time.monotonic() - self.stored_at)
+
+    @property
+    def has_validators(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def refresh(self, headers: httpx.Headers, default_ttl: float) -> None:
+        """Recompute freshness from (possibly 304) upstream headers"""
+        directives = parse_cache_control(headers.get("cache-control"))
+        ttl = _int_directive(directives, "s-maxage")
+        if ttl is None:
+            ttl = _int_directive(directives, "max-age")
+        if ttl is None:
+            ttl = default_ttl
+        if "no-cache" in directives:
+            ttl = 0
+
+        try:
+            upstream_age = int(headers.get("age", 0))
+        except ValueError:
+            upstream_age = 0
+
+        now = time.monotonic()
+        self.stored_at = now - upstream_age
+        self.expires_at = now + max(0, ttl - upstream_age)
+
+        if headers.get("etag"):
+            self.etag = headers["etag"]
+        if headers.get("last-modified"):
+            self.last_modified = headers["last-modified"]
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+Fetcher = Callable[[Dict[str, str]], Awaitable[httpx.Response]]
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache for proxied GET responses.
+
+    Entries are keyed by tenant, caller credentials, service, path and
+    normalized query string. The gateway does not verify credentials, so
+    a response is only ever reused for a request presenting the same ones
+    as the request the backend authorized; a client naming another tenant
+    in X-Tenant-Id with its own token gets a miss and the backend's check.
+    Identical requests that arrive while an upstream fetch is in flight
+    share that fetch instead of issuing their own.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_body_bytes: int = 1024 * 1024,
+        default_ttl: float = 0.0,
+        enabled: bool = True,
+        key_secret: Optional[bytes] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_body_bytes = max_body_bytes
+        self.default_ttl = default_ttl
+        self.enabled = enabled
+        # Credentials only appear in keys as an HMAC under a per-process secret
+        self._key_secret = key_secret or os.urandom(32)
+
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._index: Dict[Tuple[str, str], Set[str]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "coalesced": 0,
+            "stored": 0,
+            "evicted": 0,
+            "invalidated": 0,
+            "bypassed": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        return cls(
+            max_entries=int(os.getenv("GATEWAY_CACHE_MAX_ENTRIES", 1000)),
+            max_body_bytes=int(os.getenv("GATEWAY_CACHE_MAX_BODY_BYTES", 1024 * 1024)),
+            default_ttl=float(os.getenv("GATEWAY_CACHE_DEFAULT_TTL", 0)),
+            enabled=os.getenv("GATEWAY_CACHE_ENABLED", "true").lower() == "true",
+        )
+
+    # Keys
+
+    @staticmethod
+    def tenant_of(request: Request) -> Optional[str]:
+        """
+        Tenant scope for a request, used to group entries for invalidation.
+
+        Requests carrying credentials but no tenant header are not cacheable,
+        since the gateway cannot tell whose data the response holds.
+        """
+        tenant_id = request.headers.get("x-tenant-id")
+        if tenant_id:
+            return tenant_id
+        if request.headers.get("authorization"):
+            return None
+        return "anonymous"
+
+    def principal_of(self, request: Request) -> str:
+        """Keyed digest of the credentials a request presents"""
+        credentials = [
+            f"{name}:{request.headers[name]}" for name in CREDENTIAL_HEADERS
+            if request.headers.get(name)
+        ]
+        if not credentials:
+            return "public"
+        return hmac.new(
+            self._key_secret, "\n".join(credentials).encode(), hashlib.sha256
+        ).hexdigest()
+
+    def cache_key(self, request: Request, service_name: str, path: str) -> Optional[str]:
+        if not self.enabled or request.method != "GET":
+            return None
+        directives = parse_cache_control(request.headers.get("cache-control"))
+        tenant_id = self.tenant_of(request)
+        if "no-store" in directives or tenant_id is None:
+            self.stats["bypassed"] += 1
+            return None
+        query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+        return f"{tenant_id}|{self.principal_of(request)}|{service_name}|{path}?{query}"
+
+    # Lookup and fill
+
+    async def fetch(
+        self, key: str, fetcher: Fetcher, revalidate: bool = False
+    ) -> Tuple[CachedResponse, str]:
+        """
+        Return a response for ``key`` and how it was obtained.
+
+        The status is one of HIT, MISS, REVALIDATED or COALESCED.
+        """
+        entry = self._entries.get(key)
+        if entry and entry.fresh and not revalidate:
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry, "HIT"
+
+        task = self._inflight.get(key)
+        if task:
+            self.stats["coalesced"] += 1
+            result, _ = await asyncio.shield(task)
+            return result, "COALESCED"
+
+        # The fill runs as its own task so a disconnecting client can't
+        # cancel the fetch that other waiters depend on
+        task = asyncio.create_task(self._fill(key, entry, fetcher))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _fill(
+        self, key: str, entry: Optional[CachedResponse], fetcher: Fetcher
+    ) -> Tuple[CachedResponse, str]:
+        conditional = entry.conditional_headers() if entry else {}
+        response = await fetcher(conditional)
+
+        if response.status_code == 304 and entry is not None:
+            entry.refresh(response.headers, self.default_ttl)
+            self._entries.move_to_end(key)
+            self.stats["revalidated"] += 1
+            return entry, "REVALIDATED"
+
+        self.stats["misses"] += 1
+        new_entry = CachedResponse.from_upstream(response, self.default_ttl)
+        if self._is_storable(response, new_entry):
+            self._store(key, new_entry)
+        else:
+            self._remove(key)
+        return new_entry, "MISS"
+
+    def _is_storable(self, response: httpx.Response, entry: CachedResponse) -> bool:
+        if response.status_code != 200 or len(entry.body) > self.max_body_bytes:
+            return False
+        if "set-cookie" in response.headers:
+            return False
+        vary = {v.strip().lower() for v in response.headers.get("vary", "").split(",") if v.strip()}
+        if vary - {"accept-encoding", "origin"}:
+            return False
+        directives = parse_cache_control(response.headers.get("cache-control"))
+        if "no-store" in directives or "private" in directives:
+            # Private responses are for one user and must not sit in a shared cache
+            return False
+        # Worth keeping if it is fresh for a while or can be cheaply revalidated
+        return entry.fresh or entry.has_validators
+
+    def _store(self, key: str, entry: CachedResponse) -> None:
+        tenant_id, _, service_name, _ = key.split("|", 3)
+        entry.index_key = (tenant_id, service_name)
+        self._remove(key)
+        self._entries[key] = entry
+        self._index.setdefault(entry.index_key, set()).add(key)
+        self.stats["stored"] += 1
+
+        while len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.stats["evicted"] += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry and entry.index_key:
+            keys = self._index.get(entry.index_key)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self._index[entry.index_key]
+
+    # Invalidation
+
+    def invalidate(self, tenant_id: Optional[str], service_name: str) -> int:
+        """Drop every cached response of one tenant for one service"""
+        keys = list(self._index.get((tenant_id or "anonymous", service_name), ()))
+        for key in keys:
+            self._remove(key)
+        self.stats["invalidated"] += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._index.clear()
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "inflight": len(self._inflight),
+            **self.stats,
+        }
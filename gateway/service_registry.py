@@ -0,0 +1,309 @@
+"""
+VoiceCore AI 2.0 - Gateway Service Registry
+Multi-instance service registry with concurrent active and passive health checks
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Default service locations, overridable per service with <NAME>_SERVICE_URLS
+DEFAULT_SERVICES = {
+    "tenant": "http://localhost:8001",
+    "call": "http://localhost:8002",
+    "ai": "http://localhost:8003",
+    "crm": "http://localhost:8004",
+    "analytics": "http://localhost:8005",
+    "integration": "http://localhost:8006",
+    "billing": "http://localhost:8007",
+}
+
+
+@dataclass
+class ServiceInstance:
+    """A single replica of a backend service"""
+    service_name: str
+    url: str
+    instance_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    source: str = "static"
+    health: bool = True
+    consecutive_failures: int = 0
+    last_check: Optional[str] = None
+    last_error: Optional[str] = None
+    ejected_until: float = 0.0
+    registered_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    @property
+    def available(self) -> bool:
+        """Healthy and not temporarily ejected by passive health checks"""
+        return self.health and self.ejected_until <= time.monotonic()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "instance_id": self.instance_id,
+            "url": self.url,
+            "source": self.source,
+            "health": self.health,
+            "available": self.available,
+            "consecutive_failures": self.consecutive_failures,
+            "last_check": self.last_check,
+            "error": self.last_error,
+            "registered_at": self.registered_at,
+        }
+
+
+class ServiceRegistry:
+    """
+    Registry of service instances used by the gateway for routing.
+
+    Every instance is probed on its own jittered timer so a slow or dead
+    replica never delays health updates for the others. Proxy errors feed
+    back as passive health signals and eject an instance after repeated
+    failures until an active probe succeeds again.
+    """
+
+    def __init__(
+        self,
+        probe_interval: float = 30.0,
+        probe_timeout: float = 5.0,
+        probe_jitter: float = 0.2,
+        failure_threshold: int = 3,
+        ejection_seconds: float = 30.0,
+    ):
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.probe_jitter = probe_jitter
+        self.failure_threshold = failure_threshold
+        self.ejection_seconds = ejection_seconds
+
+        self.services: Dict[str, Dict[str, ServiceInstance]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._probe_tasks: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._sweep_task: Optional[asyncio.Task] = None
+        self._running = False
+
+    # Configuration
+
+    @classmethod
+    def from_env(cls) -> "ServiceRegistry":
+        """Build a registry from defaults and environment overrides"""
+        registry = cls(
+            probe_interval=float(os.getenv("GATEWAY_PROBE_INTERVAL", 30)),
+            probe_timeout=float(os.getenv("GATEWAY_PROBE_TIMEOUT", 5)),
+            failure_threshold=int(os.getenv("GATEWAY_FAILURE_THRESHOLD", 3)),
+            ejection_seconds=float(os.getenv("GATEWAY_EJECTION_SECONDS", 30)),
+        )
+
+        service_names = set(DEFAULT_SERVICES)
+        extra = os.getenv("GATEWAY_EXTRA_SERVICES", "")
+        service_names.update(name.strip() for name in extra.split(",") if name.strip())
+
+        for service_name in sorted(service_names):
+            env_key = f"{service_name.upper().replace('-', '_')}_SERVICE_URLS"
+            configured = os.getenv(env_key)
+            if configured:
+                urls = [url.strip() for url in configured.split(",") if url.strip()]
+                source = "env"
+            elif service_name in DEFAULT_SERVICES:
+                urls = [DEFAULT_SERVICES[service_name]]
+                source = "static"
+            else:
+                logger.warning(f"No URLs configured for extra service {service_name} ({env_key})")
+                continue
+
+            for url in urls:
+                registry.register(service_name, url, source=source)
+
+        return registry
+
+    # Registration
+
+    def register(
+        self,
+        service_name: str,
+        url: str,
+        instance_id: Optional[str] = None,
+        source: str = "registered",
+    ) -> ServiceInstance:
+        """
+        Register an instance, or refresh it if the same URL is already known.
+
+        Re-registering an instance id at a new URL replaces the old instance
+        and restarts its probe against the new URL.
+        """
+        url = url.rstrip("/")
+        instances = self.services.setdefault(service_name, {})
+
+        for existing in instances.values():
+            if existing.url == url:
+                return existing
+
+        instance = ServiceInstance(service_name=service_name, url=url, source=source)
+        if instance_id:
+            instance.instance_id = instance_id
+        if instance.instance_id in instances:
+            self._cancel_probe(service_name, instance.instance_id)
+        instances[instance.instance_id] = instance
+
+        if self._running:
+            self._start_probe(instance)
+
+        logger.info(f"Registered {service_name} instance {instance.instance_id} at {url} ({source})")
+        return instance
+
+    def deregister(self, service_name: str, instance_id: str) -> bool:
+        """Remove an instance and stop probing it"""
+        instances = self.services.get(service_name, {})
+        instance = instances.pop(instance_id, None)
+        if not instance:
+            return False
+
+        self._cancel_probe(service_name, instance_id)
+        if not instances:
+            self.services.pop(service_name, None)
+            self._cursors.pop(service_name, None)
+
+        logger.info(f"Deregistered {service_name} instance {instance_id}")
+        return True
+
+    # Routing
+
+    def has_service(self, service_name: str) -> bool:
+        return service_name in self.services
+
+    def available_instances(self, service_name: str) -> List[ServiceInstance]:
+        return [i for i in self.services.get(service_name, {}).values() if i.available]
+
+    def choose_instance(
+        self, service_name: str, exclude: Optional[set] = None
+    ) -> Optional[ServiceInstance]:
+        """Round-robin over available instances, skipping any in ``exclude``"""
+        candidates = [
+            i for i in self.available_instances(service_name)
+            if not exclude or i.instance_id not in exclude
+        ]
+        if not candidates:
+            return None
+
+        cursor = self._cursors.get(service_name, 0)
+        self._cursors[service_name] = cursor + 1
+        return candidates[cursor % len(candidates)]
+
+    # Passive health
+
+    def record_success(self, instance: ServiceInstance) -> None:
+        instance.consecutive_failures = 0
+
+    def record_failure(self, instance: ServiceInstance, error: str) -> None:
+        """Count a proxy failure and eject the instance once the threshold is hit"""
+        instance.consecutive_failures += 1
+        instance.last_error = error
+        if instance.consecutive_failures >= self.failure_threshold:
+            instance.ejected_until = time.monotonic() + self.ejection_seconds
+            logger.warning(
+                f"Ejected {instance.service_name} instance {instance.instance_id} "
+                f"after {instance.consecutive_failures} consecutive failures"
+            )
+
+    # Active health
+
+    async def start(self, client: httpx.AsyncClient) -> None:
+        """Kick off an initial concurrent sweep, then probe each instance on its own timer"""
+        self._client = client
+        self._running = True
+        self._sweep_task = asyncio.create_task(self.probe_all())
+        for instances in self.services.values():
+            for instance in instances.values():
+                self._start_probe(instance)
+
+    async def stop(self) -> None:
+        self._running = False
+        tasks = list(self._probe_tasks.values())
+        if self._sweep_task:
+            tasks.append(self._sweep_task)
+            self._sweep_task = None
+        self._probe_tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def probe_all(self) -> None:
+        """Probe every instance concurrently"""
+        instances = [i for group in self.services.values() for i in group.values()]
+        await asyncio.gather(*(self.probe(i) for i in instances), return_exceptions=True)
+
+    async def probe(self, instance: ServiceInstance) -> bool:
+        """Probe one instance's /health endpoint and update its state"""
+        try:
+            response = await self._client.get(
+                f"{instance.url}/health", timeout=self.probe_timeout
+            )
+            healthy = response.status_code == 200
+            instance.last_error = None if healthy else f"HTTP {response.status_code}"
+        except Exception as e:
+            healthy = False
+            instance.last_error = str(e)
+
+        if healthy and not instance.health:
+            logger.info(f"{instance.service_name} instance {instance.instance_id} is healthy again")
+        elif not healthy and instance.health:
+            logger.warning(
+                f"{instance.service_name} instance {instance.instance_id} failed health check: "
+                f"{instance.last_error}"
+            )
+
+        instance.health = healthy
+        instance.last_check = datetime.now().isoformat()
+        if healthy:
+            # A successful probe readmits passively ejected instances
+            instance.consecutive_failures = 0
+            instance.ejected_until = 0.0
+        return healthy
+
+    def _start_probe(self, instance: ServiceInstance) -> None:
+        key = (instance.service_name, instance.instance_id)
+        if key not in self._probe_tasks:
+            self._probe_tasks[key] = asyncio.create_task(self._probe_loop(instance))
+
+    def _cancel_probe(self, service_name: str, instance_id: str) -> None:
+        task = self._probe_tasks.pop((service_name, instance_id), None)
+        if task:
+            task.cancel()
+
+    def _next_delay(self) -> float:
+        spread = self.probe_interval * self.probe_jitter
+        return max(1.0, self.probe_interval + random.uniform(-spread, spread))
+
+    async def _probe_loop(self, instance: ServiceInstance) -> None:
+        # Start at a random offset so replicas don't get probed in lockstep
+        await asyncio.sleep(random.uniform(0, self.probe_interval))
+        while True:
+            await self.probe(instance)
+            await asyncio.sleep(self._next_delay())
+
+    # Reporting
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-service view, keeping the legacy url/health keys"""
+        result = {}
+        for service_name, instances in self.services.items():
+            members = list(instances.values())
+            result[service_name] = {
+                "url": members[0].url if members else None,
+                "health": any(i.available for i in members),
+                "healthy_instances": sum(1 for i in members if i.available),
+                "total_instances": len(members),
+                "instances": [i.to_dict() for i in members],
+            }
+        return result
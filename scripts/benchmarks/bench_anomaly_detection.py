@@ -0,0 +1,75 @@
+"""
+Benchmark of batch anomaly detection.
+
+Scores synthetic hourly call series (a daily peak with Poisson noise)
+for a number of tenants, in batches as AnomalyDetectionService does, and
+reports scoring time per batch and per tenant, and the anomalies found.
+The database query is not included.
+
+Usage:
+    python scripts/benchmarks/bench_anomaly_detection.py [--tenants 10000] [--batch-size 500]
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+from voicecore.services.anomaly_service import AnomalyDetectionService, CallSeries, find_anomalies
+
+
+def make_series(tenant_count, start, hours, rng):
+    hour_of_day = np.arange(hours) % 24
+    peak = np.where((hour_of_day >= 9) & (hour_of_day < 17), 1.0, 0.1)
+    volume = rng.uniform(2, 60, size=(tenant_count, 1)) * peak
+    total = rng.poisson(volume).astype(float)
+    answered = rng.binomial(total.astype(int), 0.92).astype(float)
+    ai_handled = rng.binomial(total.astype(int), 0.5).astype(float)
+    ai_resolved = rng.binomial(ai_handled.astype(int), 0.7).astype(float)
+    # A few tenants get a spike in the last day
+    spiked = rng.choice(tenant_count, size=max(1, tenant_count // 100), replace=False)
+    total[spiked, -10] += 200
+    return CallSeries(
+        [uuid.uuid4() for _ in range(tenant_count)], start, total, answered, ai_handled, ai_resolved
+    )
+
+
+def main(tenant_count, batch_size, history_weeks, evaluation_days):
+    service = AnomalyDetectionService(history_weeks, evaluation_days, batch_size)
+    now = datetime(2026, 10, 18, 12, 30)
+    start, _, end = service.window(now)
+    hours = int((end - start) / timedelta(hours=1))
+    rng = np.random.default_rng(7)
+
+    print(f"{tenant_count:,} tenants, {hours:,} hours each, batches of {batch_size}")
+    elapsed = 0.0
+    found = 0
+    for offset in range(0, tenant_count, batch_size):
+        series = make_series(min(batch_size, tenant_count - offset), start, hours, rng)
+        started = time.perf_counter()
+        found += len(find_anomalies(series, history_weeks, now))
+        elapsed += time.perf_counter() - started
+
+    batches = -(-tenant_count // batch_size)
+    print(f"scoring: {elapsed:.2f}s total, {elapsed / batches * 1000:.0f} ms/batch, "
+          f"{elapsed / tenant_count * 1e6:.0f} us/tenant")
+    print(f"anomalies: {found:,} ({found / tenant_count:.2f} per tenant)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tenants", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--history-weeks", type=int, default=8)
+    parser.add_argument("--evaluation-days", type=int, default=7)
+    args = parser.parse_args()
+    main(args.tenants, args.batch_size, args.history_weeks, args.evaluation_days)
@@ -0,0 +1,113 @@
+"""
+Microbenchmark of emotion lexicon scoring.
+
+Compares the previous per-keyword regex scanning (one ``re.findall``
+per emotion keyword, then separate sentiment and keyword-extraction
+scans) with the precompiled lexicon trie, in utterances per second.
+
+Usage:
+    python scripts/benchmarks/bench_emotion.py [--iterations 20000]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+from voicecore.services.emotion_detection_service import EmotionDetectionService
+from voicecore.services.emotion_lexicon import normalize_text
+
+
+UTTERANCES = [
+    "Hi, I'm calling about my last invoice, it looks higher than usual.",
+    "Honestly I'm fed up. This is ridiculous and I'm really annoyed with the service.",
+    "Thank you so much, that's wonderful, I appreciate the quick help!",
+    "I'm a bit worried, my card was charged twice and I need a refund.",
+    "Can you transfer me to a manager? This is the third time I've called.",
+    "Okay, sounds good. Could you also update my mailing address please?",
+]
+
+POSITIVE_PATTERNS = [
+    r"\b(love|like|enjoy|appreciate|thank|grateful)\b",
+    r"\b(good|great|excellent|amazing|wonderful|fantastic)\b",
+    r"\b(happy|pleased|satisfied|delighted)\b"
+]
+NEGATIVE_PATTERNS = [
+    r"\b(hate|dislike|terrible|awful|horrible|disgusting)\b",
+    r"\b(bad|poor|worst|useless|pathetic)\b",
+    r"\b(angry|mad|frustrated|annoyed|upset)\b"
+]
+
+
+def legacy_score(service, text):
+    """Previous scoring path, kept here only for comparison."""
+    text = text.lower()
+    text = re.sub(r'\s+', ' ', text).strip()
+    text = re.sub(r'[^\w\s!?.,;:-]', '', text)
+
+    scores = {}
+    for emotion, keywords in service.emotion_keywords.items():
+        scores[emotion] = sum(
+            len(re.findall(r'\b' + re.escape(keyword) + r'\b', text)) for keyword in keywords
+        )
+    positive = sum(len(re.findall(p, text, re.IGNORECASE)) for p in POSITIVE_PATTERNS)
+    negative = sum(len(re.findall(p, text, re.IGNORECASE)) for p in NEGATIVE_PATTERNS)
+    escalation = None
+    for level in reversed(list(service.escalation_keywords)):
+        if any(keyword in text for keyword in service.escalation_keywords[level]):
+            escalation = level
+            break
+    keywords = [
+        keyword
+        for emotion_keywords in service.emotion_keywords.values()
+        for keyword in emotion_keywords
+        if re.search(r'\b' + re.escape(keyword) + r'\b', text)
+    ]
+    return scores, positive, negative, escalation, keywords
+
+
+def measure(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return time.perf_counter() - start
+
+
+def main(iterations):
+    service = EmotionDetectionService()
+    lexicon = service.lexicon
+    batches = iterations // len(UTTERANCES)
+    utterances = batches * len(UTTERANCES)
+
+    def run_legacy():
+        for text in UTTERANCES:
+            legacy_score(service, text)
+
+    def run_lexicon():
+        for text in UTTERANCES:
+            lexicon.score(normalize_text(text))
+
+    def run_batch():
+        lexicon.score_many(UTTERANCES)
+
+    legacy = measure(run_legacy, batches)
+    single = measure(run_lexicon, batches)
+    batch = measure(run_batch, batches)
+
+    print(f"{'path':<28}{'utterances/s':>16}{'speedup':>10}")
+    print(f"{'regex per keyword':<28}{utterances / legacy:>16,.0f}{1:>9.1f}x")
+    print(f"{'lexicon trie':<28}{utterances / single:>16,.0f}{legacy / single:>9.1f}x")
+    print(f"{'lexicon trie, batch':<28}{utterances / batch:>16,.0f}{legacy / batch:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    main(args.iterations)
@@ -0,0 +1,163 @@
+"""
+Benchmark of export file size and write time by format.
+
+Feeds synthetic call rows, chunked as the server-side cursor delivers
+them, through the CSV/NDJSON encoders with gzip and through the Parquet
+writer (plain and date-partitioned), then reports write time and file
+size for each.
+
+Usage:
+    python scripts/benchmarks/bench_export_formats.py [--rows 500000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+from sqlalchemy import Boolean, Column, DateTime, Integer, MetaData, String, Table, Text
+
+from voicecore.services.data_export_service import PARQUET_DICTIONARY_FIELDS
+from voicecore.services.export_encoders import (
+    ExportFileWriter,
+    ParquetExportWriter,
+    arrow_schema,
+    create_encoder,
+    encode_chunk,
+)
+
+
+# Same columns as the calls export query
+CALLS = Table(
+    "calls_export",
+    MetaData(),
+    Column("id", String),
+    Column("phone_number", String),
+    Column("caller_name", String),
+    Column("status", String),
+    Column("direction", String),
+    Column("department_id", String),
+    Column("duration", Integer),
+    Column("agent_name", String),
+    Column("created_at", DateTime(timezone=True)),
+    Column("ended_at", DateTime(timezone=True)),
+    Column("call_type", String),
+    Column("is_spam", Boolean),
+    Column("transcript", Text),
+)
+FIELDS = [str(column.name) for column in CALLS.c]
+
+STATUSES = ["completed", "completed", "completed", "failed", "no_answer", "busy", "transferred"]
+DIRECTIONS = ["inbound", "inbound", "inbound", "outbound"]
+CALL_TYPES = ["customer", "customer", "customer", "vip", "spam", "internal"]
+AGENTS = [f"Agent {i}" for i in range(40)] + [None]
+DEPARTMENTS = [str(uuid.uuid4()) for _ in range(8)] + [None]
+PHRASES = [
+    "I'd like to check on my order",
+    "my invoice looks wrong this month",
+    "can you transfer me to billing",
+    "thanks, that solved it",
+    "the app keeps logging me out",
+]
+
+
+def make_rows(count, days):
+    random.seed(7)
+    start = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    step = timedelta(days=days) / count
+    rows = []
+    for i in range(count):
+        created = start + step * i
+        duration = random.randint(5, 900)
+        call_type = random.choice(CALL_TYPES)
+        rows.append((
+            str(uuid.uuid4()),
+            f"+1555{random.randint(0, 9999999):07d}",
+            random.choice(["Jane Doe", "John Smith", None, "Ana Lopez"]),
+            random.choice(STATUSES),
+            random.choice(DIRECTIONS),
+            random.choice(DEPARTMENTS),
+            duration,
+            random.choice(AGENTS),
+            created,
+            created + timedelta(seconds=duration),
+            call_type,
+            call_type == "spam",
+            " ".join(random.sample(PHRASES, 2)) if random.random() < 0.6 else None,
+        ))
+    return rows
+
+
+def chunks(rows, size):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def write_text(format_name, rows, chunk_size, path):
+    encoder = create_encoder(format_name, FIELDS)
+    writer = ExportFileWriter(path, compress=True)
+    writer.open()
+    writer.write(encoder.begin())
+    continuing = False
+    for chunk in chunks(rows, chunk_size):
+        writer.append(*encode_chunk(format_name, FIELDS, chunk, continuing, writer.compression_level))
+        continuing = True
+    writer.write(encoder.end())
+    writer.close()
+    return writer.bytes_written
+
+
+def write_parquet(rows, chunk_size, path, compression, partitioned):
+    writer = ParquetExportWriter(
+        path,
+        arrow_schema(CALLS.c, PARQUET_DICTIONARY_FIELDS),
+        compression=compression,
+        partition_field="created_at" if partitioned else None
+    )
+    writer.open()
+    for chunk in chunks(rows, chunk_size):
+        writer.write_rows(chunk)
+    writer.close()
+    return writer.bytes_written
+
+
+def main(row_count, chunk_size, days):
+    rows = make_rows(row_count, days)
+    cases = [
+        ("csv + gzip", lambda path: write_text("csv", rows, chunk_size, path + ".csv.gz")),
+        ("ndjson + gzip", lambda path: write_text("ndjson", rows, chunk_size, path + ".ndjson.gz")),
+        ("parquet zstd", lambda path: write_parquet(rows, chunk_size, path, "zstd", False)),
+        ("parquet snappy", lambda path: write_parquet(rows, chunk_size, path, "snappy", False)),
+        ("parquet zstd by date", lambda path: write_parquet(rows, chunk_size, path, "zstd", True)),
+    ]
+
+    print(f"{row_count:,} rows, {chunk_size:,} rows per chunk, {days} days")
+    print(f"{'format':<24}{'write s':>10}{'rows/s':>14}{'size MB':>10}{'vs csv':>9}")
+
+    baseline = None
+    with tempfile.TemporaryDirectory() as directory:
+        for index, (name, write) in enumerate(cases):
+            started = time.perf_counter()
+            size = write(os.path.join(directory, f"export_{index}"))
+            elapsed = time.perf_counter() - started
+            baseline = baseline or size
+            print(f"{name:<24}{elapsed:>10.2f}{row_count / elapsed:>14,.0f}"
+                  f"{size / 1e6:>10.1f}{size / baseline:>8.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+    main(args.rows, args.chunk_size, args.days)
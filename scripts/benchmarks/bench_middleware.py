@@ -0,0 +1,194 @@
+"""
+Microbenchmark of per-request middleware overhead.
+
+Compares the legacy stack of four BaseHTTPMiddleware layers (security
+headers, correlation ID, tenant context, rate limiting) against the
+single-pass RequestPipelineMiddleware. Requests are driven straight
+through the ASGI interface so only middleware cost is measured; the
+tenant lookup and rate limiter are in-process stand-ins for both.
+
+Usage:
+    python scripts/benchmarks/bench_middleware.py [--requests 20000]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import logging
+import structlog
+
+# Keep log output out of the measurement for both stacks
+structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from voicecore.middleware import (
+    RequestPipelineMiddleware,
+    CorrelationStage,
+    AuthStage,
+    TenantStage,
+    RateLimitStage,
+    SecurityHeadersStage,
+)
+from voicecore.utils.rate_limiter import TokenBucketRateLimiter
+
+
+TENANT_ID = str(uuid.uuid4())
+
+
+async def endpoint(request):
+    return JSONResponse({"tenant": getattr(request.state, "tenant_id", None)})
+
+
+def make_app():
+    return Starlette(routes=[Route("/api/calls", endpoint)])
+
+
+def make_limiter():
+    return TokenBucketRateLimiter(redis_client=None, limit_per_minute=10 ** 9, burst=0)
+
+
+async def lookup_tenant(tenant_ref):
+    """Stand-in for the tenant lookup so no database is needed."""
+    return True, "Benchmark Tenant"
+
+
+# Legacy stack: one BaseHTTPMiddleware per concern, as before the pipeline
+
+class LegacySecurityHeaders(BaseHTTPMiddleware):
+    stage = SecurityHeadersStage()
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        for header, value in self.stage.security_headers.items():
+            response.headers[header] = value
+        return response
+
+
+class LegacyCorrelationID(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        correlation_id = request.headers.get("X-Correlation-ID") or str(uuid.uuid4())
+        request.state.correlation_id = correlation_id
+        start_time = time.time()
+        response = await call_next(request)
+        response.headers["X-Correlation-ID"] = correlation_id
+        response.headers["X-Process-Time"] = str(time.time() - start_time)
+        return response
+
+
+class LegacyTenantContext(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        tenant_ref = request.headers.get("X-Tenant-ID")
+        if tenant_ref:
+            valid, name = await lookup_tenant(tenant_ref)
+            if valid:
+                request.state.tenant_id = tenant_ref
+                request.state.tenant_name = name
+        return await call_next(request)
+
+
+class LegacyRateLimit(BaseHTTPMiddleware):
+    limiter = make_limiter()
+
+    async def dispatch(self, request, call_next):
+        tenant_id = getattr(request.state, "tenant_id", None)
+        decision = await self.limiter.check(f"rate_limit:tenant:{tenant_id}")
+        if not decision.allowed:
+            return JSONResponse({"error": "Rate limit exceeded"}, status_code=429)
+        return await call_next(request)
+
+
+def build_legacy():
+    app = make_app()
+    app.add_middleware(LegacySecurityHeaders)
+    app.add_middleware(LegacyCorrelationID)
+    app.add_middleware(LegacyRateLimit)
+    app.add_middleware(LegacyTenantContext)
+    return app
+
+
+def build_pipeline():
+    tenant_stage = TenantStage()
+    tenant_stage._validate_tenant = lambda ref, context: lookup_tenant(ref)
+    app = make_app()
+    app.add_middleware(
+        RequestPipelineMiddleware,
+        stages=[
+            CorrelationStage(),
+            AuthStage(),
+            tenant_stage,
+            RateLimitStage(make_limiter()),
+            SecurityHeadersStage(),
+        ],
+    )
+    return app
+
+
+def build_bare():
+    return make_app()
+
+
+async def drive(app, requests):
+    """Send ``requests`` GETs through the ASGI app and return seconds taken."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/calls",
+        "raw_path": b"/api/calls",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"api.voicecore.test"),
+            (b"x-tenant-id", TENANT_ID.encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    # Warm up
+    for _ in range(200):
+        await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return time.perf_counter() - start
+
+
+async def main(requests):
+    print(f"{'stack':<12}{'total (s)':>12}{'per request (us)':>20}{'overhead (us)':>16}")
+    bare = await drive(build_bare(), requests)
+    for name, builder in [("bare", None), ("legacy", build_legacy), ("pipeline", build_pipeline)]:
+        elapsed = bare if builder is None else await drive(builder(), requests)
+        per_request = elapsed / requests * 1e6
+        overhead = (elapsed - bare) / requests * 1e6
+        print(f"{name:<12}{elapsed:>12.3f}{per_request:>20.1f}{overhead:>16.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,199 @@
+"""
+Microbenchmark of PII redaction and log-line throughput.
+
+Compares the previous implementations (one re.sub per pattern, recursive
+key scans against keyword lists) with the single-pass redaction engine,
+both for SecurityUtils-style payload sanitization and for full structlog
+log lines rendered to JSON.
+
+Usage:
+    python scripts/benchmarks/bench_redaction.py [--iterations 50000]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+import structlog
+
+from voicecore.utils.redaction import log_redactor, security_redactor
+
+
+# Previous implementations, kept here only for comparison
+
+LEGACY_PATTERNS = {
+    'ip_address': r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b',
+    'ipv6_address': r'\b(?:[0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}\b',
+    'phone_number': r'\b\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b',
+    'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+    'ssn': r'\b\d{3}-?\d{2}-?\d{4}\b',
+    'credit_card': r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b',
+    'coordinates': r'\b-?\d{1,3}\.\d+,\s*-?\d{1,3}\.\d+\b'
+}
+LEGACY_LOCATION_KEYWORDS = [
+    'latitude', 'longitude', 'lat', 'lng', 'coordinates',
+    'geolocation', 'location', 'address', 'city', 'state',
+    'country', 'zip', 'postal', 'gps', 'position'
+]
+LEGACY_LOG_KEYS = [
+    'ip', 'ip_address', 'client_ip', 'remote_addr',
+    'geolocation', 'location', 'coordinates', 'lat', 'lng',
+    'password', 'token', 'secret', 'key', 'auth',
+    'ssn', 'social_security', 'credit_card', 'phone_number'
+]
+
+
+def legacy_sanitize(data):
+    if isinstance(data, dict):
+        sanitized = {}
+        for key, value in data.items():
+            key_lower = key.lower()
+            if any(keyword in key_lower for keyword in LEGACY_LOCATION_KEYWORDS):
+                sanitized[key] = "[REDACTED_LOCATION]"
+            elif 'ip' in key_lower or 'addr' in key_lower:
+                sanitized[key] = "[REDACTED_IP]"
+            elif 'password' in key_lower or 'secret' in key_lower or 'token' in key_lower:
+                sanitized[key] = "[REDACTED_SECRET]"
+            else:
+                sanitized[key] = legacy_sanitize(value)
+        return sanitized
+    if isinstance(data, list):
+        return [legacy_sanitize(item) for item in data]
+    if isinstance(data, str):
+        sanitized = data
+        for name, pattern in LEGACY_PATTERNS.items():
+            if name in ['ip_address', 'ipv6_address', 'coordinates']:
+                sanitized = re.sub(pattern, '[REDACTED_LOCATION]', sanitized)
+            elif name == 'phone_number':
+                sanitized = re.sub(pattern, 'XXX-XXX-XXXX', sanitized)
+            elif name == 'email':
+                sanitized = re.sub(pattern, 'user@domain.com', sanitized)
+            else:
+                sanitized = re.sub(pattern, f'[REDACTED_{name.upper()}]', sanitized)
+        return sanitized
+    return data
+
+
+def legacy_log_processor(logger, method_name, event_dict):
+    def sanitize_dict(data):
+        sanitized = {}
+        for key, value in data.items():
+            key_lower = key.lower()
+            if any(sensitive in key_lower for sensitive in LEGACY_LOG_KEYS):
+                sanitized[key] = "[REDACTED]"
+            elif isinstance(value, dict):
+                sanitized[key] = sanitize_dict(value)
+            elif isinstance(value, list):
+                sanitized[key] = [
+                    sanitize_dict(item) if isinstance(item, dict) else item
+                    for item in value
+                ]
+            else:
+                sanitized[key] = value
+        return sanitized
+    return sanitize_dict(event_dict)
+
+
+def engine_log_processor(logger, method_name, event_dict):
+    return log_redactor.redact(event_dict)
+
+
+PAYLOAD = {
+    "call_id": "CA1234567890abcdef",
+    "status": "completed",
+    "duration": 184,
+    "notes": "Caller asked for a callback at +1-555-123-4567 after 5pm",
+    "transcript": "Hello, I'd like to check on my order. My email is jane@example.com.",
+    "agent": {"name": "Support", "department": "billing", "queue_position": 3},
+    "tags": ["billing", "callback"],
+    "client_ip": "203.0.113.7",
+}
+
+LOG_EVENTS = [
+    {"event": "Request completed", "method": "GET", "path": "/api/calls",
+     "status_code": 200, "duration_ms": 12.4, "tenant_id": "5f0c", "correlation_id": "abc"},
+    {"event": "AI response generated", "call_sid": "CA123", "response_time_ms": 412.0,
+     "event_type": "ai_response"},
+    {"event": "Call transferred", "call_sid": "CA123", "from_ai": True, "to_agent": "agent-7",
+     "event_type": "call_transfer", "context": {"queue": "billing", "wait_seconds": 14}},
+]
+
+
+class NullLogger:
+    def msg(self, message):
+        pass
+
+    info = msg
+
+
+def measure(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return time.perf_counter() - start
+
+
+def log_line_rate(processor, iterations):
+    """Log lines per second through a JSON-rendering structlog chain."""
+    structlog.configure(
+        processors=[
+            structlog.processors.add_log_level,
+            processor,
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.JSONRenderer(),
+        ],
+        logger_factory=lambda *args: NullLogger(),
+        cache_logger_on_first_use=True,
+    )
+    logger = structlog.get_logger()
+    events = [{k: v for k, v in e.items() if k != "event"} for e in LOG_EVENTS]
+    messages = [e["event"] for e in LOG_EVENTS]
+
+    def log_batch():
+        for message, fields in zip(messages, events):
+            logger.info(message, **fields)
+
+    elapsed = measure(log_batch, iterations // len(LOG_EVENTS))
+    return (iterations // len(LOG_EVENTS)) * len(LOG_EVENTS) / elapsed
+
+
+def main(iterations):
+    assert security_redactor.redact(PAYLOAD) == legacy_sanitize(PAYLOAD)
+
+    print(f"{'benchmark':<34}{'legacy':>14}{'engine':>14}{'speedup':>10}")
+
+    legacy = measure(lambda: legacy_sanitize(PAYLOAD), iterations)
+    engine = measure(lambda: security_redactor.redact(PAYLOAD), iterations)
+    print(f"{'sanitize_data (payloads/s)':<34}{iterations / legacy:>14,.0f}"
+          f"{iterations / engine:>14,.0f}{legacy / engine:>9.1f}x")
+
+    text = PAYLOAD["notes"] + " " + PAYLOAD["transcript"]
+    legacy = measure(lambda: legacy_sanitize(text), iterations)
+    engine = measure(lambda: security_redactor.redact(text), iterations)
+    print(f"{'scrub string (strings/s)':<34}{iterations / legacy:>14,.0f}"
+          f"{iterations / engine:>14,.0f}{legacy / engine:>9.1f}x")
+
+    event = LOG_EVENTS[2]
+    legacy = measure(lambda: legacy_log_processor(None, "info", event), iterations)
+    engine = measure(lambda: engine_log_processor(None, "info", event), iterations)
+    print(f"{'log processor (events/s)':<34}{iterations / legacy:>14,.0f}"
+          f"{iterations / engine:>14,.0f}{legacy / engine:>9.1f}x")
+
+    legacy_rate = log_line_rate(legacy_log_processor, iterations)
+    engine_rate = log_line_rate(engine_log_processor, iterations)
+    print(f"{'log lines/s (JSON rendered)':<34}{legacy_rate:>14,.0f}"
+          f"{engine_rate:>14,.0f}{engine_rate / legacy_rate:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=50000)
+    args = parser.parse_args()
+    main(args.iterations)
@@ -0,0 +1,107 @@
+"""
+Benchmark of the streaming report renderers.
+
+Renders synthetic report rows, generated on the fly, to CSV, XLSX and
+PDF in a worker thread as ReportBuilderService does, and reports render
+time, throughput, file size and the worst event loop stall seen while
+rendering. With --trace-memory it also reports peak Python memory
+(slower; tracemalloc adds overhead), which stays flat as --rows grows.
+
+Usage:
+    python scripts/benchmarks/bench_report_renderers.py [--rows 1000000] [--trace-memory]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+from voicecore.services.report_renderers import render_report
+
+
+COLUMNS = [
+    {"field": "date", "label": "Date", "type": "date"},
+    {"field": "agent_name", "label": "Agent", "type": "string"},
+    {"field": "status", "label": "Status", "type": "string"},
+    {"field": "total_calls", "label": "Calls", "type": "number"},
+    {"field": "answer_rate", "label": "Answer Rate", "type": "number", "format": "percentage"},
+    {"field": "avg_call_duration", "label": "Avg Duration", "type": "number", "format": "duration"},
+    {"field": "total_cost", "label": "Cost", "type": "number", "format": "currency"},
+]
+
+AGENTS = [f"Agent {i}" for i in range(40)] + [None]
+STATUSES = ["completed", "failed", "no_answer", "busy", "transferred"]
+
+
+def make_rows(count):
+    random.seed(7)
+    start = date(2026, 1, 1)
+    for i in range(count):
+        yield {
+            "date": (start + timedelta(days=i % 365)).isoformat(),
+            "agent_name": random.choice(AGENTS),
+            "status": random.choice(STATUSES),
+            "total_calls": random.randint(1, 500),
+            "answer_rate": random.random(),
+            "avg_call_duration": random.uniform(5, 900),
+            "total_cost": random.uniform(0, 250),
+        }
+
+
+async def render(format_name, row_count, path):
+    """Render in a worker thread while measuring event loop stalls."""
+    worst_stall = 0.0
+    done = False
+
+    async def probe():
+        nonlocal worst_stall
+        while not done:
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            worst_stall = max(worst_stall, time.perf_counter() - started - 0.01)
+
+    probe_task = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.to_thread(render_report, format_name, make_rows(row_count), COLUMNS, path, "Benchmark")
+    elapsed = time.perf_counter() - started
+    done = True
+    await probe_task
+    return elapsed, worst_stall
+
+
+def main(row_count, formats, trace_memory):
+    print(f"{row_count:,} rows, {len(COLUMNS)} columns")
+    header = f"{'format':<8}{'render s':>10}{'rows/s':>12}{'size MB':>10}{'max stall ms':>14}"
+    print(header + (f"{'peak MB':>10}" if trace_memory else ""))
+
+    with tempfile.TemporaryDirectory() as directory:
+        for format_name in formats:
+            path = os.path.join(directory, f"report.{format_name}")
+            if trace_memory:
+                tracemalloc.start()
+            elapsed, stall = asyncio.run(render(format_name, row_count, path))
+            line = (f"{format_name:<8}{elapsed:>10.2f}{row_count / elapsed:>12,.0f}"
+                    f"{os.path.getsize(path) / 1e6:>10.1f}{stall * 1000:>14.1f}")
+            if trace_memory:
+                line += f"{tracemalloc.get_traced_memory()[1] / 1e6:>10.1f}"
+                tracemalloc.stop()
+            print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--formats", nargs="+", default=["csv", "excel", "pdf"])
+    parser.add_argument("--trace-memory", action="store_true")
+    args = parser.parse_args()
+    main(args.rows, args.formats, args.trace_memory)
@@ -8,10 +8,15 @@ for property-based and unit tests.
 import uuid
 import pytest
 import asyncio
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import List, Optional
 from datetime import datetime
+from sqlalchemy import Column, MetaData, Table, event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import StaticPool
 
-from voicecore.database import get_db_session, set_tenant_context
+import voicecore.database as database
+from voicecore.database import create_session_factory, get_db_session, set_tenant_context
 from voicecore.models import Tenant, Department, Agent, AgentStatus
 from voicecore.services.tenant_service import TenantService
 from voicecore.logging import get_logger
@@ -545,13 +550,94 @@ class CallLoadGenerator:
         }
 
 
+# Shared SQLite database
+
+def without_foreign_keys(source: Table) -> Table:
+    """Copy of a table without foreign keys, for creating it on its own."""
+    return Table(
+        source.name,
+        MetaData(),
+        *(Column(column.name, column.type, primary_key=column.primary_key) for column in source.c)
+    )
+
+
+@dataclass
+class SQLiteDatabase:
+    """A SQLite database installed in place of the application's."""
+    engine: AsyncEngine
+    statements: List[str] = field(default_factory=list)
+    tenant_contexts: List[str] = field(default_factory=list)
+
+
+@pytest.fixture
+async def sqlite_database(monkeypatch, tmp_path):
+    """
+    Install a SQLite database as the primary and reporting pool.
+    
+    Yields a coroutine function: ``await sqlite_database(*tables)``
+    creates the given tables, without their foreign keys so each can be
+    created on its own, and returns a SQLiteDatabase. Read replicas are
+    disabled. ``set_config`` is registered so tenant context can be
+    applied; its values and every statement executed are recorded.
+    
+    The database is in memory with one shared connection, unless
+    ``file=True``, where concurrent sessions get connections of their
+    own as they would from a server pool.
+    """
+    engines = []
+    
+    async def install(*tables: Table, file: bool = False) -> SQLiteDatabase:
+        if file:
+            engine = create_async_engine(
+                f"sqlite+aiosqlite:///{tmp_path / 'test.db'}",
+                connect_args={"timeout": 30},
+            )
+        else:
+            engine = create_async_engine(
+                "sqlite+aiosqlite://",
+                connect_args={"check_same_thread": False},
+                poolclass=StaticPool,
+            )
+        engines.append(engine)
+        installed = SQLiteDatabase(engine)
+        
+        @event.listens_for(engine.sync_engine, "connect")
+        def register_set_config(dbapi_connection, connection_record):
+            def set_config(name, value, is_local):
+                installed.tenant_contexts.append(value)
+                return value
+            dbapi_connection.create_function("set_config", 3, set_config)
+        
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def record(conn, cursor, statement, parameters, context, executemany):
+            installed.statements.append(statement)
+        
+        async with engine.begin() as conn:
+            for source in tables:
+                await conn.run_sync(without_foreign_keys(source).create)
+        
+        session_factory = create_session_factory(engine)
+        monkeypatch.setattr(database, "AsyncSessionLocal", session_factory)
+        monkeypatch.setattr(database, "ReportingSessionLocal", session_factory)
+        monkeypatch.setattr(database, "replica_set", None)
+        return installed
+    
+    yield install
+    for engine in engines:
+        await engine.dispose()
+
+
 # Cleanup utilities
 
 @pytest.fixture(autouse=True)
-async def cleanup_after_test(db):
-    """Automatically cleanup after each test"""
+async def cleanup_after_test(request):
+    """Automatically cleanup after tests that use the db session"""
+    db = request.getfixturevalue("db") if "db" in request.fixturenames else None
     yield
     
+    if db is None:
+        return
+    
     # Cleanup any test data
     try:
         from voicecore.models.call import Call
@@ -222,39 +222,36 @@ class TestAdminAccessControlSecurity:
         return TenantAdminService()
     
     async def test_super_admin_cannot_access_tenant_specific_data_directly(self, admin_service):
-        """Test that super admin uses proper channels for tenant data access."""
-        # Super admin should use tenant management methods, not direct tenant context
+        """Test that super admin reads tenant summaries from aggregate statistics only."""
+        # Super admin sees per-tenant counters, not tenant data, so no tenant context is entered
         tenant_id = uuid.uuid4()
         
         with patch('voicecore.services.admin_service.get_db_session') as mock_session:
             mock_session_instance = AsyncMock()
             mock_session.return_value.__aenter__.return_value = mock_session_instance
             
-            # Mock tenant summary data (this goes through proper tenant isolation)
-            mock_tenant = MagicMock()
-            mock_tenant.id = tenant_id
-            mock_tenant.name = "Test Tenant"
-            mock_tenant.is_active = True
-            mock_tenant.created_at = datetime.utcnow()
+            # Mock tenant summary row (tenant joined to its statistics)
+            mock_row = MagicMock()
+            mock_row.id = tenant_id
+            mock_row.name = "Test Tenant"
+            mock_row.is_active = True
+            mock_row.created_at = datetime.utcnow()
+            mock_row.total_agents = 5
+            mock_row.active_agents = 4
+            mock_row.calls_this_month = 100
+            mock_row.last_activity = None
             
-            mock_tenant_result = MagicMock()
-            mock_tenant_result.scalars.return_value.all.return_value = [mock_tenant]
-            
-            mock_session_instance.execute.side_effect = [
-                mock_tenant_result,  # Get tenants
-                MagicMock(first=lambda: MagicMock(total_agents=5, active_agents=4)),  # Agent metrics
-                MagicMock(scalar=lambda: 100),  # Calls this month
-                MagicMock(scalar=lambda: None)  # Last activity
-            ]
+            mock_session_instance.execute.return_value = [mock_row]
             
             with patch('voicecore.services.admin_service.set_tenant_context') as mock_context:
-                # Super admin gets tenant summaries (which properly sets tenant context per tenant)
                 summaries = await admin_service.get_all_tenants_summary(limit=10)
                 
-                # Verify that tenant context was set for the tenant being processed
-                mock_context.assert_called_with(mock_session_instance, str(tenant_id))
+                # One statement for the whole page, without switching tenant context
+                mock_context.assert_not_called()
+                assert mock_session_instance.execute.call_count == 1
                 assert len(summaries) == 1
                 assert summaries[0].tenant_id == tenant_id
+                assert summaries[0].calls_this_month == 100
     
     async def test_tenant_admin_cross_tenant_access_prevention(self, tenant_admin_service):
         """Test that tenant admin cannot access other tenants' data."""
@@ -0,0 +1,271 @@
+"""
+Tests for shared analytics frames and dashboard memoization.
+
+Covers loading the per-day frame from calls, metrics, KPI periods and
+trends computed from it, date range merging, and the memo's TTL,
+single-flight and failure handling.
+"""
+
+import uuid
+import asyncio
+import pytest
+from datetime import date, datetime
+from sqlalchemy import insert
+
+import voicecore.database as database
+import voicecore.services.analytics_frame as analytics_frame
+from voicecore.models.call import CallDirection, CallStatus
+from voicecore.services.analytics_frame import (
+    FRAME_COLUMNS,
+    DashboardMemo,
+    MetricsFrame,
+    merge_ranges,
+    previous_period,
+)
+from voicecore.services.report_query_compiler import calls as calls_table
+
+
+def day_totals(**values):
+    """Frame row with zeros for unspecified columns."""
+    return {name: float(values.get(name, 0)) for name in FRAME_COLUMNS}
+
+
+@pytest.fixture
+def frame():
+    """Two weeks of analytics: October 1-7 and 8-14."""
+    return MetricsFrame({
+        date(2026, 10, 2): day_totals(
+            total_calls=10, answered_calls=8, missed_calls=2, total_cost_cents=500,
+            satisfaction_responses=4, satisfaction_points=16,
+        ),
+        date(2026, 10, 9): day_totals(
+            total_calls=30, answered_calls=27, missed_calls=3, ai_handled_calls=10,
+            ai_resolved_calls=8, total_cost_cents=1250, escalated_calls=1,
+        ),
+        date(2026, 10, 10): day_totals(
+            total_calls=20, answered_calls=19, missed_calls=1, ai_handled_calls=5,
+            ai_resolved_calls=4, satisfaction_responses=2, satisfaction_points=9,
+        ),
+    })
+
+
+def call_row(tenant_id, created_at, status=CallStatus.COMPLETED, **values):
+    """A calls row with the columns the frame reads."""
+    return {
+        "id": uuid.uuid4(),
+        "tenant_id": tenant_id,
+        "created_at": created_at,
+        "status": status,
+        "direction": CallDirection.INBOUND,
+        "ai_handled": False,
+        "is_vip": False,
+        "escalation_triggered": False,
+        "agent_id": uuid.uuid4(),
+        "cost_cents": 0,
+        "customer_satisfaction": None,
+        **values,
+    }
+
+
+@pytest.fixture
+async def call_session(sqlite_database):
+    """A SQLite session over calls of two tenants. Yields (session, tenant_id)."""
+    db = await sqlite_database(calls_table)
+    tenant_id, other_tenant = uuid.uuid4(), uuid.uuid4()
+    async with db.engine.begin() as conn:
+        await conn.execute(insert(calls_table), [
+            call_row(tenant_id, datetime(2026, 10, 2, 9), cost_cents=300, customer_satisfaction=4),
+            call_row(tenant_id, datetime(2026, 10, 2, 23, 59), CallStatus.NO_ANSWER, is_vip=True),
+            # AI resolved: answered without an agent
+            call_row(tenant_id, datetime(2026, 10, 9, 0, 0), ai_handled=True, agent_id=None, cost_cents=200),
+            call_row(tenant_id, datetime(2026, 10, 9, 12), ai_handled=True, escalation_triggered=True,
+                     customer_satisfaction=5),
+            # Outside the requested ranges, and another tenant's call
+            call_row(tenant_id, datetime(2026, 10, 15, 0, 0)),
+            call_row(other_tenant, datetime(2026, 10, 2, 10)),
+        ])
+
+    async with database.get_read_session() as session:
+        yield session, tenant_id
+
+
+class TestFrameQuery:
+    """Test loading a frame from calls."""
+
+    async def test_load_sums_calls_per_day(self, call_session):
+        """Test per-day totals over the requested ranges of one tenant's calls."""
+        session, tenant_id = call_session
+        current = (date(2026, 10, 8), date(2026, 10, 14))
+
+        frame = await MetricsFrame.load(session, tenant_id, [current, previous_period(*current)])
+
+        assert sorted(frame.days) == [date(2026, 10, 2), date(2026, 10, 9)]
+        assert frame.days[date(2026, 10, 2)] == day_totals(
+            total_calls=2, answered_calls=1, missed_calls=1, total_cost_cents=300,
+            satisfaction_responses=1, satisfaction_points=4, vip_calls=1,
+        )
+
+        metrics = frame.key_metrics(*current)
+        assert metrics["total_calls"] == 2
+        assert (metrics["ai_handled_calls"], metrics["ai_resolved_calls"]) == (2, 1)
+        assert metrics["total_revenue"] == 2.0
+        assert metrics["average_satisfaction"] == 5.0
+        assert metrics["escalated_calls"] == 1
+
+    async def test_load_without_calls(self, call_session):
+        """Test that a range without calls loads an empty frame."""
+        session, tenant_id = call_session
+
+        frame = await MetricsFrame.load(session, tenant_id, [(date(2026, 9, 1), date(2026, 9, 30))])
+
+        assert frame.days == {}
+        assert frame.key_metrics(date(2026, 9, 1), date(2026, 9, 30))["total_calls"] == 0
+
+
+class TestMetricsFrame:
+    """Test metrics computed from a frame."""
+
+    def test_key_metrics_for_a_range(self, frame):
+        """Test that key metrics sum only the days in range."""
+        metrics = frame.key_metrics(date(2026, 10, 8), date(2026, 10, 14))
+
+        assert metrics["total_calls"] == 50
+        assert metrics["answered_calls"] == 46
+        assert metrics["answer_rate"] == pytest.approx(0.92)
+        assert metrics["ai_resolution_rate"] == pytest.approx(12 / 15)
+        assert metrics["total_revenue"] == 12.5
+        assert metrics["average_satisfaction"] == 4.5
+        assert metrics["escalated_calls"] == 1
+
+    def test_empty_range(self, frame):
+        """Test that a range without data has zero metrics."""
+        metrics = frame.key_metrics(date(2026, 9, 1), date(2026, 9, 30))
+
+        assert metrics["total_calls"] == 0
+        assert metrics["answer_rate"] == 0
+        assert metrics["average_satisfaction"] == 0.0
+
+    def test_previous_period_comes_from_the_same_frame(self, frame):
+        """Test that the comparison period is sliced from the loaded frame."""
+        current = (date(2026, 10, 8), date(2026, 10, 14))
+
+        assert previous_period(*current) == (date(2026, 10, 1), date(2026, 10, 7))
+        assert frame.key_metrics(*previous_period(*current))["total_calls"] == 10
+
+    def test_trends_are_daily(self, frame):
+        """Test the daily series, skipping days without satisfaction or AI calls."""
+        trends = frame.trends(date(2026, 10, 1), date(2026, 10, 14))
+
+        assert [point["date"] for point in trends["call_volume"]] == ["2026-10-02", "2026-10-09", "2026-10-10"]
+        assert trends["satisfaction"] == [
+            {"date": "2026-10-02", "satisfaction": 4.0},
+            {"date": "2026-10-10", "satisfaction": 4.5},
+        ]
+        assert trends["ai_performance"][0] == {
+            "date": "2026-10-09", "ai_handled": 10, "ai_resolved": 8, "resolution_rate": 0.8,
+        }
+
+    def test_merge_ranges(self):
+        """Test that overlapping and adjacent ranges become one range."""
+        assert merge_ranges([
+            (date(2026, 10, 8), date(2026, 10, 14)),
+            (date(2026, 10, 1), date(2026, 10, 7)),
+            (date(2026, 9, 1), date(2026, 9, 3)),
+            (date(2026, 9, 2), date(2026, 9, 5)),
+        ]) == [
+            (date(2026, 9, 1), date(2026, 9, 5)),
+            (date(2026, 10, 1), date(2026, 10, 14)),
+        ]
+
+
+class TestDashboardMemo:
+    """Test dashboard memoization."""
+
+    async def test_memoizes_until_ttl(self, monkeypatch):
+        """Test that values are served until they expire."""
+        now = [1000.0]
+        monkeypatch.setattr(analytics_frame.time, "monotonic", lambda: now[0])
+        memo = DashboardMemo(ttl_seconds=600)
+        tenant_id = uuid.uuid4()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return {"value": len(calls)}
+
+        assert await memo.get_or_compute((tenant_id, "today"), compute) == {"value": 1}
+        now[0] += 599
+        assert await memo.get_or_compute((tenant_id, "today"), compute) == {"value": 1}
+        now[0] += 2
+        assert await memo.get_or_compute((tenant_id, "today"), compute) == {"value": 2}
+        assert (memo.hits, memo.misses) == (1, 2)
+
+    async def test_concurrent_requests_share_one_computation(self):
+        """Test that requests arriving during a computation wait for it."""
+        memo = DashboardMemo(ttl_seconds=600)
+        release = asyncio.Event()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await release.wait()
+            return "dashboard"
+
+        waiters = [asyncio.create_task(memo.get_or_compute(("t", "week"), compute)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*waiters) == ["dashboard"] * 5
+        assert len(calls) == 1
+
+    async def test_cancelled_caller_does_not_cancel_computation(self):
+        """Test that the shared computation completes if its first caller goes away."""
+        memo = DashboardMemo(ttl_seconds=600)
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return "dashboard"
+
+        first = asyncio.create_task(memo.get_or_compute(("t", "week"), compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        second = asyncio.create_task(memo.get_or_compute(("t", "week"), compute))
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == "dashboard"
+        assert memo.misses == 1
+
+    async def test_failures_are_not_memoized(self):
+        """Test that a failed computation is retried on the next request."""
+        memo = DashboardMemo(ttl_seconds=600)
+        attempts = []
+
+        async def compute():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ConnectionError("replica down")
+            return "dashboard"
+
+        with pytest.raises(ConnectionError):
+            await memo.get_or_compute(("t", "today"), compute)
+        assert await memo.get_or_compute(("t", "today"), compute) == "dashboard"
+
+    async def test_invalidate_tenant(self):
+        """Test that invalidation drops only the tenant's entries."""
+        memo = DashboardMemo(ttl_seconds=600)
+        tenant_a, tenant_b = uuid.uuid4(), uuid.uuid4()
+
+        async def compute():
+            return "dashboard"
+
+        for key in [(tenant_a, "today"), (tenant_a, "week"), (tenant_b, "today")]:
+            await memo.get_or_compute(key, compute)
+
+        assert memo.invalidate(tenant_a) == 2
+        assert memo.invalidate() == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -180,7 +180,7 @@ class TestAnalyticsService:
     @pytest.mark.asyncio
     async def test_get_call_volume_trends(self, analytics_service, sample_tenant_id):
         """Test call volume trend analysis."""
-        with patch('voicecore.services.analytics_service.get_db_session') as mock_db:
+        with patch('voicecore.services.analytics_service.get_read_session') as mock_db:
             mock_session = AsyncMock()
             mock_db.return_value.__aenter__.return_value = mock_session
             
@@ -285,7 +285,7 @@ class TestReportingAndDashboard:
     @pytest.mark.asyncio
     async def test_generate_call_report(self, analytics_service, sample_tenant_id, sample_call_data):
         """Test call report generation."""
-        with patch('voicecore.services.analytics_service.get_db_session') as mock_db:
+        with patch('voicecore.services.analytics_service.get_read_session') as mock_db:
             mock_session = AsyncMock()
             mock_db.return_value.__aenter__.return_value = mock_session
             
@@ -318,7 +318,7 @@ class TestReportingAndDashboard:
     @pytest.mark.asyncio
     async def test_generate_agent_report(self, analytics_service, sample_tenant_id, sample_agent_id):
         """Test agent report generation."""
-        with patch('voicecore.services.analytics_service.get_db_session') as mock_db:
+        with patch('voicecore.services.analytics_service.get_read_session') as mock_db:
             mock_session = AsyncMock()
             mock_db.return_value.__aenter__.return_value = mock_session
             
@@ -350,7 +350,7 @@ class TestReportingAndDashboard:
     @pytest.mark.asyncio
     async def test_generate_conversation_analytics(self, analytics_service, sample_tenant_id):
         """Test conversation analytics generation."""
-        with patch('voicecore.services.analytics_service.get_db_session') as mock_db:
+        with patch('voicecore.services.analytics_service.get_read_session') as mock_db:
             mock_session = AsyncMock()
             mock_db.return_value.__aenter__.return_value = mock_session
             
@@ -412,7 +412,7 @@ class TestReportingAndDashboard:
     @pytest.mark.asyncio
     async def test_get_call_volume_trends(self, analytics_service, sample_tenant_id):
         """Test call volume trends analysis."""
-        with patch('voicecore.services.analytics_service.get_db_session') as mock_db:
+        with patch('voicecore.services.analytics_service.get_read_session') as mock_db:
             mock_session = AsyncMock()
             mock_db.return_value.__aenter__.return_value = mock_session
             
@@ -440,7 +440,7 @@ class TestReportingAndDashboard:
     @pytest.mark.asyncio
     async def test_get_ai_performance_insights(self, analytics_service, sample_tenant_id):
         """Test AI performance insights generation."""
-        with patch('voicecore.services.analytics_service.get_db_session') as mock_db:
+        with patch('voicecore.services.analytics_service.get_read_session') as mock_db:
             mock_session = AsyncMock()
             mock_db.return_value.__aenter__.return_value = mock_session
             
@@ -0,0 +1,228 @@
+"""
+Tests for analytics anomaly detection.
+
+Covers the vectorized seasonal, EWMA and change point detectors, and
+the batch job that scores tenants' call series and stores anomalies.
+"""
+
+import uuid
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert, select
+
+import voicecore.database as database
+from voicecore.models.call import CallStatus
+from voicecore.services.anomaly_detection import (
+    HOURS_PER_WEEK,
+    detect_change_points,
+    detect_ewma,
+    detect_seasonal,
+    ewma_scores,
+    seasonal_scores,
+)
+from voicecore.services.anomaly_service import (
+    AnomalyDetectionService,
+    anomaly_insight,
+    anomalies_table,
+    calls,
+    tenants,
+)
+
+
+NOW = datetime(2026, 10, 18, 12, 30)
+
+
+def weekly_pattern(weeks, rows=1, seed=3):
+    """Noisy call counts with a daytime peak, repeated every week."""
+    rng = np.random.default_rng(seed)
+    hour_of_day = np.arange(weeks * HOURS_PER_WEEK) % 24
+    base = np.where((hour_of_day >= 9) & (hour_of_day < 17), 40.0, 2.0)
+    return rng.poisson(base, size=(rows, base.size)).astype(float)
+
+
+class TestSeasonalDetector:
+    """Test hour-of-week baselines."""
+
+    def test_flags_spike_against_same_hour_of_week(self):
+        """Test that a spike is flagged and ordinary hours are not."""
+        series = weekly_pattern(9, rows=3)
+        history, recent = series[:, :8 * HOURS_PER_WEEK], series[:, 8 * HOURS_PER_WEEK:].copy()
+        recent[1, 10] = 200
+
+        detection = detect_seasonal(history, recent, threshold=4.0, poisson=True)
+
+        assert list(zip(detection.series, detection.position)) == [(1, 10)]
+        assert detection.value[0] == 200
+        assert 30 < detection.expected[0] < 50
+        assert detection.score[0] > 4
+
+    def test_quiet_hours_use_count_noise(self):
+        """Test that a slot that never varied does not flag a change of one call."""
+        history = np.zeros((1, 4 * HOURS_PER_WEEK))
+        recent = np.zeros((1, HOURS_PER_WEEK))
+        recent[0, 3] = 1
+
+        expected, score = seasonal_scores(history, recent, poisson=True)
+
+        assert expected[0, 3] == 0
+        assert 0 < score[0, 3] < 2
+        assert score[0, 4] == 0
+
+    def test_slots_without_history_are_not_scored(self):
+        """Test that missing history gives no score rather than a false alarm."""
+        history = np.full((1, 4 * HOURS_PER_WEEK), np.nan)
+        history[0, -HOURS_PER_WEEK:] = 5
+
+        _, score = seasonal_scores(history, np.full((1, 24), 500.0))
+
+        assert np.isnan(score).all()
+
+    def test_history_must_cover_whole_weeks(self):
+        """Test that misaligned history is rejected."""
+        with pytest.raises(ValueError):
+            seasonal_scores(np.zeros((1, 100)), np.zeros((1, 10)))
+
+
+class TestEWMADetector:
+    """Test EWMA control charts."""
+
+    def test_flags_sustained_drift(self):
+        """Test that a small lasting shift is flagged while day-to-day swings are not."""
+        values = np.tile(0.9 + np.where(np.arange(70) % 2, 0.02, -0.02), (2, 1))
+        values[1, 60:] -= 0.03
+
+        detection = detect_ewma(values, history_points=56, threshold=3.0)
+
+        assert set(detection.series) == {1}
+        assert detection.position.min() >= 60
+        assert (detection.score < 0).all()
+        assert (detection.value < detection.expected).all()
+
+    def test_missing_values_carry_the_average(self):
+        """Test that days without a value do not move the chart."""
+        values = np.array([[1.0, 2.0, 1.0, 2.0, np.nan, np.nan, 1.5]])
+
+        smoothed, centre, score = ewma_scores(values, history_points=4)
+
+        assert smoothed[0, 3] == smoothed[0, 4] == smoothed[0, 5]
+        assert smoothed[0, 6] != smoothed[0, 5]
+        assert (centre == 1.5).all()
+
+
+class TestChangePointDetector:
+    """Test mean shift detection."""
+
+    def test_finds_the_shift(self):
+        """Test that the split is the first point of the new level."""
+        rng = np.random.default_rng(11)
+        values = rng.normal(100, 5, size=(3, 60))
+        values[0, 52:] += 40
+        values[2, 20:] -= 40
+
+        detection = detect_change_points(values, first_position=49, threshold=6.0)
+
+        assert list(detection.series) == [0]
+        assert detection.position[0] == 52
+        assert detection.value[0] == pytest.approx(140, abs=5)
+        assert detection.expected[0] == pytest.approx(100, abs=3)
+
+    def test_short_series(self):
+        """Test that series too short to split give no detections."""
+        assert len(detect_change_points(np.ones((2, 4)), min_size=3)) == 0
+
+
+@pytest.fixture
+async def tenant_ids(sqlite_database):
+    """Two tenants with 16 calls a day; the second has a spike and an answer rate drop."""
+    db = await sqlite_database(calls, tenants, anomalies_table)
+
+    normal, affected, inactive = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    first_day = NOW.date() - timedelta(weeks=9)
+
+    def call(tenant_id, created_at, status=CallStatus.COMPLETED):
+        return {
+            "id": uuid.uuid4(),
+            "tenant_id": tenant_id,
+            "status": status,
+            "ai_handled": False,
+            "created_at": created_at,
+        }
+
+    rows = []
+    for day in range((NOW.date() - first_day).days + 1):
+        current = datetime.combine(first_day + timedelta(days=day), datetime.min.time())
+        for hour in range(9, 17):
+            created_at = current + timedelta(hours=hour, minutes=5)
+            if created_at >= NOW:
+                continue
+            for tenant_id in (normal, affected):
+                dropped = tenant_id == affected and NOW.date() - timedelta(days=5) <= current.date() < NOW.date()
+                status = CallStatus.NO_ANSWER if dropped else CallStatus.COMPLETED
+                rows.extend(call(tenant_id, created_at, status) for _ in range(2))
+    spike = datetime.combine(NOW.date() - timedelta(days=1), datetime.min.time()) + timedelta(hours=10, minutes=30)
+    rows.extend(call(affected, spike, CallStatus.NO_ANSWER) for _ in range(30))
+
+    async with db.engine.begin() as conn:
+        await conn.execute(insert(tenants), [
+            {"id": tenant_id, "name": str(tenant_id), "is_active": active}
+            for tenant_id, active in ((normal, True), (affected, True), (inactive, False))
+        ])
+        await conn.execute(insert(calls), rows)
+
+    return normal, affected
+
+
+async def stored_count():
+    async with database.get_read_session() as session:
+        return (await session.execute(select(func.count()).select_from(anomalies_table))).scalar()
+
+
+class TestAnomalyDetectionJob:
+    """Test the batch detection job."""
+
+    async def test_detects_and_stores_anomalies(self, tenant_ids):
+        """Test that only the affected tenant's spike and rate drop are stored."""
+        normal, affected = tenant_ids
+        service = AnomalyDetectionService(history_weeks=8, evaluation_days=7, batch_size=1)
+
+        stored = await service.run_detection(NOW)
+
+        assert stored == await stored_count()
+        assert await service.get_anomalies(normal, NOW - timedelta(days=30), NOW) == []
+
+        anomalies = await service.get_anomalies(affected, NOW - timedelta(days=30), NOW)
+        found = {(a["metric"], a["detector"], a["period_start"]) for a in anomalies}
+        spike_hour = datetime.combine(NOW.date() - timedelta(days=1), datetime.min.time()) + timedelta(hours=10)
+        drop_day = datetime.combine(NOW.date() - timedelta(days=5), datetime.min.time())
+        assert ("total_calls", "seasonal", spike_hour) in found
+        assert ("answer_rate", "change_point", drop_day) in found
+
+        insights = [anomaly_insight(a) for a in anomalies]
+        assert all(insight["severity"] in ("medium", "high") for insight in insights)
+        change = next(i for i in insights if i["detector"] == "change_point" and i["metric"] == "answer_rate")
+        assert change["type"] == "trend"
+        assert change["message"] == f"Answer rate shifted from 100.0% to 0.0% starting {drop_day:%Y-%m-%d}"
+
+    async def test_rerun_replaces_window(self, tenant_ids):
+        """Test that re-evaluating the window does not duplicate anomalies."""
+        service = AnomalyDetectionService(history_weeks=8, evaluation_days=7)
+
+        first = await service.run_detection(NOW)
+        second = await service.run_detection(NOW + timedelta(minutes=10))
+
+        assert first == second == await stored_count()
+
+    def test_window(self):
+        """Test that runs cover whole weeks of baseline before the evaluation days."""
+        service = AnomalyDetectionService(history_weeks=8, evaluation_days=7)
+
+        start, window_start, end = service.window(NOW)
+
+        assert end == datetime(2026, 10, 18, 12)
+        assert window_start == datetime(2026, 10, 11)
+        assert start == datetime(2026, 8, 16)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,241 @@
+"""
+Tests for API key verification caching and batched usage writes.
+
+Covers the verified-key cache, the fast key hash with bcrypt upgrade,
+revocation invalidating cached keys and the usage buffer flush.
+"""
+
+import time
+import uuid
+import bcrypt
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from voicecore.services.auth_service import (
+    AuthService,
+    ApiKeyUsageBuffer,
+    VerifiedKey,
+    VerifiedKeyCache,
+    fast_key_hash,
+)
+
+
+def make_entry(key_id="k1", ttl=30.0):
+    """Create a cache entry that stays live for ``ttl`` seconds."""
+    return VerifiedKey(
+        tenant_id=uuid.uuid4(),
+        key_id=key_id,
+        name="integration",
+        permissions=["api:read"],
+        scopes=[],
+        rate_limit_per_minute=100,
+        usage_count=1,
+        key_expires_at=None,
+        cached_until=time.monotonic() + ttl
+    )
+
+
+def make_session(record=None):
+    """Create a mock session whose select returns ``record``."""
+    session = MagicMock()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = record
+    result.rowcount = 1
+    session.execute = AsyncMock(return_value=result)
+    session.commit = AsyncMock()
+
+    @asynccontextmanager
+    async def get_session():
+        yield session
+
+    return session, get_session
+
+
+def make_record(api_key, key_hash=None):
+    """Create an API key row for ``api_key``."""
+    record = MagicMock()
+    record.key_id = uuid.uuid4()
+    record.name = "integration"
+    record.key_hash = key_hash or fast_key_hash(api_key)
+    record.permissions = ["api:read"]
+    record.scopes = []
+    record.rate_limit_per_minute = 100
+    record.usage_count = 4
+    record.expires_at = None
+    record.is_expired = False
+    return record
+
+
+class TestVerifiedKeyCache:
+    """Test the verified-key cache."""
+
+    def test_fingerprint_is_keyed_per_tenant(self):
+        """Test that the same key under another tenant maps elsewhere."""
+        tenant_a, tenant_b = uuid.uuid4(), uuid.uuid4()
+        fingerprint = VerifiedKeyCache.fingerprint(tenant_a, "secret-key")
+
+        assert fingerprint == VerifiedKeyCache.fingerprint(tenant_a, "secret-key")
+        assert fingerprint != VerifiedKeyCache.fingerprint(tenant_b, "secret-key")
+        assert "secret-key" not in fingerprint
+
+    def test_stale_entries_are_dropped(self):
+        """Test that entries past their TTL are not returned."""
+        cache = VerifiedKeyCache()
+        cache.put("fp", make_entry(ttl=-1))
+
+        assert cache.get("fp") is None
+        assert len(cache) == 0
+
+    def test_invalidate_key_removes_all_fingerprints(self):
+        """Test that revocation drops every entry for a key."""
+        cache = VerifiedKeyCache()
+        cache.put("fp1", make_entry("k1"))
+        cache.put("fp2", make_entry("k1"))
+        cache.put("fp3", make_entry("k2"))
+
+        assert cache.invalidate_key("k1") == 2
+        assert cache.get("fp1") is None
+        assert cache.get("fp3") is not None
+
+    def test_bounded_size(self):
+        """Test that the oldest entry is evicted when full."""
+        cache = VerifiedKeyCache(max_size=2)
+        for i in range(3):
+            cache.put(f"fp{i}", make_entry(f"k{i}"))
+
+        assert len(cache) == 2
+        assert cache.get("fp0") is None
+
+
+class TestValidateApiKey:
+    """Test API key validation through the cache."""
+
+    async def test_second_validation_skips_database(self):
+        """Test that a verified key is served from the cache."""
+        service = AuthService()
+        tenant_id = uuid.uuid4()
+        record = make_record("abcdefgh-secret")
+        session, get_session = make_session(record)
+
+        with patch("voicecore.services.auth_service.get_db_session", get_session), \
+                patch("voicecore.services.auth_service.set_tenant_context", AsyncMock()):
+            first = await service.validate_api_key(tenant_id, "abcdefgh-secret")
+            second = await service.validate_api_key(tenant_id, "abcdefgh-secret")
+
+        assert first["key_id"] == second["key_id"] == str(record.key_id)
+        assert second["usage_count"] == 6
+        assert session.execute.await_count == 1
+        assert service.key_usage.pending_count == 2
+
+    async def test_wrong_key_rejected(self):
+        """Test that a key with a matching prefix but wrong secret fails."""
+        service = AuthService()
+        record = make_record("abcdefgh-secret")
+        _, get_session = make_session(record)
+
+        with patch("voicecore.services.auth_service.get_db_session", get_session), \
+                patch("voicecore.services.auth_service.set_tenant_context", AsyncMock()):
+            result = await service.validate_api_key(uuid.uuid4(), "abcdefgh-guess")
+
+        assert result is None
+        assert len(service.verified_keys) == 0
+
+    async def test_legacy_bcrypt_hash_is_upgraded(self):
+        """Test that bcrypt hashes are verified and replaced with the fast hash."""
+        service = AuthService()
+        api_key = "abcdefgh-legacy"
+        legacy_hash = bcrypt.hashpw(api_key.encode(), bcrypt.gensalt(rounds=4)).decode()
+        record = make_record(api_key, key_hash=legacy_hash)
+        session, get_session = make_session(record)
+
+        with patch("voicecore.services.auth_service.get_db_session", get_session), \
+                patch("voicecore.services.auth_service.set_tenant_context", AsyncMock()):
+            result = await service.validate_api_key(uuid.uuid4(), api_key)
+
+        assert result is not None
+        assert record.key_hash == fast_key_hash(api_key)
+        session.commit.assert_awaited()
+
+    async def test_key_hash_survives_secret_rotation(self, monkeypatch):
+        """Test that stored key hashes do not depend on SECRET_KEY."""
+        api_key = "abcdefgh-rotated"
+        stored = fast_key_hash(api_key)
+        monkeypatch.setattr("voicecore.services.auth_service.settings.secret_key", "rotated-secret")
+
+        valid, upgraded = await AuthService()._verify_key_hash(api_key, stored)
+
+        assert fast_key_hash(api_key) == stored
+        assert valid and upgraded is None
+
+    async def test_revoke_invalidates_cache(self):
+        """Test that a revoked key is no longer served from the cache."""
+        service = AuthService()
+        service.privacy_service.log_audit_event = AsyncMock(return_value=True)
+        tenant_id = uuid.uuid4()
+        record = make_record("abcdefgh-secret")
+        session, get_session = make_session(record)
+
+        with patch("voicecore.services.auth_service.get_db_session", get_session), \
+                patch("voicecore.services.auth_service.set_tenant_context", AsyncMock()):
+            assert await service.validate_api_key(tenant_id, "abcdefgh-secret")
+            assert await service.revoke_api_key(tenant_id, str(record.key_id))
+
+            # The row is now inactive
+            session.execute.return_value.scalar_one_or_none.return_value = None
+            result = await service.validate_api_key(tenant_id, "abcdefgh-secret")
+
+        assert result is None
+
+
+class TestApiKeyUsageBuffer:
+    """Test batched usage writes."""
+
+    async def test_flush_aggregates_usage(self):
+        """Test that repeated uses flush as one update row and one audit event."""
+        privacy_service = MagicMock()
+        privacy_service.log_audit_event = AsyncMock(return_value=True)
+        buffer = ApiKeyUsageBuffer(privacy_service, flush_interval=60)
+        tenant_id, key_id = uuid.uuid4(), str(uuid.uuid4())
+        session, get_session = make_session()
+
+        for _ in range(5):
+            buffer.record(tenant_id, key_id, "integration")
+
+        with patch("voicecore.services.auth_service.get_db_session", get_session), \
+                patch("voicecore.services.auth_service.set_tenant_context", AsyncMock()):
+            written = await buffer.flush()
+
+        params = session.execute.await_args.args[1]
+        assert params == [{
+            "b_key_id": uuid.UUID(key_id),
+            "b_count": 5,
+            "b_last_used_at": params[0]["b_last_used_at"]
+        }]
+        privacy_service.log_audit_event.assert_awaited_once()
+        assert privacy_service.log_audit_event.await_args.kwargs["event_data"]["uses"] == 5
+        assert written == 5
+        assert buffer.pending_count == 0
+
+    async def test_failed_flush_keeps_usage(self):
+        """Test that usage is retained when the database write fails."""
+        privacy_service = MagicMock()
+        privacy_service.log_audit_event = AsyncMock(return_value=True)
+        buffer = ApiKeyUsageBuffer(privacy_service, flush_interval=60)
+        buffer.record(uuid.uuid4(), str(uuid.uuid4()), "integration")
+
+        @asynccontextmanager
+        async def failing_session():
+            raise ConnectionError("database unavailable")
+            yield
+
+        with patch("voicecore.services.auth_service.get_db_session", failing_session):
+            assert await buffer.flush() == 0
+
+        assert buffer.pending_count == 1
+        privacy_service.log_audit_event.assert_not_awaited()
+        buffer._flush_task.cancel()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
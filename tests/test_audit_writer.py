@@ -0,0 +1,195 @@
+"""
+Tests for the buffered audit log writer.
+
+Covers batching into multi-row inserts, the spill journal, replay after
+failures and backpressure accounting, using a mocked database session.
+"""
+
+import os
+import uuid
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy import Boolean, Column, JSON, MetaData, String, Table
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import UUID
+
+from voicecore.services.audit_writer import AuditJournal, AuditLogWriter
+
+
+metadata = MetaData()
+audit_table = Table(
+    "test_audit_logs", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("tenant_id", UUID(as_uuid=True)),
+    Column("event_id", UUID(as_uuid=True), unique=True),
+    Column("action", String(255)),
+    Column("event_data", JSON),
+    Column("success", Boolean),
+)
+
+
+def make_row(tenant_id, action="api_key_used"):
+    """Create an audit row."""
+    return {
+        "id": uuid.uuid4(),
+        "tenant_id": tenant_id,
+        "event_id": uuid.uuid4(),
+        "action": action,
+        "event_data": {"uses": 1},
+        "success": True,
+    }
+
+
+def patch_db(fail=False):
+    """Patch the writer's session factory, returning the mock session."""
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=ConnectionError("db down") if fail else None)
+    session.commit = AsyncMock()
+
+    @asynccontextmanager
+    async def get_session():
+        yield session
+
+    patches = [
+        patch("voicecore.services.audit_writer.get_db_session", get_session),
+        patch("voicecore.services.audit_writer.set_tenant_context", AsyncMock()),
+    ]
+    for p in patches:
+        p.start()
+    return session, patches
+
+
+@pytest.fixture
+def db():
+    """Provide a working mocked database."""
+    session, patches = patch_db()
+    yield session
+    for p in patches:
+        p.stop()
+
+
+class TestAuditLogWriter:
+    """Test batching and backpressure."""
+
+    async def test_flush_writes_one_insert_per_tenant(self, db):
+        """Test that queued rows become one multi-row insert per tenant."""
+        writer = AuditLogWriter(audit_table, flush_interval=60)
+        tenant_a, tenant_b = uuid.uuid4(), uuid.uuid4()
+        for _ in range(3):
+            writer.submit(make_row(tenant_a))
+        writer.submit(make_row(tenant_b))
+
+        written = await writer.flush()
+
+        assert written == 4
+        assert db.execute.await_count == 2
+        sql = str(db.execute.await_args_list[0].args[0].compile(dialect=postgresql.dialect()))
+        assert sql.count("VALUES") == 1
+        assert "ON CONFLICT (event_id) DO NOTHING" in sql
+        db.commit.assert_awaited_once()
+        assert writer.stats()["batches"] == 1
+        await writer.stop()
+
+    async def test_drops_when_full_without_journal(self, db):
+        """Test that a full queue drops records and counts them."""
+        writer = AuditLogWriter(audit_table, max_queue_size=2, flush_interval=60)
+        tenant_id = uuid.uuid4()
+
+        results = [writer.submit(make_row(tenant_id)) for _ in range(3)]
+
+        assert results == [True, True, False]
+        stats = writer.stats()
+        assert stats["dropped"] == 1
+        assert stats["queue_depth"] == 2
+        assert stats["queue_high_watermark"] == 2
+        await writer.stop()
+
+    async def test_journal_removed_after_commit(self, db, tmp_path):
+        """Test that committed segments are deleted."""
+        writer = AuditLogWriter(audit_table, flush_interval=60, journal_dir=str(tmp_path))
+        writer.submit(make_row(uuid.uuid4()))
+
+        assert len(os.listdir(tmp_path)) == 1
+        await writer.flush()
+
+        assert os.listdir(tmp_path) == []
+        await writer.stop()
+
+    async def test_overflow_spills_to_journal_and_replays(self, db, tmp_path):
+        """Test that records beyond the queue bound are written by replay."""
+        writer = AuditLogWriter(
+            audit_table, max_queue_size=1, flush_interval=60, journal_dir=str(tmp_path)
+        )
+        tenant_id = uuid.uuid4()
+
+        assert writer.submit(make_row(tenant_id))
+        assert writer.submit(make_row(tenant_id))
+        assert writer.stats()["spilled"] == 1
+
+        await writer.flush()
+        assert writer.stats()["spilled_segments"] == 1
+
+        replayed = await writer.replay_journal()
+
+        assert replayed == 2
+        assert os.listdir(tmp_path) == []
+        await writer.stop()
+
+    async def test_failed_batch_kept_for_replay(self, tmp_path):
+        """Test that a failed write leaves the segment on disk for replay."""
+        session, patches = patch_db(fail=True)
+        try:
+            writer = AuditLogWriter(audit_table, flush_interval=60, journal_dir=str(tmp_path))
+            writer.submit(make_row(uuid.uuid4()))
+
+            assert await writer.flush() == 0
+            assert writer.stats()["failed_batches"] == 1
+            assert len(os.listdir(tmp_path)) == 1
+        finally:
+            for p in patches:
+                p.stop()
+
+        session, patches = patch_db()
+        try:
+            assert await writer.replay_journal() == 1
+            assert os.listdir(tmp_path) == []
+            await writer.stop()
+        finally:
+            for p in patches:
+                p.stop()
+
+
+class TestAuditJournal:
+    """Test journal segments."""
+
+    def test_segments_round_trip_uuids(self, tmp_path):
+        """Test that UUID columns survive the journal."""
+        journal = AuditJournal(str(tmp_path))
+        row = make_row(uuid.uuid4())
+        journal.append(row)
+        path = journal.rotate()
+
+        assert AuditJournal.read_segment(path) == [row]
+
+    def test_torn_line_is_skipped(self, tmp_path):
+        """Test that a partially written last line does not break replay."""
+        journal = AuditJournal(str(tmp_path))
+        journal.append(make_row(uuid.uuid4()))
+        path = journal.rotate()
+        with open(path, "a") as segment:
+            segment.write('{"id": "trunc')
+
+        assert len(AuditJournal.read_segment(path)) == 1
+
+    def test_open_segment_not_replayed(self, tmp_path):
+        """Test that the segment being written is never offered for replay."""
+        journal = AuditJournal(str(tmp_path))
+        journal.append(make_row(uuid.uuid4()))
+
+        assert journal.closed_segments() == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,266 @@
+"""
+Tests for the credit ledger behind CreditManagementService.
+
+Covers cached subscription terms, atomic credit charges under concurrent
+usage, batched usage records and threshold alerts.
+"""
+
+import uuid
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import func, insert, select
+
+import voicecore.database as database
+import voicecore.services.credit_ledger as credit_ledger
+from voicecore.services.credit_ledger import (
+    Charge,
+    SubscriptionTermsCache,
+    balances,
+    plans,
+    subscriptions,
+    usage_table,
+)
+from voicecore.services.credit_management_service import (
+    CreditManagementService,
+    alerts_table,
+)
+
+
+@pytest.fixture
+async def ledger(sqlite_database):
+    """
+    A plan of 100 credits with overage at 0.01, and one without overage.
+    Returns (plan_id, strict_plan_id, executed statements).
+    
+    The database is a file so concurrent sessions get connections of
+    their own, as they would from a server pool.
+    """
+    db = await sqlite_database(plans, subscriptions, balances, usage_table, alerts_table, file=True)
+
+    plan_id, strict_plan_id = uuid.uuid4(), uuid.uuid4()
+    async with db.engine.begin() as conn:
+        await conn.execute(insert(plans), [
+            {"id": plan_id, "name": "Starter", "monthly_credits": 100, "overage_rate": Decimal("0.01")},
+            {"id": strict_plan_id, "name": "Prepaid", "monthly_credits": 10, "overage_rate": Decimal("0")},
+        ])
+
+    return plan_id, strict_plan_id, db.statements
+
+
+async def balance_of(tenant_id):
+    async with database.get_db_session() as session:
+        result = await session.execute(select(balances).where(balances.c.tenant_id == tenant_id))
+        return result.first()
+
+
+async def count(table, *conditions):
+    async with database.get_db_session() as session:
+        result = await session.execute(select(func.count()).select_from(table).where(*conditions))
+        return result.scalar()
+
+
+class TestCharge:
+    """Test charge arithmetic."""
+
+    def test_threshold_crossing(self):
+        """Test that only the charge taking usage past a point crosses it."""
+        charge = Charge(credits=5, allocated_credits=100, used_credits=82, remaining_credits=18, overage_credits=0)
+
+        assert charge.crossed_usage(0.8)
+        assert not charge.crossed_usage(0.9)
+        assert not Charge(5, 100, 87, 13, 0).crossed_usage(0.8)
+        assert Charge(5, 100, 80, 20, 0).crossed_usage(0.8)
+
+    def test_went_over(self):
+        """Test that only the charge leaving the allocation goes over."""
+        assert Charge(10, 100, 105, 0, 5).went_over
+        assert not Charge(10, 100, 100, 0, 0).went_over
+        assert not Charge(10, 100, 120, 0, 20).went_over
+
+    def test_overage_added(self):
+        """Test the part of a charge beyond the allocation."""
+        assert Charge(10, 100, 105, 0, 5).overage_added == 5
+        assert Charge(10, 100, 120, 0, 20).overage_added == 10
+        assert Charge(10, 100, 50, 50, 0).overage_added == 0
+
+
+class TestSubscriptionTermsCache:
+    """Test sharing subscription loads between callers."""
+
+    async def test_cancelled_caller_does_not_strand_waiters(self, monkeypatch):
+        """Test that cancelling the caller that started a load still answers the others."""
+        release = asyncio.Event()
+        loads = []
+
+        async def load(tenant_id):
+            loads.append(tenant_id)
+            await release.wait()
+            return None
+
+        monkeypatch.setattr(credit_ledger, "load_subscription_terms", load)
+        cache, tenant_id = SubscriptionTermsCache(), uuid.uuid4()
+        first = asyncio.create_task(cache.get(tenant_id))
+        second = asyncio.create_task(cache.get(tenant_id))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.wait_for(second, timeout=1) is None
+        assert first.cancelled()
+        assert await cache.get(tenant_id) is None
+        assert loads == [tenant_id]
+
+
+class TestCreditLedger:
+    """Test metering through CreditManagementService."""
+
+    async def test_subscription_creates_balance(self, ledger):
+        """Test that subscribing allocates the plan's credits."""
+        plan_id, _, _ = ledger
+        service, tenant_id = CreditManagementService(), uuid.uuid4()
+
+        terms = await service.create_tenant_subscription(tenant_id, plan_id)
+
+        assert terms.plan_name == "Starter"
+        assert terms.monthly_credits == 100
+        balance = await balance_of(tenant_id)
+        assert (balance.subscription_id, balance.allocated_credits, balance.remaining_credits) == (
+            terms.subscription_id, 100, 100
+        )
+
+    async def test_concurrent_usage_is_not_lost(self, ledger):
+        """Test that concurrent usage events each charge the balance."""
+        plan_id, _, _ = ledger
+        service, tenant_id = CreditManagementService(), uuid.uuid4()
+        await service.create_tenant_subscription(tenant_id, plan_id)
+
+        results = await asyncio.gather(*(
+            service.record_usage(tenant_id, "call_minute", 1, resource_id=str(i)) for i in range(40)
+        ))
+
+        assert all(results)
+        balance = await balance_of(tenant_id)
+        assert (balance.used_credits, balance.remaining_credits) == (40, 60)
+
+        assert await service.flush_usage() == 40
+        assert await count(usage_table, usage_table.c.tenant_id == tenant_id) == 40
+
+    async def test_terms_are_cached(self, ledger):
+        """Test that metering loads the subscription once and writes records in one batch."""
+        plan_id, _, executed = ledger
+        service, tenant_id = CreditManagementService(), uuid.uuid4()
+        await service.create_tenant_subscription(tenant_id, plan_id)
+        executed.clear()
+
+        for _ in range(10):
+            assert await service.record_usage(tenant_id, "ai_request")
+        await service.flush_usage()
+
+        assert len([s for s in executed if "FROM tenant_subscriptions" in s]) == 0
+        assert len([s for s in executed if s.startswith("UPDATE credit_balances")]) == 10
+        assert len([s for s in executed if s.startswith("INSERT INTO credit_usage")]) == 1
+
+    async def test_stale_terms_are_reloaded(self, ledger):
+        """Test that a subscription changed by another worker is charged, not the old one."""
+        plan_id, _, _ = ledger
+        tenant_id = uuid.uuid4()
+        first, other_worker = CreditManagementService(), CreditManagementService()
+        await first.create_tenant_subscription(tenant_id, plan_id)
+        assert await first.record_usage(tenant_id, "call_minute", 3)
+
+        new_terms = await other_worker.create_tenant_subscription(
+            tenant_id, plan_id, start_date=datetime.utcnow() + timedelta(seconds=1)
+        )
+        assert await first.record_usage(tenant_id, "call_minute", 2)
+
+        balance = await balance_of(tenant_id)
+        assert balance.subscription_id == new_terms.subscription_id
+        assert balance.used_credits == 2
+
+    async def test_unknown_tenant(self, ledger):
+        """Test that usage without a subscription is refused."""
+        service = CreditManagementService()
+
+        assert not await service.record_usage(uuid.uuid4(), "call_minute")
+        assert service.usage_records.pending_count == 0
+
+    async def test_alerts_once_per_threshold(self, ledger):
+        """Test low, critical and overage alerts are raised once each."""
+        plan_id, _, _ = ledger
+        service, tenant_id = CreditManagementService(), uuid.uuid4()
+        await service.create_tenant_subscription(tenant_id, plan_id)
+
+        for _ in range(11):
+            await service.record_usage(tenant_id, "call_minute", 10)
+
+        async with database.get_db_session() as session:
+            result = await session.execute(
+                select(alerts_table.c.alert_type, alerts_table.c.severity, alerts_table.c.current_usage)
+                .where(alerts_table.c.tenant_id == tenant_id)
+                .order_by(alerts_table.c.current_usage)
+            )
+            alerts = [tuple(row) for row in result]
+
+        assert alerts == [
+            ("credit_low", "warning", 80),
+            ("credit_low", "critical", 90),
+            ("overage", "warning", 110),
+        ]
+        balance = await balance_of(tenant_id)
+        assert (balance.remaining_credits, balance.overage_credits) == (0, 10)
+        assert Decimal(str(balance.overage_cost)) == Decimal("0.10")
+
+    async def test_usage_limits(self, ledger):
+        """Test that plans without overage refuse usage beyond the balance."""
+        plan_id, strict_plan_id, _ = ledger
+        service = CreditManagementService()
+        strict, flexible = uuid.uuid4(), uuid.uuid4()
+        await service.create_tenant_subscription(strict, strict_plan_id)
+        await service.create_tenant_subscription(flexible, plan_id)
+
+        assert await service.check_usage_limits(strict, "call_minute", 10) == (True, "Usage allowed")
+        allowed, _ = await service.check_usage_limits(strict, "call_minute", 11)
+        assert not allowed
+
+        allowed, reason = await service.check_usage_limits(flexible, "call_minute", 101)
+        assert allowed and "overage" in reason
+
+    async def test_billing_cycle_resets_balance(self, ledger):
+        """Test that a due billing cycle starts a fresh allocation."""
+        plan_id, _, _ = ledger
+        service, tenant_id = CreditManagementService(), uuid.uuid4()
+        await service.create_tenant_subscription(
+            tenant_id, plan_id, start_date=datetime.utcnow() - timedelta(days=31)
+        )
+        await service.record_usage(tenant_id, "call_minute", 70)
+
+        assert await service.process_billing_cycle(tenant_id)
+
+        balance = await service.get_credit_balance(tenant_id)
+        assert (balance.used_credits, balance.remaining_credits) == (0, 100)
+        assert balance.period_end > datetime.utcnow()
+        terms = await service.get_subscription_terms(tenant_id)
+        assert terms.next_billing_date == balance.period_end
+
+    async def test_failed_flush_keeps_records(self, ledger, monkeypatch):
+        """Test that records are kept for the next flush when a write fails."""
+        plan_id, _, _ = ledger
+        service, tenant_id = CreditManagementService(), uuid.uuid4()
+        await service.create_tenant_subscription(tenant_id, plan_id)
+        await service.record_usage(tenant_id, "sms", 2)
+
+        working = database.AsyncSessionLocal
+        monkeypatch.setattr(database, "AsyncSessionLocal", None)
+        assert await service.flush_usage() == 0
+        assert service.usage_records.pending_count == 1
+
+        monkeypatch.setattr(database, "AsyncSessionLocal", working)
+        assert await service.flush_usage() == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,512 @@
+"""
+Tests for the streaming export pipeline.
+
+Covers the chunk encoders, incremental gzip output, Parquet row groups
+and date partitions, full exports streamed from a server-side cursor on
+an in-memory SQLite database, and the export job queue: claiming,
+cancellation, stale recovery and resuming from a checkpoint.
+"""
+
+import asyncio
+
+import csv
+import gzip
+import io
+import json
+import os
+import uuid
+import zipfile
+import pytest
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import date, datetime, timedelta, timezone
+from enum import Enum
+from xml.etree import ElementTree
+from sqlalchemy import (
+    Boolean, Column, Date, DateTime, Float, Integer, MetaData, String, Table,
+    column, insert, select, table, text,
+)
+
+from voicecore.models.export_job import ExportJob, ExportJobStatus
+from voicecore.services.data_export_service import (
+    DataExportService,
+    DataType,
+    ExportFormat,
+    ExportRequest,
+)
+from voicecore.services.export_encoders import (
+    ExportFileWriter,
+    ParquetExportWriter,
+    arrow_schema,
+    create_encoder,
+    encode_chunk,
+)
+from voicecore.services.export_jobs import ExportJobStore
+
+
+ROWS = [
+    {"id": 1, "name": "Ana", "note": "says \"hi\", <twice> & leaves"},
+    {"id": 2, "name": "Bo", "note": None},
+    {"id": 3, "name": "Cy", "note": "line\nbreak"},
+]
+FIELDS = ["id", "name", "note"]
+
+metadata = MetaData()
+calls = Table(
+    "calls",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("status", String(20)),
+    Column("duration", Integer),
+    Column("score", Float),
+    Column("is_spam", Boolean),
+    Column("created_at", DateTime(timezone=True)),
+)
+
+
+class Status(Enum):
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+def call_rows(count, days=1):
+    """Rows in (id, status, duration, score, is_spam, created_at) order, by time."""
+    start = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    per_day = count // days
+    return [
+        (
+            i,
+            Status.COMPLETED if i % 3 else Status.FAILED,
+            i * 10,
+            i / 2,
+            i % 5 == 0,
+            start + timedelta(days=i // per_day, minutes=i),
+        )
+        for i in range(count)
+    ]
+
+
+def encode_all(format_name, chunks):
+    """Encode row chunks into one document."""
+    encoder = create_encoder(format_name, FIELDS)
+    return encoder.begin() + "".join(encoder.encode(chunk) for chunk in chunks) + encoder.end()
+
+
+def make_request(data_type=DataType.CALLS, format=ExportFormat.CSV):
+    """Create an export request over the last week."""
+    now = datetime.utcnow()
+    return ExportRequest(
+        id=str(uuid.uuid4()),
+        tenant_id=uuid.uuid4(),
+        data_type=data_type,
+        format=format,
+        filters={},
+        date_range={"start": now - timedelta(days=7), "end": now},
+        status="pending",
+        created_at=now
+    )
+
+
+class TestEncoders:
+    """Test chunked encoders."""
+
+    def test_csv(self):
+        """Test that chunked CSV parses back to the rows."""
+        parsed = list(csv.DictReader(io.StringIO(encode_all("csv", [ROWS[:2], ROWS[2:]]))))
+
+        assert [row["name"] for row in parsed] == ["Ana", "Bo", "Cy"]
+        assert parsed[0]["note"] == ROWS[0]["note"]
+        assert parsed[2]["note"] == "line\nbreak"
+
+    def test_json_array_across_chunks(self):
+        """Test that the JSON array stays valid across chunks, empty ones included."""
+        assert json.loads(encode_all("json", [ROWS[:1], [], ROWS[1:]])) == ROWS
+        assert json.loads(encode_all("json", [])) == []
+
+    def test_ndjson(self):
+        """Test one object per line."""
+        lines = encode_all("ndjson", [ROWS]).splitlines()
+
+        assert [json.loads(line) for line in lines] == ROWS
+
+    def test_xml_escapes_values(self):
+        """Test that values are escaped and the document is well formed."""
+        root = ElementTree.fromstring(encode_all("xml", [ROWS]).encode())
+
+        records = root.findall("record")
+        assert len(records) == 3
+        assert records[0].find("note").text == ROWS[0]["note"]
+
+    def test_unsupported_format(self):
+        """Test that formats without a streaming encoder are rejected."""
+        with pytest.raises(ValueError):
+            create_encoder("xlsx", FIELDS)
+
+
+class TestExportFileWriter:
+    """Test incremental compression."""
+
+    def test_gzip_written_incrementally(self, tmp_path):
+        """Test that chunks form one valid gzip stream."""
+        path = tmp_path / "export.csv.gz"
+        writer = ExportFileWriter(str(path))
+        writer.open()
+        for index in range(100):
+            writer.write(f"row {index}\n")
+        writer.close()
+
+        content = gzip.decompress(path.read_bytes()).decode()
+        assert content.splitlines()[-1] == "row 99"
+        assert writer.bytes_encoded == len(content.encode())
+        assert writer.bytes_written == path.stat().st_size
+
+    def test_resume_truncates_to_checkpoint(self, tmp_path):
+        """Test that reopening at a synced offset drops later writes."""
+        path = tmp_path / "export.ndjson.gz"
+        writer = ExportFileWriter(str(path))
+        writer.open()
+        writer.append(*encode_chunk("ndjson", FIELDS, [tuple(row.values()) for row in ROWS[:2]], False, 6))
+        offset = writer.sync()
+        writer.write("partial chunk lost in a crash\n")
+        writer.close()
+
+        writer = ExportFileWriter(str(path))
+        writer.open(offset)
+        writer.append(*encode_chunk("ndjson", FIELDS, [tuple(ROWS[2].values())], True, 6))
+        writer.close()
+
+        lines = gzip.decompress(path.read_bytes()).decode().splitlines()
+        assert [json.loads(line) for line in lines] == ROWS
+
+    def test_json_chunks_continue_array(self):
+        """Test that continuing chunks are comma-separated from earlier ones."""
+        first, _ = encode_chunk("json", FIELDS, [tuple(ROWS[0].values())], False)
+        rest, size = encode_chunk("json", FIELDS, [tuple(row.values()) for row in ROWS[1:]], True)
+
+        assert json.loads(b"[" + first + rest + b"]") == ROWS
+        assert size == len(rest)
+
+
+class TestParquetExportWriter:
+    """Test Arrow conversion, row groups and partitions."""
+
+    def test_schema_from_columns(self):
+        """Test that SQL column types map to Arrow types."""
+        day = Column("day", Date)
+        schema = arrow_schema(list(calls.c) + [day], dictionary_fields={"status"})
+
+        assert schema.field("id").type == pa.int64()
+        assert pa.types.is_dictionary(schema.field("status").type)
+        assert schema.field("score").type == pa.float64()
+        assert schema.field("is_spam").type == pa.bool_()
+        assert schema.field("created_at").type == pa.timestamp("us", tz="UTC")
+        assert schema.field("day").type == pa.date32()
+
+    def test_fixed_row_groups(self, tmp_path):
+        """Test that small chunks are regrouped into full row groups."""
+        schema = arrow_schema(calls.c, dictionary_fields={"status"})
+        writer = ParquetExportWriter(str(tmp_path / "calls"), schema, row_group_size=10)
+        writer.open()
+        rows = call_rows(25)
+        for start in range(0, len(rows), 7):
+            writer.write_rows(rows[start:start + 7])
+        writer.close()
+
+        parquet_file = pq.ParquetFile(writer.output_path)
+        sizes = [parquet_file.metadata.row_group(i).num_rows for i in range(parquet_file.num_row_groups)]
+        assert sizes == [10, 10, 5]
+
+        result = parquet_file.read()
+        assert result.column("status").to_pylist()[:3] == ["failed", "completed", "completed"]
+        assert pa.types.is_dictionary(result.schema.field("status").type)
+        assert result.column("created_at").to_pylist()[0] == rows[0][5]
+        assert writer.bytes_written == os.path.getsize(writer.output_path)
+
+    def test_partitioned_by_date(self, tmp_path):
+        """Test one partition directory per day, packed into a zip."""
+        schema = arrow_schema(calls.c)
+        writer = ParquetExportWriter(
+            str(tmp_path / "calls"), schema, row_group_size=4, partition_field="created_at"
+        )
+        writer.open()
+        rows = call_rows(30, days=3)
+        for start in range(0, len(rows), 8):
+            writer.write_rows(rows[start:start + 8])
+        writer.close()
+
+        with zipfile.ZipFile(writer.output_path) as archive:
+            names = sorted(archive.namelist())
+            archive.extractall(tmp_path / "unpacked")
+
+        assert names == [
+            "date=2026-10-01/part-00000.parquet",
+            "date=2026-10-02/part-00000.parquet",
+            "date=2026-10-03/part-00000.parquet",
+        ]
+        assert not os.path.exists(tmp_path / "calls.parts")
+
+        day = pq.read_table(tmp_path / "unpacked" / names[1])
+        assert day.column("id").to_pylist() == list(range(10, 20))
+
+
+@pytest.fixture
+async def engine(sqlite_database):
+    """Provide one SQLite database as the primary and reporting pool."""
+    db = await sqlite_database()
+
+    async with db.engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: ExportJob.__table__.create(sync_conn))
+        await conn.run_sync(metadata.create_all)
+        await conn.execute(insert(calls), [
+            dict(zip(calls.c.keys(), (row[0], row[1].value) + row[2:]))
+            for row in call_rows(1000, days=2)
+        ])
+
+    return db.engine
+
+
+def job_values(tenant_id=None, **values):
+    """Column values for a pending calls export job."""
+    now = datetime.utcnow()
+    return {
+        "tenant_id": tenant_id or uuid.uuid4(),
+        "data_type": DataType.CALLS.value,
+        "format": ExportFormat.NDJSON.value,
+        "filters": {},
+        "date_start": now - timedelta(days=7),
+        "date_end": now,
+        "partition_by_date": False,
+        "priority": 0,
+        "status": ExportJobStatus.PENDING,
+        **values
+    }
+
+
+class TestStreamingExport:
+    """Test a full export through a server-side cursor."""
+
+    @pytest.fixture
+    def service(self, engine, monkeypatch, tmp_path):
+        """Provide a service exporting the test calls table."""
+        service = DataExportService()
+        service.export_directory = str(tmp_path)
+        service.chunk_size = 64
+        query = select(*calls.c).order_by(calls.c.created_at, calls.c.id)
+        monkeypatch.setattr(service, "_build_export_query", lambda request: (query, [str(c.name) for c in calls.c]))
+        return service
+
+    async def test_streams_chunks_to_gzip_file(self, service, monkeypatch):
+        """Test that every row lands in the file and progress is tracked."""
+        chunks = []
+        original = service._encode
+
+        async def record_chunk(export_request, fields, rows):
+            chunks.append(len(rows))
+            return await original(export_request, fields, rows)
+
+        monkeypatch.setattr(service, "_encode", record_chunk)
+
+        request = await service.export_now(uuid.uuid4(), DataType.CALLS, ExportFormat.NDJSON)
+
+        assert request.status == "completed", request.error_message
+        assert request.rows_exported == request.total_rows == 1000
+        assert request.progress == 1.0
+        assert max(chunks) == 64
+
+        with gzip.open(request.file_path, "rt") as handle:
+            rows = [json.loads(line) for line in handle]
+        assert rows[0]["id"] == 0
+        assert len(rows) == 1000
+        assert request.bytes_encoded > request.file_size
+
+        stored = await service.get_export_request(request.id, request.tenant_id)
+        assert stored.status == "completed"
+        assert stored.file_path == request.file_path
+        assert await service.get_export_request(request.id, uuid.uuid4()) is None
+
+    async def test_failed_export_removes_file(self, service, monkeypatch):
+        """Test that a failure leaves no partial file behind."""
+        query = select(text("id")).select_from(text("missing_table"))
+        monkeypatch.setattr(service, "_build_export_query", lambda request: (query, ["id"]))
+
+        request = await service.export_now(uuid.uuid4(), DataType.CALLS, ExportFormat.CSV)
+
+        assert request.status == "failed"
+        assert request.file_path is None
+        assert os.listdir(service.export_directory) == []
+
+    async def test_parquet_export(self, service):
+        """Test a date-partitioned Parquet export from the database."""
+        request = await service.export_now(
+            uuid.uuid4(), DataType.CALLS, ExportFormat.PARQUET, partition_by_date=True
+        )
+
+        assert request.status == "completed", request.error_message
+        assert request.rows_exported == 1000
+        assert request.content_type == "application/zip"
+        assert request.file_path.endswith(".zip")
+        with zipfile.ZipFile(request.file_path) as archive:
+            assert len(archive.namelist()) == 2
+
+    async def test_resumes_from_checkpoint(self, service, monkeypatch):
+        """Test that an interrupted export continues after its last checkpoint."""
+        service.checkpoint_rows = 128
+        encoded = []
+        original = service._encode
+
+        async def crash_after_five_chunks(export_request, fields, rows):
+            if len(encoded) == 5:
+                raise asyncio.CancelledError()
+            encoded.append(len(rows))
+            return await original(export_request, fields, rows)
+
+        monkeypatch.setattr(service, "_encode", crash_after_five_chunks)
+        job = await service.job_store.create(job_values(
+            status=ExportJobStatus.PROCESSING, worker_id="worker-1", attempts=1
+        ))
+        with pytest.raises(asyncio.CancelledError):
+            await service._run_export_job(job)
+
+        job = await service.job_store.get(job["id"])
+        assert job["status"] == ExportJobStatus.PROCESSING
+        assert job["rows_exported"] == 256
+        assert job["checkpoint_offset"] > 0
+
+        encoded.clear()
+
+        async def count_rows(export_request, fields, rows):
+            encoded.append(len(rows))
+            return await original(export_request, fields, rows)
+
+        monkeypatch.setattr(service, "_encode", count_rows)
+        request = await service._run_export_job(job)
+
+        assert request.status == "completed", request.error_message
+        assert request.rows_exported == 1000
+        assert sum(encoded) == 1000 - 256
+        with gzip.open(request.file_path, "rt") as handle:
+            ids = [json.loads(line)["id"] for line in handle]
+        assert ids == list(range(1000))
+
+    async def test_cancel_running_export(self, service, monkeypatch):
+        """Test that cancelling a running export stops it and removes its output."""
+        original = service._encode
+        chunks = []
+
+        async def cancel_after_two_chunks(export_request, fields, rows):
+            chunks.append(len(rows))
+            if len(chunks) == 2:
+                await service.cancel_export_request(export_request.id, export_request.tenant_id)
+            return await original(export_request, fields, rows)
+
+        monkeypatch.setattr(service, "_encode", cancel_after_two_chunks)
+        request = await service.export_now(uuid.uuid4(), DataType.CALLS, ExportFormat.CSV)
+
+        assert request.status == "cancelled"
+        assert len(chunks) == 2
+        assert os.listdir(service.export_directory) == []
+        stored = await service.get_export_request(request.id, request.tenant_id)
+        assert stored.status == "cancelled"
+        assert stored.cancel_requested
+
+    async def test_cancel_queued_export(self, service):
+        """Test that a queued export is cancelled without running."""
+        request = await service.create_export_request(uuid.uuid4(), DataType.CALLS, ExportFormat.CSV)
+
+        cancelled = await service.cancel_export_request(request.id, request.tenant_id)
+
+        assert cancelled.status == "cancelled"
+        assert await service.job_store.claim("worker-1", 1) is None
+
+    async def test_worker_pool_runs_queued_exports(self, service):
+        """Test that started workers pick up new export requests."""
+        service.worker_pool.poll_interval = 0.05
+        await service.start()
+        try:
+            request = await service.create_export_request(uuid.uuid4(), DataType.CALLS, ExportFormat.CSV)
+            for _ in range(100):
+                stored = await service.get_export_request(request.id, request.tenant_id)
+                if stored.status in ExportJobStatus.FINISHED:
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            await service.stop()
+
+        assert stored.status == "completed", stored.error_message
+        assert stored.rows_exported == 1000
+
+
+class TestExportJobStore:
+    """Test claiming and recovering export jobs."""
+
+    async def test_claim_by_fairness_then_priority(self, engine):
+        """Test that claims prefer tenants with fewer running jobs, then priority within a tenant."""
+        store = ExportJobStore()
+        busy, idle = uuid.uuid4(), uuid.uuid4()
+        await store.create(job_values(busy))
+        await store.create(job_values(idle))
+        urgent = [await store.create(job_values(busy, priority=10)) for _ in range(2)]
+
+        claimed = [await store.claim("worker-1", max_jobs_per_tenant=2) for _ in range(4)]
+
+        assert claimed[0]["id"] == urgent[0]["id"]
+        assert claimed[1]["tenant_id"] == idle
+        assert claimed[2]["id"] == urgent[1]["id"]
+        assert claimed[3] is None
+        assert all(job["attempts"] == 1 and job["worker_id"] == "worker-1" for job in claimed[:3])
+
+    async def test_checkpoint_by_other_worker_is_lost(self, engine):
+        """Test that a worker cannot report on a job it no longer owns."""
+        from voicecore.services.export_jobs import ExportJobLost
+
+        store = ExportJobStore()
+        await store.create(job_values())
+        job = await store.claim("worker-1", 1)
+
+        assert await store.checkpoint(job["id"], "worker-1", {"rows_exported": 10}) is False
+        with pytest.raises(ExportJobLost):
+            await store.checkpoint(job["id"], "worker-2", {"rows_exported": 20})
+
+    async def test_recover_stale_jobs(self, engine):
+        """Test that silent jobs are requeued, or failed after too many attempts."""
+        store = ExportJobStore()
+        stale = datetime.utcnow() - timedelta(minutes=10)
+        retry = await store.create(job_values(
+            status=ExportJobStatus.PROCESSING, worker_id="gone", attempts=1, heartbeat_at=stale
+        ))
+        give_up = await store.create(job_values(
+            status=ExportJobStatus.PROCESSING, worker_id="gone", attempts=3, heartbeat_at=stale
+        ))
+        alive = await store.create(job_values(
+            status=ExportJobStatus.PROCESSING, worker_id="here", attempts=1, heartbeat_at=datetime.utcnow()
+        ))
+
+        counts = await store.recover_stale(stale_after_seconds=300, max_attempts=3)
+
+        assert counts == {"requeued": 1, "failed": 1}
+        assert (await store.get(retry["id"]))["status"] == ExportJobStatus.PENDING
+        assert (await store.get(give_up["id"]))["status"] == ExportJobStatus.FAILED
+        assert (await store.get(alive["id"]))["status"] == ExportJobStatus.PROCESSING
+
+
+class TestExportQueries:
+    """Test export query selection."""
+
+    def test_partitioning_needs_time_series(self, tmp_path):
+        """Test that date partitions are refused for non time-series data."""
+        service = DataExportService()
+        request = make_request(DataType.AGENTS, ExportFormat.PARQUET)
+        request.partition_by_date = True
+        query = select(*calls.c)
+
+        with pytest.raises(ValueError):
+            service._create_parquet_writer(request, query, str(tmp_path / "agents"))
+
+    def test_unavailable_data_type(self):
+        """Test that data types without an export query are rejected."""
+        with pytest.raises(ValueError):
+            DataExportService()._build_export_query(make_request(DataType.VOICEMAILS))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
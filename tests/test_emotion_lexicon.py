@@ -0,0 +1,123 @@
+"""
+Tests for the precompiled emotion lexicon engine.
+
+Checks that trie scoring matches per-keyword regex scanning, that
+phrases and escalation triggers are word-bounded, and the conversation
+batch path.
+"""
+
+import re
+import uuid
+import pytest
+
+from voicecore.services.emotion_detection_service import (
+    EmotionDetectionService,
+    EmotionType,
+    EscalationLevel,
+)
+from voicecore.services.emotion_lexicon import LexiconEngine, normalize_text
+
+
+SAMPLES = [
+    "I am so happy and excited, this is wonderful!",
+    "Honestly I'm fed up. This is ridiculous and I'm really annoyed, annoyed!",
+    "I was worried and anxious, a bit nervous on edge about the bill",
+    "The   service was terrible,   awful and the agent was useless",
+    "Thank you, I appreciate it, looking forward to the update",
+    "fed, up is not the same as fed up",
+    "",
+]
+
+
+@pytest.fixture
+def service():
+    """Provide a fresh emotion detection service."""
+    return EmotionDetectionService()
+
+
+def regex_counts(service, text):
+    """Per-emotion match counts using one regex scan per keyword."""
+    return {
+        emotion: sum(
+            len(re.findall(r'\b' + re.escape(keyword) + r'\b', text))
+            for keyword in keywords
+        )
+        for emotion, keywords in service.emotion_keywords.items()
+    }
+
+
+class TestLexiconEngine:
+    """Test trie scoring."""
+
+    def test_matches_regex_scan(self, service):
+        """Test that emotion and sentiment counts equal regex scanning."""
+        positive = re.compile(r'\b(' + '|'.join(service.positive_words) + r')\b')
+        negative = re.compile(r'\b(' + '|'.join(service.negative_words) + r')\b')
+
+        for sample in SAMPLES:
+            text = normalize_text(sample)
+            scores = service.lexicon.score(text)
+
+            assert scores.emotion_matches == regex_counts(service, text), sample
+            assert scores.positive_matches == len(positive.findall(text))
+            assert scores.negative_matches == len(negative.findall(text))
+            assert scores.word_count == len(text.split())
+
+    def test_phrase_requires_single_space(self):
+        """Test that phrases only match across a single space."""
+        engine = LexiconEngine({"frustration": ["fed up"]}, [], [], {})
+
+        assert engine.score("fed up").emotion_matches == {"frustration": 1}
+        assert engine.score("fed, up").emotion_matches == {"frustration": 0}
+        assert engine.score("fed  up").emotion_matches == {"frustration": 0}
+
+    def test_keywords_in_reporting_order(self, service):
+        """Test that matched keywords follow emotion and keyword order."""
+        scores = service.lexicon.score(normalize_text("I'm excited and happy"))
+
+        assert scores.keywords == ["happy", "excited", "excited"]
+
+    def test_most_severe_escalation_wins(self, service):
+        """Test that urgent phrases outrank high ones."""
+        scores = service.lexicon.score(normalize_text("I want a refund, this is an emergency"))
+
+        assert scores.escalation == EscalationLevel.URGENT
+
+    def test_escalation_is_word_bounded(self, service):
+        """Test that escalation words inside other words do not trigger."""
+        assert service.lexicon.score("there is an issue with my bill").escalation is None
+        assert service.lexicon.score("i will sue you").escalation == EscalationLevel.HIGH
+
+
+class TestEmotionDetectionService:
+    """Test the service on top of the lexicon engine."""
+
+    async def test_analyze_text_emotion(self, service):
+        """Test a single analysis."""
+        analysis = await service.analyze_text_emotion("I am furious and angry, get me a manager")
+
+        assert analysis.primary_emotion == EmotionType.ANGER
+        assert analysis.escalation_level == EscalationLevel.HIGH
+        assert analysis.sentiment_score == -1.0
+        assert analysis.keywords_detected == ["angry", "furious"]
+
+    async def test_conversation_batch(self, service):
+        """Test that a conversation is scored in one batch."""
+        segments = [
+            {"speaker": "caller", "text": "I'm worried about my order"},
+            {"speaker": "agent", "text": "Let me check that for you"},
+            {"speaker": "caller", "text": "Great, thank you, that is wonderful"},
+        ]
+
+        analyses = await service.analyze_conversation_emotion(
+            segments, call_id=str(uuid.uuid4()), tenant_id=uuid.uuid4()
+        )
+
+        assert [a.metadata["segment_index"] for a in analyses] == [0, 2]
+        assert analyses[1].primary_emotion == EmotionType.JOY
+        assert analyses[0].metadata["emotion_progression"]["sentiment_trend"] == "improving"
+        assert all(analysis.id in service.emotion_analyses for analysis in analyses)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
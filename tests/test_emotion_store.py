@@ -0,0 +1,231 @@
+"""
+Tests for the bounded emotion analysis store.
+
+Covers bucketed aggregates, their roll-up and retention, the tenant
+bucket cap, eviction of full analyses and their spill to the database,
+and the service queries built on them.
+"""
+
+import uuid
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import insert
+
+from voicecore.services.emotion_detection_service import (
+    EmotionAnalysis,
+    EmotionDetectionService,
+    EmotionType,
+    EscalationLevel,
+    SentimentPolarity,
+)
+from voicecore.models.call import Call, CallDirection, CallStatus, CallType
+from voicecore.services.emotion_store import EmotionAnalysisStore
+
+calls = Call.__table__
+
+
+def make_analysis(tenant_id, timestamp, emotion=EmotionType.ANGER, intensity=0.5,
+                  sentiment=-0.5, escalation=EscalationLevel.NONE, call_id=None):
+    """Create an emotion analysis."""
+    return EmotionAnalysis(
+        id=str(uuid.uuid4()),
+        text="text",
+        primary_emotion=emotion,
+        emotion_scores={emotion: intensity},
+        sentiment_polarity=SentimentPolarity.NEGATIVE if sentiment < 0 else SentimentPolarity.POSITIVE,
+        sentiment_score=sentiment,
+        confidence=0.8,
+        escalation_level=escalation,
+        keywords_detected=[],
+        timestamp=timestamp,
+        call_id=call_id,
+        tenant_id=tenant_id
+    )
+
+
+class TestEmotionAnalysisStore:
+    """Test aggregates and eviction."""
+
+    def test_aggregate_sums_buckets_in_range(self):
+        """Test that aggregates cover only buckets from the start of the period."""
+        store = EmotionAnalysisStore(bucket_seconds=3600, recent_window_seconds=60)
+        tenant_id = uuid.uuid4()
+        now = datetime.utcnow()
+        for hours_ago, intensity in [(0, 0.4), (1, 0.6), (5, 1.0)]:
+            store.add(make_analysis(tenant_id, now - timedelta(hours=hours_ago), intensity=intensity), now)
+
+        period = store.aggregate(tenant_id, now - timedelta(hours=2))
+
+        assert period.total == 2
+        assert period.emotion_counts == {EmotionType.ANGER: 2}
+        assert period.intensity_sums[EmotionType.ANGER] == pytest.approx(1.0)
+        assert store.aggregate(uuid.uuid4(), now - timedelta(days=1)).total == 0
+
+    def test_fine_buckets_roll_up(self):
+        """Test that buckets past the fine window merge into coarse ones, which expire."""
+        store = EmotionAnalysisStore(bucket_seconds=60, fine_buckets=3, coarse_seconds=600, coarse_buckets=2)
+        tenant_id = uuid.uuid4()
+        start = datetime(2026, 1, 1)
+        for minute in range(30):
+            store.add(make_analysis(tenant_id, start + timedelta(minutes=minute)), start)
+
+        # Minutes 27-29 stay fine, 10-26 are in two coarse buckets, 0-9 expired
+        assert store.stats()["buckets"] == 5
+        assert store.aggregate(tenant_id, start).total == 20
+        assert store.aggregate(tenant_id, start + timedelta(minutes=28)).total == 2
+        assert store.aggregate(tenant_id, start + timedelta(minutes=25)).total == 10
+
+    def test_late_analysis_lands_in_coarse_bucket(self):
+        """Test that an analysis older than the fine window is still counted."""
+        store = EmotionAnalysisStore(bucket_seconds=60, fine_buckets=3, coarse_seconds=600, coarse_buckets=2)
+        tenant_id = uuid.uuid4()
+        start = datetime(2026, 1, 1)
+        for minute in range(20):
+            store.add(make_analysis(tenant_id, start + timedelta(minutes=minute)), start)
+
+        store.add(make_analysis(tenant_id, start + timedelta(minutes=12)), start)
+
+        assert store.aggregate(tenant_id, start).total == 21
+        assert store.stats()["buckets"] == 5
+
+    def test_bucket_cap_drops_idle_tenants(self):
+        """Test that the least recently active tenants are dropped over the bucket cap."""
+        store = EmotionAnalysisStore(max_buckets=2)
+        idle, active, new = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        now = datetime.utcnow()
+        store.add(make_analysis(idle, now), now)
+        store.add(make_analysis(active, now), now)
+        store.add(make_analysis(idle, now), now)
+        store.add(make_analysis(active, now), now)
+
+        store.add(make_analysis(new, now), now)
+
+        assert store.stats() == {"recent_analyses": 5, "tenants": 2, "buckets": 2}
+        assert store.aggregate(idle, now - timedelta(hours=1)).total == 0
+        assert store.aggregate(active, now - timedelta(hours=1)).total == 2
+
+    def test_horizon(self):
+        """Test that the horizon is the start of the oldest coarse bucket kept."""
+        store = EmotionAnalysisStore(coarse_buckets=31)
+
+        assert store.horizon(datetime(2026, 3, 31, 15, 30)) == datetime(2026, 3, 1)
+
+    def test_recent_window_evicts_oldest(self):
+        """Test eviction by age and by capacity."""
+        store = EmotionAnalysisStore(recent_window_seconds=60, max_recent=2)
+        tenant_id = uuid.uuid4()
+        now = datetime.utcnow()
+
+        old = make_analysis(tenant_id, now - timedelta(minutes=5))
+        assert store.add(old, now) == [old]
+        assert old.id not in store
+
+        first = make_analysis(tenant_id, now)
+        second = make_analysis(tenant_id, now)
+        third = make_analysis(tenant_id, now)
+        store.add(first, now)
+        store.add(second, now)
+        assert store.add(third, now) == [first]
+        assert [a.id for a in store.recent(tenant_id, now - timedelta(minutes=1))] == [third.id, second.id]
+        assert store.aggregate(tenant_id, now - timedelta(hours=1)).total == 4
+
+
+class TestServiceQueries:
+    """Test trend, report and alert queries on the store."""
+
+    @pytest.fixture
+    def service(self):
+        """Provide a service with analyses over the last week."""
+        service = EmotionDetectionService()
+        service.tenant_id = uuid.uuid4()
+        now = datetime.utcnow()
+        for days_ago, emotion, escalation in [
+            (6, EmotionType.JOY, EscalationLevel.URGENT),
+            (5, EmotionType.JOY, EscalationLevel.NONE),
+            (1, EmotionType.JOY, EscalationLevel.NONE),
+            (0, EmotionType.ANGER, EscalationLevel.NONE),
+            (0, EmotionType.ANGER, EscalationLevel.HIGH),
+        ]:
+            service.emotion_analyses.add(make_analysis(
+                service.tenant_id, now - timedelta(days=days_ago), emotion=emotion,
+                sentiment=-0.8 if emotion == EmotionType.ANGER else 0.5, escalation=escalation
+            ), now)
+        return service
+
+    async def test_track_emotion_trends(self, service):
+        """Test frequencies and trend directions."""
+        trends = {t.emotion: t for t in await service.track_emotion_trends(service.tenant_id, days=7)}
+
+        assert trends[EmotionType.JOY].frequency == 3
+        assert trends[EmotionType.JOY].trend_direction == "decreasing"
+        assert trends[EmotionType.ANGER].trend_direction == "increasing"
+        assert trends[EmotionType.ANGER].average_intensity == pytest.approx(0.5)
+
+    async def test_generate_sentiment_report(self, service):
+        """Test report totals."""
+        report = await service.generate_sentiment_report(service.tenant_id, days=30)
+
+        assert report.total_analyses == 5
+        assert report.escalation_triggers == 2
+        assert report.emotion_distribution[EmotionType.JOY] == 3
+        assert report.most_common_emotions[0] == (EmotionType.JOY, 3)
+        assert report.average_sentiment_score == pytest.approx((-0.8 * 2 + 0.5 * 3) / 5)
+
+    async def test_alerts_use_recent_window(self, service):
+        """Test that alerts come from recent analyses only."""
+        alerts = await service.get_real_time_emotion_alerts(service.tenant_id, minutes=60)
+
+        assert len(alerts) == 2
+        assert alerts[0]["escalation_level"] == "high"
+
+    async def test_evicted_analyses_spill_latest_per_call(self):
+        """Test that only the latest evicted analysis per call is written."""
+        service = EmotionDetectionService()
+        tenant_id, call_id = uuid.uuid4(), str(uuid.uuid4())
+        now = datetime.utcnow()
+        analyses = [make_analysis(tenant_id, now, call_id=call_id) for _ in range(3)]
+        for analysis in analyses:
+            service.emotion_analyses.add(analysis, now)
+
+        with patch.object(service, "_store_analysis_in_database", AsyncMock()) as store:
+            await service.flush_analyses()
+
+        store.assert_awaited_once_with(analyses[-1])
+        assert len(service.emotion_analyses) == 0
+
+    async def test_report_reads_older_periods_from_calls(self, service, sqlite_database):
+        """Test that a report past the in-memory horizon adds the analyses stored on calls."""
+        db = await sqlite_database(calls)
+        old = datetime.utcnow() - timedelta(days=60)
+        async with db.engine.begin() as conn:
+            await conn.execute(insert(calls), [
+                {
+                    "id": uuid.uuid4(),
+                    "tenant_id": tenant_id,
+                    "twilio_call_sid": f"CA{i}",
+                    "from_number": "+15550000000",
+                    "to_number": "+15559999999",
+                    "status": CallStatus.COMPLETED,
+                    "direction": CallDirection.INBOUND,
+                    "call_type": CallType.CUSTOMER,
+                    "emotion_detected": EmotionType.SADNESS.value,
+                    "sentiment_score": -0.7,
+                    "escalation_triggered": i == 0,
+                    "created_at": old,
+                    "updated_at": old,
+                }
+                for i, tenant_id in enumerate([service.tenant_id, service.tenant_id, uuid.uuid4()])
+            ])
+
+        report = await service.generate_sentiment_report(service.tenant_id, days=90)
+
+        assert report.total_analyses == 7
+        assert report.emotion_distribution[EmotionType.SADNESS] == 2
+        assert report.sentiment_distribution[SentimentPolarity.VERY_NEGATIVE] == 2
+        assert report.escalation_triggers == 3
+        assert (await service.generate_sentiment_report(service.tenant_id, days=30)).total_analyses == 5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
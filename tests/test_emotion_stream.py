@@ -0,0 +1,197 @@
+"""
+Tests for live transcript emotion streaming.
+
+Covers the rolling window, phrases split across chunks, escalation
+events and the routing reaction to them.
+"""
+
+import uuid
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from voicecore.services.emotion_detection_service import (
+    EmotionDetectionService,
+    EmotionType,
+    EscalationLevel,
+)
+from voicecore.services.emotion_lexicon import normalize_text
+from voicecore.services.emotion_stream import CallEmotionStream, EscalationEvent
+
+
+@pytest.fixture
+def service():
+    """Provide a fresh emotion detection service."""
+    return EmotionDetectionService()
+
+
+class TestCallEmotionStream:
+    """Test incremental scoring."""
+
+    def test_window_matches_full_rescore(self, service):
+        """Test that rolling totals equal scoring the window text at once."""
+        chunks = [
+            "I am really annoyed",
+            "and honestly fed",
+            "up with this terrible service",
+            "I want a refund",
+            "thank you anyway",
+        ]
+        stream = CallEmotionStream("call-1", uuid.uuid4(), service.lexicon, window_chunks=3)
+
+        for position, chunk in enumerate(chunks):
+            window = stream.ingest(chunk)
+            expected = service.lexicon.score(
+                normalize_text(" ".join(chunks[max(0, position - 2):position + 1]))
+            )
+
+            assert window.word_count == expected.word_count
+            assert window.positive_matches == expected.positive_matches
+            assert window.negative_matches == expected.negative_matches
+            if position != 4:
+                # Once "and honestly fed" leaves the window, the chunk that
+                # completed "fed up" still carries the match
+                assert window.emotion_matches == expected.emotion_matches
+
+    def test_phrase_across_chunks_counted_once(self, service):
+        """Test that a phrase split over two chunks is matched once."""
+        stream = CallEmotionStream("call-1", uuid.uuid4(), service.lexicon)
+
+        stream.ingest("I am fed")
+        window = stream.ingest("up with this")
+
+        assert window.emotion_matches[EmotionType.FRUSTRATION] == 1
+        assert "fed up" in window.keywords
+
+    def test_old_chunks_leave_window(self, service):
+        """Test that emotions fade as chunks leave the window."""
+        stream = CallEmotionStream("call-1", uuid.uuid4(), service.lexicon, window_chunks=2)
+        stream.ingest("I am furious")
+        stream.ingest("okay")
+        window = stream.ingest("let me check")
+
+        assert window.emotion_matches[EmotionType.ANGER] == 0
+        assert stream.call_scores().emotion_matches[EmotionType.ANGER] == 1
+
+
+class TestLiveEscalation:
+    """Test escalation events from the service."""
+
+    async def test_escalation_emitted_when_level_rises(self, service):
+        """Test that handlers see each rise once."""
+        events = []
+
+        async def handler(event):
+            events.append(event)
+
+        async def failing(event):
+            raise RuntimeError("handler down")
+
+        service.on_escalation(failing)
+        service.on_escalation(handler)
+        tenant_id = uuid.uuid4()
+
+        await service.ingest_transcript_chunk("call-1", tenant_id, "hello there")
+        await service.ingest_transcript_chunk("call-1", tenant_id, "get me a manager")
+        await service.ingest_transcript_chunk("call-1", tenant_id, "i want a manager now")
+        await service.ingest_transcript_chunk("call-1", tenant_id, "this is an emergency")
+
+        assert [(e.previous_level, e.level) for e in events] == [
+            (EscalationLevel.NONE, EscalationLevel.HIGH),
+            (EscalationLevel.HIGH, EscalationLevel.URGENT),
+        ]
+        assert service.get_live_escalation("call-1") == EscalationLevel.URGENT
+
+    async def test_agent_speech_ignored(self, service):
+        """Test that only caller chunks are scored."""
+        assert await service.ingest_transcript_chunk(
+            "call-1", uuid.uuid4(), "emergency", speaker="agent"
+        ) is None
+        assert "call-1" not in service.streams
+
+    async def test_recommendation_uses_live_level(self, service):
+        """Test that routing recommendations account for live escalation."""
+        tenant_id = uuid.uuid4()
+        earlier = await service.analyze_text_emotion("hello", call_id="call-1", tenant_id=tenant_id)
+        await service.ingest_transcript_chunk("call-1", tenant_id, "this is an emergency")
+
+        recommendation = await service.get_emotion_based_routing_recommendation(earlier, tenant_id)
+
+        assert recommendation["should_escalate"] is True
+        assert recommendation["escalation_level"] == "urgent"
+        assert recommendation["priority_level"] == "urgent"
+
+    async def test_end_stream_records_call_analysis(self, service):
+        """Test that ending a stream records one whole-call analysis."""
+        tenant_id = uuid.uuid4()
+        await service.ingest_transcript_chunk("call-1", tenant_id, "I am so happy")
+        await service.ingest_transcript_chunk("call-1", tenant_id, "wonderful, thank you")
+
+        analysis = await service.end_transcript_stream("call-1")
+
+        assert analysis.primary_emotion == EmotionType.JOY
+        assert analysis.metadata["stream_chunks"] == 2
+        assert analysis.id in service.emotion_analyses
+        assert "call-1" not in service.streams
+
+    async def test_other_tenant_rejected(self, service):
+        """Test that a call's stream cannot be fed by another tenant."""
+        await service.ingest_transcript_chunk("call-1", uuid.uuid4(), "hello")
+
+        with pytest.raises(ValueError):
+            await service.ingest_transcript_chunk("call-1", uuid.uuid4(), "hello")
+
+
+class TestRoutingReaction:
+    """Test the routing service's escalation handler."""
+
+    async def test_queued_call_reprioritized(self):
+        """Test that an urgent escalation raises the queue priority."""
+        from voicecore.services.call_routing_service import CallPriority, CallRoutingService
+
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock(rowcount=1))
+        session.commit = AsyncMock()
+
+        @asynccontextmanager
+        async def get_session():
+            yield session
+
+        event = EscalationEvent(
+            call_id=str(uuid.uuid4()),
+            tenant_id=uuid.uuid4(),
+            previous_level=EscalationLevel.NONE,
+            level=EscalationLevel.URGENT,
+            primary_emotion=EmotionType.FEAR,
+            sentiment_score=-0.5,
+            keywords=[],
+            chunk_index=1
+        )
+
+        with patch("voicecore.services.call_routing_service.get_db_session", get_session), \
+                patch("voicecore.services.call_routing_service.set_tenant_context", AsyncMock()):
+            assert await CallRoutingService().handle_emotion_escalation(event) is True
+
+        statement = session.execute.await_args.args[0]
+        assert statement.compile().params["priority"] == CallPriority.EMERGENCY.value
+
+    async def test_low_levels_ignored(self):
+        """Test that levels below HIGH do not touch the queue."""
+        from voicecore.services.call_routing_service import CallRoutingService
+
+        event = EscalationEvent(
+            call_id=str(uuid.uuid4()),
+            tenant_id=uuid.uuid4(),
+            previous_level=EscalationLevel.NONE,
+            level=EscalationLevel.MEDIUM,
+            primary_emotion=EmotionType.ANGER,
+            sentiment_score=-0.5,
+            keywords=[],
+            chunk_index=1
+        )
+
+        assert await CallRoutingService().handle_emotion_escalation(event) is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,172 @@
+"""
+Tests for the envelope encryption engine.
+
+Covers per-tenant data keys, legacy token compatibility, master key
+rotation and the bulk record APIs.
+"""
+
+import base64
+import uuid
+import pytest
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+from voicecore.utils.encryption import (
+    EncryptionEngine,
+    KeyNotFoundError,
+    LocalKeyring,
+    parse_master_secrets,
+    _derive_master_key,
+)
+
+
+def make_engine(active_version=1, secrets=None):
+    """Create an engine over a local keyring."""
+    keyring = LocalKeyring(secrets or {1: "secret-one"}, active_version)
+    return EncryptionEngine(keyring=keyring, max_workers=2, batch_size=3)
+
+
+class TestEncryptionEngine:
+    """Test single-value encryption."""
+
+    def test_round_trip(self):
+        """Test that a value decrypts back to the original."""
+        engine = make_engine()
+        tenant_id = uuid.uuid4()
+
+        token = engine.encrypt("+1-555-123-4567", tenant_id)
+
+        assert engine.is_encrypted(token)
+        assert "555" not in token
+        assert engine.decrypt(token, tenant_id) == "+1-555-123-4567"
+
+    def test_tokens_are_randomized(self):
+        """Test that encrypting the same value twice gives different tokens."""
+        engine = make_engine()
+
+        assert engine.encrypt("same") != engine.encrypt("same")
+
+    def test_tenant_binding(self):
+        """Test that another tenant cannot decrypt a tenant's token."""
+        engine = make_engine()
+        token = engine.encrypt("transcript", uuid.uuid4())
+
+        with pytest.raises(InvalidTag):
+            engine.decrypt(token, uuid.uuid4())
+
+    def test_data_key_reused_per_tenant(self):
+        """Test that one wrapped data key serves all of a tenant's values."""
+        engine = make_engine()
+        tenant_id = uuid.uuid4()
+
+        headers = {engine.encrypt(str(i), tenant_id).rsplit("$", 1)[0] for i in range(5)}
+
+        assert len(headers) == 1
+
+    def test_tokens_survive_new_engine(self):
+        """Test that a fresh process with the same keyring can decrypt."""
+        tenant_id = uuid.uuid4()
+        token = make_engine().encrypt("notes", tenant_id)
+
+        assert make_engine().decrypt(token, tenant_id) == "notes"
+
+    def test_legacy_tokens_still_decrypt(self):
+        """Test that tokens from the per-call PBKDF2 encryptor are readable."""
+        kdf = PBKDF2HMAC(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=b'voicecore_salt_2024',
+            iterations=100000,
+        )
+        legacy_key = base64.urlsafe_b64encode(kdf.derive(b"secret-one"))
+        legacy_token = base64.b64encode(Fernet(legacy_key).encrypt(b"old data")).decode()
+
+        assert make_engine().decrypt(legacy_token) == "old data"
+
+    def test_master_key_derived_once(self):
+        """Test that master key derivation is cached per secret and version."""
+        _derive_master_key.cache_clear()
+
+        for _ in range(3):
+            engine = make_engine()
+            tenant_id = uuid.uuid4()
+            engine.decrypt(engine.encrypt("value", tenant_id), tenant_id)
+
+        assert _derive_master_key.cache_info().misses == 1
+
+
+class TestKeyRotation:
+    """Test master key versions and rotation."""
+
+    def test_rotate_to_new_version(self):
+        """Test that rotation re-encrypts old tokens under the active version."""
+        tenant_id = uuid.uuid4()
+        secrets = {1: "secret-one", 2: "secret-two"}
+        old_token = make_engine(1, secrets).encrypt("recording", tenant_id)
+        engine = make_engine(2, secrets)
+
+        assert engine.needs_rotation(old_token)
+        new_token = engine.rotate(old_token, tenant_id)
+
+        assert engine.token_version(new_token) == 2
+        assert not engine.needs_rotation(new_token)
+        assert engine.decrypt(new_token, tenant_id) == "recording"
+        assert engine.decrypt(old_token, tenant_id) == "recording"
+
+    def test_unknown_version_rejected(self):
+        """Test that tokens from a retired master key fail clearly."""
+        tenant_id = uuid.uuid4()
+        token = make_engine(2, {1: "a", 2: "b"}).encrypt("value", tenant_id)
+
+        with pytest.raises(KeyNotFoundError):
+            make_engine(1, {1: "a"}).decrypt(token, tenant_id)
+
+    def test_parse_master_secrets(self):
+        """Test parsing of the master key setting."""
+        parsed = parse_master_secrets("2:second, 3:third", "default")
+
+        assert parsed == {1: "default", 2: "second", 3: "third"}
+
+        with pytest.raises(ValueError):
+            parse_master_secrets("no-version", "default")
+
+
+class TestBulkRecords:
+    """Test batch encryption off the event loop."""
+
+    async def test_encrypt_and_decrypt_records(self):
+        """Test that batches round-trip and skip empty fields."""
+        engine = make_engine()
+        tenant_id = uuid.uuid4()
+        records = [
+            {"call_id": i, "transcript": f"hello {i}", "notes": None}
+            for i in range(10)
+        ]
+
+        encrypted = await engine.encrypt_records(records, ["transcript", "notes"], tenant_id)
+
+        assert [r["call_id"] for r in encrypted] == list(range(10))
+        assert all(engine.is_encrypted(r["transcript"]) for r in encrypted)
+        assert all(r["notes"] is None for r in encrypted)
+        assert records[0]["transcript"] == "hello 0"
+
+        decrypted = await engine.decrypt_records(encrypted, ["transcript", "notes"], tenant_id)
+
+        assert decrypted == records
+
+    async def test_non_strict_decrypt_keeps_plaintext(self):
+        """Test that unencrypted values pass through non-strict decryption."""
+        engine = make_engine()
+
+        decrypted = await engine.decrypt_records([{"notes": "plain"}], ["notes"])
+
+        assert decrypted == [{"notes": "plain"}]
+
+        with pytest.raises(Exception):
+            await engine.decrypt_records([{"notes": "plain"}], ["notes"], strict=True)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
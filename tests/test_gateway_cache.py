@@ -0,0 +1,213 @@
+"""
+Tests for the API gateway's edge response cache.
+
+Covers keying by caller credentials, storability rules, request
+coalescing, conditional revalidation and invalidation after writes.
+"""
+
+import sys
+import asyncio
+import importlib
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import Request
+from fastapi.testclient import TestClient
+
+# The gateway is deployed on its own and imports its modules top-level
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "gateway"))
+
+from response_cache import ResponseCache
+from service_registry import ServiceRegistry
+
+gateway = importlib.import_module("main")
+
+TOKENS = {"Bearer alice": "tenant-a", "Bearer mallory": "tenant-b"}
+
+
+def make_request(headers=None, method="GET", query=b""):
+    """A bare request as the gateway receives it."""
+    return Request({
+        "type": "http",
+        "method": method,
+        "path": "/reports",
+        "query_string": query,
+        "headers": [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+    })
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """
+    A reports service that checks the bearer token against the tenant
+    header, as the real services do. Yields the requests it received.
+    """
+    registry = ServiceRegistry()
+    registry.register("reports", "http://reports")
+    monkeypatch.setattr(gateway, "registry", registry)
+    monkeypatch.setattr(gateway, "response_cache", ResponseCache(default_ttl=60.0))
+    received = []
+
+    def handler(request):
+        received.append(request)
+        tenant = TOKENS.get(request.headers.get("authorization"))
+        if tenant != request.headers.get("x-tenant-id"):
+            return httpx.Response(403, json={"detail": "Forbidden"})
+        if request.method != "GET":
+            return httpx.Response(204)
+        cache_control = "private" if request.url.path == "/me" else "max-age=60"
+        return httpx.Response(
+            200,
+            json={"tenant": tenant, "revenue": 1000},
+            headers={"Cache-Control": cache_control, "ETag": '"v1"'},
+        )
+
+    monkeypatch.setattr(gateway, "http_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    return received
+
+
+class TestCacheKeys:
+    """Test what a cache key is scoped to."""
+
+    def test_credentials_are_part_of_the_key(self):
+        """Test that different credentials for the same tenant get different keys."""
+        cache = ResponseCache()
+        alice = make_request({"X-Tenant-Id": "tenant-a", "Authorization": "Bearer alice"})
+        mallory = make_request({"X-Tenant-Id": "tenant-a", "Authorization": "Bearer mallory"})
+
+        assert cache.cache_key(alice, "reports", "/reports") != cache.cache_key(mallory, "reports", "/reports")
+        assert cache.cache_key(alice, "reports", "/reports") == cache.cache_key(
+            make_request({"X-Tenant-Id": "tenant-a", "Authorization": "Bearer alice"}), "reports", "/reports"
+        )
+
+    def test_credentials_are_not_stored(self):
+        """Test that keys hold a digest of the credentials, not the credentials."""
+        cache = ResponseCache()
+        key = cache.cache_key(
+            make_request({"X-Tenant-Id": "t", "X-API-Key": "sk-live-secret"}), "reports", "/reports"
+        )
+
+        assert "sk-live-secret" not in key
+        assert key != ResponseCache().cache_key(
+            make_request({"X-Tenant-Id": "t", "X-API-Key": "sk-live-secret"}), "reports", "/reports"
+        )
+
+    def test_uncacheable_requests(self):
+        """Test the requests that bypass the cache."""
+        cache = ResponseCache()
+
+        assert cache.cache_key(make_request(method="POST"), "reports", "/reports") is None
+        assert cache.cache_key(make_request({"Authorization": "Bearer alice"}), "reports", "/reports") is None
+        assert cache.cache_key(make_request({"Cache-Control": "no-store"}), "reports", "/reports") is None
+        assert cache.cache_key(make_request(query=b"b=2&a=1"), "reports", "/reports") == cache.cache_key(
+            make_request(query=b"a=1&b=2"), "reports", "/reports"
+        )
+
+
+class TestResponseCache:
+    """Test serving proxied GETs through the cache."""
+
+    def test_hit_for_same_caller(self, backend):
+        """Test that a repeated request is answered from the cache."""
+        client = TestClient(gateway.app)
+        headers = {"X-Tenant-Id": "tenant-a", "Authorization": "Bearer alice"}
+
+        first = client.get("/api/reports/revenue", headers=headers)
+        second = client.get("/api/reports/revenue", headers=headers)
+
+        assert (first.headers["X-Cache"], second.headers["X-Cache"]) == ("MISS", "HIT")
+        assert second.json() == {"tenant": "tenant-a", "revenue": 1000}
+        assert len(backend) == 1
+
+    def test_spoofed_tenant_is_checked_upstream(self, backend):
+        """Test that another caller naming a cached tenant is not served its data."""
+        client = TestClient(gateway.app)
+        client.get("/api/reports/revenue", headers={"X-Tenant-Id": "tenant-a", "Authorization": "Bearer alice"})
+
+        response = client.get(
+            "/api/reports/revenue", headers={"X-Tenant-Id": "tenant-a", "Authorization": "Bearer mallory"}
+        )
+
+        assert response.status_code == 403
+        assert len(backend) == 2
+
+    def test_private_responses_are_not_stored(self, backend):
+        """Test that Cache-Control: private keeps a response out of the cache."""
+        client = TestClient(gateway.app)
+        headers = {"X-Tenant-Id": "tenant-a", "Authorization": "Bearer alice"}
+
+        for _ in range(2):
+            response = client.get("/api/reports/me", headers=headers)
+            assert response.headers["X-Cache"] == "MISS"
+
+        assert len(backend) == 2
+        assert gateway.response_cache.snapshot()["entries"] == 0
+
+    def test_write_invalidates_tenant(self, backend):
+        """Test that a successful write drops the tenant's cached responses for the service."""
+        client = TestClient(gateway.app)
+        headers = {"X-Tenant-Id": "tenant-a", "Authorization": "Bearer alice"}
+        client.get("/api/reports/revenue", headers=headers)
+
+        assert client.delete("/api/reports/revenue", headers=headers).status_code == 204
+        assert client.get("/api/reports/revenue", headers=headers).headers["X-Cache"] == "MISS"
+
+    def test_conditional_client_request(self, backend):
+        """Test that a client's own validator is answered with 304 from the cache."""
+        client = TestClient(gateway.app)
+        headers = {"X-Tenant-Id": "tenant-a", "Authorization": "Bearer alice"}
+        client.get("/api/reports/revenue", headers=headers)
+
+        response = client.get("/api/reports/revenue", headers={**headers, "If-None-Match": '"v1"'})
+
+        assert response.status_code == 304
+        assert len(backend) == 1
+
+
+class TestFetch:
+    """Test coalescing and revalidation in ResponseCache.fetch."""
+
+    async def test_identical_requests_coalesce(self):
+        """Test that concurrent requests with one key share one upstream fetch."""
+        cache = ResponseCache(default_ttl=60.0)
+        release = asyncio.Event()
+        fetches = []
+
+        async def fetcher(conditional):
+            fetches.append(conditional)
+            await release.wait()
+            return httpx.Response(200, content=b"report")
+
+        key = cache.cache_key(make_request({"X-Tenant-Id": "t", "Authorization": "Bearer alice"}), "r", "/")
+        other = cache.cache_key(make_request({"X-Tenant-Id": "t", "Authorization": "Bearer mallory"}), "r", "/")
+        waiters = [asyncio.create_task(cache.fetch(k, fetcher)) for k in (key, key, other)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert [status for _, status in results] == ["MISS", "COALESCED", "MISS"]
+        assert len(fetches) == 2
+
+    async def test_stale_entry_is_revalidated(self):
+        """Test that a stale entry with a validator is refreshed by a 304."""
+        cache = ResponseCache(default_ttl=0.0)
+        key = cache.cache_key(make_request(), "r", "/")
+
+        async def first(conditional):
+            return httpx.Response(200, content=b"report", headers={"ETag": '"v1"'})
+
+        async def second(conditional):
+            assert conditional == {"If-None-Match": '"v1"'}
+            return httpx.Response(304, headers={"Cache-Control": "max-age=60"})
+
+        assert (await cache.fetch(key, first))[1] == "MISS"
+        entry, status = await cache.fetch(key, second)
+
+        assert status == "REVALIDATED"
+        assert entry.body == b"report"
+        assert (await cache.fetch(key, first))[1] == "HIT"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
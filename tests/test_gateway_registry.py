@@ -0,0 +1,184 @@
+"""
+Tests for the API gateway's service registry.
+
+Covers registration and its token check, per-instance probe tasks,
+passive ejection and failover of proxied requests between instances.
+"""
+
+import sys
+import asyncio
+import importlib
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+# The gateway is deployed on its own and imports its modules top-level
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "gateway"))
+
+from service_registry import ServiceRegistry
+
+gateway = importlib.import_module("main")
+
+
+def upstream(handler):
+    """An HTTP client whose requests are answered by ``handler``."""
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """An empty registry installed in the gateway."""
+    registry = ServiceRegistry(probe_interval=60.0, failure_threshold=2, ejection_seconds=30.0)
+    monkeypatch.setattr(gateway, "registry", registry)
+    return registry
+
+
+class TestServiceRegistry:
+    """Test instance bookkeeping and probing."""
+
+    def test_register_is_idempotent_per_url(self, registry):
+        """Test that registering a known URL returns the existing instance."""
+        first = registry.register("call", "http://call-1:8002/")
+        again = registry.register("call", "http://call-1:8002", instance_id="other")
+
+        assert again is first
+        assert list(registry.services["call"]) == [first.instance_id]
+
+    def test_round_robin_skips_ejected(self, registry):
+        """Test that ejected instances are left out of the rotation."""
+        a = registry.register("call", "http://call-1", instance_id="a")
+        b = registry.register("call", "http://call-2", instance_id="b")
+
+        assert {registry.choose_instance("call").instance_id for _ in range(4)} == {"a", "b"}
+
+        registry.record_failure(a, "boom")
+        assert a.available
+        registry.record_failure(a, "boom")
+        assert not a.available
+        assert {registry.choose_instance("call").instance_id for _ in range(4)} == {"b"}
+        assert registry.choose_instance("call", exclude={"b"}) is None
+
+    async def test_successful_probe_readmits(self, registry):
+        """Test that an active probe success ends a passive ejection."""
+        instance = registry.register("call", "http://call-1")
+        registry.record_failure(instance, "boom")
+        registry.record_failure(instance, "boom")
+        registry._client = upstream(lambda request: httpx.Response(200))
+
+        assert await registry.probe(instance)
+        assert instance.available
+        assert instance.consecutive_failures == 0
+
+    async def test_probe_tasks_are_per_service(self, registry):
+        """Test that the same instance id under two services gets two probes."""
+        async with upstream(lambda request: httpx.Response(200)) as client:
+            await registry.start(client)
+            registry.register("call", "http://host-1", instance_id="replica-1")
+            registry.register("crm", "http://host-2", instance_id="replica-1")
+
+            assert set(registry._probe_tasks) == {("call", "replica-1"), ("crm", "replica-1")}
+
+            registry.deregister("call", "replica-1")
+            assert set(registry._probe_tasks) == {("crm", "replica-1")}
+            await registry.stop()
+
+    async def test_reregistration_restarts_probe(self, registry):
+        """Test that moving an instance id to a new URL replaces its probe."""
+        async with upstream(lambda request: httpx.Response(200)) as client:
+            await registry.start(client)
+            old = registry.register("call", "http://old-host", instance_id="replica-1")
+            old_task = registry._probe_tasks[("call", "replica-1")]
+
+            new = registry.register("call", "http://new-host", instance_id="replica-1")
+            await asyncio.sleep(0)
+
+            assert new is not old
+            assert registry.services["call"]["replica-1"] is new
+            assert old_task.cancelled()
+            assert registry._probe_tasks[("call", "replica-1")] is not old_task
+            await registry.stop()
+
+
+class TestRegistrationEndpoints:
+    """Test the registration token check."""
+
+    def test_registration_disabled_without_token(self, registry, monkeypatch):
+        """Test that registration fails closed when no token is configured."""
+        monkeypatch.setattr(gateway, "REGISTRATION_TOKEN", None)
+        client = TestClient(gateway.app)
+
+        response = client.post("/services/register", json={"service": "call", "url": "http://evil"})
+        assert response.status_code == 403
+        assert client.delete("/services/call/instances/any").status_code == 403
+        assert not registry.has_service("call")
+
+    def test_registration_requires_token(self, registry, monkeypatch):
+        """Test that only callers with the token may register and deregister."""
+        monkeypatch.setattr(gateway, "REGISTRATION_TOKEN", "secret")
+        client = TestClient(gateway.app)
+        payload = {"service": "call", "url": "http://call-1", "instance_id": "a"}
+
+        assert client.post("/services/register", json=payload).status_code == 401
+        wrong = {"X-Registration-Token": "guess"}
+        assert client.post("/services/register", json=payload, headers=wrong).status_code == 401
+
+        good = {"X-Registration-Token": "secret"}
+        response = client.post("/services/register", json=payload, headers=good)
+        assert response.status_code == 200
+        assert response.json()["instance"]["instance_id"] == "a"
+
+        assert client.delete("/services/call/instances/a", headers=wrong).status_code == 401
+        assert client.delete("/services/call/instances/a", headers=good).status_code == 200
+        assert not registry.has_service("call")
+
+
+class TestFailover:
+    """Test proxying across instances."""
+
+    @pytest.fixture
+    def calls(self, registry, monkeypatch):
+        """Two call instances; the first refuses connections. Yields the hosts hit."""
+        registry.register("call", "http://down", instance_id="down")
+        registry.register("call", "http://up", instance_id="up")
+        monkeypatch.setattr(gateway.response_cache, "enabled", False)
+        hits = []
+
+        def handler(request):
+            hits.append(request.url.host)
+            if request.url.host == "down":
+                raise httpx.ConnectError("connection refused", request=request)
+            return httpx.Response(200, json={"host": request.url.host})
+
+        monkeypatch.setattr(gateway, "http_client", upstream(handler))
+        return hits
+
+    def test_connect_error_fails_over(self, registry, calls):
+        """Test that an unreachable instance is skipped within the same request."""
+        client = TestClient(gateway.app)
+
+        for _ in range(2):
+            response = client.post("/api/call/calls", json={})
+            assert response.status_code == 200
+            assert response.json() == {"host": "up"}
+
+        assert calls.count("down") == 2
+        assert not registry.services["call"]["down"].available
+
+        # Ejected after the threshold, so it is no longer tried
+        calls.clear()
+        assert client.get("/api/call/calls").json() == {"host": "up"}
+        assert calls == ["up"]
+
+    def test_no_reachable_instance(self, registry, calls):
+        """Test a bad gateway once every instance has failed."""
+        registry.deregister("call", "up")
+        client = TestClient(gateway.app)
+
+        assert client.get("/api/call/calls").status_code == 502
+        assert client.get("/api/unknown/calls").status_code == 404
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
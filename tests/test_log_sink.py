@@ -0,0 +1,157 @@
+"""
+Tests for the off-loop log sink and per-event sampling.
+
+Covers the sampling processor, the non-blocking queue handler and the
+rendering of structlog events on the listener thread.
+"""
+
+import io
+import json
+import logging
+import queue
+import pytest
+import structlog
+
+from voicecore.logging import (
+    AsyncLogSink,
+    LogSampler,
+    NonBlockingQueueHandler,
+    json_dumps,
+    parse_sample_rates,
+)
+
+
+def make_record(level=logging.INFO, msg="hello"):
+    """Create a stdlib log record."""
+    return logging.LogRecord("test", level, __file__, 1, msg, None, None)
+
+
+class TestLogSampler:
+    """Test per-event-name sampling."""
+
+    def test_limits_each_event_name(self):
+        """Test that only the configured number of events pass per window."""
+        sampler = LogSampler(rates={"Call metrics collected": 2})
+        kept = 0
+        for _ in range(5):
+            try:
+                sampler(None, "info", {"event": "Call metrics collected"})
+                kept += 1
+            except structlog.DropEvent:
+                pass
+
+        assert kept == 2
+        assert sampler.dropped == 3
+        assert sampler.dropped_by_event == {"Call metrics collected": 3}
+
+    def test_unlisted_events_pass_when_default_disabled(self):
+        """Test that events without a limit are never sampled."""
+        sampler = LogSampler(rates={"Call metrics collected": 1})
+
+        for _ in range(10):
+            sampler(None, "info", {"event": "Call started"})
+
+        assert sampler.dropped == 0
+
+    def test_errors_bypass_sampling(self):
+        """Test that warnings and errors are never dropped."""
+        sampler = LogSampler(default_per_second=1)
+
+        for method in ["warning", "error", "critical"] * 3:
+            sampler(None, method, {"event": "Database unavailable"})
+
+        assert sampler.dropped == 0
+
+    def test_dropped_count_reported_on_next_event(self):
+        """Test that the first event of a new window carries the drop count."""
+        sampler = LogSampler(default_per_second=1)
+        sampler(None, "info", {"event": "tick"})
+        with pytest.raises(structlog.DropEvent):
+            sampler(None, "info", {"event": "tick"})
+
+        sampler._windows["tick"][0] -= 1
+        event = sampler(None, "info", {"event": "tick"})
+
+        assert event["sampled_out"] == 1
+
+    def test_parse_sample_rates(self):
+        """Test parsing of the LOG_SAMPLE_RATES setting."""
+        assert parse_sample_rates("Spam analysis completed=10, VIP caller identified=5,") == {
+            "Spam analysis completed": 10,
+            "VIP caller identified": 5,
+        }
+
+
+class TestNonBlockingQueueHandler:
+    """Test enqueueing on the calling thread."""
+
+    def test_structlog_event_not_rendered_on_caller(self):
+        """Test that event dicts are queued without formatting."""
+        handler = NonBlockingQueueHandler(queue.Queue())
+        record = make_record(msg={"event": "Call started"})
+
+        handler.emit(record)
+
+        assert handler.queue.get_nowait().msg == {"event": "Call started"}
+
+    def test_full_queue_drops_info_only(self):
+        """Test that info records are dropped and counted on a full queue."""
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+        handler.emit(make_record())
+        handler.emit(make_record())
+
+        assert handler.dropped == 1
+        assert handler.queue.qsize() == 1
+
+        handler.queue.get_nowait()
+        handler.emit(make_record(level=logging.ERROR))
+        assert handler.queue.qsize() == 1
+
+
+class TestAsyncLogSink:
+    """Test rendering on the listener thread."""
+
+    def test_events_rendered_as_json_lines(self):
+        """Test that structlog events reach the stream as JSON."""
+        stream = io.StringIO()
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(structlog.stdlib.ProcessorFormatter(
+            processors=[
+                structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+                structlog.processors.JSONRenderer(serializer=json_dumps),
+            ],
+        ))
+        sink = AsyncLogSink(handler, max_queue_size=100)
+        sink.start()
+
+        logger = logging.getLogger("voicecore.test_sink")
+        logger.propagate = False
+        logger.addHandler(sink.queue_handler)
+        logger.setLevel(logging.INFO)
+        try:
+            structlog.wrap_logger(
+                logger,
+                processors=[structlog.stdlib.ProcessorFormatter.wrap_for_formatter],
+                wrapper_class=structlog.stdlib.BoundLogger,
+            ).info("Call started", call_sid="CA1", duration=3)
+        finally:
+            sink.stop()
+            logger.removeHandler(sink.queue_handler)
+
+        assert json.loads(stream.getvalue()) == {
+            "event": "Call started", "call_sid": "CA1", "duration": 3
+        }
+        assert sink.stats()["queue_full_dropped"] == 0
+
+    def test_stop_tolerates_closed_stream(self):
+        """Test that stopping after the stream was closed does not raise."""
+        stream = io.StringIO()
+        sink = AsyncLogSink(logging.StreamHandler(stream), max_queue_size=10)
+        sink.start()
+        stream.close()
+
+        sink.stop()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
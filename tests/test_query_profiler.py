@@ -0,0 +1,117 @@
+"""
+Tests for the SQL statement profiler.
+
+Covers statement normalization, per-statement and per-request
+recording through engine events, pool checkout timing and slow query
+plans, against an in-memory SQLite engine.
+"""
+
+import pytest
+from unittest.mock import patch
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import voicecore.database as database
+from voicecore.database import create_session_factory, get_db_session, unit_of_work
+from voicecore.utils.query_profiler import (
+    OTHER_STATEMENTS,
+    QueryProfiler,
+    TimedAsyncQueuePool,
+    normalize_sql,
+)
+
+
+@pytest.fixture
+async def profiler(monkeypatch, tmp_path):
+    """Install a fresh profiler on a SQLite engine with a timed pool."""
+    profiler = QueryProfiler(slow_query_ms=10_000)
+    monkeypatch.setattr("voicecore.database.query_profiler", profiler)
+    monkeypatch.setattr("voicecore.utils.query_profiler.query_profiler", profiler)
+
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'profiler.db'}",
+        poolclass=TimedAsyncQueuePool,
+    )
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+
+    monkeypatch.setattr(database, "AsyncSessionLocal", create_session_factory(engine))
+    profiler.reset()
+    yield profiler
+    await engine.dispose()
+
+
+class TestNormalizeSql:
+    """Test statement normalization."""
+
+    def test_literals_and_markers_collapse(self):
+        """Test that statements differing only in values share a key."""
+        assert normalize_sql("SELECT * FROM calls WHERE id = $1 AND n > 10") == \
+            normalize_sql("SELECT *  FROM calls\n WHERE id = $2 AND n > 3")
+        assert normalize_sql("SELECT 'a''b', :name, %(p)s") == "SELECT ?, ?, ?"
+
+    def test_in_lists_and_values_rows_collapse(self):
+        """Test that variable-length lists do not create new keys."""
+        assert normalize_sql("SELECT 1 FROM t WHERE id IN ($1, $2, $3)") == \
+            "SELECT ? FROM t WHERE id IN (...)"
+        assert normalize_sql("INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4)") == \
+            "INSERT INTO t (a, b) VALUES (?, ?)"
+
+    def test_identifiers_and_casts_kept(self):
+        """Test that digits in names and type casts survive."""
+        assert normalize_sql("SELECT t1.id::uuid FROM t1") == "SELECT t1.id::uuid FROM t1"
+
+
+class TestQueryProfiler:
+    """Test recording through engine events."""
+
+    async def test_statements_and_request_counts(self, profiler):
+        """Test per-statement totals and per-request query counts."""
+        async with unit_of_work(correlation_id="req-1") as unit:
+            async with get_db_session() as session:
+                for name in ("a", "b", "c"):
+                    await session.execute(
+                        text("INSERT INTO items (name) VALUES (:name)"), {"name": name}
+                    )
+                await session.execute(text("SELECT COUNT(*) FROM items"))
+
+        snapshot = profiler.snapshot()
+        assert snapshot["queries"] == 4
+        assert snapshot["distinct_statements"] == 2
+        assert snapshot["top_statements"][0]["count"] in (1, 3)
+        assert unit.stats.queries == 4
+        assert unit.stats.query_time_ms > 0
+        assert snapshot["pool_checkouts"]["primary"]["count"] >= 1
+
+    async def test_slow_query_logged_with_plan(self, profiler):
+        """Test that slow SELECTs are logged with their plan once per interval."""
+        profiler.slow_query_seconds = 0
+
+        with patch("voicecore.utils.query_profiler.logger") as logger:
+            async with unit_of_work(correlation_id="req-2"):
+                async with get_db_session() as session:
+                    await session.execute(text("SELECT name FROM items WHERE id = :id"), {"id": 1})
+                    await session.execute(text("SELECT name FROM items WHERE id = :id"), {"id": 2})
+
+        slow_logs = [
+            call.kwargs for call in logger.warning.call_args_list
+            if call.kwargs["statement"].startswith("SELECT name")
+        ]
+        assert len(slow_logs) == 2
+        assert slow_logs[0]["correlation_id"] == "req-2"
+        assert slow_logs[0]["plan"] and "items" in slow_logs[0]["plan"][0]
+        assert slow_logs[1]["plan"] is None
+        assert profiler.snapshot()["slow_queries"] >= 2
+
+    def test_statement_cap_groups_other(self):
+        """Test that keys beyond the cap are grouped together."""
+        profiler = QueryProfiler(max_statements=2)
+        for table in ("a", "b", "c", "d"):
+            profiler.record(f"SELECT * FROM {table}", 0.001)
+
+        assert set(profiler.statements) == {"SELECT * FROM a", "SELECT * FROM b", OTHER_STATEMENTS}
+        assert profiler.statements[OTHER_STATEMENTS].count == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
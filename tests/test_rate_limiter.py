@@ -0,0 +1,109 @@
+"""
+Unit tests for the token-bucket rate limiter.
+
+Exercises lease handling, denial and the local fallback bucket with a
+stubbed Redis script, so no Redis server is required.
+"""
+
+import pytest
+from unittest.mock import Mock, AsyncMock
+
+from voicecore.utils.rate_limiter import TokenBucketRateLimiter, TOKEN_BUCKET_SCRIPT
+
+
+def make_limiter(script_result=None, side_effect=None, **kwargs):
+    """Create a limiter whose Redis script returns a fixed result."""
+    script = AsyncMock(return_value=script_result, side_effect=side_effect)
+    redis_client = Mock()
+    redis_client.register_script = Mock(return_value=script)
+    limiter = TokenBucketRateLimiter(redis_client=redis_client, **kwargs)
+    return limiter, script
+
+
+class TestTokenBucketRateLimiter:
+    """Test token-bucket rate limiting decisions."""
+
+    def test_script_registered_once(self):
+        """Test that the Lua script is registered at construction."""
+        limiter, _ = make_limiter([1, "10", 0])
+        limiter.redis.register_script.assert_called_once_with(TOKEN_BUCKET_SCRIPT)
+
+    async def test_allows_when_tokens_granted(self):
+        """Test that a granted token allows the request."""
+        limiter, script = make_limiter([1, "69", 0])
+
+        decision = await limiter.check("rate_limit:tenant:t1")
+
+        assert decision.allowed
+        assert decision.source == "redis"
+        assert decision.remaining == 69
+        script.assert_awaited_once()
+        assert script.await_args.kwargs["keys"] == ["rate_limit:tenant:t1"]
+
+    async def test_denies_with_retry_after(self):
+        """Test that an empty bucket denies with a retry-after hint."""
+        limiter, _ = make_limiter([0, "0.2", 1500])
+
+        decision = await limiter.check("rate_limit:tenant:t1")
+
+        assert not decision.allowed
+        assert decision.remaining == 0
+        assert decision.retry_after == 2
+
+    async def test_leased_tokens_skip_redis(self):
+        """Test that leased tokens are spent locally without Redis calls."""
+        limiter, script = make_limiter([5, "50", 0])
+
+        decisions = [await limiter.check("rate_limit:tenant:hot") for _ in range(5)]
+
+        assert all(d.allowed for d in decisions)
+        assert [d.source for d in decisions] == ["redis", "lease", "lease", "lease", "lease"]
+        assert script.await_count == 1
+
+    async def test_lease_size_follows_demand(self):
+        """Test that lease requests grow with recent demand but stay bounded."""
+        limiter, script = make_limiter([1, "50", 0], max_lease_tokens=8)
+
+        for _ in range(30):
+            await limiter.check("rate_limit:tenant:hot")
+
+        requested = [call.kwargs["args"][2] for call in script.await_args_list]
+        assert requested[0] == 1
+        assert max(requested) == 8
+
+    async def test_keys_are_independent(self):
+        """Test that leases are tracked per key."""
+        limiter, script = make_limiter([3, "50", 0])
+
+        await limiter.check("rate_limit:tenant:a")
+        await limiter.check("rate_limit:tenant:b")
+
+        assert script.await_count == 2
+
+    async def test_falls_back_to_local_bucket_on_redis_error(self):
+        """Test that Redis failures degrade to per-process limiting."""
+        limiter, _ = make_limiter(
+            side_effect=ConnectionError("redis down"),
+            limit_per_minute=2,
+            burst=0
+        )
+
+        decisions = [await limiter.check("rate_limit:anonymous:abc") for _ in range(3)]
+
+        assert [d.allowed for d in decisions] == [True, True, False]
+        assert all(d.source == "local" for d in decisions)
+        assert decisions[-1].retry_after >= 1
+
+    async def test_local_only_without_redis(self):
+        """Test that the limiter works without a Redis client."""
+        limiter = TokenBucketRateLimiter(redis_client=None, limit_per_minute=60, burst=5)
+
+        decision = await limiter.check("rate_limit:tenant:t1")
+
+        assert decision.allowed
+        assert decision.source == "local"
+        assert decision.remaining == 64
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
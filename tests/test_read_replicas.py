@@ -0,0 +1,150 @@
+"""
+Tests for read replica routing and separate pool budgets.
+
+Covers lag-aware replica selection, fallback to the primary's
+reporting pool, read-only sessions and pool statistics.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import voicecore.database as database
+from voicecore.database import (
+    ReadReplica,
+    ReplicaSet,
+    _create_engine,
+    create_session_factory,
+    get_db_session,
+    get_pool_stats,
+    get_read_session,
+    parse_replica_urls,
+    unit_of_work,
+)
+
+
+def make_replica(name, lag, healthy=True):
+    """Create a replica with a stub engine and factory."""
+    return ReadReplica(name, MagicMock(), MagicMock(name=f"{name}-factory"), lag_seconds=lag, healthy=healthy)
+
+
+@pytest.fixture
+async def databases(monkeypatch, tmp_path):
+    """Primary, reporting and one replica engine on separate SQLite files."""
+    engines = {}
+    for name in ("primary", "reporting", "replica"):
+        url = f"sqlite+aiosqlite:///{tmp_path / name}.db"
+        engine = engines[name] = _create_engine(url, name, 2, 1, 5.0)
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE source (name TEXT)"))
+            await conn.execute(text("INSERT INTO source VALUES (:name)"), {"name": name})
+
+    replica = ReadReplica("replica", engines["replica"], create_session_factory(engines["replica"]))
+    reporting_factory = create_session_factory(engines["reporting"])
+    replicas = ReplicaSet([replica], reporting_factory)
+
+    monkeypatch.setattr(database, "async_engine", engines["primary"])
+    monkeypatch.setattr(database, "AsyncSessionLocal", create_session_factory(engines["primary"]))
+    monkeypatch.setattr(database, "reporting_engine", engines["reporting"])
+    monkeypatch.setattr(database, "ReportingSessionLocal", reporting_factory)
+    monkeypatch.setattr(database, "replica_set", replicas)
+    yield replicas
+    for engine in engines.values():
+        await engine.dispose()
+
+
+async def read_source(session):
+    """Return which database a session is connected to."""
+    return (await session.execute(text("SELECT name FROM source"))).scalar()
+
+
+class TestReplicaSelection:
+    """Test lag-aware selection."""
+
+    def test_lagging_and_unhealthy_replicas_skipped(self):
+        """Test that only healthy replicas within the lag limit are used."""
+        near, lagging, down = make_replica("near", 2.0), make_replica("lagging", 90.0), make_replica("down", 0.0, False)
+        replicas = ReplicaSet([near, lagging, down], MagicMock(), max_lag_seconds=30.0)
+
+        assert {replicas.select().name for _ in range(5)} == {"near"}
+
+    def test_load_spread_over_least_lagged(self):
+        """Test round robin among replicas with similar lag."""
+        replicas = ReplicaSet(
+            [make_replica("a", 0.2), make_replica("b", 0.8), make_replica("c", 12.0)],
+            MagicMock(),
+            lag_tolerance_seconds=1.0
+        )
+
+        assert sorted(replicas.select().name for _ in range(4)) == ["a", "a", "b", "b"]
+
+    def test_fallback_when_no_replica_usable(self):
+        """Test that reads fall back to the reporting pool."""
+        fallback = MagicMock()
+        replicas = ReplicaSet([make_replica("a", 120.0)], fallback, max_lag_seconds=30.0)
+
+        assert replicas.select() is None
+        assert replicas.session_factory() is fallback
+
+    async def test_failed_lag_check_marks_unhealthy(self):
+        """Test that an unreachable replica stops receiving reads."""
+        replica = make_replica("a", 0.0)
+        replica.engine.connect.side_effect = OSError("connection refused")
+        replicas = ReplicaSet([replica], MagicMock())
+
+        await replicas.check_lag()
+
+        assert replica.healthy is False
+        assert "refused" in replica.error
+        assert replicas.select() is None
+
+    def test_parse_replica_urls(self):
+        """Test parsing the comma-separated URL list."""
+        assert parse_replica_urls(" postgresql://a/db, ,postgresql://b/db ") == [
+            "postgresql://a/db", "postgresql://b/db"
+        ]
+
+
+class TestReadSessions:
+    """Test read session routing."""
+
+    async def test_reads_use_replica_then_reporting_pool(self, databases):
+        """Test that reads go to a replica, or to the reporting pool, never the call path."""
+        await databases.check_lag()
+        async with get_read_session() as session:
+            assert await read_source(session) == "replica"
+
+        databases.replicas[0].healthy = False
+        async with get_read_session() as session:
+            assert await read_source(session) == "reporting"
+
+        async with get_db_session() as session:
+            assert await read_source(session) == "primary"
+
+    async def test_read_session_not_shared_with_unit(self, databases):
+        """Test that read sessions are separate from the unit's session."""
+        await databases.check_lag()
+        async with unit_of_work() as unit:
+            async with get_db_session() as primary:
+                async with get_read_session() as reader:
+                    assert reader is not primary
+
+        assert unit.stats.sessions == 2
+
+    async def test_pool_stats_per_pool(self, databases):
+        """Test that each pool reports its own budget and usage."""
+        await databases.check_lag()
+        async with get_read_session() as session:
+            await read_source(session)
+            stats = get_pool_stats()
+
+        assert set(stats["pools"]) == {"primary", "reporting", "replica"}
+        assert stats["pools"]["replica"]["checked_out"] == 1
+        assert stats["pools"]["primary"]["checked_out"] == 0
+        assert stats["pools"]["reporting"]["capacity"] == 3
+        assert stats["replicas"][0]["healthy"] is True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,149 @@
+"""
+Tests for the single-pass redaction engine.
+
+Validates value scrubbing, key classification, traversal of nested
+structures and the structlog processor built on the engine.
+"""
+
+import pytest
+
+from voicecore.logging import sanitize_sensitive_data
+from voicecore.utils.redaction import (
+    COMBINED_PATTERN,
+    REPLACEMENTS,
+    RedactionEngine,
+    RedactionPolicy,
+    log_redactor,
+    scrub_text,
+    security_redactor,
+)
+
+
+class TestScrubText:
+    """Test single-pass value scrubbing."""
+
+    def test_each_pattern_redacted(self):
+        """Test that every value pattern gets its replacement."""
+        text = (
+            "ip 192.168.1.20, v6 2001:0db8:85a3:0000:0000:8a2e:0370:7334, "
+            "at 40.7128, -74.0060, mail jane@example.com, card 4111 1111 1111 1111, "
+            "ssn 123-45-6789, phone +1-555-123-4567"
+        )
+
+        scrubbed = scrub_text(text)
+
+        assert scrubbed.count("[REDACTED_LOCATION]") == 3
+        assert "user@domain.com" in scrubbed
+        assert "[REDACTED_CREDIT_CARD]" in scrubbed
+        assert "[REDACTED_SSN]" in scrubbed
+        assert "XXX-XXX-XXXX" in scrubbed
+        for leaked in ["192.168", "2001:", "40.7128", "jane@", "4111", "123-45", "555-123"]:
+            assert leaked not in scrubbed
+
+    def test_plain_text_untouched(self):
+        """Test that text without candidate characters is returned as is."""
+        text = "Caller asked about opening hours"
+
+        assert scrub_text(text) is text
+
+    def test_variants_match_full_pattern(self):
+        """Test that the reduced variants agree with the full combined pattern."""
+        samples = [
+            "call 555.987.6543 now",
+            "reach me: 555-987-6543",
+            "x@y.io or 10.0.0.1",
+            "time 12:30, order 4111-1111-1111-1111",
+        ]
+        for text in samples:
+            expected = COMBINED_PATTERN.sub(lambda m: REPLACEMENTS[m.lastgroup], text)
+            assert scrub_text(text) == expected
+
+
+class TestRedactionEngine:
+    """Test structural redaction."""
+
+    def test_security_policy_key_rules(self):
+        """Test typed replacements for sensitive keys."""
+        sanitized = security_redactor.redact({
+            "client_ip": "10.0.0.1",
+            "city": "Springfield",
+            "api_token": "abc",
+            "status": "ok",
+        })
+
+        assert sanitized == {
+            "client_ip": "[REDACTED_IP]",
+            "city": "[REDACTED_LOCATION]",
+            "api_token": "[REDACTED_SECRET]",
+            "status": "ok",
+        }
+
+    def test_nested_structures_redacted(self):
+        """Test that nested dicts and lists are traversed."""
+        data = {"calls": [{"notes": "call 555-123-4567", "password": "x"}, "ssn 123-45-6789"]}
+
+        sanitized = security_redactor.redact(data)
+
+        assert "XXX-XXX-XXXX" in sanitized["calls"][0]["notes"]
+        assert sanitized["calls"][0]["password"] == "[REDACTED_SECRET]"
+        assert sanitized["calls"][1] == "ssn [REDACTED_SSN]"
+        assert data["calls"][0]["password"] == "x"
+
+    def test_fast_path_returns_copy(self):
+        """Test that clean flat dicts are still copied."""
+        data = {"status": "ok", "count": 3}
+
+        sanitized = log_redactor.redact(data)
+
+        assert sanitized == data
+        assert sanitized is not data
+
+    def test_deep_nesting_does_not_recurse(self):
+        """Test that very deep payloads do not hit the recursion limit."""
+        data = current = {}
+        for _ in range(5000):
+            current["child"] = {}
+            current = current["child"]
+        current["password"] = "x"
+
+        sanitized = log_redactor.redact(data)
+
+        for _ in range(5000):
+            sanitized = sanitized["child"]
+        assert sanitized == {"password": "[REDACTED]"}
+
+    def test_key_classification_cached(self):
+        """Test that each distinct key is classified once."""
+        policy = RedactionPolicy([(("secret",), "[X]")], scrub_values=False)
+        engine = RedactionEngine(policy)
+
+        for _ in range(10):
+            engine.redact({"secret_value": 1, "name": "a"})
+
+        info = policy.classify.cache_info()
+        assert info.misses == 2
+        assert info.hits > 0
+
+
+class TestLogProcessor:
+    """Test the structlog sanitization processor."""
+
+    def test_sensitive_keys_redacted(self):
+        """Test that sensitive log fields are replaced."""
+        event = {"event": "Login", "auth_header": "Bearer x", "user": {"password": "p"}}
+
+        sanitized = sanitize_sensitive_data(None, "info", event)
+
+        assert sanitized["auth_header"] == "[REDACTED]"
+        assert sanitized["user"]["password"] == "[REDACTED]"
+        assert sanitized["event"] == "Login"
+
+    def test_values_not_scrubbed(self):
+        """Test that log values are left as they are, matching prior behaviour."""
+        event = {"event": "Call started", "call_sid": "CA123", "duration": "555-123-4567"}
+
+        assert sanitize_sensitive_data(None, "info", event) == event
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
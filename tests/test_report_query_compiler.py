@@ -0,0 +1,267 @@
+"""
+Tests for the report query compiler.
+
+Covers field whitelisting, SQL-side projection, grouping and
+aggregation, sargable date ranges, the compiled-statement cache, and
+compiled reports executed on an in-memory SQLite database.
+"""
+
+import uuid
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql
+
+import voicecore.database as database
+from voicecore.models.call import CallDirection, CallStatus, CallType
+from voicecore.services.export_encoders import export_value
+from voicecore.services.report_query_compiler import (
+    ReportQueryCompiler,
+    agents,
+    calls,
+    date_range_params,
+    definition_hash,
+)
+
+
+def report(columns, **extra):
+    """Report definition over the calls data source."""
+    return {
+        "data_source": "calls",
+        "columns": [
+            column if isinstance(column, dict) else {"field": column}
+            for column in columns
+        ],
+        **extra
+    }
+
+
+async def run_report(tenant_id, definition, start_date, end_date):
+    """Execute a report definition as ReportBuilderService does."""
+    compiled = ReportQueryCompiler().compile(definition)
+    async with database.get_read_session() as session:
+        result = await session.execute(
+            compiled.statement,
+            {"tenant_id": tenant_id, **date_range_params(start_date, end_date)}
+        )
+        return [
+            {key: export_value(value) for key, value in zip(compiled.keys, row)}
+            for row in result
+        ]
+
+
+def sql(compiled):
+    """Render a compiled report for PostgreSQL."""
+    return str(compiled.statement.compile(dialect=postgresql.dialect()))
+
+
+class TestReportQueryCompiler:
+    """Test compiling report definitions."""
+
+    def test_selects_only_requested_columns(self):
+        """Test that the projection is the requested columns, in order."""
+        compiled = ReportQueryCompiler().compile(report(["from_number", "duration"]))
+        statement = sql(compiled)
+
+        assert compiled.keys == ["from_number", "duration"]
+        assert statement.startswith(
+            "SELECT calls.from_number AS from_number, calls.duration AS duration \nFROM calls \nWHERE"
+        )
+        assert "JOIN" not in statement
+
+    def test_date_range_is_sargable(self):
+        """Test that the range compares created_at directly, end exclusive."""
+        statement = sql(ReportQueryCompiler().compile(report(["id"])))
+
+        assert "calls.created_at >= %(range_start)s" in statement
+        assert "calls.created_at < %(range_end)s" in statement
+        assert "date(calls.created_at) >=" not in statement
+        assert date_range_params(date(2026, 10, 1), date(2026, 10, 31)) == {
+            "range_start": datetime(2026, 10, 1),
+            "range_end": datetime(2026, 11, 1),
+        }
+
+    def test_group_by_and_aggregates_in_sql(self):
+        """Test that grouping and aggregation are compiled into the statement."""
+        compiled = ReportQueryCompiler().compile(report(
+            [
+                "agent_name",
+                {"field": "id", "aggregation": "count"},
+                {"field": "duration", "aggregation": "avg"},
+                {"field": "duration", "aggregation": "p95"},
+            ],
+            group_by=["agent_name"],
+            sorts=[{"field": "id_count", "direction": "desc"}],
+        ))
+        statement = sql(compiled)
+
+        assert compiled.keys == ["agent_name", "id_count", "duration_avg", "duration_p95"]
+        assert "LEFT OUTER JOIN agents" in statement
+        assert "GROUP BY agents.name" in statement
+        assert "percentile_cont(%(percentile_cont_1)s) WITHIN GROUP (ORDER BY calls.duration ASC)" in statement
+        assert "ORDER BY id_count DESC" in statement
+
+    def test_aggregates_group_plain_columns_implicitly(self):
+        """Test that plain columns become the grouping when measures are selected."""
+        compiled = ReportQueryCompiler().compile({
+            "data_source": "analytics",
+            "columns": [{"field": "date"}, {"field": "total_calls"}, {"field": "answer_rate"}],
+        })
+
+        assert compiled.grouped
+        assert "GROUP BY date(calls.created_at) ORDER BY date(calls.created_at)" in sql(compiled)
+
+    def test_measure_filters_become_having(self):
+        """Test that filters on measures apply after grouping."""
+        statement = sql(ReportQueryCompiler().compile({
+            "data_source": "agents",
+            "columns": [{"field": "agent_name"}, {"field": "calls_handled"}],
+            "filters": [
+                {"field": "calls_handled", "operator": "greater_than", "value": 10},
+                {"field": "status", "operator": "equals", "value": "completed"},
+            ],
+        }))
+
+        assert "HAVING count(calls.agent_id) >" in statement
+        assert "calls.status = %(status_1)s" in statement
+        assert "calls.agent_id IS NOT NULL" in statement
+
+    @pytest.mark.parametrize("definition, message", [
+        (report(["password_hash"]), "Unknown field"),
+        ({"data_source": "agents", "columns": [{"field": "transcript"}]}, "Unknown field"),
+        (report(["id"], filters=[{"field": "tenant_id", "operator": "equals", "value": "x"}]), "Unknown field"),
+        (report([{"field": "caller_name", "aggregation": "sum"}]), "numeric"),
+        (report([{"field": "duration", "aggregation": "stddev"}]), "Unsupported aggregation"),
+        (report(["id"], filters=[{"field": "duration", "operator": "regex", "value": 1}]), "operator"),
+        (report(["status", "direction", "total_calls"], group_by=["status"]), "grouped or aggregated"),
+        (report(["status", "total_calls"], sorts=[{"field": "duration"}]), "sort"),
+        ({"data_source": "billing", "columns": [{"field": "id"}]}, "data source"),
+    ])
+    def test_rejects_invalid_definitions(self, definition, message):
+        """Test that fields, aggregations and groupings are validated."""
+        with pytest.raises(ValueError, match=message):
+            ReportQueryCompiler().compile(definition)
+
+    def test_enum_filter_values_are_coerced(self):
+        """Test that enum filter values bind as enum members."""
+        compiled = ReportQueryCompiler().compile(report(
+            ["id"], filters=[{"field": "status", "operator": "in", "value": ["completed", "busy"]}]
+        ))
+        params = compiled.statement.compile().params
+
+        assert params["status_1"] == [CallStatus.COMPLETED, CallStatus.BUSY]
+
+    def test_compiled_statements_are_cached(self):
+        """Test that equal definitions reuse one statement and the cache is bounded."""
+        compiler = ReportQueryCompiler(max_cached=2)
+        first = compiler.compile(report(["id"], limit=10))
+        again = compiler.compile({**report(["id"], limit=10), "name": "Renamed"})
+
+        assert again is first
+        assert (compiler.hits, compiler.misses) == (1, 1)
+
+        compiler.compile(report(["duration"]))
+        compiler.compile(report(["status"]))
+        assert compiler.compile(report(["id"], limit=10)) is not first
+        assert definition_hash(report(["id"])) != definition_hash(report(["id"], limit=10))
+
+
+class TestReportExecution:
+    """Test reports run against a database."""
+
+    @pytest.fixture
+    async def tenant_id(self, sqlite_database):
+        """Provide a tenant with calls on a SQLite reporting pool."""
+        db = await sqlite_database(agents, calls)
+
+        tenant_id, other_tenant = uuid.uuid4(), uuid.uuid4()
+        agent_ids = [uuid.uuid4(), uuid.uuid4()]
+        start = datetime(2026, 10, 1, 9)
+        async with db.engine.begin() as conn:
+            await conn.execute(insert(agents), [
+                {
+                    "id": agent_id, "tenant_id": tenant_id, "email": f"agent{i}@example.com",
+                    "name": f"Agent {i}", "first_name": "Agent", "last_name": str(i),
+                    "extension": f"10{i}", "department_id": uuid.uuid4(),
+                    "created_at": start, "updated_at": start,
+                }
+                for i, agent_id in enumerate(agent_ids)
+            ])
+            await conn.execute(insert(calls), [
+                {
+                    "id": uuid.uuid4(),
+                    "tenant_id": other_tenant if i == 11 else tenant_id,
+                    "twilio_call_sid": f"CA{i}",
+                    "from_number": f"+1555000{i:04d}",
+                    "to_number": "+15559999999",
+                    "agent_id": agent_ids[i % 2] if i % 3 else None,
+                    "status": CallStatus.COMPLETED if i % 4 else CallStatus.NO_ANSWER,
+                    "direction": CallDirection.INBOUND,
+                    "call_type": CallType.CUSTOMER,
+                    "duration": i * 10,
+                    "ai_handled": i % 3 == 0,
+                    "created_at": start + timedelta(hours=12 * i),
+                    "updated_at": start,
+                }
+                for i in range(12)
+            ])
+
+        return tenant_id
+
+    async def test_grouped_report(self, tenant_id):
+        """Test a grouped report with aggregates computed in the database."""
+        data = await run_report(
+            tenant_id,
+            report(
+                ["agent_name", {"field": "id", "aggregation": "count"}, {"field": "duration", "aggregation": "sum"}],
+                group_by=["agent_name"],
+                filters=[{"field": "agent_id", "operator": "not_equals", "value": None}],
+                sorts=[{"field": "agent_name", "direction": "asc"}],
+            ),
+            date(2026, 10, 1),
+            date(2026, 10, 5)
+        )
+
+        # Calls 1, 5 and 7 for Agent 1; 2, 4 and 8 for Agent 0 (10 is past the range)
+        assert data == [
+            {"agent_name": "Agent 0", "id_count": 3, "duration_sum": 140},
+            {"agent_name": "Agent 1", "id_count": 3, "duration_sum": 130},
+        ]
+
+    async def test_analytics_measures_by_day(self, tenant_id):
+        """Test daily measures and an inclusive end date."""
+        data = await run_report(
+            tenant_id,
+            {
+                "data_source": "analytics",
+                "columns": [
+                    {"field": "date"}, {"field": "total_calls"},
+                    {"field": "missed_calls"}, {"field": "ai_handled_calls"},
+                ],
+            },
+            date(2026, 10, 1),
+            date(2026, 10, 2)
+        )
+
+        assert data == [
+            {"date": "2026-10-01", "total_calls": 2, "missed_calls": 1, "ai_handled_calls": 1},
+            {"date": "2026-10-02", "total_calls": 2, "missed_calls": 0, "ai_handled_calls": 1},
+        ]
+
+    async def test_rows_are_projected(self, tenant_id):
+        """Test that ungrouped reports return only the requested fields."""
+        data = await run_report(
+            tenant_id,
+            report(["status", "duration"], sorts=[{"field": "created_at", "direction": "desc"}], limit=2),
+            date(2026, 10, 1),
+            date(2026, 10, 31)
+        )
+
+        assert data == [
+            {"status": "completed", "duration": 100},
+            {"status": "completed", "duration": 90},
+        ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
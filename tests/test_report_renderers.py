@@ -0,0 +1,197 @@
+"""
+Tests for the streaming report renderers.
+
+Covers CSV, write-only XLSX and paginated PDF output, including
+rendering from generators, sheet overflow and PDF structure.
+"""
+
+import re
+import zlib
+import pytest
+from datetime import date
+
+from openpyxl import load_workbook
+
+import voicecore.services.report_renderers as report_renderers
+from voicecore.services.report_renderers import (
+    PDFReportRenderer,
+    create_renderer,
+    format_value,
+    render_report,
+)
+
+
+COLUMNS = [
+    {"field": "date", "label": "Date", "type": "date"},
+    {"field": "agent_name", "label": "Agent", "type": "string"},
+    {"field": "total_calls", "label": "Calls", "type": "number"},
+    {"field": "answer_rate", "label": "Answer Rate", "type": "number", "format": "percentage"},
+    {"field": "total_cost", "label": "Cost", "type": "number", "format": "currency"},
+]
+
+
+def rows(count):
+    """Report rows, as a generator so renderers cannot rely on len()."""
+    for i in range(count):
+        yield {
+            "date": date(2026, 10, 1 + i % 28).isoformat(),
+            "agent_name": f"Agent ({i})" if i % 7 else None,
+            "total_calls": i,
+            "answer_rate": 0.5,
+            "total_cost": i * 1.25,
+        }
+
+
+def pdf_objects(data):
+    """Map object numbers to their offsets per the PDF's xref table."""
+    xref = int(re.search(rb"startxref\n(\d+)\n%%EOF", data).group(1))
+    table = data[xref:].split(b"trailer")[0].splitlines()[2:]
+    return {
+        number: int(entry[:10])
+        for number, entry in enumerate(table)
+        if entry.endswith(b"n ")
+    }
+
+
+class TestCSVRenderer:
+    """Test CSV output."""
+
+    def test_writes_header_and_rows(self, tmp_path):
+        """Test that CSV has a field-name header and one line per row."""
+        path = str(tmp_path / "report.csv")
+
+        assert render_report("csv", rows(3), COLUMNS, path) == 3
+        lines = open(path).read().splitlines()
+
+        assert lines[0] == "date,agent_name,total_calls,answer_rate,total_cost"
+        assert lines[1] == "2026-10-01,,0,0.5,0.0"
+        assert lines[2] == '2026-10-02,Agent (1),1,0.5,1.25'
+
+
+class TestXLSXRenderer:
+    """Test XLSX output."""
+
+    def test_typed_cells_and_bold_header(self, tmp_path):
+        """Test that dates and numbers are typed cells with the column's number format."""
+        path = str(tmp_path / "report.xlsx")
+
+        assert render_report("excel", rows(5), COLUMNS, path, title="Daily: Calls") == 5
+
+        workbook = load_workbook(path)
+        sheet = workbook.active
+        assert sheet.title == "Daily Calls"
+        assert [cell.value for cell in sheet[1]] == ["Date", "Agent", "Calls", "Answer Rate", "Cost"]
+        assert sheet["A1"].font.bold
+        assert sheet.freeze_panes == "A2"
+        assert sheet["A3"].value.date() == date(2026, 10, 2)
+        assert sheet["D3"].value == 0.5
+        assert sheet["D3"].number_format == "0.0%"
+        assert sheet["E3"].number_format == "$#,##0.00"
+        assert sheet.max_row == 6
+
+    def test_strips_illegal_characters(self, tmp_path):
+        """Test that control characters do not make the workbook invalid."""
+        path = str(tmp_path / "report.xlsx")
+
+        render_report("excel", [{"agent_name": "bad\x00name\x07"}], COLUMNS, path)
+
+        assert load_workbook(path).active["B2"].value == "badname"
+
+    def test_overflows_to_further_sheets(self, tmp_path, monkeypatch):
+        """Test that rows past the sheet row limit continue on a new sheet."""
+        monkeypatch.setattr(report_renderers, "XLSX_MAX_ROWS", 4)
+        path = str(tmp_path / "report.xlsx")
+
+        render_report("excel", rows(7), COLUMNS, path)
+
+        workbook = load_workbook(path)
+        assert workbook.sheetnames == ["Report", "Report (2)", "Report (3)"]
+        assert [sheet.max_row for sheet in workbook.worksheets] == [4, 4, 2]
+
+    def test_empty_report_has_header(self, tmp_path):
+        """Test that a report without rows still produces a valid workbook."""
+        path = str(tmp_path / "report.xlsx")
+
+        assert render_report("excel", [], COLUMNS, path) == 0
+        assert load_workbook(path).active.max_row == 1
+
+
+class TestPDFRenderer:
+    """Test PDF output."""
+
+    def test_paginates_rows(self, tmp_path):
+        """Test that rows are split into pages with the header repeated."""
+        path = str(tmp_path / "report.pdf")
+        per_page = PDFReportRenderer(COLUMNS).rows_per_page
+
+        assert render_report("pdf", rows(per_page * 2 + 1), COLUMNS, path, title="Calls", subtitle="October") == per_page * 2 + 1
+
+        data = open(path, "rb").read()
+        assert data.startswith(b"%PDF-1.4")
+        assert b"/Type /Pages /Kids [" in data
+        assert b"/Count 3 >>" in data
+
+        streams = [
+            zlib.decompress(match)
+            for match in re.findall(rb"stream\n(.*?)\nendstream", data, re.S)
+        ]
+        assert len(streams) == 3
+        assert all(b"(Calls  -  October) Tj" in stream for stream in streams)
+        assert all(b"Answer Rate" in stream for stream in streams)
+        assert b"Agent \\(1\\)" in streams[0]
+        assert b"(Page 3) Tj" in streams[2]
+
+    def test_xref_points_at_objects(self, tmp_path):
+        """Test that every cross-reference offset starts its object."""
+        path = str(tmp_path / "report.pdf")
+        render_report("pdf", rows(120), COLUMNS, path)
+
+        data = open(path, "rb").read()
+        objects = pdf_objects(data)
+        assert objects
+        for number, offset in objects.items():
+            assert data[offset:].startswith(f"{number} 0 obj".encode())
+
+    def test_empty_report_has_one_page(self, tmp_path):
+        """Test that a report without rows is a one-page document."""
+        path = str(tmp_path / "report.pdf")
+
+        render_report("pdf", [], COLUMNS, path)
+
+        assert b"/Count 1 >>" in open(path, "rb").read()
+
+    def test_cells_are_formatted_and_truncated(self):
+        """Test that cells follow the column format and fit their width."""
+        renderer = PDFReportRenderer([{"field": "name"}, *COLUMNS[2:]])
+        line = renderer._line(["x" * 500, 1234, 0.256, 12.5])
+
+        assert len(line) <= sum(renderer.widths) + len(renderer.widths) - 1
+        assert "…" in line
+        assert line.rstrip().endswith("$12.50")
+        assert "25.6%" in line
+        assert "1,234" in line
+
+
+class TestRenderers:
+    """Test renderer selection and value formatting."""
+
+    def test_unknown_format(self):
+        """Test that unsupported formats are rejected."""
+        with pytest.raises(ValueError, match="Unsupported output format"):
+            create_renderer("docx", COLUMNS)
+
+    @pytest.mark.parametrize("column, value, text", [
+        ({"format": "percentage"}, 0.125, "12.5%"),
+        ({"format": "currency"}, 1234.5, "$1,234.50"),
+        ({"format": "duration"}, 125, "2:05"),
+        ({}, 3.14159, "3.14"),
+        ({}, None, ""),
+        ({}, "text", "text"),
+    ])
+    def test_format_value(self, column, value, text):
+        """Test display formatting of values."""
+        assert format_value(column, value) == text
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,271 @@
+"""
+Tests for materialized report results.
+
+Covers the per-day partition plan, reuse of closed days, invalidation
+by late-arriving call updates, and the scheduled report worker pool.
+"""
+
+import uuid
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import insert, update
+
+import voicecore.database as database
+from voicecore.models.call import CallDirection, CallStatus, CallType
+from voicecore.models.report_result import ReportResultPartition, ReportRun
+from voicecore.services.report_query_compiler import ReportQueryCompiler, calls
+from voicecore.services.report_results import (
+    ReportMaterializer,
+    ReportResultStore,
+    ReportScheduler,
+    assemble_rows,
+)
+
+
+TODAY = datetime.utcnow().date()
+FIRST_DAY = TODAY - timedelta(days=10)
+
+
+def by_day(columns):
+    return {"data_source": "analytics", "columns": [{"field": name} for name in columns]}
+
+
+BY_STATUS = {
+    "data_source": "calls",
+    "columns": [
+        {"field": "status"},
+        {"field": "id", "aggregation": "count"},
+        {"field": "duration", "aggregation": "sum"},
+        {"field": "duration", "aggregation": "max"},
+        {"field": "total_cost"},
+    ],
+    "group_by": ["status"],
+    "sorts": [{"field": "id_count", "direction": "desc"}],
+}
+
+
+@pytest.fixture
+async def tenant_id(sqlite_database):
+    """Provide a tenant with three calls a day over the last ten days."""
+    db = await sqlite_database(calls, ReportResultPartition.__table__, ReportRun.__table__)
+
+    tenant_id = uuid.uuid4()
+    loaded_at = datetime.utcnow() - timedelta(days=1)
+    async with db.engine.begin() as conn:
+        await conn.execute(insert(calls), [
+            {
+                "id": uuid.uuid4(),
+                "tenant_id": tenant_id,
+                "twilio_call_sid": f"CA{day}-{i}",
+                "from_number": "+15550000000",
+                "to_number": "+15559999999",
+                "status": CallStatus.NO_ANSWER if i == 2 else CallStatus.COMPLETED,
+                "direction": CallDirection.INBOUND,
+                "call_type": CallType.CUSTOMER,
+                "duration": day * 10 + i,
+                "cost_cents": 5,
+                "created_at": datetime.combine(FIRST_DAY + timedelta(days=day), datetime.min.time()) + timedelta(hours=8 + i),
+                "updated_at": loaded_at,
+            }
+            for day in range(11)
+            for i in range(3)
+        ])
+
+    return tenant_id
+
+
+@pytest.fixture
+def materializer():
+    """Materializer that treats every day before today as closed."""
+    return ReportMaterializer(ReportResultStore(), close_after=timedelta(0))
+
+
+async def full_query(materializer, tenant_id, compiled, start_date, end_date):
+    """The report run as one statement over the whole range."""
+    return await materializer._execute(tenant_id, compiled.statement, compiled.keys, start_date, end_date)
+
+
+class TestPartitionPlan:
+    """Test which reports get a per-day form."""
+
+    def test_date_grouped_reports_concatenate(self):
+        """Test that reports grouped by date concatenate days."""
+        partitioning = ReportQueryCompiler().compile(by_day(["date", "total_calls", "answer_rate"])).partitioning
+
+        assert partitioning is not None
+        assert partitioning.merge is None
+        assert partitioning.order == [("date", False)]
+
+    def test_additive_reports_merge(self):
+        """Test that counts, sums and maxima merge across days by group key."""
+        partitioning = ReportQueryCompiler().compile(BY_STATUS).partitioning
+
+        assert partitioning.merge == {
+            "status": None, "id_count": "sum", "duration_sum": "sum",
+            "duration_max": "max", "total_cost": "sum",
+        }
+        assert partitioning.order == [("id_count", True)]
+
+    @pytest.mark.parametrize("definition", [
+        {**BY_STATUS, "columns": [{"field": "status"}, {"field": "duration", "aggregation": "avg"}], "sorts": []},
+        {**BY_STATUS, "columns": [{"field": "status"}, {"field": "answer_rate"}], "sorts": []},
+        {**BY_STATUS, "filters": [{"field": "total_calls", "operator": "greater_than", "value": 1}]},
+        {"data_source": "calls", "columns": [{"field": "status"}, {"field": "duration"}]},
+    ])
+    def test_unmergeable_reports_are_not_partitioned(self, definition):
+        """Test that averages, ratios, HAVING and ungrouped reports run whole."""
+        assert ReportQueryCompiler().compile(definition).partitioning is None
+
+    def test_assemble_sorts_nulls_like_postgres(self):
+        """Test that NULLs sort last ascending and first descending."""
+        partitioning = ReportQueryCompiler().compile(
+            {**BY_STATUS, "sorts": [{"field": "duration_max", "direction": "asc"}]}
+        ).partitioning
+        days = [
+            [{"status": "busy", "id_count": 1, "duration_sum": None, "duration_max": None, "total_cost": 1}],
+            [{"status": "busy", "id_count": 2, "duration_sum": 5, "duration_max": 4, "total_cost": 2},
+             {"status": "failed", "id_count": 1, "duration_sum": None, "duration_max": None, "total_cost": 0}],
+        ]
+
+        rows = assemble_rows(partitioning, days)
+
+        assert rows == [
+            {"status": "busy", "id_count": 3, "duration_sum": 5, "duration_max": 4, "total_cost": 3},
+            {"status": "failed", "id_count": 1, "duration_sum": None, "duration_max": None, "total_cost": 0},
+        ]
+
+
+class TestReportMaterializer:
+    """Test running reports from materialized days."""
+
+    @pytest.mark.parametrize("definition", [
+        by_day(["date", "total_calls", "missed_calls", "answer_rate"]),
+        BY_STATUS,
+        {**BY_STATUS, "limit": 1},
+    ])
+    async def test_matches_full_query_and_reuses_closed_days(self, tenant_id, materializer, definition):
+        """Test that materialized results equal the full query, and closed days are reused."""
+        compiled = ReportQueryCompiler().compile(definition)
+        start_date, end_date = FIRST_DAY + timedelta(days=1), TODAY - timedelta(days=2)
+        expected = await full_query(materializer, tenant_id, compiled, start_date, end_date)
+
+        first = await materializer.run(tenant_id, compiled, start_date, end_date)
+        second = await materializer.run(tenant_id, compiled, start_date, end_date)
+
+        assert first.rows == expected
+        assert (first.partitions_reused, first.partitions_computed) == (0, 8)
+        assert second.rows == expected
+        assert (second.partitions_reused, second.partitions_computed) == (8, 0)
+
+    async def test_rolling_window_computes_only_new_days(self, tenant_id, materializer):
+        """Test that moving the range forward reuses the overlap."""
+        compiled = ReportQueryCompiler().compile(by_day(["date", "total_calls"]))
+        await materializer.run(tenant_id, compiled, FIRST_DAY, FIRST_DAY + timedelta(days=6))
+
+        result = await materializer.run(tenant_id, compiled, FIRST_DAY + timedelta(days=2), FIRST_DAY + timedelta(days=8))
+
+        assert (result.partitions_reused, result.partitions_computed) == (5, 2)
+        assert [row["date"] for row in result.rows][0] == (FIRST_DAY + timedelta(days=2)).isoformat()
+
+    async def test_open_days_are_not_stored(self, tenant_id, materializer):
+        """Test that today is computed on every run."""
+        compiled = ReportQueryCompiler().compile(by_day(["date", "total_calls"]))
+        await materializer.run(tenant_id, compiled, TODAY - timedelta(days=1), TODAY)
+
+        result = await materializer.run(tenant_id, compiled, TODAY - timedelta(days=1), TODAY)
+
+        assert (result.partitions_reused, result.partitions_computed) == (1, 1)
+
+    async def test_late_update_invalidates_its_day(self, tenant_id, materializer):
+        """Test that a call updated after its day was materialized recomputes that day."""
+        compiled = ReportQueryCompiler().compile(BY_STATUS)
+        start_date, end_date = FIRST_DAY, FIRST_DAY + timedelta(days=4)
+        await materializer.run(tenant_id, compiled, start_date, end_date)
+
+        late_day = datetime.combine(FIRST_DAY + timedelta(days=3), datetime.min.time())
+        async with database.get_db_session() as session:
+            await session.execute(
+                update(calls)
+                .where(calls.c.created_at >= late_day, calls.c.created_at < late_day + timedelta(days=1))
+                .values(status=CallStatus.FAILED, updated_at=datetime.utcnow())
+            )
+
+        result = await materializer.run(tenant_id, compiled, start_date, end_date)
+
+        assert (result.partitions_reused, result.partitions_computed) == (4, 1)
+        assert result.rows == await full_query(materializer, tenant_id, compiled, start_date, end_date)
+        assert {"status": "failed", "id_count": 3} == {
+            key: value for key, value in result.rows[-1].items() if key in ("status", "id_count")
+        }
+
+    async def test_unpartitioned_report_runs_whole(self, tenant_id, materializer):
+        """Test that reports without a per-day form run as one statement."""
+        compiled = ReportQueryCompiler().compile(
+            {**BY_STATUS, "columns": [{"field": "status"}, {"field": "duration", "aggregation": "avg"}], "sorts": []}
+        )
+
+        result = await materializer.run(tenant_id, compiled, FIRST_DAY, TODAY)
+
+        assert (result.partitions_reused, result.partitions_computed) == (0, 0)
+        assert {row["status"] for row in result.rows} == {"completed", "no_answer"}
+
+
+class TestReportScheduler:
+    """Test the scheduled report worker pool."""
+
+    async def test_runs_due_schedules_once(self):
+        """Test that due schedules run once per tick, with bounded concurrency."""
+        schedules = [{"schedule_id": f"s{i}"} for i in range(5)]
+        running, peak, finished = 0, 0, []
+        release = asyncio.Event()
+
+        async def run_schedule(schedule):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await release.wait()
+            running -= 1
+            finished.append(schedule["schedule_id"])
+
+        scheduler = ReportScheduler(run_schedule, lambda now: schedules, concurrency=2, poll_interval=3600)
+        await scheduler.start()
+        await asyncio.sleep(0)
+
+        # Still queued or running, so not enqueued again
+        assert scheduler.enqueue_due() == 0
+
+        release.set()
+        await scheduler._queue.join()
+        await scheduler.stop()
+
+        assert sorted(finished) == [f"s{i}" for i in range(5)]
+        assert peak == 2
+
+    async def test_stores_runs(self, tenant_id):
+        """Test that the latest stored run of a schedule is returned."""
+        store = ReportResultStore()
+        for status in ("failed", "completed"):
+            await store.save_run({
+                "tenant_id": tenant_id,
+                "schedule_id": "nightly",
+                "report_id": "r1",
+                "start_date": FIRST_DAY,
+                "end_date": TODAY,
+                "status": status,
+                "rows": [{"date": FIRST_DAY.isoformat(), "total_calls": 3}],
+                "row_count": 1,
+                "partitions_reused": 0,
+                "partitions_computed": 0,
+            })
+            await asyncio.sleep(0.01)
+
+        run = await store.latest_run(tenant_id, "nightly")
+
+        assert run["status"] == "completed"
+        assert run["rows"] == [{"date": FIRST_DAY.isoformat(), "total_calls": 3}]
+        assert await store.latest_run(tenant_id, "weekly") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
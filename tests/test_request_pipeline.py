@@ -0,0 +1,189 @@
+"""
+Tests for the single-pass request pipeline middleware.
+
+Validates that stages share one request context, that response headers
+are applied once, and that short-circuiting stages stop the request.
+"""
+
+import uuid
+import jwt
+import pytest
+from unittest.mock import AsyncMock
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from voicecore.config import settings
+from voicecore.middleware import (
+    RequestContext,
+    RequestPipelineMiddleware,
+    CorrelationStage,
+    AuthStage,
+    TenantStage,
+    RateLimitStage,
+    SecurityHeadersStage,
+)
+from voicecore.utils.rate_limiter import RateLimitDecision
+
+
+def bearer_token(**claims):
+    """An Authorization header with a token the pipeline accepts."""
+    token = jwt.encode(claims, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def rate_limit_key(peer, headers=None):
+    """The rate limit key of an anonymous request from ``peer``."""
+    request = Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/api/calls",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+        "client": (peer, 40000),
+    })
+    return RateLimitStage._rate_limit_key(request, RequestContext())
+
+
+async def echo_context(request):
+    """Return what the pipeline stored on the request state."""
+    return JSONResponse({
+        "correlation_id": request.state.correlation_id,
+        "tenant_id": getattr(request.state, "tenant_id", None),
+        "user_id": getattr(request.state, "user_id", None),
+    })
+
+
+def make_client(limiter=None, tenant_lookup=None):
+    """Build an app wrapped in the pipeline with stubbed dependencies."""
+    tenant_stage = TenantStage()
+    tenant_stage._validate_tenant = tenant_lookup or AsyncMock(return_value=(True, "Acme"))
+
+    if limiter is None:
+        limiter = AsyncMock()
+        limiter.check = AsyncMock(
+            return_value=RateLimitDecision(allowed=True, limit=60, remaining=59)
+        )
+
+    app = Starlette(routes=[Route("/api/calls", echo_context)])
+    app.add_middleware(
+        RequestPipelineMiddleware,
+        stages=[
+            CorrelationStage(),
+            AuthStage(),
+            tenant_stage,
+            RateLimitStage(limiter),
+            SecurityHeadersStage(),
+        ],
+    )
+    return TestClient(app), tenant_stage, limiter
+
+
+class TestRequestPipelineMiddleware:
+    """Test the consolidated request pipeline."""
+
+    def test_correlation_id_propagated(self):
+        """Test that an incoming correlation ID is reused and echoed."""
+        client, _, _ = make_client()
+
+        response = client.get("/api/calls", headers={"X-Correlation-ID": "abc-123"})
+
+        assert response.json()["correlation_id"] == "abc-123"
+        assert response.headers["X-Correlation-ID"] == "abc-123"
+        assert "X-Process-Time" in response.headers
+
+    def test_security_and_rate_limit_headers(self):
+        """Test that response stages add their headers."""
+        client, _, _ = make_client()
+
+        response = client.get("/api/calls")
+
+        assert response.headers["X-Content-Type-Options"] == "nosniff"
+        assert response.headers["X-Frame-Options"] == "DENY"
+        assert response.headers["X-RateLimit-Limit"] == "60"
+        assert response.headers["X-RateLimit-Remaining"] == "59"
+
+    def test_tenant_validated_once(self):
+        """Test that tenant lookups are cached."""
+        tenant_id = str(uuid.uuid4())
+        client, tenant_stage, _ = make_client()
+
+        for _ in range(3):
+            response = client.get("/api/calls", headers={"X-Tenant-ID": tenant_id})
+            assert response.json()["tenant_id"] == tenant_id
+
+        assert tenant_stage._validate_tenant.await_count == 1
+
+    def test_rate_limit_key_uses_verified_tenant(self):
+        """Test that only a verified token's tenant selects the tenant bucket."""
+        tenant_id = str(uuid.uuid4())
+        client, _, limiter = make_client()
+
+        client.get("/api/calls", headers=bearer_token(sub="u1", tenant_id=tenant_id))
+        assert limiter.check.await_args.args[0] == f"rate_limit:tenant:{tenant_id}"
+
+        client.get("/api/calls", headers={"X-Tenant-ID": tenant_id})
+        assert limiter.check.await_args.args[0].startswith("rate_limit:anonymous:")
+
+    def test_invalid_tenant_not_set(self):
+        """Test that an unknown tenant does not populate request state."""
+        client, _, limiter = make_client(tenant_lookup=AsyncMock(return_value=(False, None)))
+
+        response = client.get("/api/calls", headers={"X-Tenant-ID": str(uuid.uuid4())})
+
+        assert response.json()["tenant_id"] is None
+        assert limiter.check.await_args.args[0].startswith("rate_limit:anonymous:")
+
+    def test_anonymous_key_does_not_contain_address(self):
+        """Test that anonymous rate limit keys never expose the client address."""
+        client, _, limiter = make_client(tenant_lookup=AsyncMock(return_value=(False, None)))
+
+        client.get("/api/calls", headers={"X-Forwarded-For": "203.0.113.7"})
+
+        key = limiter.check.await_args.args[0]
+        assert "203.0.113.7" not in key
+
+    def test_forwarded_for_ignored_without_trusted_proxy(self, monkeypatch):
+        """Test that a client cannot pick its own address with X-Forwarded-For."""
+        monkeypatch.setattr(settings, "trusted_proxies", [])
+
+        assert rate_limit_key("198.51.100.1", {"X-Forwarded-For": "203.0.113.7"}) == rate_limit_key("198.51.100.1")
+        assert rate_limit_key("198.51.100.1", {"X-Forwarded-For": "203.0.113.7"}) != rate_limit_key("203.0.113.7")
+
+    def test_forwarded_for_read_from_trusted_proxy(self, monkeypatch):
+        """Test that the client is the last address before the trusted proxies."""
+        monkeypatch.setattr(settings, "trusted_proxies", ["10.0.0.0/8"])
+        forwarded = {"X-Forwarded-For": "192.0.2.99, 203.0.113.7, 10.0.0.5"}
+
+        assert rate_limit_key("10.0.0.1", forwarded) == rate_limit_key("203.0.113.7")
+        assert rate_limit_key("198.51.100.1", forwarded) == rate_limit_key("198.51.100.1")
+
+    def test_rate_limited_request_short_circuits(self):
+        """Test that a denied request never reaches the application."""
+        limiter = AsyncMock()
+        limiter.check = AsyncMock(
+            return_value=RateLimitDecision(allowed=False, limit=60, remaining=0, retry_after=7)
+        )
+        client, _, _ = make_client(limiter=limiter)
+
+        response = client.get("/api/calls")
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "7"
+        assert response.headers["X-Content-Type-Options"] == "nosniff"
+        assert "X-Correlation-ID" in response.headers
+
+    def test_invalid_bearer_token_is_not_authenticated(self):
+        """Test that an undecodable bearer token leaves the caller anonymous."""
+        client, _, _ = make_client()
+
+        response = client.get("/api/calls", headers={"Authorization": "Bearer not-a-jwt"})
+
+        assert response.status_code == 200
+        assert response.json()["user_id"] is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,129 @@
+"""
+Tests for per-tenant statistics behind the super admin console.
+
+Covers rebuilding the counters from agents and calls, and the tenant
+summary page and system metrics read from them in one statement each.
+"""
+
+import uuid
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+
+import voicecore.database as database
+from voicecore.services.admin_service import (
+    AdminService,
+    agents,
+    calls,
+    daily_call_stats,
+    tenant_stats,
+    tenants,
+)
+
+
+NOW = datetime.utcnow()
+TODAY = datetime.combine(NOW.date(), datetime.min.time())
+MONTH_START = TODAY.replace(day=1)
+
+
+@pytest.fixture
+async def statements(sqlite_database):
+    """
+    Three tenants: a busy one with agents and calls, an idle one and an
+    inactive one. Returns the list of statements executed.
+    """
+    db = await sqlite_database(tenants, agents, calls, tenant_stats, daily_call_stats)
+
+    busy, idle, inactive = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    async with db.engine.begin() as conn:
+        await conn.execute(insert(tenants), [
+            {"id": busy, "name": "Busy", "is_active": True, "created_at": NOW - timedelta(days=3)},
+            {"id": idle, "name": "Idle", "is_active": True, "created_at": NOW - timedelta(days=2)},
+            {"id": inactive, "name": "Gone", "is_active": False, "created_at": NOW - timedelta(days=1)},
+        ])
+        await conn.execute(insert(agents), [
+            {"id": uuid.uuid4(), "tenant_id": busy, "is_active": True},
+            {"id": uuid.uuid4(), "tenant_id": busy, "is_active": True},
+            {"id": uuid.uuid4(), "tenant_id": busy, "is_active": False},
+            {"id": uuid.uuid4(), "tenant_id": inactive, "is_active": False},
+        ])
+        await conn.execute(insert(calls), [
+            # Two calls today, one earlier this month, one last month
+            {"id": uuid.uuid4(), "tenant_id": busy, "duration": 60, "created_at": TODAY + timedelta(seconds=1)},
+            {"id": uuid.uuid4(), "tenant_id": busy, "duration": 120, "created_at": TODAY + timedelta(seconds=2)},
+            {"id": uuid.uuid4(), "tenant_id": busy, "duration": 30, "created_at": MONTH_START},
+            {"id": uuid.uuid4(), "tenant_id": busy, "duration": 999, "created_at": MONTH_START - timedelta(days=2)},
+        ])
+
+    await AdminService().rebuild_tenant_stats()
+    db.statements.clear()
+    return db.statements
+
+
+class TestTenantStats:
+    """Test the tenant summary and system metrics."""
+
+    async def test_rebuild_counts(self, statements):
+        """Test that a rebuild writes one row per tenant with agents and per call day."""
+        counts = await AdminService().rebuild_tenant_stats()
+
+        assert counts["tenants"] == 2
+        assert counts["days"] == len({MONTH_START.date(), (MONTH_START - timedelta(days=2)).date(), TODAY.date()})
+
+    async def test_tenant_summary_page_is_one_statement(self, statements):
+        """Test the summary figures and that the page takes a single query."""
+        summaries = await AdminService().get_all_tenants_summary(limit=10)
+
+        assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 1
+        assert [s.company_name for s in summaries] == ["Gone", "Idle", "Busy"]
+
+        busy = summaries[2]
+        assert (busy.total_agents, busy.active_agents) == (3, 2)
+        assert busy.calls_this_month == 3
+        assert busy.last_activity == TODAY + timedelta(seconds=2)
+        assert busy.status == "active"
+
+        idle = summaries[1]
+        assert (idle.total_agents, idle.calls_this_month, idle.last_activity) == (0, 0, None)
+
+    async def test_slots_are_summed(self, statements):
+        """Test that counters split over slots read as one figure per tenant."""
+        async with database.get_db_session() as session:
+            busy = (await AdminService().get_all_tenants_summary(limit=10))[2].tenant_id
+            await session.execute(insert(daily_call_stats), [
+                # As the trigger writes them: a call in slot 3, a removal in slot 5
+                {"tenant_id": busy, "day": TODAY.date(), "slot": 3, "calls": 1,
+                 "duration_total": 40, "last_call_at": TODAY + timedelta(seconds=3)},
+                {"tenant_id": busy, "day": TODAY.date(), "slot": 5, "calls": -1,
+                 "duration_total": -60, "last_call_at": None},
+            ])
+
+        summaries = await AdminService().get_all_tenants_summary(limit=10)
+        metrics = await AdminService().get_system_metrics()
+
+        assert summaries[2].calls_this_month == 3
+        assert summaries[2].last_activity == TODAY + timedelta(seconds=3)
+        assert metrics.total_calls_today == (3 if TODAY == MONTH_START else 2)
+        assert metrics.average_call_duration == pytest.approx(190 / 3)
+
+    async def test_status_filter(self, statements):
+        """Test that the summary filters by tenant status."""
+        summaries = await AdminService().get_all_tenants_summary(status_filter="inactive")
+
+        assert [s.company_name for s in summaries] == ["Gone"]
+        assert summaries[0].status == "inactive"
+
+    async def test_system_metrics(self, statements):
+        """Test system-wide figures from the statistics tables."""
+        metrics = await AdminService().get_system_metrics()
+
+        assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 1
+        assert (metrics.total_tenants, metrics.active_tenants) == (3, 2)
+        assert (metrics.total_agents, metrics.active_agents) == (4, 2)
+        assert metrics.total_calls_this_month == 3
+        assert metrics.total_calls_today == (3 if TODAY == MONTH_START else 2)
+        assert metrics.average_call_duration == pytest.approx(70.0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,191 @@
+"""
+Tests for the request-scoped database unit of work.
+
+Runs against an in-memory SQLite engine with a ``set_config`` function
+registered, so tenant context application and round trips can be
+observed.
+"""
+
+import asyncio
+import pytest
+from sqlalchemy import event, text
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+import voicecore.database as database
+from voicecore.database import (
+    get_db_session,
+    set_tenant_context,
+    unit_of_work,
+)
+from voicecore.middleware import RequestPipelineMiddleware
+
+
+@pytest.fixture
+async def tenant_calls(sqlite_database):
+    """Install a SQLite session factory and record set_config calls."""
+    db = await sqlite_database()
+
+    async with db.engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+
+    return db.tenant_contexts
+
+
+class TestTenantContext:
+    """Test deferred tenant context application."""
+
+    async def test_applied_when_transaction_begins(self, tenant_calls):
+        """Test that setting the tenant costs no round trip of its own."""
+        async with get_db_session() as session:
+            await set_tenant_context(session, "tenant-a")
+            assert tenant_calls == []
+
+            await session.execute(text("SELECT 1"))
+            await session.execute(text("SELECT 1"))
+
+        assert tenant_calls == ["tenant-a"]
+
+    async def test_reapplied_after_commit(self, tenant_calls):
+        """Test that the tenant survives commits within one session."""
+        async with get_db_session() as session:
+            await set_tenant_context(session, "tenant-a")
+            await session.execute(text("INSERT INTO items (name) VALUES ('a')"))
+            await session.commit()
+            await session.execute(text("SELECT 1"))
+
+        assert tenant_calls == ["tenant-a", "tenant-a"]
+
+    async def test_switching_tenant_in_transaction(self, tenant_calls):
+        """Test that a different tenant is applied immediately."""
+        async with get_db_session() as session:
+            await set_tenant_context(session, "tenant-a")
+            await session.execute(text("SELECT 1"))
+            await set_tenant_context(session, "tenant-b")
+
+        assert tenant_calls == ["tenant-a", "tenant-b"]
+
+
+class TestUnitOfWork:
+    """Test session sharing and instrumentation."""
+
+    async def test_services_share_one_session(self, tenant_calls):
+        """Test that sequential service blocks reuse the unit's session."""
+        async with unit_of_work() as unit:
+            for name in ("routing", "vip", "spam", "queue"):
+                async with get_db_session() as session:
+                    await set_tenant_context(session, "tenant-a")
+                    await session.execute(
+                        text("INSERT INTO items (name) VALUES (:name)"), {"name": name}
+                    )
+
+        assert unit.stats.sessions == 1
+        assert unit.stats.tenant_context_set == 1
+        assert unit.stats.tenant_context_reused == 3
+        assert tenant_calls == ["tenant-a"]
+        # BEGIN, set_config, four inserts, a SAVEPOINT and RELEASE around
+        # each block after the first, COMMIT
+        assert unit.stats.round_trips == 13
+
+        async with get_db_session() as session:
+            count = (await session.execute(text("SELECT COUNT(*) FROM items"))).scalar()
+        assert count == 4
+
+    async def test_failure_rolls_back_unit(self, tenant_calls):
+        """Test that an exception leaving the unit discards its work."""
+        with pytest.raises(RuntimeError):
+            async with unit_of_work():
+                async with get_db_session() as session:
+                    await session.execute(text("INSERT INTO items (name) VALUES ('lost')"))
+                raise RuntimeError("pipeline failed")
+
+        async with get_db_session() as session:
+            count = (await session.execute(text("SELECT COUNT(*) FROM items"))).scalar()
+        assert count == 0
+
+    async def test_failed_block_keeps_earlier_writes(self, tenant_calls):
+        """Test that a handled failure in one service rolls back only its own block."""
+        async with unit_of_work():
+            async with get_db_session() as session:
+                await session.execute(text("INSERT INTO items (name) VALUES ('routing')"))
+
+            with pytest.raises(RuntimeError):
+                async with get_db_session() as session:
+                    await session.execute(text("INSERT INTO items (name) VALUES ('spam')"))
+                    raise RuntimeError("spam check failed")
+
+            async with get_db_session() as session:
+                await session.execute(text("INSERT INTO items (name) VALUES ('queue')"))
+
+        async with get_db_session() as session:
+            names = (await session.execute(text("SELECT name FROM items ORDER BY id"))).scalars().all()
+        assert names == ["routing", "queue"]
+
+    async def test_block_may_commit_itself(self, tenant_calls):
+        """Test that a service committing inside its block leaves the unit usable."""
+        async with unit_of_work():
+            async with get_db_session() as session:
+                await session.execute(text("INSERT INTO items (name) VALUES ('a')"))
+            async with get_db_session() as session:
+                await session.execute(text("INSERT INTO items (name) VALUES ('b')"))
+                await session.commit()
+                await session.execute(text("INSERT INTO items (name) VALUES ('c')"))
+
+        async with get_db_session() as session:
+            count = (await session.execute(text("SELECT COUNT(*) FROM items"))).scalar()
+        assert count == 3
+
+    async def test_request_committed_before_response(self, tenant_calls):
+        """Test that the pipeline commits the unit before the response starts."""
+        events = []
+        engine = database.AsyncSessionLocal.kw["bind"].sync_engine
+        event.listen(engine, "commit", lambda conn: events.append("commit"))
+
+        async def create_item(request):
+            async with get_db_session() as session:
+                await session.execute(text("INSERT INTO items (name) VALUES ('call')"))
+            return JSONResponse({"created": True}, status_code=201)
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            events.append(message["type"])
+
+        app = RequestPipelineMiddleware(Starlette(routes=[Route("/items", create_item, methods=["POST"])]), stages=[])
+        await app({"type": "http", "method": "POST", "path": "/items", "headers": [], "query_string": b""}, receive, send)
+
+        assert events == ["commit", "http.response.start", "http.response.body"]
+
+    async def test_unused_unit_opens_nothing(self, tenant_calls):
+        """Test that a unit without database work opens no session."""
+        async with unit_of_work() as unit:
+            pass
+
+        assert unit.session is None
+        assert unit.stats.sessions == 0
+
+    async def test_spawned_tasks_get_own_sessions(self, tenant_calls):
+        """Test that background tasks do not share the unit's session."""
+        async def background():
+            async with get_db_session() as session:
+                return session
+
+        async with unit_of_work() as unit:
+            async with get_db_session() as session:
+                task_session = await asyncio.create_task(background())
+
+        assert task_session is not session
+        assert unit.stats.sessions == 2
+
+    async def test_nested_unit_joins_outer(self, tenant_calls):
+        """Test that nested units in the same task share the outer unit."""
+        async with unit_of_work() as outer:
+            async with unit_of_work() as inner:
+                assert inner is outer
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -202,6 +202,32 @@ async def get_all_tenants(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/tenant-stats/rebuild")
+async def rebuild_tenant_stats(
+    admin_service: AdminService = Depends(verify_super_admin)
+):
+    """
+    Rebuild per-tenant statistics.
+    
+    Recomputes the agent and daily call counters behind the tenant
+    summary and system metrics from agents and calls. They are normally
+    kept current incrementally; use this after direct data fixes.
+    """
+    try:
+        counts = await admin_service.rebuild_tenant_stats()
+        
+        return {
+            "status": "success",
+            "message": "Tenant statistics rebuilt",
+            **counts
+        }
+        
+    except AdminServiceError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.post("/tenants")
 async def create_tenant_as_admin(
     request: CreateTenantRequest,
@@ -5,6 +5,7 @@ Provides REST API endpoints for analytics data collection,
 real-time dashboard metrics, and performance reporting.
 """
 
+import os
 import uuid
 from typing import Optional, Dict, Any
 from datetime import datetime, date, timedelta
@@ -13,6 +14,7 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
 from voicecore.services.analytics_service import AnalyticsService, AnalyticsServiceError
+from voicecore.services.data_export_service import ExportRequest
 from voicecore.models import MetricType
 from voicecore.middleware import get_current_tenant_id
 from voicecore.logging import get_logger
@@ -677,7 +679,7 @@ async def export_analytics_data(
     data_type: str = Query(..., description="Data type: calls, agents, metrics, all"),
     start_date: Optional[date] = Query(None, description="Start date for export"),
     end_date: Optional[date] = Query(None, description="End date for export"),
-    format: str = Query("json", description="Export format: json, csv, xlsx"),
+    format: str = Query("json", description="Export format: json, csv, ndjson, xml, parquet"),
     tenant_id: uuid.UUID = Depends(get_current_tenant_id)
 ):
     """
@@ -703,24 +705,16 @@ async def export_analytics_data(
             format=format
         )
         
-        if format.lower() in ["csv", "xlsx"]:
+        if isinstance(export_data, ExportRequest):
             # Return file download
-            from fastapi.responses import StreamingResponse
-            import io
-            
-            if format.lower() == "csv":
-                media_type = "text/csv"
-                extension = "csv"
-            else:
-                media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                extension = "xlsx"
+            from fastapi.responses import FileResponse
             
-            response = StreamingResponse(
-                io.BytesIO(export_data),
-                media_type=media_type,
-                headers={"Content-Disposition": f"attachment; filename=analytics_export_{data_type}_{start_date}_{end_date}.{extension}"}
+            extension = os.path.basename(export_data.file_path).split(".", 1)[1]
+            return FileResponse(
+                export_data.file_path,
+                media_type="application/gzip" if export_data.compressed else export_data.content_type,
+                filename=f"analytics_export_{data_type}_{start_date}_{end_date}.{extension}"
             )
-            return response
         
         return export_data
         
@@ -13,7 +13,7 @@ from datetime import datetime, date, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
 
-from voicecore.services.bi_dashboard_service import BIDashboardService
+from voicecore.services.bi_dashboard_service import bi_dashboard_service
 from voicecore.middleware import get_current_tenant_id
 from voicecore.logging import get_logger
 
@@ -77,9 +77,7 @@ async def get_executive_dashboard(
     **Validates: Requirements 3.2**
     """
     try:
-        bi_service = BIDashboardService()
-        
-        executive_data = await bi_service.get_executive_dashboard(
+        executive_data = await bi_dashboard_service.get_executive_dashboard(
             tenant_id=tenant_id,
             period=period
         )
@@ -111,9 +109,7 @@ async def get_realtime_dashboard(
     **Validates: Requirements 3.2**
     """
     try:
-        bi_service = BIDashboardService()
-        
-        realtime_data = await bi_service.get_realtime_dashboard(
+        realtime_data = await bi_dashboard_service.get_realtime_dashboard(
             tenant_id=tenant_id,
             refresh_interval=refresh_interval
         )
@@ -145,9 +141,7 @@ async def get_kpis(
     **Validates: Requirements 3.2**
     """
     try:
-        bi_service = BIDashboardService()
-        
-        kpis = await bi_service.get_kpis(
+        kpis = await bi_dashboard_service.get_kpis(
             tenant_id=tenant_id,
             period=period,
             category=category
@@ -181,14 +175,12 @@ async def get_business_metrics(
     **Validates: Requirements 3.2**
     """
     try:
-        bi_service = BIDashboardService()
-        
         if not end_date:
             end_date = date.today()
         if not start_date:
             start_date = end_date - timedelta(days=30)
         
-        metrics = await bi_service.get_business_metrics(
+        metrics = await bi_dashboard_service.get_business_metrics(
             tenant_id=tenant_id,
             start_date=start_date,
             end_date=end_date,
@@ -216,9 +208,7 @@ async def save_dashboard_layout(
     **Validates: Requirements 3.2**
     """
     try:
-        bi_service = BIDashboardService()
-        
-        saved_layout = await bi_service.save_dashboard_layout(
+        saved_layout = await bi_dashboard_service.save_dashboard_layout(
             tenant_id=tenant_id,
             layout=layout.dict()
         )
@@ -252,9 +242,7 @@ async def get_dashboard_layouts(
     **Validates: Requirements 3.2**
     """
     try:
-        bi_service = BIDashboardService()
-        
-        layouts = await bi_service.get_dashboard_layouts(tenant_id=tenant_id)
+        layouts = await bi_dashboard_service.get_dashboard_layouts(tenant_id=tenant_id)
         
         return {
             "layouts": layouts,
@@ -279,9 +267,7 @@ async def get_dashboard_layout(
     **Validates: Requirements 3.2**
     """
     try:
-        bi_service = BIDashboardService()
-        
-        layout = await bi_service.get_dashboard_layout(
+        layout = await bi_dashboard_service.get_dashboard_layout(
             tenant_id=tenant_id,
             dashboard_id=dashboard_id
         )
@@ -314,9 +300,7 @@ async def delete_dashboard_layout(
     **Validates: Requirements 3.2**
     """
     try:
-        bi_service = BIDashboardService()
-        
-        success = await bi_service.delete_dashboard_layout(
+        success = await bi_dashboard_service.delete_dashboard_layout(
             tenant_id=tenant_id,
             dashboard_id=dashboard_id
         )
@@ -357,9 +341,7 @@ async def get_business_insights(
     **Validates: Requirements 3.2**
     """
     try:
-        bi_service = BIDashboardService()
-        
-        insights = await bi_service.get_business_insights(
+        insights = await bi_dashboard_service.get_business_insights(
             tenant_id=tenant_id,
             period=period,
             insight_type=insight_type
@@ -393,9 +375,7 @@ async def get_comparative_analysis(
     **Validates: Requirements 3.2**
     """
     try:
-        bi_service = BIDashboardService()
-        
-        comparison = await bi_service.get_comparative_analysis(
+        comparison = await bi_dashboard_service.get_comparative_analysis(
             tenant_id=tenant_id,
             metric=metric,
             period1=period1,
@@ -422,9 +402,7 @@ async def get_available_widgets(
     **Validates: Requirements 3.2**
     """
     try:
-        bi_service = BIDashboardService()
-        
-        widgets = await bi_service.get_available_widgets()
+        widgets = await bi_dashboard_service.get_available_widgets()
         
         return {
             "widgets": widgets,
@@ -5,10 +5,12 @@ Provides REST API endpoints for data export in standard formats
 and external integration management per Requirements 10.1 and 10.4.
 """
 
+import os
 import uuid
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks
+from fastapi.responses import FileResponse
 from pydantic import BaseModel, Field, validator
 
 from voicecore.services.data_export_service import (
@@ -31,6 +33,8 @@ class CreateExportRequest(BaseModel):
     filters: Optional[Dict[str, Any]] = Field(None, description="Data filters")
     start_date: Optional[datetime] = Field(None, description="Start date for data range")
     end_date: Optional[datetime] = Field(None, description="End date for data range")
+    partition_by_date: bool = Field(False, description="Partition Parquet exports by date")
+    priority: int = Field(0, ge=0, le=10, description="Higher priority exports start before the tenant's other exports")
     
     @validator('data_type')
     def validate_data_type(cls, v):
@@ -98,7 +102,8 @@ async def create_data_export(
     Create a new data export request.
     
     Initiates data export in the specified format with optional filters
-    and date range. The export is processed asynchronously.
+    and date range. The export is queued and processed by the export
+    workers; each tenant runs a limited number of exports at a time.
     """
     try:
         # Prepare date range
@@ -114,7 +119,9 @@ async def create_data_export(
             data_type=DataType(request.data_type),
             format=ExportFormat(request.format),
             filters=request.filters or {},
-            date_range=date_range
+            date_range=date_range,
+            partition_by_date=request.partition_by_date,
+            priority=request.priority
         )
         
         return {
@@ -124,6 +131,7 @@ async def create_data_export(
                 "data_type": export_request.data_type.value,
                 "format": export_request.format.value,
                 "status": export_request.status,
+                "priority": export_request.priority,
                 "created_at": export_request.created_at.isoformat(),
                 "filters": export_request.filters,
                 "date_range": {
@@ -165,6 +173,9 @@ async def get_export_status(
                 "data_type": export_request.data_type.value,
                 "format": export_request.format.value,
                 "status": export_request.status,
+                "priority": export_request.priority,
+                "attempts": export_request.attempts,
+                "cancel_requested": export_request.cancel_requested,
                 "created_at": export_request.created_at.isoformat(),
                 "filters": export_request.filters,
                 "date_range": {
@@ -174,6 +185,14 @@ async def get_export_status(
             }
         }
         
+        response["export_request"]["progress"] = {
+            "rows_exported": export_request.rows_exported,
+            "total_rows": export_request.total_rows,
+            "fraction": round(export_request.progress, 4),
+            "bytes_encoded": export_request.bytes_encoded,
+            "bytes_written": export_request.file_size or 0
+        }
+        
         # Add completion details if available
         if export_request.completed_at:
             response["export_request"]["completed_at"] = export_request.completed_at.isoformat()
@@ -181,6 +200,7 @@ async def get_export_status(
         if export_request.file_path:
             response["export_request"]["file_path"] = export_request.file_path
             response["export_request"]["file_size"] = export_request.file_size
+            response["export_request"]["download_url"] = f"/api/v1/export/{export_request.id}/download"
         
         if export_request.error_message:
             response["export_request"]["error_message"] = export_request.error_message
@@ -194,6 +214,78 @@ async def get_export_status(
         raise HTTPException(status_code=500, detail="Failed to get export status")
 
 
+@router.post("/export/{export_id}/cancel")
+async def cancel_export(
+    export_id: str,
+    tenant_id: uuid.UUID = Depends(get_current_tenant)
+):
+    """
+    Cancel a data export request.
+    
+    Queued exports are cancelled immediately; running exports stop at
+    their next checkpoint and their partial output is removed.
+    """
+    try:
+        export_request = await data_export_service.cancel_export_request(
+            request_id=export_id,
+            tenant_id=tenant_id
+        )
+        
+        if not export_request:
+            raise HTTPException(status_code=404, detail="Export request not found")
+        
+        if export_request.status in ("completed", "failed"):
+            raise HTTPException(status_code=409, detail=f"Export is {export_request.status}")
+        
+        return {
+            "success": True,
+            "export_request": {
+                "id": export_request.id,
+                "status": export_request.status,
+                "cancel_requested": export_request.cancel_requested
+            }
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Failed to cancel export", error=str(e))
+        raise HTTPException(status_code=500, detail="Failed to cancel export")
+
+
+@router.get("/export/{export_id}/download")
+async def download_export(
+    export_id: str,
+    tenant_id: uuid.UUID = Depends(get_current_tenant)
+):
+    """
+    Download a completed data export.
+    
+    Streams the export file from disk in chunks. Compressed exports are
+    sent as gzip files and date-partitioned Parquet exports as zip
+    archives.
+    """
+    export_request = await data_export_service.get_export_request(
+        request_id=export_id,
+        tenant_id=tenant_id
+    )
+    
+    if not export_request:
+        raise HTTPException(status_code=404, detail="Export request not found")
+    
+    if export_request.status != "completed" or not export_request.file_path:
+        raise HTTPException(status_code=409, detail=f"Export is {export_request.status}")
+    
+    extension = os.path.basename(export_request.file_path).split(".", 1)[1]
+    filename = f"{export_request.data_type.value}_export.{extension}"
+    
+    return FileResponse(
+        export_request.file_path,
+        media_type="application/gzip" if export_request.compressed else export_request.content_type,
+        filename=filename
+    )
+
+
 @router.get("/exports")
 async def list_export_requests(
     tenant_id: uuid.UUID = Depends(get_current_tenant),
@@ -224,9 +316,13 @@ async def list_export_requests(
                     "data_type": req.data_type.value,
                     "format": req.format.value,
                     "status": req.status,
+                    "priority": req.priority,
+                    "attempts": req.attempts,
                     "created_at": req.created_at.isoformat(),
                     "completed_at": req.completed_at.isoformat() if req.completed_at else None,
-                    "file_size": req.file_size
+                    "file_size": req.file_size,
+                    "rows_exported": req.rows_exported,
+                    "progress": round(req.progress, 4)
                 }
                 for req in export_requests
             ]
@@ -593,10 +689,12 @@ async def get_api_documentation():
                         "description": "Create a new data export request",
                         "parameters": {
                             "data_type": "Type of data to export (calls, agents, analytics, etc.)",
-                            "format": "Export format (json, csv, xml, xlsx)",
+                            "format": "Export format (json, ndjson, csv, xml, xlsx, parquet)",
                             "filters": "Optional data filters",
                             "start_date": "Optional start date for data range",
-                            "end_date": "Optional end date for data range"
+                            "end_date": "Optional end date for data range",
+                            "partition_by_date": "Parquet only: one directory per day, downloaded as a zip",
+                            "priority": "0-10, higher priority exports start before your other exports"
                         }
                     },
                     "get_export_status": {
@@ -604,6 +702,16 @@ async def get_api_documentation():
                         "path": "/export/{export_id}",
                         "description": "Get the status of a data export request"
                     },
+                    "cancel_export": {
+                        "method": "POST",
+                        "path": "/export/{export_id}/cancel",
+                        "description": "Cancel a queued or running export"
+                    },
+                    "download_export": {
+                        "method": "GET",
+                        "path": "/export/{export_id}/download",
+                        "description": "Download a completed export file"
+                    },
                     "list_exports": {
                         "method": "GET",
                         "path": "/exports",
@@ -39,6 +39,12 @@ class AnalyzeConversationRequest(BaseModel):
     call_id: str = Field(..., description="Call ID")
 
 
+class TranscriptChunkRequest(BaseModel):
+    """Request model for a live transcript chunk."""
+    text: str = Field(..., description="Transcript chunk, ending on a word boundary")
+    speaker: str = Field("caller", description="Speaker of the chunk")
+
+
 class EmotionRoutingRequest(BaseModel):
     """Request model for emotion-based routing recommendation."""
     analysis_id: str = Field(..., description="Emotion analysis ID")
@@ -133,6 +139,89 @@ async def analyze_conversation_emotion(
         raise HTTPException(status_code=500, detail="Failed to analyze conversation emotion")
 
 
+@router.post("/stream/{call_id}/chunk")
+async def ingest_transcript_chunk(
+    call_id: str,
+    request: TranscriptChunkRequest,
+    tenant_id: uuid.UUID = Depends(get_current_tenant)
+):
+    """
+    Analyze a live transcript chunk.
+    
+    Updates the call's rolling emotion window and returns the current
+    window analysis. Escalations are pushed to routing as they happen.
+    """
+    try:
+        analysis = await emotion_detection_service.ingest_transcript_chunk(
+            call_id=call_id,
+            tenant_id=tenant_id,
+            text=request.text,
+            speaker=request.speaker
+        )
+        live_level = emotion_detection_service.get_live_escalation(call_id)
+        
+        if analysis is None:
+            return {"success": True, "call_id": call_id, "analyzed": False}
+        
+        return {
+            "success": True,
+            "call_id": call_id,
+            "analyzed": True,
+            "window": {
+                "primary_emotion": analysis.primary_emotion.value,
+                "sentiment_score": analysis.sentiment_score,
+                "sentiment_polarity": analysis.sentiment_polarity.value,
+                "escalation_level": analysis.escalation_level.value,
+                "confidence": analysis.confidence,
+                "keywords_detected": analysis.keywords_detected,
+                "metadata": analysis.metadata
+            },
+            "peak_escalation_level": live_level.value if live_level else None
+        }
+        
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Call stream not found")
+    except Exception as e:
+        logger.error("Failed to analyze transcript chunk", error=str(e))
+        raise HTTPException(status_code=500, detail="Failed to analyze transcript chunk")
+
+
+@router.post("/stream/{call_id}/end")
+async def end_transcript_stream(
+    call_id: str,
+    tenant_id: uuid.UUID = Depends(get_current_tenant)
+):
+    """
+    Close a call's live emotion analyzer.
+    
+    Returns the whole-call analysis, which is also recorded for trends
+    and reports.
+    """
+    try:
+        stream = emotion_detection_service.streams.get(call_id)
+        if stream is None or stream.tenant_id != tenant_id:
+            raise HTTPException(status_code=404, detail="Call stream not found")
+        
+        analysis = await emotion_detection_service.end_transcript_stream(call_id)
+        
+        return {
+            "success": True,
+            "call_id": call_id,
+            "analysis_id": analysis.id,
+            "primary_emotion": analysis.primary_emotion.value,
+            "sentiment_score": analysis.sentiment_score,
+            "escalation_level": analysis.escalation_level.value,
+            "keywords_detected": analysis.keywords_detected,
+            "metadata": analysis.metadata
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Failed to end transcript stream", error=str(e))
+        raise HTTPException(status_code=500, detail="Failed to end transcript stream")
+
+
 @router.get("/analysis/{analysis_id}")
 async def get_emotion_analysis(
     analysis_id: str,
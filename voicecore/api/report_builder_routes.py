@@ -7,13 +7,16 @@ scheduled reports, and advanced analytics capabilities.
 Implements Requirements 3.3, 3.6: Advanced analytics and custom report builder
 """
 
+import os
 import uuid
 from typing import Optional, Dict, Any, List
 from datetime import datetime, date, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query, status, BackgroundTasks
+from fastapi.responses import FileResponse
 from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
 
-from voicecore.services.report_builder_service import ReportBuilderService
+from voicecore.services.report_builder_service import report_builder_service
 from voicecore.middleware import get_current_tenant_id
 from voicecore.logging import get_logger
 
@@ -28,7 +31,7 @@ class ReportColumn(BaseModel):
     field: str
     label: str
     type: str  # "string", "number", "date", "boolean"
-    aggregation: Optional[str] = None  # "sum", "avg", "count", "min", "max"
+    aggregation: Optional[str] = None  # "count", "count_distinct", "sum", "avg", "min", "max", "median", "p90", "p95", "p99"
     format: Optional[str] = None
 
 
@@ -67,6 +70,7 @@ class ScheduledReport(BaseModel):
     schedule_time: str  # "HH:MM" format
     recipients: List[str]  # Email addresses
     format: str = "pdf"  # "pdf", "excel", "csv"
+    period_days: Optional[int] = Field(None, ge=1, le=366)  # Defaults by schedule type
     is_active: bool = True
 
 
@@ -84,9 +88,7 @@ async def create_report(
     **Validates: Requirements 3.3**
     """
     try:
-        report_service = ReportBuilderService()
-        
-        report = await report_service.create_report(
+        report = await report_builder_service.create_report(
             tenant_id=tenant_id,
             config=report_config.dict()
         )
@@ -121,9 +123,7 @@ async def list_reports(
     **Validates: Requirements 3.3**
     """
     try:
-        report_service = ReportBuilderService()
-        
-        reports = await report_service.list_reports(tenant_id=tenant_id)
+        reports = await report_builder_service.list_reports(tenant_id=tenant_id)
         
         return {
             "reports": reports,
@@ -148,9 +148,7 @@ async def get_report(
     **Validates: Requirements 3.3**
     """
     try:
-        report_service = ReportBuilderService()
-        
-        report = await report_service.get_report(
+        report = await report_builder_service.get_report(
             tenant_id=tenant_id,
             report_id=report_id
         )
@@ -186,14 +184,12 @@ async def execute_report(
     **Validates: Requirements 3.3**
     """
     try:
-        report_service = ReportBuilderService()
-        
         if not end_date:
             end_date = date.today()
         if not start_date:
             start_date = end_date - timedelta(days=30)
         
-        result = await report_service.execute_report(
+        result = await report_builder_service.execute_report(
             tenant_id=tenant_id,
             report_id=report_id,
             start_date=start_date,
@@ -201,30 +197,21 @@ async def execute_report(
             output_format=format
         )
         
-        if format in ["csv", "excel", "pdf"]:
-            # Return file download
-            from fastapi.responses import StreamingResponse
-            import io
-            
-            media_types = {
-                "csv": "text/csv",
-                "excel": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                "pdf": "application/pdf"
-            }
-            
-            response = StreamingResponse(
-                io.BytesIO(result["data"]),
-                media_type=media_types[format],
-                headers={
-                    "Content-Disposition": f"attachment; filename=report_{report_id}_{start_date}_{end_date}.{format}"
-                }
+        if "file_path" in result:
+            # Stream the rendered file and remove it once sent
+            return FileResponse(
+                result["file_path"],
+                media_type=result["media_type"],
+                filename=result["filename"],
+                background=BackgroundTask(os.remove, result["file_path"])
             )
-            return response
         
         return result
         
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.error("Failed to execute report", tenant_id=str(tenant_id), error=str(e))
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
@@ -244,9 +231,7 @@ async def update_report(
     **Validates: Requirements 3.3**
     """
     try:
-        report_service = ReportBuilderService()
-        
-        updated_report = await report_service.update_report(
+        updated_report = await report_builder_service.update_report(
             tenant_id=tenant_id,
             report_id=report_id,
             config=report_config.dict()
@@ -290,9 +275,7 @@ async def delete_report(
     **Validates: Requirements 3.3**
     """
     try:
-        report_service = ReportBuilderService()
-        
-        success = await report_service.delete_report(
+        success = await report_builder_service.delete_report(
             tenant_id=tenant_id,
             report_id=report_id
         )
@@ -331,9 +314,7 @@ async def schedule_report(
     **Validates: Requirements 3.6**
     """
     try:
-        report_service = ReportBuilderService()
-        
-        schedule = await report_service.schedule_report(
+        schedule = await report_builder_service.schedule_report(
             tenant_id=tenant_id,
             config=schedule_config.dict()
         )
@@ -368,9 +349,7 @@ async def list_scheduled_reports(
     **Validates: Requirements 3.6**
     """
     try:
-        report_service = ReportBuilderService()
-        
-        schedules = await report_service.list_scheduled_reports(tenant_id=tenant_id)
+        schedules = await report_builder_service.list_scheduled_reports(tenant_id=tenant_id)
         
         return {
             "schedules": schedules,
@@ -395,9 +374,7 @@ async def delete_scheduled_report(
     **Validates: Requirements 3.6**
     """
     try:
-        report_service = ReportBuilderService()
-        
-        success = await report_service.delete_scheduled_report(
+        success = await report_builder_service.delete_scheduled_report(
             tenant_id=tenant_id,
             schedule_id=schedule_id
         )
@@ -423,6 +400,39 @@ async def delete_scheduled_report(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
 
+@router.get("/schedules/{schedule_id}/result")
+async def get_scheduled_report_result(
+    schedule_id: str,
+    tenant_id: uuid.UUID = Depends(get_current_tenant_id)
+):
+    """
+    Get the latest result of a scheduled report.
+    
+    Returns the rows stored by the schedule's most recent run.
+    
+    **Validates: Requirements 3.6**
+    """
+    try:
+        result = await report_builder_service.get_scheduled_report_result(
+            tenant_id=tenant_id,
+            schedule_id=schedule_id
+        )
+        
+        if not result:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No result for scheduled report"
+            )
+        
+        return result
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Failed to get scheduled report result", tenant_id=str(tenant_id), error=str(e))
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+
 @router.get("/templates")
 async def get_report_templates(
     tenant_id: uuid.UUID = Depends(get_current_tenant_id)
@@ -435,9 +445,7 @@ async def get_report_templates(
     **Validates: Requirements 3.3**
     """
     try:
-        report_service = ReportBuilderService()
-        
-        templates = await report_service.get_report_templates()
+        templates = await report_builder_service.get_report_templates()
         
         return {
             "templates": templates,
@@ -458,19 +466,21 @@ async def execute_custom_query(
     Execute a custom query for advanced users.
     
     Allows advanced users to build custom queries with complex logic.
+    Columns may carry an aggregation and rows may be grouped with
+    ``group_by``; fields are limited to those of the data source.
     
     **Validates: Requirements 3.3**
     """
     try:
-        report_service = ReportBuilderService()
-        
-        result = await report_service.execute_custom_query(
+        result = await report_builder_service.execute_custom_query(
             tenant_id=tenant_id,
             query_config=query_config
         )
         
         return result
         
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.error("Failed to execute custom query", tenant_id=str(tenant_id), error=str(e))
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
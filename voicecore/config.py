@@ -30,6 +30,15 @@ class Settings(BaseSettings):
     supabase_anon_key: Optional[str] = Field(default=None, env="SUPABASE_ANON_KEY")
     supabase_service_role_key: Optional[str] = Field(default=None, env="SUPABASE_SERVICE_ROLE_KEY")
     database_url: str = Field(..., env="DATABASE_URL")
+    database_replica_urls: str = Field(default="", env="DATABASE_REPLICA_URLS")
+    db_pool_size: int = Field(default=20, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=30, env="DB_MAX_OVERFLOW")
+    db_pool_timeout_seconds: float = Field(default=30.0, env="DB_POOL_TIMEOUT_SECONDS")
+    db_reporting_pool_size: int = Field(default=5, env="DB_REPORTING_POOL_SIZE")
+    db_reporting_max_overflow: int = Field(default=5, env="DB_REPORTING_MAX_OVERFLOW")
+    db_reporting_pool_timeout_seconds: float = Field(default=60.0, env="DB_REPORTING_POOL_TIMEOUT_SECONDS")
+    db_replica_max_lag_seconds: float = Field(default=30.0, env="DB_REPLICA_MAX_LAG_SECONDS")
+    db_replica_check_interval_seconds: float = Field(default=10.0, env="DB_REPLICA_CHECK_INTERVAL_SECONDS")
     
     # Twilio Configuration
     twilio_account_sid: Optional[str] = Field(default=None, env="TWILIO_ACCOUNT_SID")
@@ -66,6 +75,32 @@ class Settings(BaseSettings):
     # File Storage
     storage_bucket: str = Field(default="voicecore-recordings", env="STORAGE_BUCKET")
     max_file_size_mb: int = Field(default=100, env="MAX_FILE_SIZE_MB")
+    export_directory: str = Field(default="/tmp/voicecore-exports", env="EXPORT_DIRECTORY")
+    export_chunk_size: int = Field(default=2000, env="EXPORT_CHUNK_SIZE")
+    export_compress: bool = Field(default=True, env="EXPORT_COMPRESS")
+    export_parquet_row_group_size: int = Field(default=100000, env="EXPORT_PARQUET_ROW_GROUP_SIZE")
+    export_parquet_compression: str = Field(default="zstd", env="EXPORT_PARQUET_COMPRESSION")
+    export_worker_concurrency: int = Field(default=4, env="EXPORT_WORKER_CONCURRENCY")
+    export_max_jobs_per_tenant: int = Field(default=1, env="EXPORT_MAX_JOBS_PER_TENANT")
+    export_process_workers: int = Field(default=0, env="EXPORT_PROCESS_WORKERS")
+    export_checkpoint_rows: int = Field(default=50000, env="EXPORT_CHECKPOINT_ROWS")
+    export_heartbeat_seconds: float = Field(default=30.0, env="EXPORT_HEARTBEAT_SECONDS")
+    export_poll_interval_seconds: float = Field(default=5.0, env="EXPORT_POLL_INTERVAL_SECONDS")
+    export_job_stale_seconds: float = Field(default=300.0, env="EXPORT_JOB_STALE_SECONDS")
+    export_job_max_attempts: int = Field(default=3, env="EXPORT_JOB_MAX_ATTEMPTS")
+    
+    # Report materialization and scheduling
+    report_partition_close_after_minutes: int = Field(default=60, env="REPORT_PARTITION_CLOSE_AFTER_MINUTES")
+    report_late_data_margin_seconds: int = Field(default=300, env="REPORT_LATE_DATA_MARGIN_SECONDS")
+    report_scheduler_concurrency: int = Field(default=2, env="REPORT_SCHEDULER_CONCURRENCY")
+    report_scheduler_poll_seconds: float = Field(default=60.0, env="REPORT_SCHEDULER_POLL_SECONDS")
+    report_render_process_workers: int = Field(default=0, env="REPORT_RENDER_PROCESS_WORKERS")
+    
+    # Analytics anomaly detection
+    anomaly_detection_interval_seconds: int = Field(default=3600, env="ANOMALY_DETECTION_INTERVAL_SECONDS")
+    anomaly_history_weeks: int = Field(default=8, env="ANOMALY_HISTORY_WEEKS")
+    anomaly_evaluation_days: int = Field(default=7, env="ANOMALY_EVALUATION_DAYS")
+    anomaly_tenant_batch_size: int = Field(default=500, env="ANOMALY_TENANT_BATCH_SIZE")
     
     # Rate Limiting
     rate_limit_calls_per_minute: int = Field(
@@ -73,6 +108,31 @@ class Settings(BaseSettings):
         env="RATE_LIMIT_CALLS_PER_MINUTE"
     )
     rate_limit_burst: int = Field(default=10, env="RATE_LIMIT_BURST")
+    rate_limit_lease_seconds: float = Field(default=1.0, env="RATE_LIMIT_LEASE_SECONDS")
+    rate_limit_max_lease_tokens: int = Field(default=20, env="RATE_LIMIT_MAX_LEASE_TOKENS")
+    trusted_proxies: List[str] = Field(default=[], env="TRUSTED_PROXIES")
+    
+    # API Key Verification
+    api_key_cache_ttl_seconds: float = Field(default=30.0, env="API_KEY_CACHE_TTL_SECONDS")
+    api_key_usage_flush_seconds: float = Field(default=5.0, env="API_KEY_USAGE_FLUSH_SECONDS")
+    api_key_hash_workers: int = Field(default=4, env="API_KEY_HASH_WORKERS")
+    
+    # Credit Ledger
+    credit_subscription_cache_ttl_seconds: float = Field(default=60.0, env="CREDIT_SUBSCRIPTION_CACHE_TTL_SECONDS")
+    credit_usage_flush_seconds: float = Field(default=2.0, env="CREDIT_USAGE_FLUSH_SECONDS")
+    credit_usage_batch_size: int = Field(default=500, env="CREDIT_USAGE_BATCH_SIZE")
+    
+    # Sensitive Data Encryption
+    encryption_active_key_version: int = Field(default=1, env="ENCRYPTION_ACTIVE_KEY_VERSION")
+    encryption_master_keys: Optional[str] = Field(default=None, env="ENCRYPTION_MASTER_KEYS")
+    encryption_workers: int = Field(default=4, env="ENCRYPTION_WORKERS")
+    
+    # Audit Logging
+    audit_queue_size: int = Field(default=10000, env="AUDIT_QUEUE_SIZE")
+    audit_batch_size: int = Field(default=500, env="AUDIT_BATCH_SIZE")
+    audit_flush_interval_seconds: float = Field(default=1.0, env="AUDIT_FLUSH_INTERVAL_SECONDS")
+    audit_journal_dir: Optional[str] = Field(default="var/audit_journal", env="AUDIT_JOURNAL_DIR")
+    audit_journal_fsync: bool = Field(default=False, env="AUDIT_JOURNAL_FSYNC")
     
     # WebSocket Configuration
     websocket_heartbeat_interval: int = Field(default=30, env="WEBSOCKET_HEARTBEAT_INTERVAL")
@@ -90,7 +150,17 @@ class Settings(BaseSettings):
     # Monitoring & Logging
     sentry_dsn: Optional[str] = Field(default=None, env="SENTRY_DSN")
     log_format: str = Field(default="json", env="LOG_FORMAT")
+    log_queue_size: int = Field(default=10000, env="LOG_QUEUE_SIZE")
+    log_sample_default_per_second: int = Field(default=0, env="LOG_SAMPLE_DEFAULT_PER_SECOND")
+    log_sample_rates: str = Field(
+        default="Spam analysis completed=50,Call metrics collected=50,VIP caller identified=50",
+        env="LOG_SAMPLE_RATES"
+    )
     enable_metrics: bool = Field(default=True, env="ENABLE_METRICS")
+    analytics_collection_interval_seconds: int = Field(default=600, env="ANALYTICS_COLLECTION_INTERVAL_SECONDS")
+    slow_query_ms: int = Field(default=200, env="SLOW_QUERY_MS")
+    explain_slow_queries: bool = Field(default=True, env="EXPLAIN_SLOW_QUERIES")
+    query_profiler_max_statements: int = Field(default=500, env="QUERY_PROFILER_MAX_STATEMENTS")
     
     @validator("allowed_origins", pre=True)
     def parse_cors_origins(cls, v):
@@ -99,6 +169,13 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in v.split(",")]
         return v
     
+    @validator("trusted_proxies", pre=True)
+    def parse_trusted_proxies(cls, v):
+        """Parse trusted proxy addresses or networks from comma-separated string."""
+        if isinstance(v, str):
+            return [proxy.strip() for proxy in v.split(",") if proxy.strip()]
+        return v
+    
     @validator("log_level")
     def validate_log_level(cls, v):
         """Validate log level is supported."""
@@ -124,6 +201,11 @@ class Settings(BaseSettings):
 settings = Settings()
 
 
+def get_settings() -> Settings:
+    """Return the global settings instance."""
+    return settings
+
+
 class TenantSettings(BaseSettings):
     """Tenant-specific configuration settings."""
     
@@ -5,15 +5,23 @@ This module handles Supabase PostgreSQL connections with Row-Level Security (RLS
 for multitenant data isolation and provides database utilities.
 """
 
-from typing import Optional, AsyncGenerator
+from typing import Any, Dict, List, Optional, AsyncGenerator
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+import asyncio
+import itertools
 import os
+import time
+from prometheus_client import Gauge
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
-from sqlalchemy import text
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
 
 from voicecore.config import settings
 from voicecore.logging import get_logger
+from voicecore.utils.query_profiler import TimedAsyncQueuePool, query_profiler
 
 
 logger = get_logger(__name__)
@@ -26,41 +34,386 @@ supabase_client: Optional[object] = None
 async_engine = None
 AsyncSessionLocal = None
 
+# Reporting pool on the primary, used for reads when no replica is usable
+reporting_engine = None
+ReportingSessionLocal = None
+replica_set: Optional["ReplicaSet"] = None
+
+# Session.info keys for the requested and the applied RLS tenant
+TENANT_CONTEXT_KEY = "tenant_context"
+APPLIED_TENANT_KEY = "applied_tenant_context"
+
+SET_TENANT_SQL = text("SELECT set_config('app.current_tenant', :tenant_id, true)")
+
+# Replay lag in seconds; zero on a primary or a replica that has replayed all it received
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+POOL_CONNECTIONS = Gauge(
+    "voicecore_db_pool_connections",
+    "Pooled database connections by pool and state",
+    ["pool", "state"],
+)
+REPLICA_LAG_SECONDS = Gauge(
+    "voicecore_db_replica_lag_seconds",
+    "Replication replay lag of each read replica",
+    ["replica"],
+)
+
+
+@dataclass
+class SessionStats:
+    """Database work done by one request or unit of work."""
+    sessions: int = 0
+    round_trips: int = 0
+    queries: int = 0
+    query_time_ms: float = 0.0
+    tenant_context_set: int = 0
+    tenant_context_reused: int = 0
+    correlation_id: Optional[str] = None
+
+
+class SessionStatsCollector:
+    """Process-wide totals over completed units of work."""
+
+    def __init__(self):
+        self.units = 0
+        self.totals = SessionStats()
+        self.max_sessions = 0
+        self.max_round_trips = 0
+
+    def record(self, stats: SessionStats) -> None:
+        self.units += 1
+        self.totals.sessions += stats.sessions
+        self.totals.round_trips += stats.round_trips
+        self.totals.queries += stats.queries
+        self.totals.query_time_ms += stats.query_time_ms
+        self.totals.tenant_context_set += stats.tenant_context_set
+        self.totals.tenant_context_reused += stats.tenant_context_reused
+        self.max_sessions = max(self.max_sessions, stats.sessions)
+        self.max_round_trips = max(self.max_round_trips, stats.round_trips)
+
+    def snapshot(self) -> Dict[str, Any]:
+        units = self.units or 1
+        totals = asdict(self.totals)
+        totals.pop("correlation_id")
+        totals["query_time_ms"] = round(totals["query_time_ms"], 2)
+        return {
+            "units": self.units,
+            **totals,
+            "avg_sessions": round(self.totals.sessions / units, 2),
+            "avg_round_trips": round(self.totals.round_trips / units, 2),
+            "avg_queries": round(self.totals.queries / units, 2),
+            "max_sessions": self.max_sessions,
+            "max_round_trips": self.max_round_trips,
+        }
+
+
+session_stats = SessionStatsCollector()
+
+_current_stats: ContextVar[Optional[SessionStats]] = ContextVar("db_session_stats", default=None)
+_current_unit: ContextVar[Optional["UnitOfWork"]] = ContextVar("db_unit_of_work", default=None)
+
+
+def current_session_stats() -> Optional[SessionStats]:
+    """Return the SessionStats of the current request or unit of work."""
+    return _current_stats.get()
+
+
+class TenantSession(Session):
+    """
+    Session that applies its RLS tenant at the start of every transaction.
+
+    ``set_tenant_context`` only records the tenant on ``session.info``;
+    the ``set_config`` call is issued by the ``after_begin`` hook on the
+    connection that runs the session's first statement, and again after
+    each commit or rollback since ``SET LOCAL`` ends with the transaction.
+    """
+
+
+@event.listens_for(TenantSession, "after_begin")
+def _apply_tenant_on_begin(session, transaction, connection) -> None:
+    tenant_id = session.info.get(TENANT_CONTEXT_KEY)
+    if tenant_id is None or session.info.get(APPLIED_TENANT_KEY) == tenant_id:
+        return
+    connection.execute(SET_TENANT_SQL, {"tenant_id": tenant_id})
+    session.info[APPLIED_TENANT_KEY] = tenant_id
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.tenant_context_set += 1
+
+
+@event.listens_for(TenantSession, "after_transaction_end")
+def _clear_applied_tenant(session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(APPLIED_TENANT_KEY, None)
+
+
+def _restore_applied_tenant(session: AsyncSession, tenant_id: Optional[str]) -> None:
+    if tenant_id is None:
+        session.info.pop(APPLIED_TENANT_KEY, None)
+    else:
+        session.info[APPLIED_TENANT_KEY] = tenant_id
+
+
+def _count_round_trip(*args) -> None:
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.round_trips += 1
+
+
+def instrument_engine(engine) -> None:
+    """
+    Count statements and transaction control as round trips.
+
+    Counts go to the SessionStats of the current request or unit of work.
+
+    Args:
+        engine: Sync engine (``async_engine.sync_engine``)
+    """
+    for name in ("before_cursor_execute", "begin", "commit", "rollback"):
+        if not event.contains(engine, name, _count_round_trip):
+            event.listen(engine, name, _count_round_trip)
+
+
+def create_session_factory(engine) -> async_sessionmaker:
+    """
+    Create the tenant-aware async session factory for an engine.
+
+    Args:
+        engine: Async engine
+
+    Returns:
+        async_sessionmaker producing TenantSession-backed sessions
+    """
+    instrument_engine(engine.sync_engine)
+    query_profiler.install(engine.sync_engine, request_stats=current_session_stats)
+    return async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        sync_session_class=TenantSession,
+        expire_on_commit=False
+    )
+
+
+def parse_replica_urls(value: str) -> List[str]:
+    """Split a comma-separated list of replica URLs."""
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+def _create_engine(url: str, pool_name: str, pool_size: int, max_overflow: int, pool_timeout: float):
+    """Create an async engine with its own connection pool budget."""
+    return create_async_engine(
+        url,
+        echo=settings.debug,
+        poolclass=TimedAsyncQueuePool,
+        pool_logging_name=pool_name,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_pre_ping=True,
+        pool_recycle=3600,
+    )
+
+
+def _read_only(engine):
+    """Engine view whose transactions start READ ONLY where supported."""
+    if engine.dialect.name == "postgresql":
+        return engine.execution_options(postgresql_readonly=True)
+    return engine
+
+
+@dataclass
+class ReadReplica:
+    """A read replica and its last measured lag."""
+    name: str
+    engine: Any
+    session_factory: Any
+    lag_seconds: Optional[float] = None
+    healthy: bool = False
+    checked_at: Optional[float] = None
+    error: Optional[str] = None
+
+
+class ReplicaSet:
+    """
+    Lag-aware selection among read replicas.
+    
+    Replicas are polled for replay lag; reads go to a healthy replica
+    within ``max_lag_seconds``, spread round-robin over those close to
+    the lowest lag. With no usable replica, reads fall back to the
+    primary's reporting pool, never to the call-path pool.
+    
+    Args:
+        replicas: Configured replicas
+        fallback_factory: Session factory for the primary's reporting pool
+        max_lag_seconds: Replicas lagging more than this are skipped
+        lag_tolerance_seconds: Lag difference treated as equal when spreading load
+    """
+    
+    def __init__(
+        self,
+        replicas: List[ReadReplica],
+        fallback_factory: Any,
+        max_lag_seconds: float = 30.0,
+        lag_tolerance_seconds: float = 1.0
+    ):
+        self.replicas = replicas
+        self.fallback_factory = fallback_factory
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_tolerance_seconds = lag_tolerance_seconds
+        self._counter = itertools.count()
+        self._monitor_task: Optional[asyncio.Task] = None
+    
+    def select(self) -> Optional[ReadReplica]:
+        """
+        Pick the replica for the next read.
+        
+        Returns:
+            ReadReplica: Chosen replica, or None to use the fallback
+        """
+        usable = [
+            replica for replica in self.replicas
+            if replica.healthy and replica.lag_seconds is not None
+            and replica.lag_seconds <= self.max_lag_seconds
+        ]
+        if not usable:
+            return None
+        best = min(replica.lag_seconds for replica in usable)
+        closest = [r for r in usable if r.lag_seconds <= best + self.lag_tolerance_seconds]
+        return closest[next(self._counter) % len(closest)]
+    
+    def session_factory(self) -> Any:
+        """Session factory for the next read."""
+        replica = self.select()
+        return replica.session_factory if replica else self.fallback_factory
+    
+    async def check_lag(self) -> None:
+        """Measure the replay lag of every replica."""
+        for replica in self.replicas:
+            try:
+                async with replica.engine.connect() as conn:
+                    if conn.dialect.name == "postgresql":
+                        lag = (await conn.execute(REPLICA_LAG_SQL)).scalar()
+                    else:
+                        lag = 0.0
+                replica.lag_seconds = float(lag or 0.0)
+                replica.healthy = True
+                replica.error = None
+                REPLICA_LAG_SECONDS.labels(replica.name).set(replica.lag_seconds)
+            except Exception as e:
+                if replica.healthy:
+                    logger.warning("Read replica unavailable", replica=replica.name, error=str(e))
+                replica.healthy = False
+                replica.error = str(e)
+            replica.checked_at = time.time()
+    
+    async def _monitor(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.check_lag()
+            except Exception as e:
+                logger.error("Replica lag check failed", error=str(e))
+    
+    def start(self, interval_seconds: float) -> None:
+        """Start polling replica lag in the background."""
+        if self._monitor_task is None and self.replicas:
+            self._monitor_task = asyncio.create_task(self._monitor(interval_seconds))
+    
+    async def close(self) -> None:
+        """Stop polling and dispose of replica engines."""
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                pass
+            self._monitor_task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+    
+    def stats(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": replica.name,
+                "healthy": replica.healthy,
+                "lag_seconds": replica.lag_seconds,
+                "error": replica.error,
+            }
+            for replica in self.replicas
+        ]
+
 
 async def init_database() -> None:
     """
     Initialize database connections and verify connectivity.
     
-    Sets up SQLAlchemy async engine for database operations.
+    Sets up the call-path engine, a separately budgeted reporting pool on
+    the primary and any configured read replicas, so that report and
+    export reads can never exhaust the connections live calls depend on.
     """
     global supabase_client, async_engine, AsyncSessionLocal
+    global reporting_engine, ReportingSessionLocal, replica_set
     
     try:
         # Skip Supabase initialization for now
         logger.info("Skipping Supabase client initialization (not configured)")
         
-        # Initialize SQLAlchemy async engine
-        async_engine = create_async_engine(
+        # Initialize SQLAlchemy async engine for the call path
+        async_engine = _create_engine(
             settings.database_url,
-            echo=settings.debug,
-            pool_size=20,
-            max_overflow=30,
-            pool_pre_ping=True,
-            pool_recycle=3600,
+            "primary",
+            settings.db_pool_size,
+            settings.db_max_overflow,
+            settings.db_pool_timeout_seconds,
         )
         
         # Create session factory
-        AsyncSessionLocal = async_sessionmaker(
-            async_engine,
-            class_=AsyncSession,
-            expire_on_commit=False
+        AsyncSessionLocal = create_session_factory(async_engine)
+        
+        # Reporting reads get their own, smaller pool on the primary
+        reporting_engine = _create_engine(
+            settings.database_url,
+            "reporting",
+            settings.db_reporting_pool_size,
+            settings.db_reporting_max_overflow,
+            settings.db_reporting_pool_timeout_seconds,
+        )
+        ReportingSessionLocal = create_session_factory(_read_only(reporting_engine))
+        
+        replicas = []
+        for index, url in enumerate(parse_replica_urls(settings.database_replica_urls)):
+            parsed = make_url(url)
+            name = f"replica-{index}:{parsed.host or parsed.database}"
+            engine = _create_engine(
+                url,
+                name,
+                settings.db_reporting_pool_size,
+                settings.db_reporting_max_overflow,
+                settings.db_reporting_pool_timeout_seconds,
+            )
+            replicas.append(ReadReplica(name, engine, create_session_factory(_read_only(engine))))
+        replica_set = ReplicaSet(
+            replicas,
+            ReportingSessionLocal,
+            max_lag_seconds=settings.db_replica_max_lag_seconds,
         )
         
         # Test database connectivity
         async with async_engine.begin() as conn:
             await conn.execute(text("SELECT 1"))
         
-        logger.info("Database engine initialized successfully")
+        logger.info("Database engine initialized successfully", replicas=len(replicas))
+        
+        if replicas:
+            await replica_set.check_lag()
+            replica_set.start(settings.db_replica_check_interval_seconds)
         
         # Skip RLS verification for SQLite
         if not settings.database_url.startswith("sqlite"):
@@ -73,7 +426,14 @@ async def init_database() -> None:
 
 async def close_database() -> None:
     """Close database connections gracefully."""
-    global async_engine
+    global async_engine, reporting_engine, replica_set
+    
+    if replica_set:
+        await replica_set.close()
+        replica_set = None
+    
+    if reporting_engine:
+        await reporting_engine.dispose()
     
     if async_engine:
         await async_engine.dispose()
@@ -149,16 +509,64 @@ async def verify_rls_setup() -> None:
 
 
 @asynccontextmanager
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
+async def get_db_session(independent: bool = False) -> AsyncGenerator[AsyncSession, None]:
     """
     Get an async database session with proper error handling.
     
+    Inside a unit of work this yields the unit's shared session; it is
+    committed when the unit completes rather than when this block exits.
+    Each block after the first runs in a savepoint, so an exception
+    rolls back only that block's work, not that of earlier services.
+    
+    Args:
+        independent: Always open a separate session, committed when this
+            block exits, for writes other workers must see immediately
+    
     Yields:
         AsyncSession: Database session
     """
+    unit = _current_unit.get()
+    if not independent and unit is not None and unit.owns_current_task():
+        session = unit.get_session()
+        if not session.in_transaction():
+            # Nothing earlier in the unit to protect, so skip the savepoint
+            try:
+                yield session
+            except Exception as e:
+                await session.rollback()
+                logger.error("Database session error", error=str(e))
+                raise
+            return
+        
+        # Blocks may commit the unit's transaction themselves, which also
+        # ends the savepoint, so it is only closed while that transaction lasts
+        transaction = session.sync_session.get_transaction()
+        applied_tenant = session.info.get(APPLIED_TENANT_KEY)
+        savepoint = await session.begin_nested()
+        try:
+            yield session
+        except Exception as e:
+            if session.sync_session.get_transaction() is transaction:
+                await savepoint.rollback()
+                # ROLLBACK TO SAVEPOINT also undoes a set_config issued in the block
+                _restore_applied_tenant(session, applied_tenant)
+            logger.error("Database session error", error=str(e))
+            raise
+        if session.sync_session.get_transaction() is transaction:
+            if savepoint.is_active:
+                await savepoint.commit()
+            else:
+                # A failed flush the block handled itself deactivated it
+                await savepoint.rollback()
+        return
+    
     if not AsyncSessionLocal:
         raise RuntimeError("Database not initialized. Call init_database() first.")
     
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.sessions += 1
+    
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -171,22 +579,228 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+class UnitOfWork:
+    """
+    One database session shared by everything in a request or call pipeline.
+    
+    The session is opened on first use, so a unit that never touches the
+    database costs nothing. Only code running in the task that opened the
+    unit shares its session; tasks spawned from it (which inherit the
+    context) get sessions of their own, since an AsyncSession must not be
+    used concurrently.
+    
+    Args:
+        tenant_id: Optional tenant applied to the session from the start
+        correlation_id: Request correlation ID, for slow query logs
+    """
+    
+    def __init__(self, tenant_id: Optional[str] = None, correlation_id: Optional[str] = None):
+        self.tenant_id = str(tenant_id) if tenant_id else None
+        self.stats = SessionStats(correlation_id=correlation_id)
+        self.session: Optional[AsyncSession] = None
+        self._owner = asyncio.current_task()
+    
+    def owns_current_task(self) -> bool:
+        return asyncio.current_task() is self._owner
+    
+    def get_session(self) -> AsyncSession:
+        """Return the shared session, opening it on first use."""
+        if self.session is None:
+            if not AsyncSessionLocal:
+                raise RuntimeError("Database not initialized. Call init_database() first.")
+            self.session = AsyncSessionLocal()
+            self.stats.sessions += 1
+            if self.tenant_id:
+                self.session.info[TENANT_CONTEXT_KEY] = self.tenant_id
+        return self.session
+    
+    async def commit(self) -> None:
+        """Commit the work so far, keeping the session open for later blocks."""
+        if self.session is None:
+            return
+        try:
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            logger.error("Unit of work commit failed", error=str(e))
+            raise
+    
+    async def complete(self) -> None:
+        """Commit and close the shared session, if one was opened."""
+        if self.session is None:
+            return
+        try:
+            await self.commit()
+        finally:
+            await self.session.close()
+    
+    async def abort(self) -> None:
+        """Roll back and close the shared session, if one was opened."""
+        if self.session is None:
+            return
+        try:
+            await self.session.rollback()
+        finally:
+            await self.session.close()
+
+
+@asynccontextmanager
+async def unit_of_work(
+    tenant_id: Optional[str] = None,
+    correlation_id: Optional[str] = None
+) -> AsyncGenerator[UnitOfWork, None]:
+    """
+    Share one session across every ``get_db_session()`` block in this scope.
+    
+    Nested calls in the same task join the outer unit. Work is committed
+    when the outermost unit exits and rolled back if it raises.
+    
+    Args:
+        tenant_id: Optional tenant applied to the shared session
+        correlation_id: Request correlation ID, for slow query logs
+        
+    Yields:
+        UnitOfWork: The active unit, whose ``stats`` count its sessions
+        and round trips
+    """
+    current = _current_unit.get()
+    if current is not None and current.owns_current_task():
+        yield current
+        return
+    
+    unit = UnitOfWork(tenant_id, correlation_id)
+    unit_token = _current_unit.set(unit)
+    stats_token = _current_stats.set(unit.stats)
+    try:
+        try:
+            yield unit
+        except BaseException:
+            await unit.abort()
+            raise
+        await unit.complete()
+    finally:
+        _current_unit.reset(unit_token)
+        _current_stats.reset(stats_token)
+        if unit.stats.sessions:
+            session_stats.record(unit.stats)
+            query_profiler.record_request(unit.stats.queries)
+
+
+def get_session_stats() -> Dict[str, Any]:
+    """
+    Return session and round-trip totals over completed units of work.
+    
+    Returns:
+        dict: Totals, per-unit averages and maxima
+    """
+    return session_stats.snapshot()
+
+
+@asynccontextmanager
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get a read-only session for reporting, analytics and exports.
+    
+    Reads go to the least-lagged healthy replica, or to the primary's
+    reporting pool, never the call-path pool. Results may be up to
+    ``DB_REPLICA_MAX_LAG_SECONDS`` stale, so paths that must see their
+    own writes should use ``get_db_session()``. The session is not
+    shared with the current unit of work.
+    
+    Yields:
+        AsyncSession: Read-only database session
+    """
+    factory = replica_set.session_factory() if replica_set else ReportingSessionLocal
+    if factory is None:
+        raise RuntimeError("Database not initialized. Call init_database() first.")
+    
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.sessions += 1
+    
+    async with factory() as session:
+        try:
+            yield session
+        except Exception as e:
+            logger.error("Read session error", error=str(e))
+            raise
+        finally:
+            await session.rollback()
+            await session.close()
+
+
+def _pool_status(pool) -> Dict[str, Any]:
+    status = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+    status["capacity"] = status["size"] + getattr(pool, "_max_overflow", 0)
+    return status
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Return connection pool usage per pool and replica lag.
+    
+    Also refreshes the pool gauges exported on ``/metrics``.
+    
+    Returns:
+        dict: Pool status keyed by pool name, plus replica health
+    """
+    engines = {"primary": async_engine, "reporting": reporting_engine}
+    if replica_set:
+        engines.update({replica.name: replica.engine for replica in replica_set.replicas})
+    
+    pools = {}
+    for name, engine in engines.items():
+        if engine is None or not hasattr(engine.pool, "checkedout"):
+            continue
+        status = pools[name] = _pool_status(engine.pool)
+        POOL_CONNECTIONS.labels(name, "checked_out").set(status["checked_out"])
+        POOL_CONNECTIONS.labels(name, "checked_in").set(status["checked_in"])
+        POOL_CONNECTIONS.labels(name, "capacity").set(status["capacity"])
+    
+    return {
+        "pools": pools,
+        "replicas": replica_set.stats() if replica_set else [],
+    }
+
+
 async def set_tenant_context(session: AsyncSession, tenant_id: str) -> None:
     """
     Set the tenant context for Row-Level Security (RLS).
     
-    This function sets the PostgreSQL session variable that RLS policies
-    use to filter data by tenant.
+    The tenant is recorded on the session and applied with a transaction
+    scoped ``set_config`` as the session's transaction begins, ahead of
+    its first statement. If a transaction is already open it is applied
+    immediately, unless that tenant is already in effect, so services
+    sharing a unit of work pay for it once per transaction.
     
     Args:
         session: Database session
         tenant_id: Tenant UUID to set as context
     """
+    tenant_id = str(tenant_id)
+    session.info[TENANT_CONTEXT_KEY] = tenant_id
+    
+    if isinstance(session.sync_session, TenantSession) and not session.in_transaction():
+        return
+    
+    if session.info.get(APPLIED_TENANT_KEY) == tenant_id:
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.tenant_context_reused += 1
+        return
+    
     try:
-        await session.execute(
-            text("SELECT set_config('app.current_tenant', :tenant_id, true)"),
-            {"tenant_id": tenant_id}
-        )
+        await session.execute(SET_TENANT_SQL, {"tenant_id": tenant_id})
+        session.info[APPLIED_TENANT_KEY] = tenant_id
+        
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.tenant_context_set += 1
         
         logger.debug("Tenant context set", tenant_id=tenant_id)
         
@@ -547,11 +1161,7 @@ class DatabaseManager:
                 await session.execute(text("SELECT 1"))
                 
                 # Check connection pool status
-                pool_status = {
-                    "size": async_engine.pool.size(),
-                    "checked_in": async_engine.pool.checkedin(),
-                    "checked_out": async_engine.pool.checkedout(),
-                }
+                pool_stats = get_pool_stats()
                 
                 # Check RLS status
                 rls_result = await session.execute(text("""
@@ -572,7 +1182,9 @@ class DatabaseManager:
                 return {
                     "status": "healthy",
                     "database": "connected",
-                    "pool": pool_status,
+                    "pool": pool_stats["pools"].get("primary"),
+                    "pools": pool_stats["pools"],
+                    "replicas": pool_stats["replicas"],
                     "rls_policies": rls_policies_count,
                     "tenant_function": tenant_func_exists,
                     "multitenant_ready": rls_policies_count > 0 and tenant_func_exists
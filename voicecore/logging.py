@@ -3,10 +3,21 @@ Structured logging configuration for VoiceCore AI.
 
 This module provides comprehensive logging with structured output,
 correlation IDs, and security-compliant logging (no PII/location data).
+
+Log records are handed to a bounded in-memory queue on the calling
+thread and rendered and written by a background listener thread, so
+slow stdout never stalls the event loop. High-volume info events can be
+rate-limited per event name; warnings and errors are never sampled.
 """
 
+import atexit
+import json
 import logging
+import queue
 import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, Dict, Optional
 from datetime import datetime
 import structlog
@@ -14,17 +25,198 @@ from rich.console import Console
 from rich.logging import RichHandler
 
 from voicecore.config import settings
+from voicecore.utils.redaction import log_redactor
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def json_dumps(obj: Any, default: Any = None, **kwargs) -> str:
+    """Serialize a log event, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, default=default, **kwargs)
+
+
+def parse_sample_rates(value: str) -> Dict[str, int]:
+    """
+    Parse per-event sampling limits.
+
+    Args:
+        value: Comma-separated ``event name=max per second`` pairs
+
+    Returns:
+        Mapping of event name to the number of events kept per second
+    """
+    rates = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        event, limit = item.rsplit("=", 1)
+        rates[event.strip()] = int(limit)
+    return rates
+
+
+class LogSampler:
+    """
+    Per-event-name rate sampling for debug and info log events.
+
+    Each event name may emit up to its limit per one-second window; the
+    rest are dropped and counted. The first event kept after a window
+    with drops carries the number dropped as ``sampled_out``. Warnings
+    and above always pass.
+
+    Args:
+        default_per_second: Limit for event names without an override;
+            0 disables sampling for them
+        rates: Per-event-name limit overrides
+    """
+
+    def __init__(self, default_per_second: int = 0, rates: Optional[Dict[str, int]] = None):
+        self.default_per_second = default_per_second
+        self.rates = dict(rates or {})
+        self._windows: Dict[str, list] = {}
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self.dropped_by_event: Dict[str, int] = {}
+
+    def __call__(self, logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """Structlog processor dropping events over their rate."""
+        if method_name not in ("debug", "info"):
+            return event_dict
+
+        event = event_dict.get("event")
+        limit = self.rates.get(event, self.default_per_second)
+        if limit <= 0:
+            return event_dict
+
+        now = int(time.monotonic())
+        with self._lock:
+            # [window second, kept in window, dropped since last kept]
+            window = self._windows.get(event)
+            if window is None:
+                window = self._windows[event] = [now, 0, 0]
+            elif window[0] != now:
+                window[0], window[1] = now, 0
+
+            if window[1] >= limit:
+                window[2] += 1
+                self.dropped += 1
+                self.dropped_by_event[event] = self.dropped_by_event.get(event, 0) + 1
+                raise structlog.DropEvent
+
+            window[1] += 1
+            dropped, window[2] = window[2], 0
+
+        if dropped:
+            event_dict["sampled_out"] = dropped
+        return event_dict
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves rendering to the listener thread.
+
+    Structlog event dicts are enqueued as they are instead of being
+    formatted on the calling thread. When the queue is full, records
+    below WARNING are dropped and counted; warnings and errors wait for
+    space so they are never lost.
+    """
+
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if not isinstance(record.msg, dict) and record.args:
+            # Foreign stdlib records: merge arguments now, since they may
+            # be mutated by the caller before the listener renders them
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno < logging.WARNING:
+                self.dropped += 1
+                return
+            self.queue.put(record)
+
+
+class AsyncLogSink:
+    """
+    Bounded queue plus background listener writing to the real handler.
+
+    Args:
+        handler: Handler that renders and writes records
+        max_queue_size: Maximum records waiting for the listener
+    """
+
+    def __init__(self, handler: logging.Handler, max_queue_size: int = 10000):
+        self.handler = handler
+        self.queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self.queue_handler = NonBlockingQueueHandler(self.queue)
+        self.listener = QueueListener(self.queue, handler, respect_handler_level=True)
+        self._started = False
+
+    def start(self) -> None:
+        """Start the listener thread."""
+        if not self._started:
+            self.listener.start()
+            self._started = True
+
+    def stop(self) -> None:
+        """Write everything queued, stop the listener thread and close the handler."""
+        if self._started:
+            self.listener.stop()
+            self._started = False
+        try:
+            self.handler.flush()
+            self.handler.close()
+        except (ValueError, OSError):
+            # The stream may already be closed at interpreter exit, as
+            # logging.shutdown tolerates
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth and records dropped because the queue was full."""
+        return {
+            "queue_depth": self.queue.qsize(),
+            "max_queue_size": self.queue.maxsize,
+            "queue_full_dropped": self.queue_handler.dropped,
+        }
+
+
+_sink: Optional[AsyncLogSink] = None
+sampler = LogSampler()
+
+
+def build_renderer() -> Any:
+    """Final renderer, run on the listener thread."""
+    if settings.log_format == "json":
+        return structlog.processors.JSONRenderer(serializer=json_dumps)
+    return structlog.dev.ConsoleRenderer(colors=True)
 
 
 def configure_logging() -> None:
     """Configure structured logging for the application."""
+    global _sink
+    
+    sampler.default_per_second = settings.log_sample_default_per_second
+    sampler.rates = parse_sample_rates(settings.log_sample_rates)
     
-    # Configure structlog
+    # Configure structlog; everything before wrap_for_formatter runs on
+    # the calling thread, the renderer runs on the listener thread
     structlog.configure(
         processors=[
             structlog.stdlib.filter_by_level,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
+            sampler,
             structlog.stdlib.PositionalArgumentsFormatter(),
             add_correlation_id,
             sanitize_sensitive_data,
@@ -32,8 +224,7 @@ def configure_logging() -> None:
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
             structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer() if settings.log_format == "json" 
-            else structlog.dev.ConsoleRenderer(colors=True),
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
         ],
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
@@ -41,20 +232,35 @@ def configure_logging() -> None:
         cache_logger_on_first_use=True,
     )
     
-    # Configure standard library logging
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=getattr(logging, settings.log_level),
-        handlers=[
-            RichHandler(
-                console=Console(stderr=True),
-                show_time=False,
-                show_path=False,
-                markup=True,
-            ) if settings.debug else logging.StreamHandler(sys.stdout)
-        ]
-    )
+    handler = RichHandler(
+        console=Console(stderr=True),
+        show_time=False,
+        show_path=False,
+        markup=True,
+    ) if settings.debug else logging.StreamHandler(sys.stdout)
+    handler.setFormatter(structlog.stdlib.ProcessorFormatter(
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            build_renderer(),
+        ],
+        foreign_pre_chain=[
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+        ],
+    ))
+    
+    # Configure standard library logging; the root logger only enqueues
+    if _sink is not None:
+        _sink.stop()
+    _sink = AsyncLogSink(handler, max_queue_size=settings.log_queue_size)
+    
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(_sink.queue_handler)
+    root.setLevel(getattr(logging, settings.log_level))
+    _sink.start()
     
     # Set third-party library log levels
     logging.getLogger("uvicorn").setLevel(logging.WARNING)
@@ -62,6 +268,29 @@ def configure_logging() -> None:
     logging.getLogger("asyncio").setLevel(logging.WARNING)
 
 
+def shutdown_logging() -> None:
+    """Flush queued log records and stop the listener thread."""
+    if _sink is not None:
+        _sink.stop()
+
+
+atexit.register(shutdown_logging)
+
+
+def get_log_stats() -> Dict[str, Any]:
+    """
+    Return log sink and sampling counters.
+
+    Returns:
+        Queue depth, records dropped on a full queue and events dropped
+        by sampling, overall and per event name
+    """
+    stats = _sink.stats() if _sink is not None else {}
+    stats["sampled_out"] = sampler.dropped
+    stats["sampled_out_by_event"] = dict(sampler.dropped_by_event)
+    return stats
+
+
 def add_correlation_id(logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
     """Add correlation ID to log entries for request tracing."""
     # This will be populated by middleware in actual requests
@@ -78,36 +307,7 @@ def sanitize_sensitive_data(logger: Any, method_name: str, event_dict: Dict[str,
     CRITICAL: This ensures no IP addresses, geolocation, or PII is logged
     as per security requirements.
     """
-    sensitive_keys = [
-        'ip', 'ip_address', 'client_ip', 'remote_addr',
-        'geolocation', 'location', 'coordinates', 'lat', 'lng',
-        'password', 'token', 'secret', 'key', 'auth',
-        'ssn', 'social_security', 'credit_card', 'phone_number'
-    ]
-    
-    def sanitize_dict(data: Dict[str, Any]) -> Dict[str, Any]:
-        """Recursively sanitize dictionary data."""
-        sanitized = {}
-        for key, value in data.items():
-            key_lower = key.lower()
-            
-            # Check if key contains sensitive information
-            if any(sensitive in key_lower for sensitive in sensitive_keys):
-                sanitized[key] = "[REDACTED]"
-            elif isinstance(value, dict):
-                sanitized[key] = sanitize_dict(value)
-            elif isinstance(value, list):
-                sanitized[key] = [
-                    sanitize_dict(item) if isinstance(item, dict) else item 
-                    for item in value
-                ]
-            else:
-                sanitized[key] = value
-        
-        return sanitized
-    
-    # Sanitize the event dictionary
-    return sanitize_dict(event_dict)
+    return log_redactor.redact(event_dict)
 
 
 class VoiceCoreLogger:
@@ -16,16 +16,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 import structlog
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from voicecore.config import settings
-from voicecore.logging import configure_logging, get_logger
-from voicecore.database import init_database, close_database
-from voicecore.middleware import (
-    CorrelationIDMiddleware,
-    TenantContextMiddleware,
-    SecurityHeadersMiddleware,
-    RateLimitMiddleware
-)
+from voicecore.logging import configure_logging, get_log_stats, get_logger
+from voicecore.database import init_database, close_database, get_pool_stats, get_session_stats
+from voicecore.middleware import RequestPipelineMiddleware, default_pipeline_stages
 
 
 # Configure logging before any other imports
@@ -48,11 +44,28 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         await init_database()
         logger.info("Database initialized successfully")
         
+        # Replay any journaled audit records and start the audit writer
+        from voicecore.services.privacy_service import audit_writer
+        await audit_writer.start()
+        
+        # Start export workers; exports interrupted by the last shutdown resume
+        from voicecore.services.data_export_service import data_export_service
+        await data_export_service.start()
+        
+        # Start the scheduled report workers
+        from voicecore.services.report_builder_service import report_builder_service
+        await report_builder_service.start()
+        
         # Initialize WebSocket manager
         from voicecore.services.websocket_service import websocket_manager
         await websocket_manager.start()
         logger.info("WebSocket manager initialized successfully")
         
+        # Re-prioritize queued calls when live emotion analysis escalates
+        from voicecore.services.emotion_detection_service import emotion_detection_service
+        from voicecore.services.call_routing_service import CallRoutingService
+        emotion_detection_service.on_escalation(CallRoutingService().handle_emotion_escalation)
+        
         # Initialize task scheduler for analytics
         from voicecore.services.scheduler_service import scheduler
         from voicecore.services.analytics_service import AnalyticsService
@@ -67,11 +80,20 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             300  # 5 minutes
         )
         
-        # Schedule call analytics collection every 10 minutes
+        # Schedule call analytics collection (every 10 minutes by default);
+        # BI dashboards are memoized for the same interval
         scheduler.schedule_task(
             "collect_call_analytics",
             analytics_service.collect_call_analytics,
-            600  # 10 minutes
+            settings.analytics_collection_interval_seconds
+        )
+        
+        # Detect anomalies in all tenants' call analytics (hourly by default)
+        from voicecore.services.anomaly_service import anomaly_detection_service
+        scheduler.schedule_task(
+            "detect_analytics_anomalies",
+            anomaly_detection_service.run_detection,
+            settings.anomaly_detection_interval_seconds
         )
         
         logger.info("Analytics scheduler initialized successfully")
@@ -98,6 +120,30 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         from voicecore.services.scheduler_service import scheduler
         await scheduler.stop()
         
+        # Persist emotion analyses still held in memory
+        from voicecore.services.emotion_detection_service import emotion_detection_service
+        await emotion_detection_service.flush_analyses()
+        
+        # Write buffered API key usage before the database goes away
+        from voicecore.services.auth_service import auth_service
+        await auth_service.key_usage.stop()
+        
+        # Write buffered credit usage records
+        from voicecore.services.credit_management_service import credit_management_service
+        await credit_management_service.usage_records.stop()
+        
+        # Stop export workers; running exports are requeued from their checkpoint
+        from voicecore.services.data_export_service import data_export_service
+        await data_export_service.stop()
+        
+        # Stop the scheduled report workers
+        from voicecore.services.report_builder_service import report_builder_service
+        await report_builder_service.stop()
+        
+        # Flush queued audit records
+        from voicecore.services.privacy_service import audit_writer
+        await audit_writer.stop()
+        
         await close_database()
         logger.info("VoiceCore AI shutdown completed")
 
@@ -120,9 +166,6 @@ def create_application() -> FastAPI:
         lifespan=lifespan
     )
     
-    # Add security middleware
-    app.add_middleware(SecurityHeadersMiddleware)
-    
     # Add CORS middleware
     app.add_middleware(
         CORSMiddleware,
@@ -139,10 +182,10 @@ def create_application() -> FastAPI:
             allowed_hosts=["*"]  # Configure with actual domains in production
         )
     
-    # Add custom middleware
-    app.add_middleware(CorrelationIDMiddleware)
-    app.add_middleware(TenantContextMiddleware)
-    app.add_middleware(RateLimitMiddleware)
+    # Correlation IDs, auth, tenant context, rate limiting and security
+    # headers run as stages of one pure-ASGI middleware (added last, so
+    # it runs first)
+    app.add_middleware(RequestPipelineMiddleware, stages=default_pipeline_stages())
     
     # Add exception handlers
     @app.exception_handler(Exception)
@@ -241,6 +284,8 @@ def create_application() -> FastAPI:
                 logger.warning("Failed to get system health for health check", error=str(e))
                 basic_health["system_status"] = "unknown"
             
+            basic_health["logging"] = get_log_stats()
+            basic_health["database_sessions"] = get_session_stats()
             return basic_health
             
         except Exception as e:
@@ -253,6 +298,14 @@ def create_application() -> FastAPI:
                 "error": "Health check failed"
             }
     
+    if settings.enable_metrics:
+        # Prometheus metrics endpoint
+        @app.get("/metrics", include_in_schema=False)
+        async def metrics() -> Response:
+            """Expose Prometheus metrics, including database statement timings."""
+            get_pool_stats()
+            return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    
     # Root endpoint
     @app.get("/")
     async def root() -> dict:
@@ -2,149 +2,394 @@
 Custom middleware for VoiceCore AI application.
 
 This module provides security, tenant isolation, rate limiting,
-and request tracking middleware with enterprise-grade features.
+and request tracking as a single pure-ASGI request pipeline. Each
+concern is a pluggable stage that reads and extends one shared
+request context, so tenant, auth and rate-limit decisions are
+computed once per request.
 """
 
+import hashlib
+import hmac
+import ipaddress
 import time
 import uuid
-from typing import Callable, Optional
-from starlette.middleware.base import BaseHTTPMiddleware
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import jwt
+from starlette.datastructures import MutableHeaders
 from starlette.requests import Request
 from starlette.responses import Response, JSONResponse
-from starlette.types import ASGIApp
-import aioredis
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import redis.asyncio as aioredis
 
 from voicecore.config import settings
+from voicecore.database import SessionStats, unit_of_work
 from voicecore.logging import get_logger
+from voicecore.utils.rate_limiter import RateLimitDecision, TokenBucketRateLimiter
 
 
 logger = get_logger(__name__)
 
 
-class CorrelationIDMiddleware(BaseHTTPMiddleware):
+@dataclass
+class RequestContext:
     """
-    Middleware to add correlation IDs to all requests for tracing.
-    
+    Per-request context shared by all pipeline stages.
+
+    Stored on ``request.state.request_context``; the commonly used fields
+    are also mirrored onto ``request.state`` for route handlers.
+    """
+    correlation_id: str = ""
+    start_time: float = field(default_factory=time.perf_counter)
+    tenant_id: Optional[str] = None
+    tenant_name: Optional[str] = None
+    user_id: Optional[str] = None
+    auth_scheme: Optional[str] = None
+    auth_claims: Optional[Dict[str, Any]] = None
+    rate_limit: Optional[RateLimitDecision] = None
+    status_code: Optional[int] = None
+    db_stats: Optional[SessionStats] = None
+
+    @property
+    def authenticated(self) -> bool:
+        return self.auth_claims is not None
+
+
+class PipelineStage:
+    """
+    Base class for request pipeline stages.
+
+    ``on_request`` runs in stage order before the application and may
+    return a response to short-circuit the request. ``on_response`` runs
+    in reverse order when the response headers are sent.
+    """
+
+    async def on_request(self, context: RequestContext, request: Request) -> Optional[Response]:
+        return None
+
+    def on_response(self, context: RequestContext, headers: MutableHeaders) -> None:
+        return None
+
+
+class CorrelationStage(PipelineStage):
+    """
+    Assign correlation IDs to all requests for tracing.
+
     This enables end-to-end request tracking across all services
     and logs for debugging and monitoring purposes.
     """
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Generate or extract correlation ID
-        correlation_id = request.headers.get("X-Correlation-ID") or str(uuid.uuid4())
-        
-        # Store in request state
-        request.state.correlation_id = correlation_id
-        
-        # Set logger correlation ID
-        logger.set_correlation_id(correlation_id)
-        
-        # Process request
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        
-        # Add correlation ID to response headers
-        response.headers["X-Correlation-ID"] = correlation_id
-        response.headers["X-Process-Time"] = str(process_time)
-        
-        # Log request completion
-        logger.info(
-            "Request completed",
-            method=request.method,
-            path=str(request.url.path),
-            status_code=response.status_code,
-            process_time_ms=round(process_time * 1000, 2),
-            correlation_id=correlation_id
-        )
-        
-        return response
+
+    async def on_request(self, context: RequestContext, request: Request) -> Optional[Response]:
+        context.correlation_id = request.headers.get("X-Correlation-ID") or str(uuid.uuid4())
+        request.state.correlation_id = context.correlation_id
+        logger.set_correlation_id(context.correlation_id)
+        return None
+
+    def on_response(self, context: RequestContext, headers: MutableHeaders) -> None:
+        headers["X-Correlation-ID"] = context.correlation_id
+        headers["X-Process-Time"] = str(time.perf_counter() - context.start_time)
 
 
-class TenantContextMiddleware(BaseHTTPMiddleware):
+class AuthStage(PipelineStage):
     """
-    Middleware to extract and validate tenant context from requests.
-    
-    This ensures proper tenant isolation and sets the database
-    context for Row-Level Security (RLS) policies.
+    Identify the caller once per request.
+
+    Bearer tokens are decoded and their claims kept on the context.
+    API keys are only recorded here; they are verified by the auth
+    service where a route requires them. This stage never rejects a
+    request, it only records who the caller claims to be.
     """
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Extract tenant ID from various sources
-        tenant_id = self._extract_tenant_id(request)
-        
-        if tenant_id:
-            # Validate tenant exists and is active
+
+    async def on_request(self, context: RequestContext, request: Request) -> Optional[Response]:
+        auth_header = request.headers.get("Authorization", "")
+
+        if auth_header.startswith("Bearer "):
+            context.auth_scheme = "bearer"
             try:
-                from voicecore.services.tenant_service import TenantService
-                tenant_service = TenantService()
-                tenant_info = await tenant_service.get_tenant(tenant_id)
-                
-                if tenant_info and tenant_info.get('is_active', False):
-                    request.state.tenant_id = tenant_id
-                    request.state.tenant_name = tenant_info.get('name')
-                    
-                    logger.debug(
-                        "Tenant context set",
-                        tenant_id=tenant_id,
-                        tenant_name=tenant_info.get('name'),
-                        correlation_id=getattr(request.state, 'correlation_id', None)
-                    )
-                else:
-                    logger.warning(
-                        "Invalid or inactive tenant",
-                        tenant_id=tenant_id,
-                        correlation_id=getattr(request.state, 'correlation_id', None)
-                    )
-            except Exception as e:
-                logger.error(
-                    "Failed to validate tenant",
-                    tenant_id=tenant_id,
+                claims = jwt.decode(
+                    auth_header[7:],
+                    settings.jwt_secret_key,
+                    algorithms=[settings.jwt_algorithm]
+                )
+                context.auth_claims = claims
+                context.user_id = claims.get("sub")
+            except jwt.InvalidTokenError as e:
+                logger.debug(
+                    "Bearer token rejected",
                     error=str(e),
-                    correlation_id=getattr(request.state, 'correlation_id', None)
+                    correlation_id=context.correlation_id
                 )
-        
-        return await call_next(request)
-    
-    def _extract_tenant_id(self, request: Request) -> Optional[str]:
+        elif request.headers.get("X-API-Key"):
+            context.auth_scheme = "api_key"
+
+        request.state.user_id = context.user_id
+        return None
+
+
+class TenantStage(PipelineStage):
+    """
+    Extract and validate tenant context from requests.
+
+    This ensures proper tenant isolation and sets the database
+    context for Row-Level Security (RLS) policies. Validation results
+    are cached briefly so a hot tenant costs one lookup per TTL rather
+    than one per request.
+    """
+
+    def __init__(self, cache_ttl: float = 30.0, max_cache_size: int = 10000):
+        self.cache_ttl = cache_ttl
+        self.max_cache_size = max_cache_size
+        self._cache: Dict[str, Tuple[float, Optional[str]]] = {}
+
+    async def on_request(self, context: RequestContext, request: Request) -> Optional[Response]:
+        tenant_ref = self._extract_tenant_id(request, context)
+        if not tenant_ref:
+            return None
+
+        cached = self._cache.get(tenant_ref)
+        now = time.monotonic()
+        if cached and cached[0] > now:
+            tenant_name = cached[1]
+            valid = tenant_name is not None
+        else:
+            valid, tenant_name = await self._validate_tenant(tenant_ref, context)
+            if len(self._cache) >= self.max_cache_size:
+                self._cache.clear()
+            self._cache[tenant_ref] = (now + self.cache_ttl, tenant_name if valid else None)
+
+        if valid:
+            context.tenant_id = tenant_ref
+            context.tenant_name = tenant_name
+            request.state.tenant_id = tenant_ref
+            request.state.tenant_name = tenant_name
+
+        return None
+
+    def invalidate(self, tenant_ref: Optional[str] = None) -> None:
+        """Drop cached validation results for one tenant or all tenants."""
+        if tenant_ref is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(tenant_ref, None)
+
+    async def _validate_tenant(
+        self,
+        tenant_ref: str,
+        context: RequestContext
+    ) -> Tuple[bool, Optional[str]]:
+        """Check that the tenant exists and is active."""
+        try:
+            from voicecore.services.tenant_service import TenantService
+            tenant_service = TenantService()
+
+            try:
+                tenant = await tenant_service.get_tenant(uuid.UUID(tenant_ref))
+            except ValueError:
+                tenant = await tenant_service.get_tenant_by_subdomain(tenant_ref)
+
+            if tenant and getattr(tenant, "is_active", False):
+                logger.debug(
+                    "Tenant context set",
+                    tenant_id=tenant_ref,
+                    tenant_name=tenant.name,
+                    correlation_id=context.correlation_id
+                )
+                return True, tenant.name
+
+            logger.warning(
+                "Invalid or inactive tenant",
+                tenant_id=tenant_ref,
+                correlation_id=context.correlation_id
+            )
+        except Exception as e:
+            logger.error(
+                "Failed to validate tenant",
+                tenant_id=tenant_ref,
+                error=str(e),
+                correlation_id=context.correlation_id
+            )
+
+        return False, None
+
+    @staticmethod
+    def _extract_tenant_id(request: Request, context: RequestContext) -> Optional[str]:
         """
-        Extract tenant ID from request headers, subdomain, or JWT token.
-        
+        Extract tenant ID from request headers, JWT token, or subdomain.
+
         Priority order:
         1. X-Tenant-ID header
-        2. Subdomain extraction
-        3. JWT token claims
+        2. JWT token claims
+        3. Subdomain extraction
         """
-        # Check header first
         tenant_id = request.headers.get("X-Tenant-ID")
         if tenant_id:
             return tenant_id
-        
-        # Extract from subdomain
+
+        if context.auth_claims and context.auth_claims.get("tenant_id"):
+            return str(context.auth_claims["tenant_id"])
+
         host = request.headers.get("host", "")
         if "." in host:
             subdomain = host.split(".")[0]
             if subdomain and subdomain != "www" and subdomain != "api":
                 return subdomain
-        
-        # TODO: Extract from JWT token if present
-        
+
         return None
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class RateLimitStage(PipelineStage):
+    """
+    Rate limit requests per tenant or client.
+
+    Uses a Redis-backed token bucket (one atomic Lua call per decision)
+    shared across application instances. Traffic with a verified bearer
+    token is keyed by the token's tenant; all other traffic is keyed by
+    a keyed hash of the client address so the address itself is never
+    stored or logged.
     """
-    Middleware to add security headers to all responses.
-    
+
+    EXEMPT_PATHS = frozenset(["/health", "/metrics"])
+
+    def __init__(self, limiter: Optional[TokenBucketRateLimiter] = None):
+        self.limiter = limiter
+
+    async def on_request(self, context: RequestContext, request: Request) -> Optional[Response]:
+        if request.url.path in self.EXEMPT_PATHS:
+            return None
+
+        if not self.limiter:
+            self.limiter = self._create_limiter()
+
+        rate_limit_key = self._rate_limit_key(request, context)
+
+        try:
+            decision = await self.limiter.check(rate_limit_key)
+        except Exception as e:
+            logger.error("Rate limiting error", error=str(e))
+            return None
+
+        context.rate_limit = decision
+        if decision.allowed:
+            return None
+
+        logger.warning(
+            "Rate limit exceeded",
+            key=rate_limit_key,
+            limit=decision.limit,
+            retry_after=decision.retry_after,
+            correlation_id=context.correlation_id
+        )
+
+        return JSONResponse(
+            status_code=429,
+            content={
+                "error": "Rate limit exceeded",
+                "message": "Too many requests. Please try again later.",
+                "retry_after": decision.retry_after
+            },
+            headers={"Retry-After": str(decision.retry_after)}
+        )
+
+    def on_response(self, context: RequestContext, headers: MutableHeaders) -> None:
+        if context.rate_limit:
+            headers["X-RateLimit-Limit"] = str(context.rate_limit.limit)
+            headers["X-RateLimit-Remaining"] = str(context.rate_limit.remaining)
+
+    @staticmethod
+    def _create_limiter() -> TokenBucketRateLimiter:
+        """Create the limiter, falling back to per-process buckets without Redis."""
+        redis_client = None
+        try:
+            redis_client = aioredis.from_url(settings.redis_url)
+        except Exception as e:
+            logger.warning("Redis not available for rate limiting", error=str(e))
+
+        return TokenBucketRateLimiter(
+            redis_client=redis_client,
+            limit_per_minute=settings.rate_limit_calls_per_minute,
+            burst=settings.rate_limit_burst,
+            lease_seconds=settings.rate_limit_lease_seconds,
+            max_lease_tokens=settings.rate_limit_max_lease_tokens
+        )
+
+    @staticmethod
+    def _rate_limit_key(request: Request, context: RequestContext) -> str:
+        """
+        Determine the rate limit key, preferring tenant over client identity.
+
+        Only the tenant of a verified bearer token is used. The X-Tenant-ID
+        header is unauthenticated, so keying on it would let any client
+        drain another tenant's bucket, or escape its own limit by rotating
+        tenant IDs. API keys are verified later by the routes, so their
+        callers are limited per client here.
+
+        Anonymous clients are identified by an HMAC of their address so that
+        no IP address is persisted in Redis, per security requirements.
+        """
+        claims = context.auth_claims or {}
+        if claims.get("tenant_id"):
+            return f"rate_limit:tenant:{claims['tenant_id']}"
+
+        client_hash = hmac.new(
+            settings.secret_key.encode(),
+            client_address(request).encode(),
+            hashlib.sha256
+        ).hexdigest()[:24]
+        return f"rate_limit:anonymous:{client_hash}"
+
+
+@lru_cache(maxsize=8)
+def _proxy_networks(proxies: Tuple[str, ...]) -> Tuple[Any, ...]:
+    return tuple(ipaddress.ip_network(proxy, strict=False) for proxy in proxies)
+
+
+def _is_trusted_proxy(address: str, networks: Tuple[Any, ...]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def client_address(request: Request) -> str:
+    """
+    Return the address of the client that sent a request.
+
+    X-Forwarded-For is only read when the connecting peer is one of the
+    configured trusted proxies. Its entries are then walked from the
+    right past further trusted proxies; the first other address is the
+    client, since anything left of it was supplied by the client itself.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        Client IP address, or "unknown" without a peer address
+    """
+    peer = request.client.host if request.client else "unknown"
+    networks = _proxy_networks(tuple(settings.trusted_proxies))
+    if not _is_trusted_proxy(peer, networks):
+        return peer
+
+    forwarded_for = request.headers.get("X-Forwarded-For", "")
+    hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop, networks):
+            return hop
+    return hops[0] if hops else peer
+
+
+class SecurityHeadersStage(PipelineStage):
+    """
+    Add security headers to all responses.
+
     Implements enterprise security best practices including
     HSTS, CSP, and other protective headers.
     """
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
-        
-        # Security headers
-        security_headers = {
+
+    def __init__(self):
+        self.security_headers = {
             "X-Content-Type-Options": "nosniff",
             "X-Frame-Options": "DENY",
             "X-XSS-Protection": "1; mode=block",
@@ -162,149 +407,96 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
                 "form-action 'self'"
             )
         }
-        
+
         # Add HSTS in production
         if not settings.debug:
-            security_headers["Strict-Transport-Security"] = (
+            self.security_headers["Strict-Transport-Security"] = (
                 "max-age=31536000; includeSubDomains; preload"
             )
-        
-        # Apply headers
-        for header, value in security_headers.items():
-            response.headers[header] = value
-        
-        return response
 
+    def on_response(self, context: RequestContext, headers: MutableHeaders) -> None:
+        for header, value in self.security_headers.items():
+            headers[header] = value
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware for rate limiting requests per IP/tenant.
-    
-    Uses Redis for distributed rate limiting across multiple
-    application instances with sliding window algorithm.
-    """
-    
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
-        self.redis: Optional[aioredis.Redis] = None
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Skip rate limiting for health checks and internal endpoints
-        if request.url.path in ["/health", "/metrics"]:
-            return await call_next(request)
-        
-        # Initialize Redis connection if needed
-        if not self.redis:
-            try:
-                self.redis = aioredis.from_url(settings.redis_url)
-            except Exception as e:
-                logger.warning("Redis not available for rate limiting", error=str(e))
-                return await call_next(request)
-        
-        # Determine rate limit key (prefer tenant over IP for security)
-        tenant_id = getattr(request.state, 'tenant_id', None)
-        if tenant_id:
-            rate_limit_key = f"rate_limit:tenant:{tenant_id}"
-        else:
-            # Use a generic key for unauthenticated requests
-            rate_limit_key = "rate_limit:anonymous"
-        
-        # Check rate limit
-        try:
-            current_requests = await self._check_rate_limit(rate_limit_key)
-            
-            if current_requests > settings.rate_limit_calls_per_minute:
-                logger.warning(
-                    "Rate limit exceeded",
-                    key=rate_limit_key,
-                    current_requests=current_requests,
-                    limit=settings.rate_limit_calls_per_minute
-                )
-                
-                return JSONResponse(
-                    status_code=429,
-                    content={
-                        "error": "Rate limit exceeded",
-                        "message": "Too many requests. Please try again later.",
-                        "retry_after": 60
-                    },
-                    headers={"Retry-After": "60"}
-                )
-            
-        except Exception as e:
-            logger.error("Rate limiting error", error=str(e))
-            # Continue without rate limiting if Redis fails
-        
-        return await call_next(request)
-    
-    async def _check_rate_limit(self, key: str) -> int:
-        """
-        Check and update rate limit using sliding window algorithm.
-        
-        Returns:
-            int: Current request count in the window
-        """
-        now = int(time.time())
-        window_start = now - 60  # 1-minute window
-        
-        # Use Redis pipeline for atomic operations
-        pipe = self.redis.pipeline()
-        
-        # Remove old entries
-        pipe.zremrangebyscore(key, 0, window_start)
-        
-        # Add current request
-        pipe.zadd(key, {str(uuid.uuid4()): now})
-        
-        # Count requests in window
-        pipe.zcard(key)
-        
-        # Set expiration
-        pipe.expire(key, 120)  # Keep data for 2 minutes
-        
-        results = await pipe.execute()
-        return results[2]  # Request count
-
-
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+
+def default_pipeline_stages() -> List[PipelineStage]:
+    """Stages used by the application, in request order."""
+    return [
+        CorrelationStage(),
+        AuthStage(),
+        TenantStage(),
+        RateLimitStage(),
+        SecurityHeadersStage(),
+    ]
+
+
+class RequestPipelineMiddleware:
     """
-    Middleware for comprehensive request/response logging.
-    
-    Logs all API requests with security-compliant data sanitization.
-    Does NOT log IP addresses or location data per security requirements.
+    Single-pass pure-ASGI middleware running all request stages.
+
+    Unlike stacked ``BaseHTTPMiddleware`` layers this adds no extra task
+    or body stream per concern: stages run inline on the request, and
+    response headers are applied once when the response starts.
+
+    The application runs inside a database unit of work, so every
+    service the request calls shares one session (opened only if used).
+    The unit is committed before the response starts, so a client never
+    sees a success whose writes then fail to commit; anything written
+    afterwards, such as by background tasks, is committed at the end.
     """
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        start_time = time.time()
-        
-        # Log request start (without sensitive data)
-        logger.info(
-            "Request started",
-            method=request.method,
-            path=str(request.url.path),
-            query_params=dict(request.query_params),
-            user_agent=request.headers.get("user-agent", "unknown"),
-            content_type=request.headers.get("content-type"),
-            tenant_id=getattr(request.state, 'tenant_id', None),
-            correlation_id=getattr(request.state, 'correlation_id', None)
-        )
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Calculate processing time
-        process_time = time.time() - start_time
-        
-        # Log request completion
+
+    def __init__(self, app: ASGIApp, stages: Optional[Sequence[PipelineStage]] = None):
+        self.app = app
+        self.stages = list(stages) if stages is not None else default_pipeline_stages()
+        self._response_stages = list(reversed(self.stages))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        context = RequestContext()
+        request.state.request_context = context
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                context.status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                for stage in self._response_stages:
+                    stage.on_response(context, headers)
+            await send(message)
+
+        for stage in self.stages:
+            response = await stage.on_request(context, request)
+            if response is not None:
+                await response(scope, receive, send_with_headers)
+                self._log_completion(context, request)
+                return
+
+        async with unit_of_work(correlation_id=context.correlation_id) as unit:
+            context.db_stats = unit.stats
+
+            async def send_after_commit(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    await unit.commit()
+                await send_with_headers(message)
+
+            await self.app(scope, receive, send_after_commit)
+        self._log_completion(context, request)
+
+    @staticmethod
+    def _log_completion(context: RequestContext, request: Request) -> None:
+        """Log request completion without IP addresses or location data."""
         logger.info(
             "Request completed",
             method=request.method,
-            path=str(request.url.path),
-            status_code=response.status_code,
-            process_time_ms=round(process_time * 1000, 2),
-            response_size=response.headers.get("content-length", "unknown"),
-            tenant_id=getattr(request.state, 'tenant_id', None),
-            correlation_id=getattr(request.state, 'correlation_id', None)
+            path=request.url.path,
+            status_code=context.status_code,
+            process_time_ms=round((time.perf_counter() - context.start_time) * 1000, 2),
+            tenant_id=context.tenant_id,
+            db_sessions=context.db_stats.sessions if context.db_stats else 0,
+            db_round_trips=context.db_stats.round_trips if context.db_stats else 0,
+            db_query_time_ms=round(context.db_stats.query_time_ms, 2) if context.db_stats else 0.0,
+            correlation_id=context.correlation_id
         )
-        
-        return response
\ No newline at end of file
@@ -69,14 +69,25 @@ from .callback import (
 from .billing import (
     CreditPlan,
     TenantSubscription,
-    UsageRecord,
-    CreditTransaction,
-    BillingAlert,
-    PlanType,
-    UsageType,
-    BillingStatus
+    CreditUsage,
+    CreditBalance,
+    Invoice,
+    PaymentTransaction,
+    CreditAlert
 )
 
+# Data export job models
+from .export_job import ExportJob, ExportJobStatus
+
+# Materialized report result models
+from .report_result import ReportResultPartition, ReportRun
+
+# Analytics anomaly models
+from .anomaly import AnalyticsAnomaly
+
+# Per-tenant statistics models
+from .tenant_stats import TenantStats, TenantDailyCallStats
+
 # AI Personality models (v2.0)
 from .ai_personality import (
     AIPersonality,
@@ -162,12 +173,26 @@ __all__ = [
     # Billing models
     "CreditPlan",
     "TenantSubscription",
-    "UsageRecord",
-    "CreditTransaction",
-    "BillingAlert",
-    "PlanType",
-    "UsageType",
-    "BillingStatus",
+    "CreditUsage",
+    "CreditBalance",
+    "Invoice",
+    "PaymentTransaction",
+    "CreditAlert",
+    
+    # Data export job models
+    "ExportJob",
+    "ExportJobStatus",
+    
+    # Materialized report result models
+    "ReportResultPartition",
+    "ReportRun",
+    
+    # Analytics anomaly models
+    "AnalyticsAnomaly",
+    
+    # Per-tenant statistics models
+    "TenantStats",
+    "TenantDailyCallStats",
     
     # AI Personality models (v2.0)
     "AIPersonality",
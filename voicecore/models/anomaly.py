@@ -0,0 +1,83 @@
+"""
+Analytics anomaly models for VoiceCore AI.
+
+Anomalies found in tenants' call analytics series by the batch anomaly
+detection job, read by BI dashboard insights.
+"""
+
+from sqlalchemy import Column, String, Float, DateTime, Index, UniqueConstraint
+
+from .base import BaseModel, TimestampMixin, TenantMixin
+
+
+class AnalyticsAnomaly(BaseModel, TimestampMixin, TenantMixin):
+    """
+    An anomalous point, or change point, in a tenant's analytics series.
+
+    Each detection run replaces the anomalies of the window it evaluated,
+    so a point has at most one row per metric and detector.
+    """
+
+    __tablename__ = "analytics_anomalies"
+
+    metric = Column(
+        String(50),
+        nullable=False,
+        doc="Series the anomaly was found in (total_calls, answer_rate, ...)"
+    )
+
+    granularity = Column(
+        String(10),
+        nullable=False,
+        doc="hour or day"
+    )
+
+    detector = Column(
+        String(20),
+        nullable=False,
+        doc="seasonal, ewma or change_point"
+    )
+
+    period_start = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        doc="Start of the anomalous hour or day (UTC); for change points, the first day of the new level"
+    )
+
+    value = Column(
+        Float,
+        nullable=False,
+        doc="Observed value"
+    )
+
+    expected = Column(
+        Float,
+        nullable=False,
+        doc="Baseline value the observation was compared against"
+    )
+
+    score = Column(
+        Float,
+        nullable=False,
+        doc="Signed detector score; its magnitude is compared with the detector's threshold"
+    )
+
+    severity = Column(
+        String(20),
+        nullable=False,
+        doc="medium or high"
+    )
+
+    detected_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        doc="When the detection run that found the anomaly ran"
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "tenant_id", "metric", "detector", "period_start",
+            name="uq_analytics_anomalies_point"
+        ),
+        Index("idx_analytics_anomalies_period", "tenant_id", "period_start"),
+    )
@@ -0,0 +1,197 @@
+"""
+Export job models for VoiceCore AI.
+
+Persists data export jobs so queued and running exports survive a
+restart. Rows double as the work queue: workers claim pending jobs,
+heartbeat while they run and record checkpoints from which an
+interrupted export resumes.
+"""
+
+from sqlalchemy import Column, String, Integer, BigInteger, Boolean, JSON, DateTime, Text, Index
+
+from .base import BaseModel, TimestampMixin, TenantMixin
+
+
+class ExportJobStatus:
+    """Export job status values."""
+    PENDING = "pending"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    FINISHED = (COMPLETED, FAILED, CANCELLED)
+
+
+class ExportJob(BaseModel, TimestampMixin, TenantMixin):
+    """
+    Data export job and its progress.
+
+    Not covered by row-level security: workers claim jobs across
+    tenants, so every tenant-facing query filters on tenant_id itself.
+    """
+
+    __tablename__ = "export_jobs"
+
+    # Request
+    data_type = Column(
+        String(50),
+        nullable=False,
+        doc="Type of data to export"
+    )
+
+    format = Column(
+        String(20),
+        nullable=False,
+        doc="Export format"
+    )
+
+    filters = Column(
+        JSON,
+        default=dict,
+        nullable=False,
+        doc="Data filters"
+    )
+
+    date_start = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        doc="Start of the exported date range"
+    )
+
+    date_end = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        doc="End of the exported date range"
+    )
+
+    partition_by_date = Column(
+        Boolean,
+        default=False,
+        nullable=False,
+        doc="Write Parquet output as one directory per day"
+    )
+
+    # Scheduling
+    status = Column(
+        String(20),
+        default="pending",
+        nullable=False,
+        doc="pending, processing, completed, failed or cancelled"
+    )
+
+    priority = Column(
+        Integer,
+        default=0,
+        nullable=False,
+        doc="Higher priority jobs are claimed before the tenant's other jobs"
+    )
+
+    attempts = Column(
+        Integer,
+        default=0,
+        nullable=False,
+        doc="Times a worker has claimed the job"
+    )
+
+    worker_id = Column(
+        String(255),
+        nullable=True,
+        doc="Worker currently running the job"
+    )
+
+    heartbeat_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        doc="Last progress report from the worker"
+    )
+
+    cancel_requested = Column(
+        Boolean,
+        default=False,
+        nullable=False,
+        doc="Cancellation requested while the job was running"
+    )
+
+    started_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        doc="When a worker first claimed the job"
+    )
+
+    completed_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        doc="When the job finished"
+    )
+
+    # Progress and resume checkpoint
+    total_rows = Column(
+        Integer,
+        nullable=True,
+        doc="Rows the export will contain"
+    )
+
+    rows_exported = Column(
+        Integer,
+        default=0,
+        nullable=False,
+        doc="Rows written as of the last checkpoint"
+    )
+
+    bytes_encoded = Column(
+        BigInteger,
+        default=0,
+        nullable=False,
+        doc="Uncompressed bytes written"
+    )
+
+    checkpoint_offset = Column(
+        BigInteger,
+        default=0,
+        nullable=False,
+        doc="Length of the output file at the last checkpoint"
+    )
+
+    resume_key = Column(
+        JSON,
+        nullable=True,
+        doc="Sort key of the last row written at the last checkpoint"
+    )
+
+    # Result
+    file_path = Column(
+        String(500),
+        nullable=True,
+        doc="Output file"
+    )
+
+    file_size = Column(
+        BigInteger,
+        nullable=True,
+        doc="Output file size in bytes"
+    )
+
+    content_type = Column(
+        String(100),
+        nullable=True,
+        doc="MIME type of the output"
+    )
+
+    compressed = Column(
+        Boolean,
+        default=False,
+        nullable=False,
+        doc="Whether the output is gzip-compressed"
+    )
+
+    error_message = Column(
+        Text,
+        nullable=True,
+        doc="Failure reason"
+    )
+
+    __table_args__ = (
+        Index("idx_export_jobs_claim", "status", "priority", "created_at"),
+        Index("idx_export_jobs_tenant_created", "tenant_id", "created_at"),
+    )
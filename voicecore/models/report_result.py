@@ -0,0 +1,146 @@
+"""
+Report result models for VoiceCore AI.
+
+Materialized report results: per-day partitions of a report definition,
+reused once the day is closed, and the stored output of scheduled
+report runs.
+"""
+
+from sqlalchemy import Column, String, Integer, Float, JSON, Date, DateTime, Text, Index, UniqueConstraint
+
+from .base import BaseModel, TimestampMixin, TenantMixin
+
+
+class ReportResultPartition(BaseModel, TimestampMixin, TenantMixin):
+    """
+    One day of a report's results.
+
+    Keyed by the hash of the report definition (see
+    report_query_compiler.definition_hash) and the day, so reports with
+    the same definition share partitions.
+    """
+
+    __tablename__ = "report_result_partitions"
+
+    definition_hash = Column(
+        String(64),
+        nullable=False,
+        doc="Hash of the report definition"
+    )
+
+    partition_date = Column(
+        Date,
+        nullable=False,
+        doc="Day the rows cover"
+    )
+
+    rows = Column(
+        JSON,
+        nullable=False,
+        doc="Result rows for the day"
+    )
+
+    row_count = Column(
+        Integer,
+        default=0,
+        nullable=False,
+        doc="Number of rows"
+    )
+
+    computed_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        doc="When the rows were computed; later changes to the day's calls invalidate them"
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "tenant_id", "definition_hash", "partition_date",
+            name="uq_report_result_partitions_key"
+        ),
+    )
+
+
+class ReportRun(BaseModel, TimestampMixin, TenantMixin):
+    """Stored output of a scheduled report run."""
+
+    __tablename__ = "report_runs"
+
+    schedule_id = Column(
+        String(100),
+        nullable=False,
+        doc="Schedule that triggered the run"
+    )
+
+    report_id = Column(
+        String(100),
+        nullable=False,
+        doc="Report that was run"
+    )
+
+    definition_hash = Column(
+        String(64),
+        nullable=True,
+        doc="Hash of the report definition at run time"
+    )
+
+    start_date = Column(
+        Date,
+        nullable=False,
+        doc="First day of the report period"
+    )
+
+    end_date = Column(
+        Date,
+        nullable=False,
+        doc="Last day of the report period"
+    )
+
+    status = Column(
+        String(20),
+        nullable=False,
+        doc="completed or failed"
+    )
+
+    rows = Column(
+        JSON,
+        nullable=True,
+        doc="Result rows"
+    )
+
+    row_count = Column(
+        Integer,
+        default=0,
+        nullable=False,
+        doc="Number of rows"
+    )
+
+    partitions_reused = Column(
+        Integer,
+        default=0,
+        nullable=False,
+        doc="Days served from materialized partitions"
+    )
+
+    partitions_computed = Column(
+        Integer,
+        default=0,
+        nullable=False,
+        doc="Days computed from raw calls"
+    )
+
+    duration_ms = Column(
+        Float,
+        nullable=True,
+        doc="Run time in milliseconds"
+    )
+
+    error_message = Column(
+        Text,
+        nullable=True,
+        doc="Failure reason"
+    )
+
+    __table_args__ = (
+        Index("idx_report_runs_schedule", "tenant_id", "schedule_id", "created_at"),
+    )
@@ -0,0 +1,98 @@
+"""
+Per-tenant statistics models for VoiceCore AI.
+
+Counters maintained incrementally by database triggers on ``agents`` and
+``calls`` (migration 013), so the super admin console reads tenant and
+system-wide figures without scanning either table.
+"""
+
+from sqlalchemy import Column, Integer, BigInteger, SmallInteger, Date, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from .base import Base
+
+
+class TenantStats(Base):
+    """Agent counters of a tenant."""
+
+    __tablename__ = "tenant_stats"
+
+    tenant_id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        doc="Tenant the counters belong to"
+    )
+
+    total_agents = Column(
+        Integer,
+        default=0,
+        nullable=False,
+        doc="Agents of the tenant"
+    )
+
+    active_agents = Column(
+        Integer,
+        default=0,
+        nullable=False,
+        doc="Agents with is_active set"
+    )
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        doc="When the counters last changed"
+    )
+
+
+class TenantDailyCallStats(Base):
+    """
+    Call counters of a tenant for one UTC day, split over slots.
+
+    Every call of a tenant on a day would otherwise update the same row,
+    so the trigger adds each change to one of a few slots at random and
+    readers sum a day's slots. Monthly figures stay a short range scan
+    of the primary key.
+    """
+
+    __tablename__ = "tenant_daily_call_stats"
+
+    tenant_id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        doc="Tenant the counters belong to"
+    )
+
+    day = Column(
+        Date,
+        primary_key=True,
+        doc="UTC day of the calls' created_at"
+    )
+
+    slot = Column(
+        SmallInteger,
+        primary_key=True,
+        default=0,
+        doc="Counter slot the trigger picked; sum over slots for the day's figures"
+    )
+
+    calls = Column(
+        Integer,
+        default=0,
+        nullable=False,
+        doc="Calls created on the day, in this slot"
+    )
+
+    duration_total = Column(
+        BigInteger,
+        default=0,
+        nullable=False,
+        doc="Sum of the calls' durations in seconds"
+    )
+
+    last_call_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        doc="created_at of the slot's latest call on the day"
+    )
@@ -11,7 +11,9 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 
 from voicecore.database import get_db_session, set_tenant_context
-from voicecore.models import Tenant, Agent, Call, CallStatus, CallDirection
+from voicecore.models import (
+    Tenant, Agent, Call, CallStatus, CallDirection, TenantStats, TenantDailyCallStats
+)
 from voicecore.logging import get_logger
 from voicecore.config import settings
 from voicecore.services.tenant_service import TenantService
@@ -19,6 +21,12 @@ from voicecore.services.tenant_service import TenantService
 
 logger = get_logger(__name__)
 
+tenants = Tenant.__table__
+agents = Agent.__table__
+calls = Call.__table__
+tenant_stats = TenantStats.__table__
+daily_call_stats = TenantDailyCallStats.__table__
+
 
 @dataclass
 class SystemMetrics:
@@ -167,54 +175,39 @@ class AdminService:
         """
         Get comprehensive system metrics.
         
+        Agent and call figures come from the per-tenant statistics
+        tables, in one statement.
+        
         Returns:
             SystemMetrics: Current system metrics
         """
         try:
             async with get_db_session() as session:
-                from sqlalchemy import select, func, and_
-                
-                # Get tenant metrics
-                tenant_result = await session.execute(
-                    select(
-                        func.count(Tenant.id).label('total_tenants'),
-                        func.count(Tenant.id).filter(Tenant.is_active == True).label('active_tenants')
-                    )
-                )
-                tenant_metrics = tenant_result.first()
+                from sqlalchemy import select, func, case
                 
-                # Get agent metrics
-                agent_result = await session.execute(
-                    select(
-                        func.count(Agent.id).label('total_agents'),
-                        func.count(Agent.id).filter(Agent.is_active == True).label('active_agents')
-                    )
-                )
-                agent_metrics = agent_result.first()
-                
-                # Get call metrics for today
                 today = datetime.utcnow().date()
-                today_start = datetime.combine(today, datetime.min.time())
+                month_start = today.replace(day=1)
                 
-                calls_today_result = await session.execute(
-                    select(func.count(Call.id)).where(
-                        Call.created_at >= today_start
-                    )
-                )
-                calls_today = calls_today_result.scalar() or 0
+                tenant_counts = select(
+                    func.count().label('total_tenants'),
+                    func.count().filter(tenants.c.is_active == True).label('active_tenants')
+                ).subquery()
                 
-                # Get call metrics for this month
-                month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+                agent_counts = select(
+                    func.coalesce(func.sum(tenant_stats.c.total_agents), 0).label('total_agents'),
+                    func.coalesce(func.sum(tenant_stats.c.active_agents), 0).label('active_agents')
+                ).subquery()
                 
-                calls_month_result = await session.execute(
-                    select(
-                        func.count(Call.id).label('total_calls'),
-                        func.avg(Call.duration).label('avg_duration')
-                    ).where(
-                        Call.created_at >= month_start
-                    )
-                )
-                calls_month = calls_month_result.first()
+                call_counts = select(
+                    func.coalesce(
+                        func.sum(case((daily_call_stats.c.day == today, daily_call_stats.c.calls), else_=0)), 0
+                    ).label('calls_today'),
+                    func.coalesce(func.sum(daily_call_stats.c.calls), 0).label('calls_this_month'),
+                    func.coalesce(func.sum(daily_call_stats.c.duration_total), 0).label('duration_this_month')
+                ).where(daily_call_stats.c.day >= month_start).subquery()
+                
+                result = await session.execute(select(tenant_counts, agent_counts, call_counts))
+                metrics = result.first()
                 
                 # Calculate system uptime (simplified - would use actual uptime in production)
                 uptime_hours = 24.0  # Placeholder
@@ -224,14 +217,18 @@ class AdminService:
                 api_requests_per_minute = 150.0  # Placeholder
                 error_rate_percentage = 0.1  # Placeholder
                 
+                calls_this_month = int(metrics.calls_this_month)
+                
                 return SystemMetrics(
-                    total_tenants=tenant_metrics.total_tenants or 0,
-                    active_tenants=tenant_metrics.active_tenants or 0,
-                    total_agents=agent_metrics.total_agents or 0,
-                    active_agents=agent_metrics.active_agents or 0,
-                    total_calls_today=calls_today,
-                    total_calls_this_month=calls_month.total_calls or 0,
-                    average_call_duration=float(calls_month.avg_duration or 0),
+                    total_tenants=metrics.total_tenants or 0,
+                    active_tenants=metrics.active_tenants or 0,
+                    total_agents=int(metrics.total_agents),
+                    active_agents=int(metrics.active_agents),
+                    total_calls_today=int(metrics.calls_today),
+                    total_calls_this_month=calls_this_month,
+                    average_call_duration=(
+                        float(metrics.duration_this_month) / calls_this_month if calls_this_month else 0.0
+                    ),
                     system_uptime_hours=uptime_hours,
                     storage_usage_gb=storage_usage_gb,
                     api_requests_per_minute=api_requests_per_minute,
@@ -251,6 +248,10 @@ class AdminService:
         """
         Get summary information for all tenants.
         
+        The page is one statement: tenants joined to their agent
+        counters, with this month's calls and the last call looked up
+        per tenant in the daily call counters' primary key.
+        
         Args:
             limit: Maximum number of tenants to return
             offset: Number of tenants to skip
@@ -261,75 +262,79 @@ class AdminService:
         """
         try:
             async with get_db_session() as session:
-                from sqlalchemy import select, func, and_, desc
+                from sqlalchemy import select, func, desc
+                
+                month_start = datetime.utcnow().date().replace(day=1)
                 
-                # Base query for tenants
-                query = select(Tenant)
+                calls_this_month = (
+                    select(func.coalesce(func.sum(daily_call_stats.c.calls), 0))
+                    .where(
+                        daily_call_stats.c.tenant_id == tenants.c.id,
+                        daily_call_stats.c.day >= month_start
+                    )
+                    .scalar_subquery()
+                )
+                
+                # Latest call across the slots of the tenant's latest day;
+                # slots only written by removals have no call time
+                last_activity = (
+                    select(daily_call_stats.c.last_call_at)
+                    .where(daily_call_stats.c.tenant_id == tenants.c.id)
+                    .order_by(
+                        daily_call_stats.c.day.desc(),
+                        daily_call_stats.c.last_call_at.desc().nulls_last()
+                    )
+                    .limit(1)
+                    .scalar_subquery()
+                )
+                
+                query = (
+                    select(
+                        tenants.c.id,
+                        tenants.c.name,
+                        tenants.c.is_active,
+                        tenants.c.created_at,
+                        func.coalesce(tenant_stats.c.total_agents, 0).label('total_agents'),
+                        func.coalesce(tenant_stats.c.active_agents, 0).label('active_agents'),
+                        calls_this_month.label('calls_this_month'),
+                        last_activity.label('last_activity')
+                    )
+                    .select_from(
+                        tenants.outerjoin(tenant_stats, tenant_stats.c.tenant_id == tenants.c.id)
+                    )
+                )
                 
                 if status_filter:
                     if status_filter == "active":
-                        query = query.where(Tenant.is_active == True)
+                        query = query.where(tenants.c.is_active == True)
                     elif status_filter == "inactive":
-                        query = query.where(Tenant.is_active == False)
+                        query = query.where(tenants.c.is_active == False)
                 
-                query = query.order_by(desc(Tenant.created_at)).limit(limit).offset(offset)
+                query = query.order_by(desc(tenants.c.created_at)).limit(limit).offset(offset)
                 
-                tenant_result = await session.execute(query)
-                tenants = tenant_result.scalars().all()
+                result = await session.execute(query)
                 
                 tenant_summaries = []
                 
-                for tenant in tenants:
-                    # Get agent count for tenant
-                    await set_tenant_context(session, str(tenant.id))
-                    
-                    agent_result = await session.execute(
-                        select(
-                            func.count(Agent.id).label('total_agents'),
-                            func.count(Agent.id).filter(Agent.is_active == True).label('active_agents')
-                        ).where(Agent.tenant_id == tenant.id)
-                    )
-                    agent_metrics = agent_result.first()
-                    
-                    # Get call count for this month
-                    month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-                    
-                    calls_result = await session.execute(
-                        select(func.count(Call.id)).where(
-                            and_(
-                                Call.tenant_id == tenant.id,
-                                Call.created_at >= month_start
-                            )
-                        )
-                    )
-                    calls_this_month = calls_result.scalar() or 0
-                    
-                    # Get last activity (most recent call)
-                    last_activity_result = await session.execute(
-                        select(func.max(Call.created_at)).where(
-                            Call.tenant_id == tenant.id
-                        )
-                    )
-                    last_activity = last_activity_result.scalar()
+                for row in result:
+                    calls_count = int(row.calls_this_month or 0)
                     
                     # Calculate storage usage and cost (simplified)
-                    storage_usage_mb = calls_this_month * 2.5  # Estimate 2.5MB per call
-                    monthly_cost_cents = calls_this_month * 10  # Estimate 10 cents per call
+                    storage_usage_mb = calls_count * 2.5  # Estimate 2.5MB per call
+                    monthly_cost_cents = calls_count * 10  # Estimate 10 cents per call
                     
-                    tenant_summary = TenantSummary(
-                        tenant_id=tenant.id,
-                        company_name=tenant.company_name,
-                        status="active" if tenant.is_active else "inactive",
-                        created_at=tenant.created_at,
-                        last_activity=last_activity,
-                        total_agents=agent_metrics.total_agents or 0,
-                        active_agents=agent_metrics.active_agents or 0,
-                        calls_this_month=calls_this_month,
+                    tenant_summaries.append(TenantSummary(
+                        tenant_id=row.id,
+                        company_name=row.name,
+                        status="active" if row.is_active else "inactive",
+                        created_at=row.created_at,
+                        last_activity=row.last_activity,
+                        total_agents=row.total_agents,
+                        active_agents=row.active_agents,
+                        calls_this_month=calls_count,
                         storage_usage_mb=storage_usage_mb,
                         monthly_cost_cents=monthly_cost_cents
-                    )
-                    
-                    tenant_summaries.append(tenant_summary)
+                    ))
                 
                 return tenant_summaries
                 
@@ -337,6 +342,63 @@ class AdminService:
             self.logger.error("Failed to get tenants summary", error=str(e))
             raise AdminServiceError(f"Failed to get tenants summary: {str(e)}")
     
+    async def rebuild_tenant_stats(self) -> Dict[str, int]:
+        """
+        Recompute the per-tenant statistics from agents and calls.
+        
+        The tables are kept current by database triggers; this
+        reconciles them after direct data fixes, and corrects the last
+        call time of days whose latest call was deleted.
+        
+        Returns:
+            Dict with the number of tenant and daily rows written
+        """
+        try:
+            async with get_db_session(independent=True) as session:
+                from sqlalchemy import select, func, delete, insert, literal, text
+                
+                if session.get_bind().dialect.name == "postgresql":
+                    # Keep writers out so no call lands between delete and recount
+                    await session.execute(text("LOCK TABLE agents, calls IN SHARE MODE"))
+                
+                await session.execute(delete(tenant_stats))
+                await session.execute(delete(daily_call_stats))
+                
+                agent_rows = await session.execute(
+                    insert(tenant_stats).from_select(
+                        ['tenant_id', 'total_agents', 'active_agents', 'updated_at'],
+                        select(
+                            agents.c.tenant_id,
+                            func.count(),
+                            func.count().filter(agents.c.is_active == True),
+                            func.now()
+                        ).group_by(agents.c.tenant_id)
+                    )
+                )
+                
+                call_day = func.date(calls.c.created_at)
+                call_rows = await session.execute(
+                    insert(daily_call_stats).from_select(
+                        ['tenant_id', 'day', 'slot', 'calls', 'duration_total', 'last_call_at'],
+                        select(
+                            calls.c.tenant_id,
+                            call_day,
+                            literal(0),
+                            func.count(),
+                            func.coalesce(func.sum(calls.c.duration), 0),
+                            func.max(calls.c.created_at)
+                        ).group_by(calls.c.tenant_id, call_day)
+                    )
+                )
+                
+                counts = {"tenants": agent_rows.rowcount, "days": call_rows.rowcount}
+                self.logger.info("Tenant statistics rebuilt", **counts)
+                return counts
+                
+        except Exception as e:
+            self.logger.error("Failed to rebuild tenant statistics", error=str(e))
+            raise AdminServiceError(f"Failed to rebuild tenant statistics: {str(e)}")
+    
     async def create_tenant_as_admin(
         self,
         company_name: str,
@@ -0,0 +1,264 @@
+"""
+Shared analytics frames for BI dashboards.
+
+A frame holds a tenant's calls aggregated per day, loaded with one
+grouped query over every date range a dashboard needs (the period and
+the period it is compared against). Key metrics, KPIs, trends and
+comparisons are then computed from the frame in memory.
+
+The frame is read from ``calls`` with the report builder's measure
+definitions, rather than from pre-aggregated call analytics rows, which
+this schema does not have.
+
+Finished dashboards are memoized per tenant and period for the call
+analytics collection interval, which bounds how far they lag new calls.
+"""
+
+import time
+import asyncio
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, case, func, or_, select
+
+from voicecore.services.report_query_compiler import FIELDS, calls
+from voicecore.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+DateRange = Tuple[date, date]
+
+FRAME_COLUMNS = (
+    "total_calls",
+    "answered_calls",
+    "missed_calls",
+    "ai_handled_calls",
+    "ai_resolved_calls",
+    "total_cost_cents",
+    "satisfaction_responses",
+    "satisfaction_points",
+    "vip_calls",
+    "escalated_calls",
+)
+
+
+def previous_period(start_date: date, end_date: date) -> DateRange:
+    """The equally long period immediately before a date range."""
+    days = (end_date - start_date).days + 1
+    return start_date - timedelta(days=days), start_date - timedelta(days=1)
+
+
+def merge_ranges(ranges: Iterable[DateRange]) -> List[DateRange]:
+    """Sort date ranges and merge those that overlap or touch."""
+    merged: List[DateRange] = []
+    for start_date, end_date in sorted(ranges):
+        if merged and start_date <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end_date))
+        else:
+            merged.append((start_date, end_date))
+    return merged
+
+
+def _count_where(condition):
+    return func.sum(case((condition, 1), else_=0))
+
+
+def frame_query(tenant_id: uuid.UUID, ranges: Iterable[DateRange]):
+    """Per-day sums over a tenant's calls in the given date ranges."""
+    day = FIELDS["date"].expression
+    sums = {
+        "total_calls": FIELDS["total_calls"].expression,
+        "answered_calls": FIELDS["answered_calls"].expression,
+        "missed_calls": FIELDS["missed_calls"].expression,
+        "ai_handled_calls": FIELDS["ai_handled_calls"].expression,
+        "ai_resolved_calls": FIELDS["ai_resolved"].expression,
+        "total_cost_cents": func.sum(calls.c.cost_cents),
+        "satisfaction_responses": func.count(calls.c.customer_satisfaction),
+        # Summed scores rather than averages, so they combine across days
+        "satisfaction_points": func.sum(calls.c.customer_satisfaction),
+        "vip_calls": _count_where(calls.c.is_vip.is_(True)),
+        "escalated_calls": _count_where(calls.c.escalation_triggered.is_(True)),
+    }
+    return (
+        select(
+            day.label("date"),
+            *(func.coalesce(expression, 0).label(name) for name, expression in sums.items())
+        )
+        .where(
+            calls.c.tenant_id == tenant_id,
+            or_(*(
+                and_(
+                    calls.c.created_at >= datetime.combine(start_date, datetime.min.time()),
+                    calls.c.created_at < datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+                )
+                for start_date, end_date in merge_ranges(ranges)
+            ))
+        )
+        .group_by(day)
+        .order_by(day)
+    )
+
+
+class MetricsFrame:
+    """
+    A tenant's calls aggregated per day.
+
+    Args:
+        days: Totals per day, keyed by FRAME_COLUMNS
+    """
+
+    def __init__(self, days: Dict[date, Dict[str, float]]):
+        self.days = days
+
+    @classmethod
+    async def load(cls, session, tenant_id: uuid.UUID, ranges: Iterable[DateRange]) -> "MetricsFrame":
+        """Load the frame for the given date ranges in one query."""
+        result = await session.execute(frame_query(tenant_id, ranges))
+        return cls({
+            row.date: {name: float(getattr(row, name) or 0) for name in FRAME_COLUMNS}
+            for row in result
+        })
+
+    def _days_between(self, start_date: date, end_date: date) -> List[Tuple[date, Dict[str, float]]]:
+        return sorted(
+            (day, totals) for day, totals in self.days.items()
+            if start_date <= day <= end_date
+        )
+
+    def totals(self, start_date: date, end_date: date) -> Dict[str, float]:
+        """Column totals over a date range."""
+        totals = dict.fromkeys(FRAME_COLUMNS, 0.0)
+        for _, day_totals in self._days_between(start_date, end_date):
+            for name in FRAME_COLUMNS:
+                totals[name] += day_totals[name]
+        return totals
+
+    def key_metrics(self, start_date: date, end_date: date) -> Dict[str, Any]:
+        """Key business metrics over a date range."""
+        totals = self.totals(start_date, end_date)
+        total_calls = int(totals["total_calls"])
+        answered_calls = int(totals["answered_calls"])
+        ai_handled = int(totals["ai_handled_calls"])
+        ai_resolved = int(totals["ai_resolved_calls"])
+        responses = totals["satisfaction_responses"]
+
+        return {
+            "total_calls": total_calls,
+            "answered_calls": answered_calls,
+            "missed_calls": int(totals["missed_calls"]),
+            "answer_rate": answered_calls / max(1, total_calls),
+            "ai_handled_calls": ai_handled,
+            "ai_resolved_calls": ai_resolved,
+            "ai_resolution_rate": ai_resolved / max(1, ai_handled),
+            "total_revenue": totals["total_cost_cents"] / 100,
+            "average_satisfaction": totals["satisfaction_points"] / responses if responses > 0 else 0.0,
+            "vip_calls": int(totals["vip_calls"]),
+            "escalated_calls": int(totals["escalated_calls"])
+        }
+
+    def trends(self, start_date: date, end_date: date) -> Dict[str, List[Dict[str, Any]]]:
+        """Daily time series over a date range."""
+        call_volume = []
+        satisfaction = []
+        ai_performance = []
+
+        for day, totals in self._days_between(start_date, end_date):
+            call_volume.append({
+                "date": day.isoformat(),
+                "total_calls": int(totals["total_calls"]),
+                "answered_calls": int(totals["answered_calls"])
+            })
+
+            if totals["satisfaction_responses"] > 0 and totals["satisfaction_points"] > 0:
+                satisfaction.append({
+                    "date": day.isoformat(),
+                    "satisfaction": totals["satisfaction_points"] / totals["satisfaction_responses"]
+                })
+
+            if totals["ai_handled_calls"] > 0:
+                ai_performance.append({
+                    "date": day.isoformat(),
+                    "ai_handled": int(totals["ai_handled_calls"]),
+                    "ai_resolved": int(totals["ai_resolved_calls"]),
+                    "resolution_rate": totals["ai_resolved_calls"] / totals["ai_handled_calls"]
+                })
+
+        return {
+            "call_volume": call_volume,
+            "satisfaction": satisfaction,
+            "ai_performance": ai_performance
+        }
+
+
+class DashboardMemo:
+    """
+    Per-process memo of computed dashboards.
+
+    Entries live for ``ttl_seconds``. Concurrent requests for a key
+    that is being computed wait for that computation instead of
+    starting their own; failures are not memoized.
+
+    Args:
+        ttl_seconds: How long a computed value is served
+        max_size: Entries kept before the oldest are evicted
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int = 5000):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the memoized value for a key, computing it if missing or expired.
+
+        Args:
+            key: Memo key; its first element is the tenant ID
+            compute: Coroutine function producing the value
+
+        Returns:
+            The memoized or freshly computed value
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        task = self._pending.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(compute())
+            self._pending[key] = task
+            task.add_done_callback(lambda done: self._store(key, done))
+
+        # A cancelled caller must not cancel a computation others wait on
+        return await asyncio.shield(task)
+
+    def invalidate(self, tenant_id: Optional[uuid.UUID] = None) -> int:
+        """
+        Drop memoized values, for one tenant or all.
+
+        Returns:
+            Number of entries dropped
+        """
+        keys = [key for key in self._entries if tenant_id is None or key[0] == tenant_id]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def _store(self, key: Hashable, task: asyncio.Future) -> None:
+        self._pending.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        if key not in self._entries and len(self._entries) >= self.max_size:
+            # Evict the oldest insertion
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, task.result())
@@ -13,17 +13,27 @@ from sqlalchemy import select, and_, or_, func, update, delete, text
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import IntegrityError
 
-from voicecore.database import get_db_session, set_tenant_context
+from voicecore.database import get_db_session, get_read_session, set_tenant_context
 from voicecore.models import (
     CallAnalytics, AgentMetrics, SystemMetrics, ReportTemplate,
     Call, Agent, Department, CallStatus, AgentStatus, MetricType
 )
 from voicecore.logging import get_logger
+from voicecore.services.data_export_service import DataType, ExportFormat, data_export_service
 from voicecore.utils.security import SecurityUtils
 
 
 logger = get_logger(__name__)
 
+# Analytics exports written to files by DataExportService
+FILE_EXPORT_FORMATS = {"csv", "ndjson", "xml", "parquet"}
+FILE_EXPORT_DATA_TYPES = {
+    "calls": DataType.CALLS,
+    "agents": DataType.AGENTS,
+    "metrics": DataType.ANALYTICS,
+    "transcripts": DataType.TRANSCRIPTS,
+}
+
 
 class AnalyticsServiceError(Exception):
     """Base exception for analytics service errors."""
@@ -855,7 +865,7 @@ class AnalyticsService:
             Dict containing detailed call report data
         """
         try:
-            async with get_db_session() as session:
+            async with get_read_session() as session:
                 await set_tenant_context(session, str(tenant_id))
                 
                 # Build query with filters
@@ -960,7 +970,7 @@ class AnalyticsService:
             Dict containing detailed agent report data
         """
         try:
-            async with get_db_session() as session:
+            async with get_read_session() as session:
                 await set_tenant_context(session, str(tenant_id))
                 
                 # Get agents with filters
@@ -1097,7 +1107,7 @@ class AnalyticsService:
             Dict containing conversation analytics data
         """
         try:
-            async with get_db_session() as session:
+            async with get_read_session() as session:
                 await set_tenant_context(session, str(tenant_id))
                 
                 # Get calls with transcripts in the period
@@ -1271,7 +1281,7 @@ class AnalyticsService:
             Dict containing trend data
         """
         try:
-            async with get_db_session() as session:
+            async with get_read_session() as session:
                 await set_tenant_context(session, str(tenant_id))
                 
                 end_date = date.today()
@@ -1405,7 +1415,7 @@ class AnalyticsService:
             Dict containing AI performance insights
         """
         try:
-            async with get_db_session() as session:
+            async with get_read_session() as session:
                 await set_tenant_context(session, str(tenant_id))
                 
                 # Get AI-related call analytics
@@ -1500,6 +1510,10 @@ class AnalyticsService:
         """
         Export analytics data in various formats per Requirement 10.4.
         
+        JSON returns the report data. File formats (csv, ndjson, xml,
+        parquet) stream the rows for one data type to a file through
+        DataExportService.
+        
         Args:
             tenant_id: Tenant UUID
             data_type: Type of data to export
@@ -1508,9 +1522,14 @@ class AnalyticsService:
             format: Export format
             
         Returns:
-            Exported data in requested format
+            Report data for JSON, the finished ExportRequest for file formats
         """
         try:
+            if format.lower() in FILE_EXPORT_FORMATS:
+                return await self._export_analytics_file(
+                    tenant_id, data_type, start_date, end_date, format.lower()
+                )
+            
             if data_type == "calls":
                 data = await self.generate_call_report(tenant_id, start_date, end_date)
             elif data_type == "agents":
@@ -1540,6 +1559,32 @@ class AnalyticsService:
             )
             return {"error": "Failed to export analytics data"}
     
+    async def _export_analytics_file(
+        self,
+        tenant_id: uuid.UUID,
+        data_type: str,
+        start_date: date,
+        end_date: date,
+        format: str
+    ) -> Any:
+        """Run a file export for one analytics data type."""
+        export_data_type = FILE_EXPORT_DATA_TYPES.get(data_type)
+        if export_data_type is None:
+            return {"error": f"File export not available for data type: {data_type}"}
+        
+        export_request = await data_export_service.export_now(
+            tenant_id=tenant_id,
+            data_type=export_data_type,
+            format=ExportFormat(format),
+            date_range={
+                "start": datetime.combine(start_date, datetime.min.time()),
+                "end": datetime.combine(end_date, datetime.max.time())
+            }
+        )
+        if export_request.status != "completed":
+            return {"error": export_request.error_message or "Failed to export analytics data"}
+        return export_request
+    
     # Helper methods for new functionality
     
     def _analyze_sentiment(self, transcript: str) -> str:
@@ -0,0 +1,265 @@
+"""
+Vectorized anomaly detection over analytics series.
+
+Series are NumPy arrays shaped (series, time), one row per tenant, so
+every tenant is scored by the same array operations. Missing values are
+NaN (for example a rate on a day without calls).
+
+Three detectors:
+
+- Seasonal baseline: each point is compared with the median of the
+  same slot of the season (the same hour of the week) over the
+  preceding seasons, scaled by the median absolute deviation. Medians
+  and MADs are not pulled around by the outliers being looked for.
+- EWMA control chart: an exponentially weighted moving average against
+  control limits from the series' history, which catches small
+  sustained drifts that no single point shows.
+- Change point: the split of a series into two segments whose means
+  differ most, scored by a two-sample t statistic computed for every
+  split at once from cumulative sums.
+"""
+
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+
+
+HOURS_PER_WEEK = 168
+
+# Scales a median absolute deviation to a standard deviation for normal data
+MAD_SCALE = 1.4826
+
+
+@dataclass
+class Detection:
+    """
+    Points a detector flagged, as parallel arrays.
+
+    Attributes:
+        detector: Detector name
+        series: Row of each point
+        position: Column of each point
+        value: Observed value
+        expected: Baseline value
+        score: Signed score; positive when the value is above its baseline
+    """
+    detector: str
+    series: np.ndarray
+    position: np.ndarray
+    value: np.ndarray
+    expected: np.ndarray
+    score: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.series)
+
+
+def _flagged(detector: str, score: np.ndarray, threshold: float, value: np.ndarray,
+             expected: np.ndarray, offset: int = 0) -> Detection:
+    with np.errstate(invalid="ignore"):
+        mask = np.abs(score) >= threshold
+    series, position = np.nonzero(mask)
+    return Detection(
+        detector=detector,
+        series=series,
+        position=position + offset,
+        value=value[mask],
+        expected=expected[mask],
+        score=score[mask],
+    )
+
+
+def _nanmedian(values: np.ndarray, axis: int) -> np.ndarray:
+    with warnings.catch_warnings():
+        # Slots without any observation are NaN, which is what we want
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanmedian(values, axis=axis)
+
+
+def _anscombe(counts: np.ndarray) -> np.ndarray:
+    return 2.0 * np.sqrt(counts + 3.0 / 8.0)
+
+
+def seasonal_scores(history: np.ndarray, recent: np.ndarray, period: int = HOURS_PER_WEEK,
+                    poisson: bool = False, min_observations: int = 3):
+    """
+    Robust z-scores of recent points against seasonal medians.
+
+    Args:
+        history: (series, seasons * period) past values; column ``i``
+            falls in slot ``i % period``
+        recent: (series, points) values following ``history``, so
+            column ``j`` falls in slot ``j % period``
+        period: Slots per season
+        poisson: The values are counts. They are scored after the
+            Anscombe transform, which makes Poisson noise roughly unit
+            variance, and the scale is at least that noise, so quiet or
+            nearly constant slots do not flag a call or two
+        min_observations: Past values a slot needs before it is scored
+
+    Returns:
+        (expected, score) arrays shaped like ``recent``; scores are NaN
+        where the slot lacks history
+    """
+    rows, length = history.shape
+    if length % period:
+        raise ValueError("history must cover whole seasons")
+
+    seasons = history.reshape(rows, -1, period)
+    observations = np.sum(~np.isnan(seasons), axis=1)
+    slots = np.arange(recent.shape[1]) % period
+    expected = _nanmedian(seasons, axis=1)[:, slots]
+
+    if poisson:
+        seasons = _anscombe(seasons)
+        recent = _anscombe(recent)
+    median = _nanmedian(seasons, axis=1)
+    scale = MAD_SCALE * _nanmedian(np.abs(seasons - median[:, None, :]), axis=1)
+    if poisson:
+        scale = np.maximum(scale, 1.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        score = (recent - median[:, slots]) / scale[:, slots]
+    score[(observations[:, slots] < min_observations) | ~np.isfinite(score)] = np.nan
+    return expected, score
+
+
+def detect_seasonal(history: np.ndarray, recent: np.ndarray, threshold: float = 4.0,
+                    period: int = HOURS_PER_WEEK, poisson: bool = False) -> Detection:
+    """
+    Flag recent points far from their seasonal median.
+
+    Positions are columns of ``recent``. See seasonal_scores for the
+    arguments.
+    """
+    expected, score = seasonal_scores(history, recent, period=period, poisson=poisson)
+    return _flagged("seasonal", score, threshold, recent, expected)
+
+
+def ewma_scores(values: np.ndarray, history_points: int, alpha: float = 0.3):
+    """
+    EWMA control chart statistics.
+
+    The chart's centre line and sigma come from the first
+    ``history_points`` columns; the average starts at the centre line
+    and carries over missing values.
+
+    Args:
+        values: (series, points) values
+        history_points: Leading columns used as the in-control baseline
+        alpha: Weight of the newest value
+
+    Returns:
+        (smoothed, centre, score) arrays shaped like ``values``; score is
+        the distance from the centre line in units of the chart's
+        asymptotic sigma, NaN where the baseline has no spread
+    """
+    baseline = values[:, :history_points]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        centre = np.nanmean(baseline, axis=1)
+        sigma = np.nanstd(baseline, axis=1) * np.sqrt(alpha / (2 - alpha))
+
+    smoothed = np.empty_like(values, dtype=float)
+    average = centre.copy()
+    # Sequential in time, vectorized across series
+    for column in range(values.shape[1]):
+        observed = values[:, column]
+        average = np.where(np.isnan(observed), average, alpha * observed + (1 - alpha) * average)
+        smoothed[:, column] = average
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        score = (smoothed - centre[:, None]) / sigma[:, None]
+    score[~np.isfinite(score)] = np.nan
+    return smoothed, np.broadcast_to(centre[:, None], values.shape), score
+
+
+def detect_ewma(values: np.ndarray, history_points: int, threshold: float = 3.0,
+                alpha: float = 0.3) -> Detection:
+    """
+    Flag points after the baseline where the EWMA is outside its control limits.
+
+    Positions are columns of ``values``; the flagged value is the
+    smoothed average.
+    """
+    smoothed, centre, score = ewma_scores(values, history_points, alpha=alpha)
+    return _flagged(
+        "ewma",
+        score[:, history_points:],
+        threshold,
+        smoothed[:, history_points:],
+        centre[:, history_points:],
+        offset=history_points,
+    )
+
+
+def change_point_scores(values: np.ndarray, min_size: int = 3):
+    """
+    The most likely single mean shift in each series.
+
+    Every split leaving at least ``min_size`` points on each side is
+    scored with the two-sample t statistic of the segment means (pooled
+    variance), using cumulative sums so all splits of all series are
+    scored at once. Missing values are filled with the series median.
+
+    Args:
+        values: (series, points) values
+        min_size: Smallest segment
+
+    Returns:
+        (split, before, after, score) per series: the first column of
+        the second segment, the segment means and the signed t
+        statistic. Empty arrays if the series are too short to split.
+    """
+    rows, length = values.shape
+    if length < 2 * min_size:
+        empty = np.empty(0)
+        return empty.astype(int), empty, empty, empty
+
+    median = _nanmedian(values, axis=1)[:, None]
+    filled = np.where(np.isnan(values), median, values)
+    sums = np.cumsum(filled, axis=1)
+    squares = np.cumsum(filled * filled, axis=1)
+
+    splits = np.arange(min_size, length - min_size + 1)
+    left_count = splits.astype(float)
+    right_count = length - left_count
+    left_sum = sums[:, splits - 1]
+    right_sum = sums[:, -1:] - left_sum
+    left_squares = squares[:, splits - 1]
+    right_squares = squares[:, -1:] - left_squares
+
+    before = left_sum / left_count
+    after = right_sum / right_count
+    residual = (left_squares - left_sum * before) + (right_squares - right_sum * after)
+    # Floored so two perfectly flat segments score high rather than infinite
+    pooled_variance = np.maximum(residual, 0.0) / max(length - 2, 1) + 1e-12
+
+    t = (after - before) / np.sqrt(pooled_variance * (1 / left_count + 1 / right_count))
+    t = np.nan_to_num(t, nan=0.0)
+
+    best = np.argmax(np.abs(t), axis=1)
+    rows_index = np.arange(rows)
+    return splits[best], before[rows_index, best], after[rows_index, best], t[rows_index, best]
+
+
+def detect_change_points(values: np.ndarray, first_position: int = 0, threshold: float = 6.0,
+                         min_size: int = 3) -> Detection:
+    """
+    Flag mean shifts that start at or after ``first_position``.
+
+    Positions are the first column of the new level; the value and
+    expected value are the means after and before it.
+    """
+    split, before, after, score = change_point_scores(values, min_size=min_size)
+    score = np.where(split >= first_position, score, np.nan)
+    detection = _flagged(
+        "change_point",
+        score[:, None],
+        threshold,
+        after[:, None],
+        before[:, None],
+    )
+    detection.position = split[detection.series]
+    return detection
@@ -0,0 +1,427 @@
+"""
+Batch anomaly detection over tenants' call analytics.
+
+Scheduled every ANOMALY_DETECTION_INTERVAL_SECONDS. Each run loads
+hourly call counts for a batch of tenants with one grouped query over
+``calls``, lays them out as (tenant, hour) arrays, and scores every
+tenant of the batch at once with the detectors in anomaly_detection:
+
+- hourly call volume against hour-of-week medians and MADs;
+- daily call volume, answer rate and AI resolution rate on EWMA
+  control charts and for change points.
+
+Anomalies in the evaluation window (the last ANOMALY_EVALUATION_DAYS
+days and today so far) replace those stored for the window, and BI
+insights read them from ``analytics_anomalies``. Hours and days are
+UTC.
+"""
+
+import time
+import uuid
+import asyncio
+from dataclasses import dataclass
+from datetime import date, datetime, time as day_time, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import and_, case, delete, extract, func, insert, select
+
+from voicecore.config import settings
+from voicecore.database import get_db_session, get_read_session, set_tenant_context
+from voicecore.models.anomaly import AnalyticsAnomaly
+from voicecore.models.call import Call, CallStatus
+from voicecore.models.tenant import Tenant
+from voicecore.services.anomaly_detection import (
+    HOURS_PER_WEEK,
+    Detection,
+    detect_change_points,
+    detect_ewma,
+    detect_seasonal,
+)
+from voicecore.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+anomalies_table = AnalyticsAnomaly.__table__
+calls = Call.__table__
+tenants = Tenant.__table__
+
+# Score magnitude a detector needs to flag a point; twice this is high severity
+THRESHOLDS = {
+    "seasonal": 4.0,
+    "ewma": 3.5,
+    "change_point": 6.0,
+}
+
+# Days with fewer calls have too noisy a rate to score; they count as missing
+RATE_MIN_CALLS = 10
+
+METRIC_LABELS = {
+    "total_calls": "Call volume",
+    "answer_rate": "Answer rate",
+    "ai_resolution_rate": "AI resolution rate",
+}
+
+_answered = calls.c.status == CallStatus.COMPLETED
+_ai_handled = calls.c.ai_handled.is_(True)
+_ai_resolved = and_(_ai_handled, _answered, calls.c.agent_id.is_(None))
+
+
+def _count_where(condition):
+    return func.sum(case((condition, 1), else_=0))
+
+
+@dataclass
+class CallSeries:
+    """
+    Hourly call counts of a batch of tenants.
+
+    Arrays are shaped (tenants, hours); column 0 is the hour starting at
+    ``start``, which is midnight.
+    """
+    tenant_ids: List[uuid.UUID]
+    start: datetime
+    total_calls: np.ndarray
+    answered_calls: np.ndarray
+    ai_handled_calls: np.ndarray
+    ai_resolved_calls: np.ndarray
+
+    @classmethod
+    async def load(
+        cls,
+        session,
+        tenant_ids: List[uuid.UUID],
+        start: datetime,
+        end: datetime
+    ) -> "CallSeries":
+        """Load the hourly counts of [start, end) in one grouped query."""
+        day = func.date(calls.c.created_at)
+        hour = extract("hour", calls.c.created_at)
+        result = await session.execute(
+            select(
+                calls.c.tenant_id,
+                day,
+                hour,
+                func.count(calls.c.id),
+                _count_where(_answered),
+                _count_where(_ai_handled),
+                _count_where(_ai_resolved),
+            )
+            .where(
+                calls.c.tenant_id.in_(tenant_ids),
+                calls.c.created_at >= start,
+                calls.c.created_at < end
+            )
+            .group_by(calls.c.tenant_id, day, hour)
+        )
+
+        hours = int((end - start).total_seconds() // 3600)
+        counts = np.zeros((4, len(tenant_ids), hours))
+        rows = {tenant_id: index for index, tenant_id in enumerate(tenant_ids)}
+        for tenant_id, row_day, row_hour, *values in result:
+            if isinstance(row_day, str):
+                row_day = date.fromisoformat(row_day)
+            column = (row_day - start.date()).days * 24 + int(row_hour)
+            if 0 <= column < hours:
+                counts[:, rows[tenant_id], column] = values
+
+        return cls(tenant_ids, start, *counts)
+
+    @property
+    def hours(self) -> int:
+        return self.total_calls.shape[1]
+
+    def first_call(self) -> np.ndarray:
+        """Column of each tenant's first call; the series length if there is none."""
+        active = self.total_calls > 0
+        return np.where(active.any(axis=1), active.argmax(axis=1), self.hours)
+
+    def hourly_volume(self) -> np.ndarray:
+        """Calls per hour, missing before a tenant's first call."""
+        before = np.arange(self.hours) < self.first_call()[:, None]
+        return np.where(before, np.nan, self.total_calls)
+
+    def daily(self) -> Dict[str, np.ndarray]:
+        """Daily call volume and rates over the complete days, missing before a tenant's first call."""
+        days = self.hours // 24
+
+        def by_day(counts: np.ndarray) -> np.ndarray:
+            return counts[:, :days * 24].reshape(len(self.tenant_ids), days, 24).sum(axis=2)
+
+        total = by_day(self.total_calls)
+        answered = by_day(self.answered_calls)
+        ai_handled = by_day(self.ai_handled_calls)
+        ai_resolved = by_day(self.ai_resolved_calls)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return {
+                "total_calls": np.where(np.arange(days) < self.first_call()[:, None] // 24, np.nan, total),
+                "answer_rate": np.where(total >= RATE_MIN_CALLS, answered / total, np.nan),
+                "ai_resolution_rate": np.where(ai_handled >= RATE_MIN_CALLS, ai_resolved / ai_handled, np.nan),
+            }
+
+
+def _anomaly_rows(
+    series: CallSeries,
+    detection: Detection,
+    metric: str,
+    granularity: str,
+    detected_at: datetime
+) -> List[Dict[str, Any]]:
+    step = timedelta(hours=1) if granularity == "hour" else timedelta(days=1)
+    threshold = THRESHOLDS[detection.detector]
+    return [
+        {
+            "id": uuid.uuid4(),
+            "tenant_id": series.tenant_ids[row],
+            "metric": metric,
+            "granularity": granularity,
+            "detector": detection.detector,
+            "period_start": series.start + step * int(position),
+            "value": float(value),
+            "expected": float(expected),
+            "score": float(score),
+            "severity": "high" if abs(score) >= 2 * threshold else "medium",
+            "detected_at": detected_at,
+            "created_at": detected_at,
+            "updated_at": detected_at,
+        }
+        for row, position, value, expected, score in zip(
+            detection.series, detection.position, detection.value, detection.expected, detection.score
+        )
+    ]
+
+
+def find_anomalies(
+    series: CallSeries,
+    history_weeks: int,
+    detected_at: datetime
+) -> List[Dict[str, Any]]:
+    """
+    Score a batch of tenants' call series.
+
+    The first ``history_weeks`` weeks of the series are the baseline;
+    anomalies are reported for the hours and complete days after it.
+
+    Args:
+        series: Hourly call counts starting ``history_weeks`` weeks
+            before the evaluation window
+        history_weeks: Weeks of baseline
+        detected_at: Time of the detection run
+
+    Returns:
+        Rows for ``analytics_anomalies``
+    """
+    history_hours = history_weeks * HOURS_PER_WEEK
+    history_days = history_weeks * 7
+    rows = []
+
+    volume = series.hourly_volume()
+    hourly = detect_seasonal(
+        volume[:, :history_hours],
+        volume[:, history_hours:],
+        threshold=THRESHOLDS["seasonal"],
+        poisson=True
+    )
+    hourly.position = hourly.position + history_hours
+    rows.extend(_anomaly_rows(series, hourly, "total_calls", "hour", detected_at))
+
+    for metric, values in series.daily().items():
+        for detection in (
+            detect_ewma(values, history_days, threshold=THRESHOLDS["ewma"]),
+            detect_change_points(values, first_position=history_days, threshold=THRESHOLDS["change_point"]),
+        ):
+            rows.extend(_anomaly_rows(series, detection, metric, "day", detected_at))
+
+    return rows
+
+
+def _format_metric(metric: str, granularity: str, value: float) -> str:
+    if metric.endswith("_rate"):
+        return f"{value * 100:.1f}%"
+    return f"{value:,.0f} calls" + (" a day" if granularity == "day" else "")
+
+
+def anomaly_insight(anomaly: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Describe a stored anomaly as a BI insight.
+
+    Change points are reported as trends, other detections as anomalies.
+    """
+    metric = anomaly["metric"]
+    label = METRIC_LABELS.get(metric, metric)
+    value = _format_metric(metric, anomaly["granularity"], anomaly["value"])
+    expected = _format_metric(metric, anomaly["granularity"], anomaly["expected"])
+    direction = "above" if anomaly["score"] > 0 else "below"
+    period_start = anomaly["period_start"]
+
+    if anomaly["detector"] == "seasonal":
+        message = (
+            f"{label} was {value} at {period_start:%Y-%m-%d %H:00} UTC, "
+            f"{direction} the usual {expected} for that hour of the week"
+        )
+    elif anomaly["detector"] == "ewma":
+        message = (
+            f"{label} has drifted {direction} its normal level of {expected}, "
+            f"averaging {value} on {period_start:%Y-%m-%d}"
+        )
+    else:
+        message = f"{label} shifted from {expected} to {value} starting {period_start:%Y-%m-%d}"
+
+    return {
+        "type": "trend" if anomaly["detector"] == "change_point" else "anomaly",
+        "severity": anomaly["severity"],
+        "message": message,
+        "metric": metric,
+        "detector": anomaly["detector"],
+        "period_start": period_start.isoformat(),
+        "value": anomaly["value"],
+        "expected": anomaly["expected"],
+        "score": anomaly["score"],
+    }
+
+
+class AnomalyDetectionService:
+    """
+    Detects anomalies in all tenants' call analytics and serves them.
+
+    Args:
+        history_weeks: Weeks of baseline before the evaluation window
+        evaluation_days: Complete days, besides today, re-evaluated by
+            every run
+        batch_size: Tenants scored together
+    """
+
+    def __init__(
+        self,
+        history_weeks: Optional[int] = None,
+        evaluation_days: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ):
+        self.logger = logger
+        self.history_weeks = history_weeks or settings.anomaly_history_weeks
+        self.evaluation_days = evaluation_days or settings.anomaly_evaluation_days
+        self.batch_size = batch_size or settings.anomaly_tenant_batch_size
+
+    def window(self, now: datetime) -> tuple[datetime, datetime, datetime]:
+        """
+        Time ranges of a run at ``now``.
+
+        Returns:
+            (start, window_start, end): the baseline starts at ``start``,
+            anomalies are reported from ``window_start``, and ``end`` is
+            the end of the last complete hour
+        """
+        end = now.replace(minute=0, second=0, microsecond=0)
+        window_start = datetime.combine(end.date() - timedelta(days=self.evaluation_days), day_time.min)
+        return window_start - timedelta(weeks=self.history_weeks), window_start, end
+
+    async def run_detection(self, now: Optional[datetime] = None) -> int:
+        """
+        Detect anomalies for every active tenant and store them.
+
+        Args:
+            now: Time of the run (UTC); defaults to the current time
+
+        Returns:
+            Number of anomalies stored
+        """
+        detected_at = now or datetime.utcnow()
+        start, window_start, end = self.window(detected_at)
+        started = time.perf_counter()
+
+        async with get_read_session() as session:
+            result = await session.execute(
+                select(tenants.c.id).where(tenants.c.is_active.is_(True)).order_by(tenants.c.id)
+            )
+            tenant_ids = list(result.scalars())
+
+        stored = 0
+        for offset in range(0, len(tenant_ids), self.batch_size):
+            batch = tenant_ids[offset:offset + self.batch_size]
+            try:
+                async with get_read_session() as session:
+                    series = await CallSeries.load(session, batch, start, end)
+                rows = await asyncio.to_thread(find_anomalies, series, self.history_weeks, detected_at)
+                await self._replace(batch, window_start, rows)
+                stored += len(rows)
+            except Exception as e:
+                self.logger.error(
+                    "Anomaly detection failed for tenant batch",
+                    tenants=len(batch),
+                    first_tenant_id=str(batch[0]),
+                    error=str(e)
+                )
+
+        self.logger.info(
+            "Anomaly detection completed",
+            tenants=len(tenant_ids),
+            anomalies=stored,
+            duration_ms=round((time.perf_counter() - started) * 1000, 1)
+        )
+        return stored
+
+    async def get_anomalies(
+        self,
+        tenant_id: uuid.UUID,
+        start: datetime,
+        end: datetime,
+        limit: int = 200
+    ) -> List[Dict[str, Any]]:
+        """
+        Stored anomalies of a tenant in [start, end), newest first.
+
+        Args:
+            tenant_id: Tenant UUID
+            start: Start of the range (UTC)
+            end: End of the range (UTC)
+            limit: Maximum anomalies returned
+
+        Returns:
+            Anomalies as dictionaries
+        """
+        async with get_read_session() as session:
+            await set_tenant_context(session, tenant_id)
+            result = await session.execute(
+                select(
+                    anomalies_table.c.metric,
+                    anomalies_table.c.granularity,
+                    anomalies_table.c.detector,
+                    anomalies_table.c.period_start,
+                    anomalies_table.c.value,
+                    anomalies_table.c.expected,
+                    anomalies_table.c.score,
+                    anomalies_table.c.severity,
+                    anomalies_table.c.detected_at,
+                )
+                .where(
+                    anomalies_table.c.tenant_id == tenant_id,
+                    anomalies_table.c.period_start >= start,
+                    anomalies_table.c.period_start < end
+                )
+                .order_by(anomalies_table.c.period_start.desc())
+                .limit(limit)
+            )
+            return [dict(row._mapping) for row in result]
+
+    async def _replace(
+        self,
+        tenant_ids: List[uuid.UUID],
+        window_start: datetime,
+        rows: List[Dict[str, Any]]
+    ) -> None:
+        """Replace the batch's stored anomalies in the evaluation window."""
+        async with get_db_session(independent=True) as session:
+            await session.execute(
+                delete(anomalies_table).where(
+                    anomalies_table.c.tenant_id.in_(tenant_ids),
+                    anomalies_table.c.period_start >= window_start
+                )
+            )
+            if rows:
+                await session.execute(insert(anomalies_table), rows)
+
+
+# Global service instance
+anomaly_detection_service = AnomalyDetectionService()
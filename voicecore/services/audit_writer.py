@@ -0,0 +1,413 @@
+"""
+Buffered audit log writer for VoiceCore AI.
+
+Audit events are queued in memory and written by a background task in
+multi-row INSERTs, one per tenant per flush. Every accepted record is
+first appended to an on-disk journal segment; segments are deleted once
+their records are committed, so records survive a crash and are
+replayed on the next start. Inserts ignore duplicate event IDs, which
+makes replaying a partially written segment safe.
+"""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import Table
+from sqlalchemy.dialects.postgresql import insert
+
+from voicecore.database import get_db_session, set_tenant_context
+from voicecore.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+# Columns stored as UUID objects that travel through the journal as text
+UUID_COLUMNS = ("id", "tenant_id", "event_id")
+DATETIME_COLUMNS = ("created_at", "updated_at")
+
+
+def _encode_row(row: Dict[str, Any]) -> str:
+    """Serialize an audit row for the journal."""
+    encoded = dict(row)
+    for column in UUID_COLUMNS:
+        if encoded.get(column) is not None:
+            encoded[column] = str(encoded[column])
+    for column in DATETIME_COLUMNS:
+        if isinstance(encoded.get(column), datetime):
+            encoded[column] = encoded[column].isoformat()
+    return json.dumps(encoded, default=str, separators=(",", ":"))
+
+
+def _decode_row(line: str) -> Dict[str, Any]:
+    """Deserialize an audit row read from the journal."""
+    row = json.loads(line)
+    for column in UUID_COLUMNS:
+        if row.get(column) is not None:
+            row[column] = uuid.UUID(row[column])
+    for column in DATETIME_COLUMNS:
+        if row.get(column) is not None:
+            row[column] = datetime.fromisoformat(row[column])
+    return row
+
+
+class AuditJournal:
+    """
+    Append-only spill journal made of numbered segment files.
+
+    Records are appended to the open segment. ``rotate`` closes it and
+    returns its path so the caller can delete it once the records it
+    holds are committed, or leave it for replay.
+    """
+
+    SUFFIX = ".ndjson"
+
+    def __init__(self, directory: str, fsync: bool = False):
+        self.directory = directory
+        self.fsync = fsync
+        self._file = None
+        self._path: Optional[str] = None
+        self._records = 0
+
+    def _open(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"{time.time_ns():020d}-{os.getpid()}{self.SUFFIX}"
+        self._path = os.path.join(self.directory, name)
+        self._file = open(self._path, "a", encoding="utf-8")
+        self._records = 0
+
+    def append(self, row: Dict[str, Any]) -> None:
+        """Append one record to the open segment."""
+        if self._file is None:
+            self._open()
+        self._file.write(_encode_row(row) + "\n")
+        self._file.flush()
+        self._records += 1
+
+    def rotate(self) -> Optional[str]:
+        """
+        Close the open segment.
+
+        Returns:
+            Path of the closed segment, or None if nothing was written
+        """
+        if self._file is None:
+            return None
+
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._file.close()
+        path, self._file, self._path = self._path, None, None
+        if self._records == 0:
+            os.remove(path)
+            return None
+        return path
+
+    def closed_segments(self) -> List[str]:
+        """List closed segments on disk that this process may replay, oldest first."""
+        if not os.path.isdir(self.directory):
+            return []
+
+        segments = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not name.endswith(self.SUFFIX) or path == self._path:
+                continue
+            if self._owned_by_live_process(name):
+                continue
+            segments.append(path)
+        return sorted(segments)
+
+    @classmethod
+    def _owned_by_live_process(cls, name: str) -> bool:
+        """Check whether a segment belongs to another running worker."""
+        try:
+            pid = int(name[:-len(cls.SUFFIX)].rsplit("-", 1)[1])
+        except (IndexError, ValueError):
+            return False
+        if pid == os.getpid():
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    @staticmethod
+    def read_segment(path: str) -> List[Dict[str, Any]]:
+        """Read the records of a segment, skipping a torn final line."""
+        rows = []
+        with open(path, encoding="utf-8") as segment:
+            for line in segment:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rows.append(_decode_row(line))
+                except (ValueError, TypeError):
+                    logger.warning("Skipping unreadable audit journal line", segment=path)
+        return rows
+
+    @staticmethod
+    def remove(path: str) -> None:
+        """Delete a segment whose records are committed."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class AuditLogWriter:
+    """
+    Bounded queue and background writer for audit records.
+
+    ``submit`` never blocks the caller. When the queue is full, records
+    stay only in the journal and are written by the next replay; without
+    a journal they are dropped. Both cases are counted in ``stats``.
+    """
+
+    def __init__(
+        self,
+        table: Table,
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        journal_dir: Optional[str] = None,
+        journal_fsync: bool = False
+    ):
+        self.table = table
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.journal = AuditJournal(journal_dir, fsync=journal_fsync) if journal_dir else None
+
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._overflowed = False
+        self._spilled_segments: List[str] = []
+
+        self._stats = {
+            "submitted": 0,
+            "written": 0,
+            "batches": 0,
+            "dropped": 0,
+            "spilled": 0,
+            "replayed": 0,
+            "failed_batches": 0,
+            "queue_high_watermark": 0,
+            "last_flush_seconds": 0.0,
+        }
+
+    def _ensure_started(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = loop.create_task(self._run())
+
+    def submit(self, row: Dict[str, Any]) -> bool:
+        """
+        Queue an audit record for writing.
+
+        Args:
+            row: Column values for the audit table
+
+        Returns:
+            True if the record was accepted (queued or journaled)
+        """
+        self._stats["submitted"] += 1
+
+        if self.journal is not None:
+            try:
+                self.journal.append(row)
+            except OSError as e:
+                logger.error("Failed to journal audit record", error=str(e))
+
+        if len(self._queue) >= self.max_queue_size:
+            if self.journal is None:
+                self._stats["dropped"] += 1
+                return False
+            # Backpressure: keep the record on disk only; the segment is
+            # replayed instead of deleted after the next flush
+            self._overflowed = True
+            self._stats["spilled"] += 1
+            return True
+
+        self._queue.append(row)
+        depth = len(self._queue)
+        if depth > self._stats["queue_high_watermark"]:
+            self._stats["queue_high_watermark"] = depth
+
+        self._ensure_started()
+        if depth >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+                if self._spilled_segments:
+                    await self.replay_journal()
+            except Exception as e:
+                logger.error("Audit writer cycle failed", error=str(e))
+
+    async def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        """Write rows with one multi-row INSERT per tenant and chunk."""
+        by_tenant: Dict[Any, List[Dict[str, Any]]] = {}
+        for row in rows:
+            by_tenant.setdefault(row["tenant_id"], []).append(row)
+
+        async with get_db_session() as session:
+            for tenant_id, tenant_rows in by_tenant.items():
+                await set_tenant_context(session, str(tenant_id))
+                for start in range(0, len(tenant_rows), self.batch_size):
+                    statement = (
+                        insert(self.table)
+                        .values(tenant_rows[start:start + self.batch_size])
+                        .on_conflict_do_nothing(index_elements=["event_id"])
+                    )
+                    await session.execute(statement)
+            await session.commit()
+
+    async def flush(self) -> int:
+        """
+        Write every queued record.
+
+        Returns:
+            Number of records written
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            # Drain and rotate without awaiting in between, so the closed
+            # segment holds exactly the drained records plus any overflow
+            rows = list(self._queue)
+            self._queue.clear()
+            segment = self.journal.rotate() if self.journal is not None else None
+            overflowed, self._overflowed = self._overflowed, False
+
+            if not rows:
+                if segment:
+                    self._spilled_segments.append(segment)
+                return 0
+
+            started = time.perf_counter()
+            try:
+                await self._insert(rows)
+            except Exception as e:
+                self._stats["failed_batches"] += 1
+                if segment:
+                    self._spilled_segments.append(segment)
+                else:
+                    self._stats["dropped"] += len(rows)
+                logger.error(
+                    "Failed to write audit batch",
+                    records=len(rows),
+                    journaled=segment is not None,
+                    error=str(e)
+                )
+                return 0
+
+            if segment:
+                if overflowed:
+                    self._spilled_segments.append(segment)
+                else:
+                    self.journal.remove(segment)
+
+            self._stats["written"] += len(rows)
+            self._stats["batches"] += 1
+            self._stats["last_flush_seconds"] = time.perf_counter() - started
+            return len(rows)
+
+    async def replay_journal(self) -> int:
+        """
+        Write records from closed journal segments left by overflow,
+        failed batches or a previous process.
+
+        Returns:
+            Number of records replayed
+        """
+        if self.journal is None:
+            return 0
+
+        segments = sorted(set(self._spilled_segments) | set(self.journal.closed_segments()))
+        self._spilled_segments = []
+        replayed = 0
+
+        for position, path in enumerate(segments):
+            rows = self.journal.read_segment(path)
+            try:
+                if rows:
+                    await self._insert(rows)
+            except Exception as e:
+                self._spilled_segments.extend(segments[position:])
+                logger.error("Failed to replay audit journal", segment=path, error=str(e))
+                break
+            self.journal.remove(path)
+            replayed += len(rows)
+
+        if replayed:
+            self._stats["replayed"] += replayed
+            logger.info("Replayed audit journal", records=replayed)
+        return replayed
+
+    async def start(self) -> None:
+        """Replay leftover journal segments and start the background writer."""
+        await self.replay_journal()
+        self._ensure_started()
+
+    async def stop(self) -> None:
+        """Stop the background writer and flush everything still queued."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+        await self.flush()
+        if self._spilled_segments:
+            await self.replay_journal()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of records waiting to be written."""
+        return len(self._queue)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return writer and backpressure metrics.
+
+        Returns:
+            Dict of counters plus current queue depth and spill backlog
+        """
+        return {
+            **self._stats,
+            "queue_depth": len(self._queue),
+            "max_queue_size": self.max_queue_size,
+            "queue_utilization": len(self._queue) / self.max_queue_size,
+            "spilled_segments": len(self._spilled_segments),
+            "journal_enabled": self.journal is not None,
+        }
@@ -8,9 +8,14 @@ per Requirements 10.5 and 10.2.
 
 import uuid
 import jwt
+import hmac
+import time
 import bcrypt
 import asyncio
-from typing import Dict, Any, Optional, List, Set
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Set, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
 from sqlalchemy import Column, String, DateTime, JSON, Text, Boolean, Integer, ForeignKey
@@ -28,6 +33,25 @@ from voicecore.config import get_settings
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Scheme marker for API key hashes computed with SHA-256. API keys are
+# 256-bit random tokens, so they cannot be brute-forced and need neither a
+# slow hash nor a salt; bcrypt hashes from older keys are still accepted
+# and upgraded. The hash deliberately does not depend on any secret, so
+# rotating SECRET_KEY leaves every key valid.
+FAST_KEY_HASH_PREFIX = "sha256$"
+
+# Dedicated pool so bcrypt work never blocks the event loop or starves the
+# default executor
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.api_key_hash_workers,
+    thread_name_prefix="api-key-hash"
+)
+
+
+def fast_key_hash(api_key: str) -> str:
+    """Return the SHA-256 hash stored for an API key."""
+    return f"{FAST_KEY_HASH_PREFIX}{hashlib.sha256(api_key.encode()).hexdigest()}"
+
 
 class UserRole(Enum):
     """User roles for role-based access control."""
@@ -71,6 +95,8 @@ class Permission(Enum):
 class ApiKey(BaseModel, TimestampMixin, TenantMixin):
     """API key model for API authentication."""
     
+    __tablename__ = "api_keys"
+    
     # Key identification
     key_id = Column(
         UUID(as_uuid=True),
@@ -176,6 +202,8 @@ class ApiKey(BaseModel, TimestampMixin, TenantMixin):
 class UserSession(BaseModel, TimestampMixin, TenantMixin):
     """User session model for session management."""
     
+    __tablename__ = "user_sessions"
+    
     session_id = Column(
         UUID(as_uuid=True),
         default=uuid.uuid4,
@@ -235,6 +263,260 @@ class UserSession(BaseModel, TimestampMixin, TenantMixin):
         return datetime.utcnow() > self.expires_at
 
 
+@dataclass
+class VerifiedKey:
+    """A successfully verified API key held in the verified-key cache."""
+    tenant_id: uuid.UUID
+    key_id: str
+    name: str
+    permissions: List[str]
+    scopes: List[str]
+    rate_limit_per_minute: int
+    usage_count: int
+    key_expires_at: Optional[datetime]
+    cached_until: float
+    
+    def to_key_info(self) -> Dict[str, Any]:
+        """Build the key information returned by validate_api_key."""
+        return {
+            "key_id": self.key_id,
+            "name": self.name,
+            "permissions": self.permissions,
+            "scopes": self.scopes,
+            "rate_limit_per_minute": self.rate_limit_per_minute,
+            "usage_count": self.usage_count,
+            "last_used_at": datetime.utcnow().isoformat()
+        }
+
+
+class VerifiedKeyCache:
+    """
+    Short-lived cache of verified API keys.
+    
+    Entries are keyed by an HMAC of the tenant and presented key, so the
+    raw key is never held and lookups cost one SHA-256. A key_id index
+    lets revocation drop every entry for a key immediately.
+    """
+    
+    def __init__(self, ttl_seconds: float = 30.0, max_size: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: Dict[str, VerifiedKey] = {}
+        self._by_key_id: Dict[str, Set[str]] = {}
+    
+    @staticmethod
+    def fingerprint(tenant_id: uuid.UUID, api_key: str) -> str:
+        """Derive the cache key for a presented API key."""
+        message = f"{tenant_id}:{api_key}".encode()
+        return hmac.new(settings.secret_key.encode(), message, hashlib.sha256).hexdigest()
+    
+    def get(self, fingerprint: str) -> Optional[VerifiedKey]:
+        """Return a live cached entry, dropping it if stale or expired."""
+        entry = self._entries.get(fingerprint)
+        if entry is None:
+            return None
+        
+        if entry.cached_until <= time.monotonic() or (
+            entry.key_expires_at and datetime.utcnow() > entry.key_expires_at
+        ):
+            self._remove(fingerprint)
+            return None
+        
+        return entry
+    
+    def put(self, fingerprint: str, entry: VerifiedKey) -> None:
+        """Cache a verified key."""
+        if fingerprint not in self._entries and len(self._entries) >= self.max_size:
+            # Evict the oldest insertion
+            self._remove(next(iter(self._entries)))
+        
+        self._entries[fingerprint] = entry
+        self._by_key_id.setdefault(entry.key_id, set()).add(fingerprint)
+    
+    def invalidate_key(self, key_id: str) -> int:
+        """
+        Drop every cached entry for a key.
+        
+        Args:
+            key_id: API key ID
+            
+        Returns:
+            Number of entries removed
+        """
+        fingerprints = self._by_key_id.pop(str(key_id), set())
+        for fingerprint in fingerprints:
+            self._entries.pop(fingerprint, None)
+        return len(fingerprints)
+    
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._entries.clear()
+        self._by_key_id.clear()
+    
+    def _remove(self, fingerprint: str) -> None:
+        entry = self._entries.pop(fingerprint, None)
+        if entry is None:
+            return
+        siblings = self._by_key_id.get(entry.key_id)
+        if siblings is not None:
+            siblings.discard(fingerprint)
+            if not siblings:
+                del self._by_key_id[entry.key_id]
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass
+class PendingKeyUsage:
+    """Usage of one API key accumulated since the last flush."""
+    tenant_id: uuid.UUID
+    key_id: str
+    name: str
+    count: int = 0
+    first_used_at: datetime = field(default_factory=datetime.utcnow)
+    last_used_at: datetime = field(default_factory=datetime.utcnow)
+
+
+class ApiKeyUsageBuffer:
+    """
+    Buffers API key usage and writes it in batches.
+    
+    Each validation only bumps an in-memory counter. A background task
+    periodically applies the counts with one executemany UPDATE per
+    tenant and records one aggregated audit event per key.
+    """
+    
+    def __init__(self, privacy_service: "PrivacyService", flush_interval: float = 5.0):
+        self.privacy_service = privacy_service
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, PendingKeyUsage] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+    
+    def record(self, tenant_id: uuid.UUID, key_id: str, name: str) -> None:
+        """Record one use of an API key."""
+        usage = self._pending.get(key_id)
+        if usage is None:
+            usage = PendingKeyUsage(tenant_id=tenant_id, key_id=key_id, name=name)
+            self._pending[key_id] = usage
+        
+        usage.count += 1
+        usage.last_used_at = datetime.utcnow()
+        self._ensure_flusher()
+    
+    def discard(self, key_id: str) -> None:
+        """Forget buffered usage for a key."""
+        self._pending.pop(str(key_id), None)
+    
+    @property
+    def pending_count(self) -> int:
+        """Number of buffered uses not yet written."""
+        return sum(usage.count for usage in self._pending.values())
+    
+    def _ensure_flusher(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            try:
+                self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
+            except RuntimeError:
+                # No running loop; usage is written by the next explicit flush
+                pass
+    
+    async def _flush_loop(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+    
+    async def flush(self) -> int:
+        """
+        Write buffered usage to the database.
+        
+        Returns:
+            Number of key uses written
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            
+            batch, self._pending = self._pending, {}
+            
+            by_tenant: Dict[uuid.UUID, List[PendingKeyUsage]] = {}
+            for usage in batch.values():
+                by_tenant.setdefault(usage.tenant_id, []).append(usage)
+            
+            try:
+                from sqlalchemy import update, bindparam
+                table = ApiKey.__table__
+                statement = (
+                    update(table)
+                    .where(table.c.key_id == bindparam("b_key_id"))
+                    .values(
+                        usage_count=table.c.usage_count + bindparam("b_count"),
+                        last_used_at=bindparam("b_last_used_at")
+                    )
+                )
+                
+                async with get_db_session() as session:
+                    for tenant_id, usages in by_tenant.items():
+                        await set_tenant_context(session, str(tenant_id))
+                        await session.execute(statement, [
+                            {
+                                "b_key_id": uuid.UUID(usage.key_id),
+                                "b_count": usage.count,
+                                "b_last_used_at": usage.last_used_at
+                            }
+                            for usage in usages
+                        ])
+                    await session.commit()
+                    
+            except Exception as e:
+                # Put the counts back so the next flush retries them
+                for key_id, usage in batch.items():
+                    current = self._pending.get(key_id)
+                    if current is None:
+                        self._pending[key_id] = usage
+                    else:
+                        current.count += usage.count
+                        current.first_used_at = usage.first_used_at
+                
+                logger.error(
+                    "Failed to flush API key usage",
+                    keys=len(batch),
+                    error=str(e)
+                )
+                return 0
+            
+            for usage in batch.values():
+                await self.privacy_service.log_audit_event(
+                    tenant_id=usage.tenant_id,
+                    event_type=AuditEventType.DATA_ACCESS,
+                    action="api_key_used",
+                    resource=f"api_key:{usage.key_id}",
+                    event_data={
+                        "key_name": usage.name,
+                        "uses": usage.count,
+                        "first_used_at": usage.first_used_at.isoformat(),
+                        "last_used_at": usage.last_used_at.isoformat()
+                    },
+                    success=True
+                )
+            
+            written = sum(usage.count for usage in batch.values())
+            logger.debug("Flushed API key usage", keys=len(batch), uses=written)
+            return written
+    
+    async def stop(self) -> None:
+        """Cancel the background flusher and write anything still buffered."""
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        self._flush_task = None
+        await self.flush()
+
+
 class AuthService:
     """
     Authentication and authorization service.
@@ -248,10 +530,17 @@ class AuthService:
         self.security_utils = SecurityUtils()
         
         # JWT configuration
-        self.jwt_secret = settings.JWT_SECRET_KEY
-        self.jwt_algorithm = "HS256"
+        self.jwt_secret = settings.jwt_secret_key
+        self.jwt_algorithm = settings.jwt_algorithm
         self.jwt_expiration_hours = 24
         
+        # API key verification
+        self.verified_keys = VerifiedKeyCache(ttl_seconds=settings.api_key_cache_ttl_seconds)
+        self.key_usage = ApiKeyUsageBuffer(
+            self.privacy_service,
+            flush_interval=settings.api_key_usage_flush_seconds
+        )
+        
         # Role permissions mapping
         self.role_permissions = {
             UserRole.SUPER_ADMIN: [p for p in Permission],  # All permissions
@@ -318,7 +607,7 @@ class AuthService:
                 # Generate API key
                 api_key = self.security_utils.generate_api_key()
                 key_prefix = api_key[:8]
-                key_hash = bcrypt.hashpw(api_key.encode(), bcrypt.gensalt()).decode()
+                key_hash = fast_key_hash(api_key)
                 
                 # Set expiration
                 expires_at = None
@@ -394,6 +683,14 @@ class AuthService:
             Dict with key information if valid, None if invalid
         """
         try:
+            # Fast path: key verified recently
+            fingerprint = self.verified_keys.fingerprint(tenant_id, api_key)
+            cached = self.verified_keys.get(fingerprint)
+            if cached is not None:
+                cached.usage_count += 1
+                self.key_usage.record(tenant_id, cached.key_id, cached.name)
+                return cached.to_key_info()
+            
             async with get_db_session() as session:
                 await set_tenant_context(session, str(tenant_id))
                 
@@ -419,36 +716,34 @@ class AuthService:
                     return None
                 
                 # Verify key hash
-                if not bcrypt.checkpw(api_key.encode(), api_key_record.key_hash.encode()):
+                valid, upgraded_hash = await self._verify_key_hash(
+                    api_key, api_key_record.key_hash
+                )
+                if not valid:
                     return None
                 
-                # Update usage statistics
-                api_key_record.last_used_at = datetime.utcnow()
-                api_key_record.usage_count += 1
-                await session.commit()
+                if upgraded_hash:
+                    api_key_record.key_hash = upgraded_hash
+                    await session.commit()
                 
-                # Log key usage
-                await self.privacy_service.log_audit_event(
+                entry = VerifiedKey(
                     tenant_id=tenant_id,
-                    event_type=AuditEventType.DATA_ACCESS,
-                    action="api_key_used",
-                    resource=f"api_key:{api_key_record.key_id}",
-                    event_data={
-                        "key_name": api_key_record.name,
-                        "usage_count": api_key_record.usage_count
-                    },
-                    success=True
+                    key_id=str(api_key_record.key_id),
+                    name=api_key_record.name,
+                    permissions=api_key_record.permissions,
+                    scopes=api_key_record.scopes,
+                    rate_limit_per_minute=api_key_record.rate_limit_per_minute,
+                    usage_count=api_key_record.usage_count + 1,
+                    key_expires_at=api_key_record.expires_at,
+                    cached_until=time.monotonic() + self.verified_keys.ttl_seconds
                 )
-                
-                return {
-                    "key_id": str(api_key_record.key_id),
-                    "name": api_key_record.name,
-                    "permissions": api_key_record.permissions,
-                    "scopes": api_key_record.scopes,
-                    "rate_limit_per_minute": api_key_record.rate_limit_per_minute,
-                    "usage_count": api_key_record.usage_count,
-                    "last_used_at": api_key_record.last_used_at.isoformat()
-                }
+            
+            self.verified_keys.put(fingerprint, entry)
+            
+            # Usage statistics and audit events are written in batches
+            self.key_usage.record(tenant_id, entry.key_id, entry.name)
+            
+            return entry.to_key_info()
                 
         except Exception as e:
             self.logger.error(
@@ -458,6 +753,36 @@ class AuthService:
             )
             return None
     
+    async def _verify_key_hash(self, api_key: str, key_hash: str) -> Tuple[bool, Optional[str]]:
+        """
+        Check a presented API key against its stored hash.
+        
+        Args:
+            api_key: Presented API key
+            key_hash: Stored hash
+            
+        Returns:
+            Tuple of (valid, upgraded hash to store or None)
+        """
+        if key_hash.startswith(FAST_KEY_HASH_PREFIX):
+            return hmac.compare_digest(fast_key_hash(api_key), key_hash), None
+        
+        # Legacy bcrypt hash: verify off the event loop, then upgrade
+        loop = asyncio.get_running_loop()
+        valid = await loop.run_in_executor(
+            _hash_executor, bcrypt.checkpw, api_key.encode(), key_hash.encode()
+        )
+        return valid, (fast_key_hash(api_key) if valid else None)
+    
+    async def flush_key_usage(self) -> int:
+        """
+        Write buffered API key usage and audit events.
+        
+        Returns:
+            Number of key uses written
+        """
+        return await self.key_usage.flush()
+    
     async def create_jwt_token(
         self,
         tenant_id: uuid.UUID,
@@ -774,6 +1099,9 @@ class AuthService:
                 
                 await session.commit()
                 
+                # Stop honouring cached verifications right away
+                self.verified_keys.invalidate_key(key_id)
+                
                 # Log key revocation
                 await self.privacy_service.log_audit_event(
                     tenant_id=tenant_id,
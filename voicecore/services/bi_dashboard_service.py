@@ -14,12 +14,15 @@ from datetime import datetime, date, timedelta
 from sqlalchemy import select, and_, func, or_
 from sqlalchemy.orm import selectinload
 
-from voicecore.database import get_db_session, set_tenant_context
+from voicecore.config import settings
+from voicecore.database import get_db_session, get_read_session, set_tenant_context
 from voicecore.models import (
     CallAnalytics, AgentMetrics, SystemMetrics, Tenant,
     Call, Agent, CallStatus
 )
+from voicecore.services.analytics_frame import DashboardMemo, MetricsFrame, previous_period
 from voicecore.services.analytics_service import AnalyticsService
+from voicecore.services.anomaly_service import anomaly_detection_service, anomaly_insight
 from voicecore.services.cache_service import CacheService
 from voicecore.logging import get_logger
 
@@ -40,6 +43,8 @@ class BIDashboardService:
         self.analytics_service = AnalyticsService()
         self.cache_service = CacheService()
         self._dashboard_layouts = {}  # In-memory storage for demo
+        # Dashboards may lag new calls by up to the collection interval
+        self.dashboard_memo = DashboardMemo(settings.analytics_collection_interval_seconds)
     
     async def get_executive_dashboard(
         self,
@@ -60,46 +65,10 @@ class BIDashboardService:
             # Calculate date range
             start_date, end_date = self._get_period_dates(period)
             
-            async with get_db_session() as session:
-                await set_tenant_context(session, str(tenant_id))
-                
-                # Get key metrics
-                key_metrics = await self._get_key_metrics(
-                    session, tenant_id, start_date, end_date
-                )
-                
-                # Get performance indicators
-                kpis = await self._calculate_kpis(
-                    session, tenant_id, start_date, end_date, period
-                )
-                
-                # Get trends
-                trends = await self._get_trends(
-                    session, tenant_id, start_date, end_date
-                )
-                
-                # Generate insights
-                insights = await self._generate_insights(
-                    key_metrics, kpis, trends
-                )
-                
-                # Generate recommendations
-                recommendations = await self._generate_recommendations(
-                    key_metrics, kpis, trends
-                )
-                
-                return {
-                    "period": {
-                        "name": period,
-                        "start_date": start_date.isoformat(),
-                        "end_date": end_date.isoformat()
-                    },
-                    "key_metrics": key_metrics,
-                    "performance_indicators": kpis,
-                    "trends": trends,
-                    "insights": insights,
-                    "recommendations": recommendations
-                }
+            return await self.dashboard_memo.get_or_compute(
+                (tenant_id, "executive", period, start_date, end_date),
+                lambda: self._build_executive_dashboard(tenant_id, period, start_date, end_date)
+            )
                 
         except Exception as e:
             self.logger.error(
@@ -109,6 +78,44 @@ class BIDashboardService:
             )
             raise
     
+    async def _build_executive_dashboard(
+        self,
+        tenant_id: uuid.UUID,
+        period: str,
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, Any]:
+        """Compute the executive dashboard from one analytics frame."""
+        frame = await self._load_frame(tenant_id, [(start_date, end_date), previous_period(start_date, end_date)])
+        
+        key_metrics = frame.key_metrics(start_date, end_date)
+        kpis = self._calculate_kpis(frame, start_date, end_date)
+        trends = frame.trends(start_date, end_date)
+        
+        # Generate insights
+        insights = await self._generate_insights(
+            key_metrics, kpis, trends
+        )
+        
+        # Generate recommendations
+        recommendations = await self._generate_recommendations(
+            key_metrics, kpis, trends
+        )
+        
+        return {
+            "period": {
+                "name": period,
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat()
+            },
+            "key_metrics": key_metrics,
+            "performance_indicators": kpis,
+            "trends": trends,
+            "insights": insights,
+            "recommendations": recommendations,
+            "generated_at": datetime.utcnow().isoformat()
+        }
+    
     async def get_realtime_dashboard(
         self,
         tenant_id: uuid.UUID,
@@ -204,20 +211,14 @@ class BIDashboardService:
     ) -> List[Dict[str, Any]]:
         """Get Key Performance Indicators with trends."""
         try:
-            start_date, end_date = self._get_period_dates(period)
+            dashboard = await self.get_executive_dashboard(tenant_id, period)
+            kpis = dashboard["performance_indicators"]
             
-            async with get_db_session() as session:
-                await set_tenant_context(session, str(tenant_id))
-                
-                kpis = await self._calculate_kpis(
-                    session, tenant_id, start_date, end_date, period
-                )
-                
-                # Filter by category if specified
-                if category:
-                    kpis = [kpi for kpi in kpis if kpi.get("category") == category]
-                
-                return kpis
+            # Filter by category if specified
+            if category:
+                kpis = [kpi for kpi in kpis if kpi.get("category") == category]
+            
+            return kpis
                 
         except Exception as e:
             self.logger.error(
@@ -236,7 +237,7 @@ class BIDashboardService:
     ) -> Dict[str, Any]:
         """Get detailed business metrics with time-series data."""
         try:
-            async with get_db_session() as session:
+            async with get_read_session() as session:
                 await set_tenant_context(session, str(tenant_id))
                 
                 # Get call analytics for the period
@@ -421,42 +422,30 @@ class BIDashboardService:
     ) -> List[Dict[str, Any]]:
         """Get AI-powered business insights and recommendations."""
         try:
-            start_date, end_date = self._get_period_dates(period)
+            dashboard = await self.get_executive_dashboard(tenant_id, period)
+            key_metrics = dashboard["key_metrics"]
+            kpis = dashboard["performance_indicators"]
+            trends = dashboard["trends"]
             
-            async with get_db_session() as session:
-                await set_tenant_context(session, str(tenant_id))
-                
-                # Get metrics for analysis
-                key_metrics = await self._get_key_metrics(
-                    session, tenant_id, start_date, end_date
-                )
-                
-                kpis = await self._calculate_kpis(
-                    session, tenant_id, start_date, end_date, period
-                )
-                
-                trends = await self._get_trends(
-                    session, tenant_id, start_date, end_date
-                )
-                
-                # Generate insights
-                insights = []
-                
-                if not insight_type or insight_type == "performance":
-                    insights.extend(self._analyze_performance(key_metrics, kpis))
-                
-                if not insight_type or insight_type == "trends":
-                    insights.extend(self._analyze_trends(trends))
-                
-                if not insight_type or insight_type == "anomalies":
-                    insights.extend(self._detect_anomalies(key_metrics, trends))
-                
-                if not insight_type or insight_type == "recommendations":
-                    insights.extend(await self._generate_recommendations(
-                        key_metrics, kpis, trends
-                    ))
-                
-                return insights
+            # Generate insights
+            insights = []
+            
+            if not insight_type or insight_type == "performance":
+                insights.extend(self._analyze_performance(key_metrics, kpis))
+            
+            if not insight_type or insight_type in ("trends", "anomalies"):
+                # Precomputed by the anomaly detection job
+                detected = await self._get_anomaly_insights(tenant_id, period)
+                for detected_type, name in (("trend", "trends"), ("anomaly", "anomalies")):
+                    if not insight_type or insight_type == name:
+                        insights.extend(insight for insight in detected if insight["type"] == detected_type)
+            
+            if not insight_type or insight_type == "recommendations":
+                insights.extend(await self._generate_recommendations(
+                    key_metrics, kpis, trends
+                ))
+            
+            return insights
                 
         except Exception as e:
             self.logger.error(
@@ -479,40 +468,35 @@ class BIDashboardService:
             start_date1, end_date1 = self._get_period_dates(period1)
             start_date2, end_date2 = self._get_period_dates(period2)
             
-            async with get_db_session() as session:
-                await set_tenant_context(session, str(tenant_id))
-                
-                # Get metrics for both periods
-                metrics1 = await self._get_key_metrics(
-                    session, tenant_id, start_date1, end_date1
-                )
-                metrics2 = await self._get_key_metrics(
-                    session, tenant_id, start_date2, end_date2
-                )
-                
-                # Calculate comparison
-                comparison = self._compare_metrics(
-                    metrics1, metrics2, metric
-                )
-                
-                return {
-                    "metric": metric,
-                    "period1": {
-                        "name": period1,
-                        "start_date": start_date1.isoformat(),
-                        "end_date": end_date1.isoformat(),
-                        "value": comparison["value1"]
-                    },
-                    "period2": {
-                        "name": period2,
-                        "start_date": start_date2.isoformat(),
-                        "end_date": end_date2.isoformat(),
-                        "value": comparison["value2"]
-                    },
-                    "change": comparison["change"],
-                    "change_percentage": comparison["change_percentage"],
-                    "trend": comparison["trend"]
-                }
+            # Metrics of both periods, from one frame; shared by every metric compared
+            metrics1, metrics2 = await self.dashboard_memo.get_or_compute(
+                (tenant_id, "comparison", start_date1, end_date1, start_date2, end_date2),
+                lambda: self._compare_periods(tenant_id, (start_date1, end_date1), (start_date2, end_date2))
+            )
+            
+            # Calculate comparison
+            comparison = self._compare_metrics(
+                metrics1, metrics2, metric
+            )
+            
+            return {
+                "metric": metric,
+                "period1": {
+                    "name": period1,
+                    "start_date": start_date1.isoformat(),
+                    "end_date": end_date1.isoformat(),
+                    "value": comparison["value1"]
+                },
+                "period2": {
+                    "name": period2,
+                    "start_date": start_date2.isoformat(),
+                    "end_date": end_date2.isoformat(),
+                    "value": comparison["value2"]
+                },
+                "change": comparison["change"],
+                "change_percentage": comparison["change_percentage"],
+                "trend": comparison["trend"]
+            }
                 
         except Exception as e:
             self.logger.error(
@@ -615,77 +599,35 @@ class BIDashboardService:
             # Default to last 7 days
             return today - timedelta(days=7), today
 
-    async def _get_key_metrics(
+    async def _load_frame(
         self,
-        session,
         tenant_id: uuid.UUID,
-        start_date: date,
-        end_date: date
-    ) -> Dict[str, Any]:
-        """Get key business metrics for the period."""
-        # Get call analytics
-        result = await session.execute(
-            select(CallAnalytics).where(
-                and_(
-                    CallAnalytics.tenant_id == tenant_id,
-                    CallAnalytics.date >= start_date,
-                    CallAnalytics.date <= end_date
-                )
-            )
-        )
-        analytics = result.scalars().all()
-        
-        # Calculate metrics
-        total_calls = sum(a.total_calls for a in analytics)
-        answered_calls = sum(a.answered_calls for a in analytics)
-        ai_handled = sum(a.ai_handled_calls for a in analytics)
-        ai_resolved = sum(a.ai_resolved_calls for a in analytics)
-        total_revenue = sum(a.total_cost_cents for a in analytics) / 100
-        
-        satisfaction_responses = sum(a.satisfaction_responses for a in analytics)
-        avg_satisfaction = 0.0
-        if satisfaction_responses > 0:
-            avg_satisfaction = sum(
-                a.average_satisfaction_score * a.satisfaction_responses 
-                for a in analytics if a.average_satisfaction_score
-            ) / satisfaction_responses
-        
-        return {
-            "total_calls": total_calls,
-            "answered_calls": answered_calls,
-            "missed_calls": sum(a.missed_calls for a in analytics),
-            "answer_rate": answered_calls / max(1, total_calls),
-            "ai_handled_calls": ai_handled,
-            "ai_resolved_calls": ai_resolved,
-            "ai_resolution_rate": ai_resolved / max(1, ai_handled),
-            "total_revenue": total_revenue,
-            "average_satisfaction": avg_satisfaction,
-            "vip_calls": sum(a.vip_calls for a in analytics),
-            "escalated_calls": sum(a.escalated_calls for a in analytics)
-        }
+        ranges: List[tuple[date, date]]
+    ) -> MetricsFrame:
+        """Load per-day analytics for the given date ranges in one query."""
+        async with get_read_session() as session:
+            await set_tenant_context(session, str(tenant_id))
+            return await MetricsFrame.load(session, tenant_id, ranges)
     
-    async def _calculate_kpis(
+    async def _compare_periods(
         self,
-        session,
         tenant_id: uuid.UUID,
+        period1: tuple[date, date],
+        period2: tuple[date, date]
+    ) -> tuple[Dict[str, Any], Dict[str, Any]]:
+        """Key metrics of two periods."""
+        frame = await self._load_frame(tenant_id, [period1, period2])
+        return frame.key_metrics(*period1), frame.key_metrics(*period2)
+    
+    def _calculate_kpis(
+        self,
+        frame: MetricsFrame,
         start_date: date,
-        end_date: date,
-        period: str
+        end_date: date
     ) -> List[Dict[str, Any]]:
-        """Calculate KPIs with trends and targets."""
-        # Get current period metrics
-        current_metrics = await self._get_key_metrics(
-            session, tenant_id, start_date, end_date
-        )
-        
-        # Get previous period for comparison
-        days_diff = (end_date - start_date).days + 1
-        prev_start = start_date - timedelta(days=days_diff)
-        prev_end = start_date - timedelta(days=1)
-        
-        prev_metrics = await self._get_key_metrics(
-            session, tenant_id, prev_start, prev_end
-        )
+        """Calculate KPIs with trends and targets against the previous period."""
+        current_metrics = frame.key_metrics(start_date, end_date)
+        prev_metrics = frame.key_metrics(*previous_period(start_date, end_date))
         
         # Calculate KPIs
         kpis = []
@@ -774,57 +716,6 @@ class BIDashboardService:
         
         return kpis
     
-    async def _get_trends(
-        self,
-        session,
-        tenant_id: uuid.UUID,
-        start_date: date,
-        end_date: date
-    ) -> Dict[str, Any]:
-        """Get trend data for visualizations."""
-        result = await session.execute(
-            select(CallAnalytics).where(
-                and_(
-                    CallAnalytics.tenant_id == tenant_id,
-                    CallAnalytics.date >= start_date,
-                    CallAnalytics.date <= end_date
-                )
-            ).order_by(CallAnalytics.date)
-        )
-        analytics = result.scalars().all()
-        
-        # Build time series
-        call_volume_trend = []
-        satisfaction_trend = []
-        ai_performance_trend = []
-        
-        for a in analytics:
-            call_volume_trend.append({
-                "date": a.date.isoformat(),
-                "total_calls": a.total_calls,
-                "answered_calls": a.answered_calls
-            })
-            
-            if a.average_satisfaction_score:
-                satisfaction_trend.append({
-                    "date": a.date.isoformat(),
-                    "satisfaction": a.average_satisfaction_score
-                })
-            
-            if a.ai_handled_calls > 0:
-                ai_performance_trend.append({
-                    "date": a.date.isoformat(),
-                    "ai_handled": a.ai_handled_calls,
-                    "ai_resolved": a.ai_resolved_calls,
-                    "resolution_rate": a.ai_resolved_calls / a.ai_handled_calls
-                })
-        
-        return {
-            "call_volume": call_volume_trend,
-            "satisfaction": satisfaction_trend,
-            "ai_performance": ai_performance_trend
-        }
-    
     async def _generate_insights(
         self,
         key_metrics: Dict[str, Any],
@@ -962,41 +853,23 @@ class BIDashboardService:
         
         return insights
     
-    def _analyze_trends(self, trends: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Analyze trend patterns."""
-        insights = []
-        
-        # Analyze call volume trend
-        if trends.get("call_volume"):
-            recent_calls = [t["total_calls"] for t in trends["call_volume"][-7:]]
-            if len(recent_calls) >= 2:
-                avg_recent = sum(recent_calls) / len(recent_calls)
-                if recent_calls[-1] > avg_recent * 1.2:
-                    insights.append({
-                        "type": "trend",
-                        "severity": "medium",
-                        "message": "Call volume is trending upward significantly"
-                    })
-        
-        return insights
-    
-    def _detect_anomalies(
+    async def _get_anomaly_insights(
         self,
-        metrics: Dict[str, Any],
-        trends: Dict[str, Any]
+        tenant_id: uuid.UUID,
+        period: str
     ) -> List[Dict[str, Any]]:
-        """Detect anomalies in metrics."""
-        anomalies = []
-        
-        # Check for unusual answer rate
-        if metrics["answer_rate"] < 0.7:
-            anomalies.append({
-                "type": "anomaly",
-                "severity": "high",
-                "message": "Unusually low answer rate detected"
-            })
+        """Insights from stored anomalies in a period, the latest per metric and detector."""
+        start_date, end_date = self._get_period_dates(period)
+        anomalies = await anomaly_detection_service.get_anomalies(
+            tenant_id,
+            datetime.combine(start_date, datetime.min.time()),
+            datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+        )
         
-        return anomalies
+        latest = {}
+        for anomaly in anomalies:
+            latest.setdefault((anomaly["metric"], anomaly["detector"]), anomaly)
+        return [anomaly_insight(anomaly) for anomaly in latest.values()]
     
     def _compare_metrics(
         self,
@@ -1018,3 +891,7 @@ class BIDashboardService:
             "change_percentage": change_pct,
             "trend": "up" if change > 0 else "down" if change < 0 else "stable"
         }
+
+
+# Global service instance
+bi_dashboard_service = BIDashboardService()
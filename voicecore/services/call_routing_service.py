@@ -10,7 +10,7 @@ from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
 from dataclasses import dataclass
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, update, and_, or_, func
 from sqlalchemy.orm import selectinload
 
 from voicecore.database import get_db_session, set_tenant_context
@@ -21,6 +21,8 @@ from voicecore.models import (
 from voicecore.logging import get_logger
 from voicecore.utils.security import SecurityUtils
 from voicecore.services.vip_service import VIPService
+from voicecore.services.emotion_detection_service import emotion_detection_service, EscalationLevel
+from voicecore.services.emotion_stream import EscalationEvent
 
 
 logger = get_logger(__name__)
@@ -44,6 +46,13 @@ class CallPriority(Enum):
     EMERGENCY = 5
 
 
+# Queue priority for calls whose caller escalates mid-call
+ESCALATION_PRIORITIES = {
+    EscalationLevel.HIGH: CallPriority.HIGH,
+    EscalationLevel.URGENT: CallPriority.EMERGENCY,
+}
+
+
 @dataclass
 class RoutingResult:
     """Result of call routing operation."""
@@ -106,6 +115,15 @@ class CallRoutingService:
             RoutingResult: Routing decision and details
         """
         try:
+            # Escalation detected on the live transcript raises priority
+            live_escalation = emotion_detection_service.get_live_escalation(str(call_id))
+            if live_escalation in ESCALATION_PRIORITIES:
+                routing_context = {
+                    **(routing_context or {}),
+                    "is_escalation": True,
+                    "is_emergency": live_escalation == EscalationLevel.URGENT
+                }
+            
             async with get_db_session() as session:
                 await set_tenant_context(session, str(tenant_id))
                 
@@ -335,6 +353,67 @@ class CallRoutingService:
             )
             raise
     
+    async def handle_emotion_escalation(self, event: EscalationEvent) -> bool:
+        """
+        Raise the queue priority of a waiting call whose caller escalated.
+        
+        Registered with the emotion detection service as an escalation
+        handler, so it runs while the call is still in progress.
+        
+        Args:
+            event: Escalation event from the live transcript analyzer
+            
+        Returns:
+            bool: True if a queued call was re-prioritized
+        """
+        priority = ESCALATION_PRIORITIES.get(event.level)
+        if priority is None:
+            return False
+        
+        try:
+            call_id = uuid.UUID(str(event.call_id))
+        except ValueError:
+            return False
+        
+        try:
+            async with get_db_session() as session:
+                await set_tenant_context(session, str(event.tenant_id))
+                
+                result = await session.execute(
+                    update(CallQueue)
+                    .where(
+                        and_(
+                            CallQueue.tenant_id == event.tenant_id,
+                            CallQueue.call_id == call_id,
+                            CallQueue.assigned_agent_id.is_(None),
+                            CallQueue.priority < priority.value
+                        )
+                    )
+                    .values(priority=priority.value)
+                )
+                await session.commit()
+                
+                if result.rowcount > 0:
+                    self.logger.info(
+                        "Queued call re-prioritized after emotion escalation",
+                        tenant_id=str(event.tenant_id),
+                        call_id=str(call_id),
+                        escalation_level=event.level.value,
+                        priority=priority.value
+                    )
+                    return True
+                
+                return False
+                
+        except Exception as e:
+            self.logger.error(
+                "Failed to apply emotion escalation",
+                tenant_id=str(event.tenant_id),
+                call_id=str(call_id),
+                error=str(e)
+            )
+            return False
+    
     async def get_next_queued_call(
         self,
         tenant_id: uuid.UUID,
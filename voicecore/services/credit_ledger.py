@@ -0,0 +1,331 @@
+"""
+Credit ledger for VoiceCore AI.
+
+Keeps metering off the critical path of a call: each tenant's active
+subscription and plan are cached, credits are charged with one atomic
+UPDATE ... RETURNING on the tenant's credit balance row, and usage
+records are buffered and written in batches.
+"""
+
+import uuid
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Numeric, case, insert, literal, select, update
+
+from voicecore.database import get_db_session, set_tenant_context
+from voicecore.services.analytics_frame import DashboardMemo
+from voicecore.models import CreditBalance, CreditPlan, CreditUsage, TenantSubscription
+from voicecore.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+plans = CreditPlan.__table__
+subscriptions = TenantSubscription.__table__
+usage_table = CreditUsage.__table__
+balances = CreditBalance.__table__
+
+
+@dataclass(frozen=True)
+class SubscriptionTerms:
+    """A tenant's active subscription and plan, as metering needs them."""
+    subscription_id: uuid.UUID
+    tenant_id: uuid.UUID
+    plan_id: uuid.UUID
+    plan_name: str
+    monthly_credits: int
+    overage_rate: Decimal
+    features: Dict[str, Any]
+    next_billing_date: datetime
+
+    @property
+    def allows_overage(self) -> bool:
+        """Whether usage beyond the allocation is billed rather than refused."""
+        return self.overage_rate > 0
+
+
+@dataclass(frozen=True)
+class Charge:
+    """The balance of a tenant right after an atomic charge."""
+    credits: int
+    allocated_credits: int
+    used_credits: int
+    remaining_credits: int
+    overage_credits: int
+
+    @property
+    def used_before(self) -> int:
+        return self.used_credits - self.credits
+
+    @property
+    def went_over(self) -> bool:
+        """Whether this charge is the one that exceeded the allocation."""
+        return self.used_before <= self.allocated_credits < self.used_credits
+
+    @property
+    def overage_added(self) -> int:
+        """Credits of this charge that went beyond the allocation."""
+        return self.overage_credits - max(0, self.used_before - self.allocated_credits)
+
+    def crossed_usage(self, fraction: float) -> bool:
+        """
+        Whether this charge took usage past a fraction of the allocation.
+
+        Exactly one of any number of concurrent charges crosses a given
+        point, since each sees the balance as its own UPDATE left it.
+        """
+        limit = self.allocated_credits * fraction
+        return self.used_before < limit <= self.used_credits
+
+
+class SubscriptionTermsCache(DashboardMemo):
+    """
+    Short-lived cache of tenants' subscription terms.
+
+    Tenants without an active subscription are cached too, so metering
+    for them does not query on every event. Concurrent misses for a
+    tenant share one load, which a cancelled caller does not abandon.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, max_size: int = 10000):
+        super().__init__(ttl_seconds, max_size)
+
+    async def get(self, tenant_id: uuid.UUID) -> Optional[SubscriptionTerms]:
+        """Return the tenant's terms, loading them on a miss."""
+        return await self.get_or_compute((tenant_id,), lambda: load_subscription_terms(tenant_id))
+
+
+async def load_subscription_terms(tenant_id: uuid.UUID) -> Optional[SubscriptionTerms]:
+    """
+    Load a tenant's active subscription and plan in one query.
+
+    Args:
+        tenant_id: Tenant identifier
+
+    Returns:
+        SubscriptionTerms or None if the tenant has no active subscription
+    """
+    query = (
+        select(
+            subscriptions.c.id,
+            subscriptions.c.next_billing_date,
+            subscriptions.c.custom_monthly_credits,
+            subscriptions.c.custom_overage_rate,
+            subscriptions.c.custom_features,
+            plans.c.id.label("plan_id"),
+            plans.c.name,
+            plans.c.monthly_credits,
+            plans.c.overage_rate,
+            plans.c.features
+        )
+        .select_from(subscriptions.join(plans, plans.c.id == subscriptions.c.credit_plan_id))
+        .where(
+            subscriptions.c.tenant_id == tenant_id,
+            subscriptions.c.status == "active"
+        )
+        .order_by(subscriptions.c.started_at.desc())
+        .limit(1)
+    )
+
+    async with get_db_session() as session:
+        await set_tenant_context(session, str(tenant_id))
+        row = (await session.execute(query)).first()
+
+    if row is None:
+        return None
+
+    features = dict(row.features or {})
+    features.update(row.custom_features or {})
+
+    return SubscriptionTerms(
+        subscription_id=row.id,
+        tenant_id=tenant_id,
+        plan_id=row.plan_id,
+        plan_name=row.name,
+        monthly_credits=row.custom_monthly_credits or row.monthly_credits,
+        overage_rate=Decimal(str(
+            row.custom_overage_rate if row.custom_overage_rate is not None else row.overage_rate
+        )),
+        features=features,
+        next_billing_date=row.next_billing_date
+    )
+
+
+def charge_statement(terms: SubscriptionTerms, credits: int):
+    """
+    Build the atomic charge of credits against a tenant's balance row.
+
+    Every SET expression reads the row as it was before this UPDATE, and
+    the row lock serializes concurrent charges, so no charge is lost.
+    The subscription condition makes a charge against stale cached terms
+    match no row rather than the wrong balance.
+    """
+    used = balances.c.used_credits + credits
+    overage = case(
+        (used > balances.c.allocated_credits, used - balances.c.allocated_credits),
+        else_=0
+    )
+
+    return (
+        update(balances)
+        .where(
+            balances.c.tenant_id == terms.tenant_id,
+            balances.c.subscription_id == terms.subscription_id
+        )
+        .values(
+            used_credits=used,
+            remaining_credits=case(
+                (balances.c.remaining_credits > credits, balances.c.remaining_credits - credits),
+                else_=0
+            ),
+            overage_credits=overage,
+            overage_cost=overage * literal(terms.overage_rate, Numeric(10, 4)),
+            last_updated=datetime.utcnow()
+        )
+        .returning(
+            balances.c.allocated_credits,
+            balances.c.used_credits,
+            balances.c.remaining_credits,
+            balances.c.overage_credits
+        )
+    )
+
+
+async def charge_credits(terms: SubscriptionTerms, credits: int) -> Optional[Charge]:
+    """
+    Charge credits to a tenant's balance.
+
+    Runs in its own short transaction, so the balance row is locked only
+    for the UPDATE and not for the rest of the caller's unit of work.
+
+    Args:
+        terms: The tenant's subscription terms
+        credits: Credits to charge
+
+    Returns:
+        Charge, or None if the balance row does not belong to the terms'
+        subscription
+    """
+    async with get_db_session(independent=True) as session:
+        await set_tenant_context(session, str(terms.tenant_id))
+        row = (await session.execute(charge_statement(terms, credits))).first()
+
+    if row is None:
+        return None
+
+    return Charge(
+        credits=credits,
+        allocated_credits=row.allocated_credits,
+        used_credits=row.used_credits,
+        remaining_credits=row.remaining_credits,
+        overage_credits=row.overage_credits
+    )
+
+
+@dataclass
+class PendingUsage:
+    """A usage record waiting to be written."""
+    tenant_id: uuid.UUID
+    values: Dict[str, Any]
+    recorded_at: datetime = field(default_factory=datetime.utcnow)
+
+
+class UsageRecordBuffer:
+    """
+    Buffers credit usage records and writes them in batches.
+
+    The balance is charged synchronously; the records are the itemized
+    history behind it and are inserted by a background task with one
+    executemany INSERT per tenant, every flush interval or as soon as a
+    batch fills.
+    """
+
+    def __init__(self, flush_interval: float = 2.0, batch_size: int = 500):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending: List[PendingUsage] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._batch_full = asyncio.Event()
+
+    def record(self, tenant_id: uuid.UUID, values: Dict[str, Any]) -> None:
+        """Queue a usage record for the next flush."""
+        self._pending.append(PendingUsage(tenant_id=tenant_id, values=values))
+        if len(self._pending) >= self.batch_size:
+            self._batch_full.set()
+        self._ensure_flusher()
+
+    @property
+    def pending_count(self) -> int:
+        """Number of records not yet written."""
+        return len(self._pending)
+
+    def _ensure_flusher(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            try:
+                self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
+            except RuntimeError:
+                # No running loop; records are written by the next explicit flush
+                pass
+
+    async def _flush_loop(self) -> None:
+        while self._pending:
+            try:
+                await asyncio.wait_for(self._batch_full.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_full.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Write buffered usage records to the database.
+
+        Returns:
+            Number of records written
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            batch, self._pending = self._pending, []
+
+            by_tenant: Dict[uuid.UUID, List[Dict[str, Any]]] = {}
+            for usage in batch:
+                by_tenant.setdefault(usage.tenant_id, []).append(
+                    {**usage.values, "tenant_id": usage.tenant_id, "usage_date": usage.recorded_at}
+                )
+
+            try:
+                async with get_db_session(independent=True) as session:
+                    for tenant_id, rows in by_tenant.items():
+                        await set_tenant_context(session, str(tenant_id))
+                        await session.execute(insert(usage_table), rows)
+
+            except Exception as e:
+                # Put the records back so the next flush retries them
+                self._pending[:0] = batch
+                logger.error(
+                    "Failed to flush credit usage",
+                    records=len(batch),
+                    error=str(e)
+                )
+                return 0
+
+            logger.debug("Flushed credit usage", tenants=len(by_tenant), records=len(batch))
+            return len(batch)
+
+    async def stop(self) -> None:
+        """Cancel the background flusher and write anything still buffered."""
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        self._flush_task = None
+        await self.flush()
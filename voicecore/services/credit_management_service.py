@@ -6,50 +6,62 @@ and billing enforcement per Requirement 6.7.
 """
 
 import uuid
-import asyncio
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from decimal import Decimal
 from dataclasses import dataclass
-from sqlalchemy import select, and_, func, desc, update
+from sqlalchemy import select, func, update, delete, insert
 from sqlalchemy.orm import selectinload
 
 from voicecore.database import get_db_session, set_tenant_context
-from voicecore.models import (
-    CreditPlan, TenantSubscription, UsageRecord, CreditTransaction, 
-    BillingAlert, Tenant, PlanType, UsageType, BillingStatus
-)
+from voicecore.models import CreditAlert, TenantSubscription
 from voicecore.logging import get_logger
 from voicecore.config import get_settings
+from voicecore.services.credit_ledger import (
+    Charge,
+    SubscriptionTerms,
+    SubscriptionTermsCache,
+    UsageRecordBuffer,
+    balances,
+    charge_credits,
+    plans,
+    subscriptions,
+    usage_table,
+)
 
 
 logger = get_logger(__name__)
 settings = get_settings()
 
-
-@dataclass
-class UsageEvent:
-    """Usage event for credit consumption."""
-    tenant_id: uuid.UUID
-    usage_type: UsageType
-    quantity: Decimal
-    resource_id: Optional[str] = None
-    resource_type: Optional[str] = None
-    metadata: Optional[Dict[str, Any]] = None
+alerts_table = CreditAlert.__table__
 
 
 @dataclass
 class CreditBalance:
     """Current credit balance information."""
     tenant_id: uuid.UUID
-    credits_allocated: int
-    credits_used: int
-    credits_remaining: int
-    rollover_credits: int
+    allocated_credits: int
+    used_credits: int
+    remaining_credits: int
     overage_credits: int
-    next_billing_date: datetime
-    plan_name: str
-    plan_type: str
+    overage_cost: Decimal
+    period_start: datetime
+    period_end: datetime
+    is_suspended: bool
+    suspension_reason: Optional[str]
+    last_updated: datetime
+    
+    @property
+    def usage_percentage(self) -> float:
+        """Calculate usage percentage of allocated credits."""
+        if self.allocated_credits == 0:
+            return 0.0
+        return (self.used_credits / self.allocated_credits) * 100
+    
+    @property
+    def is_over_limit(self) -> bool:
+        """Check if tenant is over their credit limit."""
+        return self.used_credits > self.allocated_credits
 
 
 @dataclass
@@ -67,13 +79,31 @@ class CreditManagementService:
     
     Implements configurable credit system per tenant with usage tracking,
     enforcement, and billing integration per Requirement 6.7.
+    
+    Metering goes through the credit ledger: subscription terms are
+    cached per tenant, credits are charged atomically on the tenant's
+    credit balance row, and usage records are written in batches.
     """
     
     def __init__(self):
         self.logger = logger
         
-        # Usage tracking cache
-        self.usage_cache: Dict[str, List[UsageEvent]] = {}
+        # Credits charged per unit of each usage type
+        self.usage_types = {
+            "call_minute": {"credits": 1, "description": "One minute of an inbound or outbound call"},
+            "ai_request": {"credits": 1, "description": "One AI response generated during a call"},
+            "transcription_minute": {"credits": 1, "description": "One minute of call transcription"},
+            "sms": {"credits": 1, "description": "One SMS message sent"},
+            "storage_gb": {"credits": 10, "description": "One GB of recording storage per month"}
+        }
+        
+        self.config = {
+            "billing_period_days": 30,
+            "default_credits_per_unit": 1,
+            "subscription_cache_ttl_seconds": settings.credit_subscription_cache_ttl_seconds,
+            "usage_flush_seconds": settings.credit_usage_flush_seconds,
+            "usage_batch_size": settings.credit_usage_batch_size
+        }
         
         # Alert thresholds
         self.alert_thresholds = {
@@ -82,8 +112,29 @@ class CreditManagementService:
             "overage": 1.0          # Any overage
         }
         
-        # Background task for processing usage
-        self.processing_usage = False
+        # Credit ledger
+        self.subscription_terms = SubscriptionTermsCache(
+            ttl_seconds=settings.credit_subscription_cache_ttl_seconds
+        )
+        self.usage_records = UsageRecordBuffer(
+            flush_interval=settings.credit_usage_flush_seconds,
+            batch_size=settings.credit_usage_batch_size
+        )
+    
+    def credits_for(self, usage_type: str, quantity: int) -> int:
+        """
+        Credits charged for a quantity of usage.
+        
+        Args:
+            usage_type: Type of usage
+            quantity: Units used
+            
+        Returns:
+            Credits to charge
+        """
+        usage = self.usage_types.get(usage_type)
+        per_unit = usage["credits"] if usage else self.config["default_credits_per_unit"]
+        return int(quantity * per_unit)
     
     async def get_tenant_subscription(
         self,
@@ -94,7 +145,7 @@ class CreditManagementService:
         
         Args:
             tenant_id: Tenant identifier
-            
+        
         Returns:
             TenantSubscription or None if not found
         """
@@ -103,215 +154,209 @@ class CreditManagementService:
                 await set_tenant_context(session, tenant_id)
                 
                 query = select(TenantSubscription).where(
-                    and_(
-                        TenantSubscription.tenant_id == tenant_id,
-                        TenantSubscription.status == BillingStatus.ACTIVE.value
-                    )
+                    TenantSubscription.tenant_id == tenant_id,
+                    TenantSubscription.status == "active"
                 ).options(selectinload(TenantSubscription.credit_plan))
                 
                 result = await session.execute(query)
-                return result.scalar_one_or_none()
-                
+                return result.scalars().first()
+        
         except Exception as e:
             self.logger.error("Failed to get tenant subscription", error=str(e))
             return None
     
+    async def get_subscription_terms(
+        self,
+        tenant_id: uuid.UUID
+    ) -> Optional[SubscriptionTerms]:
+        """
+        Get the cached terms of a tenant's active subscription.
+        
+        Args:
+            tenant_id: Tenant identifier
+        
+        Returns:
+            SubscriptionTerms or None if the tenant has no active subscription
+        """
+        try:
+            return await self.subscription_terms.get(tenant_id)
+        
+        except Exception as e:
+            self.logger.error("Failed to get subscription terms", error=str(e))
+            return None
+    
     async def create_tenant_subscription(
         self,
         tenant_id: uuid.UUID,
         credit_plan_id: uuid.UUID,
         start_date: Optional[datetime] = None
-    ) -> Optional[TenantSubscription]:
+    ) -> Optional[SubscriptionTerms]:
         """
         Create a new tenant subscription.
         
+        The tenant's credit balance is reset to the plan's allocation for
+        the new subscription.
+        
         Args:
             tenant_id: Tenant identifier
             credit_plan_id: Credit plan identifier
             start_date: Subscription start date (defaults to now)
-            
+        
         Returns:
-            Created TenantSubscription or None if failed
+            Terms of the created subscription or None if failed
         """
         try:
             if not start_date:
                 start_date = datetime.utcnow()
             
             # Calculate billing period
-            next_billing_date = start_date + timedelta(days=30)  # Monthly billing
-            current_period_end = next_billing_date
+            next_billing_date = start_date + timedelta(days=self.config["billing_period_days"])
             
             async with get_db_session() as session:
                 await set_tenant_context(session, tenant_id)
                 
-                # Get credit plan
-                plan_query = select(CreditPlan).where(CreditPlan.id == credit_plan_id)
-                plan_result = await session.execute(plan_query)
-                credit_plan = plan_result.scalar_one_or_none()
+                plan_result = await session.execute(
+                    select(plans.c.name, plans.c.monthly_credits).where(plans.c.id == credit_plan_id)
+                )
+                credit_plan = plan_result.first()
                 
                 if not credit_plan:
                     raise ValueError(f"Credit plan not found: {credit_plan_id}")
                 
-                # Create subscription
-                subscription = TenantSubscription(
-                    tenant_id=tenant_id,
-                    credit_plan_id=credit_plan_id,
-                    status=BillingStatus.ACTIVE.value,
-                    started_at=start_date,
-                    next_billing_date=next_billing_date,
-                    current_period_start=start_date,
-                    current_period_end=current_period_end,
-                    credits_allocated=credit_plan.monthly_credits,
-                    credits_used=0,
-                    credits_remaining=credit_plan.monthly_credits
-                )
-                
-                session.add(subscription)
-                await session.commit()
-                await session.refresh(subscription)
-                
-                # Create initial credit allocation transaction
-                await self._create_credit_transaction(
-                    session=session,
-                    tenant_id=tenant_id,
-                    subscription_id=subscription.id,
-                    transaction_type="allocation",
-                    credits_amount=credit_plan.monthly_credits,
-                    balance_before=0,
-                    balance_after=credit_plan.monthly_credits,
-                    description=f"Monthly credit allocation for {credit_plan.name}",
-                    billing_period_start=start_date,
-                    billing_period_end=current_period_end
+                subscription_id = uuid.uuid4()
+                await session.execute(
+                    insert(subscriptions).values(
+                        id=subscription_id,
+                        tenant_id=tenant_id,
+                        credit_plan_id=credit_plan_id,
+                        status="active",
+                        started_at=start_date,
+                        next_billing_date=next_billing_date
+                    )
                 )
                 
-                self.logger.info(
-                    "Tenant subscription created",
-                    tenant_id=str(tenant_id),
-                    plan_name=credit_plan.name,
-                    credits_allocated=credit_plan.monthly_credits
+                # One balance row per tenant, for its current subscription
+                await session.execute(delete(balances).where(balances.c.tenant_id == tenant_id))
+                await session.execute(
+                    insert(balances).values(
+                        tenant_id=tenant_id,
+                        subscription_id=subscription_id,
+                        allocated_credits=credit_plan.monthly_credits,
+                        used_credits=0,
+                        remaining_credits=credit_plan.monthly_credits,
+                        period_start=start_date,
+                        period_end=next_billing_date
+                    )
                 )
-                
-                return subscription
-                
+            
+            self.subscription_terms.invalidate(tenant_id)
+            
+            self.logger.info(
+                "Tenant subscription created",
+                tenant_id=str(tenant_id),
+                plan_name=credit_plan.name,
+                credits_allocated=credit_plan.monthly_credits
+            )
+            
+            return await self.subscription_terms.get(tenant_id)
+        
         except Exception as e:
             self.logger.error("Failed to create tenant subscription", error=str(e))
             return None
     
     async def record_usage(
         self,
-        usage_event: UsageEvent
+        tenant_id: uuid.UUID,
+        usage_type: str,
+        quantity: int = 1,
+        resource_id: Optional[str] = None,
+        resource_type: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
     ) -> bool:
         """
-        Record usage event and consume credits.
+        Record usage and consume credits.
+        
+        The credits are charged with one atomic UPDATE against the
+        tenant's balance, so concurrent usage never overwrites another
+        event's charge. The usage record itself is buffered and written
+        with the next batch.
         
         Args:
-            usage_event: Usage event to record
-            
+            tenant_id: Tenant identifier
+            usage_type: Type of usage
+            quantity: Units used
+            resource_id: Resource identifier (call ID, agent ID, ...)
+            resource_type: Resource type
+            metadata: Additional usage context
+        
         Returns:
             True if usage was recorded successfully
         """
         try:
-            # Get tenant subscription
-            subscription = await self.get_tenant_subscription(usage_event.tenant_id)
-            if not subscription:
+            credits = self.credits_for(usage_type, quantity)
+            
+            terms = await self.subscription_terms.get(tenant_id)
+            if not terms:
                 self.logger.warning(
                     "No active subscription found for usage",
-                    tenant_id=str(usage_event.tenant_id)
+                    tenant_id=str(tenant_id)
                 )
                 return False
             
-            # Calculate credits to consume
-            usage_rates = subscription.credit_plan.usage_rates or {}
-            unit_rate = Decimal(str(usage_rates.get(usage_event.usage_type.value, 1)))
-            credits_to_consume = int(usage_event.quantity * unit_rate)
-            
-            if credits_to_consume <= 0:
+            if credits <= 0:
                 return True  # No credits needed
             
-            async with get_db_session() as session:
-                await set_tenant_context(session, usage_event.tenant_id)
-                
-                # Check if tenant has enough credits or allows overages
-                current_balance = subscription.credits_remaining
-                will_overage = credits_to_consume > current_balance
-                
-                # Create usage record
-                usage_record = UsageRecord(
-                    tenant_id=usage_event.tenant_id,
-                    subscription_id=subscription.id,
-                    usage_type=usage_event.usage_type.value,
-                    quantity=usage_event.quantity,
-                    credits_consumed=credits_to_consume,
-                    unit_rate=unit_rate,
-                    resource_id=usage_event.resource_id,
-                    resource_type=usage_event.resource_type,
-                    metadata=usage_event.metadata or {},
-                    billing_period_start=subscription.current_period_start,
-                    billing_period_end=subscription.current_period_end,
-                    usage_timestamp=datetime.utcnow()
-                )
-                
-                session.add(usage_record)
-                
-                # Update subscription credits
-                new_credits_used = subscription.credits_used + credits_to_consume
-                new_credits_remaining = max(0, subscription.credits_remaining - credits_to_consume)
-                
-                await session.execute(
-                    update(TenantSubscription)
-                    .where(TenantSubscription.id == subscription.id)
-                    .values(
-                        credits_used=new_credits_used,
-                        credits_remaining=new_credits_remaining
-                    )
-                )
-                
-                # Create credit transaction
-                await self._create_credit_transaction(
-                    session=session,
-                    tenant_id=usage_event.tenant_id,
-                    subscription_id=subscription.id,
-                    transaction_type="usage",
-                    credits_amount=-credits_to_consume,
-                    balance_before=current_balance,
-                    balance_after=new_credits_remaining,
-                    description=f"Usage: {usage_event.usage_type.value}",
-                    reference_id=str(usage_record.id),
-                    reference_type="usage_record",
-                    billing_period_start=subscription.current_period_start,
-                    billing_period_end=subscription.current_period_end
-                )
-                
-                await session.commit()
-                
-                # Check for alerts
-                if will_overage:
-                    await self._create_overage_alert(
-                        usage_event.tenant_id, subscription, credits_to_consume
-                    )
-                elif new_credits_remaining <= subscription.credits_allocated * self.alert_thresholds["credit_critical"]:
-                    await self._create_low_credit_alert(
-                        usage_event.tenant_id, subscription, "critical"
-                    )
-                elif new_credits_remaining <= subscription.credits_allocated * self.alert_thresholds["credit_low"]:
-                    await self._create_low_credit_alert(
-                        usage_event.tenant_id, subscription, "warning"
-                    )
-                
-                self.logger.info(
-                    "Usage recorded",
-                    tenant_id=str(usage_event.tenant_id),
-                    usage_type=usage_event.usage_type.value,
-                    credits_consumed=credits_to_consume,
-                    credits_remaining=new_credits_remaining
+            charge = await charge_credits(terms, credits)
+            if charge is None:
+                # The subscription changed since its terms were cached
+                self.subscription_terms.invalidate(tenant_id)
+                terms = await self.subscription_terms.get(tenant_id)
+                charge = await charge_credits(terms, credits) if terms else None
+            
+            if charge is None:
+                self.logger.warning(
+                    "No credit balance found for subscription",
+                    tenant_id=str(tenant_id)
                 )
-                
-                return True
-                
+                return False
+            
+            self.usage_records.record(tenant_id, {
+                "subscription_id": terms.subscription_id,
+                "usage_type": usage_type,
+                "quantity": quantity,
+                "credits_consumed": credits,
+                "unit_cost": terms.overage_rate,
+                "total_cost": charge.overage_added * terms.overage_rate,
+                "resource_id": resource_id,
+                "resource_type": resource_type,
+                "metadata": metadata or {}
+            })
+            
+            await self._check_alerts(terms, charge)
+            
+            self.logger.info(
+                "Usage recorded",
+                tenant_id=str(tenant_id),
+                usage_type=usage_type,
+                credits_consumed=credits,
+                credits_remaining=charge.remaining_credits
+            )
+            
+            return True
+        
         except Exception as e:
             self.logger.error("Failed to record usage", error=str(e))
             return False
     
+    async def flush_usage(self) -> int:
+        """
+        Write buffered usage records.
+        
+        Returns:
+            Number of usage records written
+        """
+        return await self.usage_records.flush()
+    
     async def get_credit_balance(
         self,
         tenant_id: uuid.UUID
@@ -321,30 +366,29 @@ class CreditManagementService:
         
         Args:
             tenant_id: Tenant identifier
-            
+        
         Returns:
             CreditBalance or None if not found
         """
         try:
-            subscription = await self.get_tenant_subscription(tenant_id)
-            if not subscription:
+            row = await self._get_balance_row(tenant_id)
+            if not row:
                 return None
             
-            # Calculate overage credits
-            overage_credits = max(0, subscription.credits_used - subscription.credits_allocated)
-            
             return CreditBalance(
                 tenant_id=tenant_id,
-                credits_allocated=subscription.credits_allocated,
-                credits_used=subscription.credits_used,
-                credits_remaining=subscription.credits_remaining,
-                rollover_credits=subscription.rollover_credits,
-                overage_credits=overage_credits,
-                next_billing_date=subscription.next_billing_date,
-                plan_name=subscription.credit_plan.name,
-                plan_type=subscription.credit_plan.plan_type
+                allocated_credits=row.allocated_credits,
+                used_credits=row.used_credits,
+                remaining_credits=row.remaining_credits,
+                overage_credits=row.overage_credits,
+                overage_cost=Decimal(str(row.overage_cost)),
+                period_start=row.period_start,
+                period_end=row.period_end,
+                is_suspended=row.is_suspended,
+                suspension_reason=row.suspension_reason,
+                last_updated=row.last_updated
             )
-            
+        
         except Exception as e:
             self.logger.error("Failed to get credit balance", error=str(e))
             return None
@@ -352,8 +396,8 @@ class CreditManagementService:
     async def check_usage_limits(
         self,
         tenant_id: uuid.UUID,
-        usage_type: UsageType,
-        requested_quantity: Decimal
+        usage_type: str,
+        requested_quantity: int
     ) -> Tuple[bool, str]:
         """
         Check if usage is within limits.
@@ -362,43 +406,33 @@ class CreditManagementService:
             tenant_id: Tenant identifier
             usage_type: Type of usage
             requested_quantity: Requested usage quantity
-            
+        
         Returns:
             Tuple of (allowed, reason)
         """
         try:
-            subscription = await self.get_tenant_subscription(tenant_id)
-            if not subscription:
+            terms = await self.subscription_terms.get(tenant_id)
+            if not terms:
                 return False, "No active subscription"
             
-            # Check plan limits
-            usage_limits = subscription.credit_plan.usage_limits or {}
-            usage_rates = subscription.credit_plan.usage_rates or {}
-            
-            # Get current period usage for this type
-            current_usage = await self._get_current_period_usage(
-                tenant_id, usage_type, subscription
-            )
+            balance = await self._get_balance_row(tenant_id)
+            if not balance or balance.subscription_id != terms.subscription_id:
+                return False, "No credit balance for subscription"
             
-            # Check quantity limit
-            limit = usage_limits.get(usage_type.value)
-            if limit and (current_usage + requested_quantity) > limit:
-                return False, f"Usage limit exceeded for {usage_type.value}"
+            if balance.is_suspended:
+                return False, f"Credits suspended: {balance.suspension_reason or 'no reason given'}"
             
-            # Check credit limit
-            unit_rate = Decimal(str(usage_rates.get(usage_type.value, 1)))
-            credits_needed = int(requested_quantity * unit_rate)
+            credits_needed = self.credits_for(usage_type, requested_quantity)
             
-            if credits_needed > subscription.credits_remaining:
+            if credits_needed > balance.remaining_credits:
                 # Check if overages are allowed
-                overage_rate = subscription.credit_plan.overage_rate
-                if overage_rate <= 0:
+                if not terms.allows_overage:
                     return False, "Insufficient credits and overages not allowed"
                 else:
-                    return True, f"Will incur overage charges at ${overage_rate} per credit"
+                    return True, f"Will incur overage charges at ${terms.overage_rate} per credit"
             
             return True, "Usage allowed"
-            
+        
         except Exception as e:
             self.logger.error("Failed to check usage limits", error=str(e))
             return False, "Error checking limits"
@@ -416,37 +450,39 @@ class CreditManagementService:
             tenant_id: Tenant identifier
             start_date: Start date for summary (defaults to current period)
             end_date: End date for summary (defaults to current period)
-            
+        
         Returns:
             Usage summary dictionary
         """
         try:
-            subscription = await self.get_tenant_subscription(tenant_id)
-            if not subscription:
+            terms = await self.subscription_terms.get(tenant_id)
+            balance = await self._get_balance_row(tenant_id)
+            if not terms or not balance:
                 return {}
             
             # Use current billing period if dates not provided
             if not start_date:
-                start_date = subscription.current_period_start
+                start_date = balance.period_start
             if not end_date:
-                end_date = subscription.current_period_end
+                end_date = balance.period_end
+            
+            # Include usage still waiting in the buffer
+            await self.usage_records.flush()
             
             async with get_db_session() as session:
                 await set_tenant_context(session, tenant_id)
                 
                 # Get usage by type
                 usage_query = select(
-                    UsageRecord.usage_type,
-                    func.sum(UsageRecord.quantity).label("total_quantity"),
-                    func.sum(UsageRecord.credits_consumed).label("total_credits"),
-                    func.count(UsageRecord.id).label("usage_count")
+                    usage_table.c.usage_type,
+                    func.sum(usage_table.c.quantity).label("total_quantity"),
+                    func.sum(usage_table.c.credits_consumed).label("total_credits"),
+                    func.count(usage_table.c.id).label("usage_count")
                 ).where(
-                    and_(
-                        UsageRecord.tenant_id == tenant_id,
-                        UsageRecord.usage_timestamp >= start_date,
-                        UsageRecord.usage_timestamp <= end_date
-                    )
-                ).group_by(UsageRecord.usage_type)
+                    usage_table.c.tenant_id == tenant_id,
+                    usage_table.c.usage_date >= start_date,
+                    usage_table.c.usage_date <= end_date
+                ).group_by(usage_table.c.usage_type)
                 
                 result = await session.execute(usage_query)
                 usage_by_type = {
@@ -457,31 +493,31 @@ class CreditManagementService:
                     }
                     for row in result
                 }
-                
-                # Get total usage
-                total_credits_used = sum(
-                    usage["credits"] for usage in usage_by_type.values()
-                )
-                
-                return {
-                    "period": {
-                        "start": start_date.isoformat(),
-                        "end": end_date.isoformat(),
-                        "days": (end_date - start_date).days
-                    },
-                    "credits": {
-                        "allocated": subscription.credits_allocated,
-                        "used": total_credits_used,
-                        "remaining": subscription.credits_remaining,
-                        "rollover": subscription.rollover_credits
-                    },
-                    "usage_by_type": usage_by_type,
-                    "plan": {
-                        "name": subscription.credit_plan.name,
-                        "type": subscription.credit_plan.plan_type
-                    }
+            
+            # Get total usage
+            total_credits_used = sum(
+                usage["credits"] for usage in usage_by_type.values()
+            )
+            
+            return {
+                "period": {
+                    "start": start_date.isoformat(),
+                    "end": end_date.isoformat(),
+                    "days": (end_date - start_date).days
+                },
+                "credits": {
+                    "allocated": balance.allocated_credits,
+                    "used": total_credits_used,
+                    "remaining": balance.remaining_credits,
+                    "overage": balance.overage_credits
+                },
+                "usage_by_type": usage_by_type,
+                "plan": {
+                    "name": terms.plan_name,
+                    "monthly_credits": terms.monthly_credits
                 }
-                
+            }
+        
         except Exception as e:
             self.logger.error("Failed to get usage summary", error=str(e))
             return {}
@@ -495,205 +531,146 @@ class CreditManagementService:
         
         Args:
             tenant_id: Tenant identifier
-            
+        
         Returns:
             True if billing cycle processed successfully
         """
         try:
-            subscription = await self.get_tenant_subscription(tenant_id)
-            if not subscription:
+            self.subscription_terms.invalidate(tenant_id)
+            terms = await self.subscription_terms.get(tenant_id)
+            if not terms:
                 return False
             
             # Check if billing cycle is due
-            if datetime.utcnow() < subscription.next_billing_date:
+            if datetime.utcnow() < terms.next_billing_date:
                 return True  # Not due yet
             
+            # Calculate new billing period
+            new_period_start = terms.next_billing_date
+            new_period_end = new_period_start + timedelta(days=self.config["billing_period_days"])
+            
             async with get_db_session() as session:
                 await set_tenant_context(session, tenant_id)
                 
-                # Calculate new billing period
-                new_period_start = subscription.next_billing_date
-                new_period_end = new_period_start + timedelta(days=30)
-                new_billing_date = new_period_end
-                
-                # Handle rollover credits
-                rollover_credits = 0
-                if subscription.credit_plan.rollover_enabled:
-                    max_rollover = subscription.credit_plan.max_rollover_credits
-                    rollover_credits = min(subscription.credits_remaining, max_rollover)
-                
-                # Allocate new credits
-                new_credits_allocated = subscription.credit_plan.monthly_credits + rollover_credits
+                await session.execute(
+                    update(subscriptions)
+                    .where(subscriptions.c.id == terms.subscription_id)
+                    .values(next_billing_date=new_period_end, updated_at=datetime.utcnow())
+                )
                 
-                # Update subscription
+                # Start the new period's allocation; the row lock orders
+                # this against in-flight charges
                 await session.execute(
-                    update(TenantSubscription)
-                    .where(TenantSubscription.id == subscription.id)
+                    update(balances)
+                    .where(
+                        balances.c.tenant_id == tenant_id,
+                        balances.c.subscription_id == terms.subscription_id
+                    )
                     .values(
-                        current_period_start=new_period_start,
-                        current_period_end=new_period_end,
-                        next_billing_date=new_billing_date,
-                        credits_allocated=new_credits_allocated,
-                        credits_used=0,
-                        credits_remaining=new_credits_allocated,
-                        rollover_credits=rollover_credits
+                        allocated_credits=terms.monthly_credits,
+                        used_credits=0,
+                        remaining_credits=terms.monthly_credits,
+                        overage_credits=0,
+                        overage_cost=0,
+                        period_start=new_period_start,
+                        period_end=new_period_end,
+                        last_updated=datetime.utcnow()
                     )
                 )
-                
-                # Create credit allocation transaction
-                await self._create_credit_transaction(
-                    session=session,
-                    tenant_id=tenant_id,
-                    subscription_id=subscription.id,
-                    transaction_type="allocation",
-                    credits_amount=new_credits_allocated,
-                    balance_before=0,
-                    balance_after=new_credits_allocated,
-                    description=f"Monthly credit allocation with {rollover_credits} rollover credits",
-                    billing_period_start=new_period_start,
-                    billing_period_end=new_period_end
-                )
-                
-                await session.commit()
-                
-                self.logger.info(
-                    "Billing cycle processed",
-                    tenant_id=str(tenant_id),
-                    new_credits=new_credits_allocated,
-                    rollover_credits=rollover_credits
-                )
-                
-                return True
-                
+            
+            self.subscription_terms.invalidate(tenant_id)
+            
+            self.logger.info(
+                "Billing cycle processed",
+                tenant_id=str(tenant_id),
+                new_credits=terms.monthly_credits
+            )
+            
+            return True
+        
         except Exception as e:
             self.logger.error("Failed to process billing cycle", error=str(e))
             return False
     
     # Private helper methods
     
-    async def _create_credit_transaction(
-        self,
-        session,
-        tenant_id: uuid.UUID,
-        subscription_id: uuid.UUID,
-        transaction_type: str,
-        credits_amount: int,
-        balance_before: int,
-        balance_after: int,
-        description: str,
-        reference_id: Optional[str] = None,
-        reference_type: Optional[str] = None,
-        billing_period_start: Optional[datetime] = None,
-        billing_period_end: Optional[datetime] = None
-    ):
-        """Create a credit transaction record."""
-        transaction = CreditTransaction(
-            tenant_id=tenant_id,
-            subscription_id=subscription_id,
-            transaction_type=transaction_type,
-            credits_amount=credits_amount,
-            balance_before=balance_before,
-            balance_after=balance_after,
-            description=description,
-            reference_id=reference_id,
-            reference_type=reference_type,
-            billing_period_start=billing_period_start,
-            billing_period_end=billing_period_end
-        )
+    async def _get_balance_row(self, tenant_id: uuid.UUID):
+        """Get the tenant's credit balance row."""
+        async with get_db_session() as session:
+            await set_tenant_context(session, tenant_id)
+            
+            result = await session.execute(
+                select(balances).where(balances.c.tenant_id == tenant_id)
+            )
+            return result.first()
+    
+    async def _check_alerts(self, terms: SubscriptionTerms, charge: Charge):
+        """
+        Raise an alert when a charge crosses a threshold.
+        
+        Only the charge that crosses a threshold alerts, so a tenant gets
+        one alert per threshold per period rather than one per event.
+        """
+        used_fraction = {
+            "credit_low": 1 - self.alert_thresholds["credit_low"],
+            "credit_critical": 1 - self.alert_thresholds["credit_critical"]
+        }
         
-        session.add(transaction)
+        if charge.went_over:
+            await self._create_overage_alert(terms, charge)
+        elif charge.crossed_usage(used_fraction["credit_critical"]):
+            await self._create_low_credit_alert(terms, charge, "critical")
+        elif charge.crossed_usage(used_fraction["credit_low"]):
+            await self._create_low_credit_alert(terms, charge, "warning")
     
-    async def _get_current_period_usage(
-        self,
-        tenant_id: uuid.UUID,
-        usage_type: UsageType,
-        subscription: TenantSubscription
-    ) -> Decimal:
-        """Get current period usage for specific type."""
+    async def _create_alert(self, tenant_id: uuid.UUID, **values):
+        """Create a credit alert."""
         try:
-            async with get_db_session() as session:
+            async with get_db_session(independent=True) as session:
                 await set_tenant_context(session, tenant_id)
-                
-                query = select(func.sum(UsageRecord.quantity)).where(
-                    and_(
-                        UsageRecord.tenant_id == tenant_id,
-                        UsageRecord.usage_type == usage_type.value,
-                        UsageRecord.usage_timestamp >= subscription.current_period_start,
-                        UsageRecord.usage_timestamp <= subscription.current_period_end
+                await session.execute(
+                    insert(alerts_table).values(
+                        tenant_id=tenant_id,
+                        delivery_methods=["dashboard"],
+                        **values
                     )
                 )
-                
-                result = await session.execute(query)
-                total = result.scalar()
-                return Decimal(str(total or 0))
-                
+        
         except Exception as e:
-            self.logger.error("Failed to get current period usage", error=str(e))
-            return Decimal("0")
+            self.logger.error("Failed to create credit alert", alert_type=values.get("alert_type"), error=str(e))
     
-    async def _create_overage_alert(
-        self,
-        tenant_id: uuid.UUID,
-        subscription: TenantSubscription,
-        overage_credits: int
-    ):
+    async def _create_overage_alert(self, terms: SubscriptionTerms, charge: Charge):
         """Create overage alert."""
-        try:
-            async with get_db_session() as session:
-                await set_tenant_context(session, tenant_id)
-                
-                alert = BillingAlert(
-                    tenant_id=tenant_id,
-                    subscription_id=subscription.id,
-                    alert_type="overage",
-                    severity="warning",
-                    title="Credit Overage Detected",
-                    message=f"Your account has exceeded the credit limit by {overage_credits} credits. "
-                           f"Overage charges will apply at ${subscription.credit_plan.overage_rate} per credit.",
-                    threshold_type="absolute",
-                    threshold_value=Decimal(str(subscription.credits_allocated)),
-                    current_value=Decimal(str(subscription.credits_used + overage_credits))
-                )
-                
-                session.add(alert)
-                await session.commit()
-                
-        except Exception as e:
-            self.logger.error("Failed to create overage alert", error=str(e))
+        await self._create_alert(
+            terms.tenant_id,
+            alert_type="overage",
+            severity="warning",
+            title="Credit Overage Detected",
+            message=f"Your account has exceeded the credit limit by {charge.overage_credits} credits. "
+                    f"Overage charges will apply at ${terms.overage_rate} per credit.",
+            threshold_percentage=100,
+            current_usage=charge.used_credits,
+            credit_limit=charge.allocated_credits
+        )
     
-    async def _create_low_credit_alert(
-        self,
-        tenant_id: uuid.UUID,
-        subscription: TenantSubscription,
-        severity: str
-    ):
+    async def _create_low_credit_alert(self, terms: SubscriptionTerms, charge: Charge, severity: str):
         """Create low credit alert."""
-        try:
-            async with get_db_session() as session:
-                await set_tenant_context(session, tenant_id)
-                
-                percentage_remaining = (subscription.credits_remaining / subscription.credits_allocated) * 100
-                
-                alert = BillingAlert(
-                    tenant_id=tenant_id,
-                    subscription_id=subscription.id,
-                    alert_type="credit_low",
-                    severity=severity,
-                    title=f"Low Credit Balance - {percentage_remaining:.1f}% Remaining",
-                    message=f"Your account has {subscription.credits_remaining} credits remaining "
-                           f"({percentage_remaining:.1f}% of monthly allocation). "
-                           f"Consider upgrading your plan or monitoring usage.",
-                    threshold_type="percentage",
-                    threshold_value=Decimal(str(self.alert_thresholds["credit_low"] * 100)),
-                    current_value=Decimal(str(percentage_remaining))
-                )
-                
-                session.add(alert)
-                await session.commit()
-                
-        except Exception as e:
-            self.logger.error("Failed to create low credit alert", error=str(e))
+        percentage_remaining = (charge.remaining_credits / charge.allocated_credits) * 100
+        threshold = self.alert_thresholds["credit_critical" if severity == "critical" else "credit_low"]
+        
+        await self._create_alert(
+            terms.tenant_id,
+            alert_type="credit_low",
+            severity=severity,
+            title=f"Low Credit Balance - {percentage_remaining:.1f}% Remaining",
+            message=f"Your account has {charge.remaining_credits} credits remaining "
+                    f"({percentage_remaining:.1f}% of monthly allocation). "
+                    f"Consider upgrading your plan or monitoring usage.",
+            threshold_percentage=int(threshold * 100),
+            current_usage=charge.used_credits,
+            credit_limit=charge.allocated_credits
+        )
 
 
 # Global service instance
-credit_management_service = CreditManagementService()
\ No newline at end of file
+credit_management_service = CreditManagementService()
@@ -5,20 +5,38 @@ Implements data export in standard formats and external integration APIs
 per Requirements 10.1 and 10.4.
 """
 
+import os
+import time
 import uuid
 import asyncio
-import json
-import csv
-import io
-from typing import Dict, Any, Optional, List, Union
-from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import aclosing
+from typing import Dict, Any, AsyncIterator, Optional, List, Sequence, Tuple, Union
+from datetime import date, datetime, timedelta
 from dataclasses import dataclass, asdict
 from enum import Enum
-from sqlalchemy import select, and_, func, desc, text
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Date, Float, select, and_, case, func, desc, text, tuple_
+from sqlalchemy.sql import Select
 
-from voicecore.database import get_db_session, set_tenant_context
+from voicecore.database import get_read_session, set_tenant_context
 from voicecore.models import Call, Agent, Tenant
+from voicecore.models.agent import AgentStatus
+from voicecore.models.call import CallType
+from voicecore.models.export_job import ExportJobStatus
+from voicecore.services.export_encoders import (
+    ExportFileWriter,
+    ParquetExportWriter,
+    arrow_schema,
+    create_encoder,
+    encode_chunk,
+    export_value,
+)
+from voicecore.services.export_jobs import (
+    ExportJobCancelled,
+    ExportJobLost,
+    ExportJobStore,
+    ExportWorkerPool,
+)
 from voicecore.logging import get_logger
 from voicecore.config import get_settings
 
@@ -27,12 +45,40 @@ logger = get_logger(__name__)
 settings = get_settings()
 
 
+def _key_value(column, value: Any) -> Any:
+    """Restore a resume key value stored as JSON to the column's type."""
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    return value
+
+
+def _after_key(query: Select, fields: Sequence[str], key: Sequence[Any]):
+    """Condition selecting the rows that sort after ``key``."""
+    columns = [query.selected_columns[field] for field in fields]
+    values = [_key_value(column, value) for column, value in zip(columns, key)]
+    if len(columns) == 1:
+        return columns[0] > values[0]
+    return tuple_(*columns) > tuple_(*values)
+
+
 class ExportFormat(Enum):
     """Supported export formats."""
     JSON = "json"
+    NDJSON = "ndjson"
     CSV = "csv"
     XML = "xml"
     XLSX = "xlsx"
+    PARQUET = "parquet"
 
 
 class DataType(Enum):
@@ -47,6 +93,26 @@ class DataType(Enum):
     EMOTIONS = "emotions"
 
 
+# Low-cardinality text columns, dictionary-encoded in Parquet exports
+PARQUET_DICTIONARY_FIELDS = {"status", "direction", "call_type", "department_id", "agent_name"}
+
+# Column whose date partitions each time-series export
+PARTITION_FIELDS = {
+    DataType.CALLS: "created_at",
+    DataType.TRANSCRIPTS: "created_at",
+    DataType.ANALYTICS: "date",
+}
+
+# Sort key of each export query; an interrupted export resumes after
+# the key of the last row it checkpointed
+RESUME_KEYS = {
+    DataType.CALLS: ("created_at", "id"),
+    DataType.AGENTS: ("created_at", "id"),
+    DataType.ANALYTICS: ("date",),
+    DataType.TRANSCRIPTS: ("created_at", "call_id"),
+}
+
+
 @dataclass
 class ExportRequest:
     """Data export request."""
@@ -56,12 +122,57 @@ class ExportRequest:
     format: ExportFormat
     filters: Dict[str, Any]
     date_range: Dict[str, datetime]
-    status: str  # "pending", "processing", "completed", "failed"
+    status: str  # "pending", "processing", "completed", "failed", "cancelled"
     created_at: datetime
     completed_at: Optional[datetime] = None
     file_path: Optional[str] = None
     file_size: Optional[int] = None
     error_message: Optional[str] = None
+    total_rows: Optional[int] = None
+    rows_exported: int = 0
+    bytes_encoded: int = 0
+    content_type: Optional[str] = None
+    compressed: bool = False
+    partition_by_date: bool = False
+    priority: int = 0
+    attempts: int = 0
+    cancel_requested: bool = False
+    
+    @property
+    def progress(self) -> float:
+        """Fraction of rows exported, 0.0 to 1.0."""
+        if self.status == "completed":
+            return 1.0
+        if not self.total_rows:
+            return 0.0
+        return min(self.rows_exported / self.total_rows, 1.0)
+    
+    @classmethod
+    def from_job(cls, job: Dict[str, Any]) -> "ExportRequest":
+        """Build a request from an ``export_jobs`` row."""
+        return cls(
+            id=str(job["id"]),
+            tenant_id=job["tenant_id"],
+            data_type=DataType(job["data_type"]),
+            format=ExportFormat(job["format"]),
+            filters=job["filters"] or {},
+            date_range={"start": job["date_start"], "end": job["date_end"]},
+            status=job["status"],
+            created_at=job["created_at"],
+            completed_at=job["completed_at"],
+            file_path=job["file_path"],
+            file_size=job["file_size"],
+            error_message=job["error_message"],
+            total_rows=job["total_rows"],
+            rows_exported=job["rows_exported"],
+            bytes_encoded=job["bytes_encoded"],
+            content_type=job["content_type"],
+            compressed=job["compressed"],
+            partition_by_date=job["partition_by_date"],
+            priority=job["priority"],
+            attempts=job["attempts"],
+            cancel_requested=job["cancel_requested"]
+        )
 
 
 @dataclass
@@ -86,20 +197,54 @@ class DataExportService:
     
     Implements data export in standard formats and REST API
     for external integrations per Requirements 10.1 and 10.4.
+    
+    Export requests are persisted as jobs and run by a worker pool (see
+    export_jobs); ``start`` must be called for queued exports to run.
     """
     
     def __init__(self):
         self.logger = logger
         
-        # Export requests storage
-        self.export_requests: Dict[str, ExportRequest] = {}
+        # Exports running in this process, with live progress
+        self.active_exports: Dict[str, ExportRequest] = {}
         
         # Integration endpoints storage
         self.integration_endpoints: Dict[str, IntegrationEndpoint] = {}
         
-        # Export processing queue
-        self.export_queue: List[str] = []
-        self.processing_exports = False
+        self.export_directory = settings.export_directory
+        self.chunk_size = settings.export_chunk_size
+        self.compress = settings.export_compress
+        self.compression_level = 6
+        self.parquet_row_group_size = settings.export_parquet_row_group_size
+        self.parquet_compression = settings.export_parquet_compression
+        self.checkpoint_rows = settings.export_checkpoint_rows
+        self.heartbeat_seconds = settings.export_heartbeat_seconds
+        self.process_workers = settings.export_process_workers
+        
+        self.job_store = ExportJobStore()
+        self.worker_pool = ExportWorkerPool(
+            self.job_store,
+            self._run_export_job,
+            concurrency=settings.export_worker_concurrency,
+            max_jobs_per_tenant=settings.export_max_jobs_per_tenant,
+            poll_interval=settings.export_poll_interval_seconds,
+            stale_after=settings.export_job_stale_seconds,
+            max_attempts=settings.export_job_max_attempts
+        )
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+    
+    async def start(self) -> None:
+        """Start the export worker pool."""
+        if self.process_workers > 0 and self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.process_workers)
+        await self.worker_pool.start()
+    
+    async def stop(self) -> None:
+        """Stop the worker pool; running exports resume on the next start."""
+        await self.worker_pool.stop()
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
     
     async def create_export_request(
         self,
@@ -107,7 +252,9 @@ class DataExportService:
         data_type: DataType,
         format: ExportFormat,
         filters: Optional[Dict[str, Any]] = None,
-        date_range: Optional[Dict[str, datetime]] = None
+        date_range: Optional[Dict[str, datetime]] = None,
+        partition_by_date: bool = False,
+        priority: int = 0
     ) -> ExportRequest:
         """
         Create a new data export request.
@@ -118,58 +265,98 @@ class DataExportService:
             format: Export format
             filters: Optional data filters
             date_range: Optional date range filter
+            partition_by_date: Split Parquet output into one directory per day
+            priority: Higher priority exports are started before the tenant's other exports
             
         Returns:
             ExportRequest: Created export request
         """
         try:
-            request_id = str(uuid.uuid4())
-            
-            # Set default date range if not provided
-            if not date_range:
-                end_date = datetime.utcnow()
-                start_date = end_date - timedelta(days=30)
-                date_range = {"start": start_date, "end": end_date}
-            
-            # Set default filters if not provided
-            if not filters:
-                filters = {}
-            
-            export_request = ExportRequest(
-                id=request_id,
-                tenant_id=tenant_id,
-                data_type=data_type,
-                format=format,
-                filters=filters,
-                date_range=date_range,
-                status="pending",
-                created_at=datetime.utcnow()
-            )
-            
-            # Store export request
-            self.export_requests[request_id] = export_request
-            
-            # Add to processing queue
-            self.export_queue.append(request_id)
+            job = await self.job_store.create(self._job_values(
+                tenant_id, data_type, format, filters, date_range, partition_by_date, priority
+            ))
+            export_request = ExportRequest.from_job(job)
             
             self.logger.info(
                 "Export request created",
-                request_id=request_id,
+                request_id=export_request.id,
                 tenant_id=str(tenant_id),
                 data_type=data_type.value,
-                format=format.value
+                format=format.value,
+                priority=priority
             )
             
-            # Start processing if not already running
-            if not self.processing_exports:
-                asyncio.create_task(self._process_export_queue())
-            
+            self.worker_pool.notify()
             return export_request
             
         except Exception as e:
             self.logger.error("Failed to create export request", error=str(e))
             raise
     
+    async def export_now(
+        self,
+        tenant_id: uuid.UUID,
+        data_type: DataType,
+        format: ExportFormat,
+        filters: Optional[Dict[str, Any]] = None,
+        date_range: Optional[Dict[str, datetime]] = None,
+        partition_by_date: bool = False
+    ) -> ExportRequest:
+        """
+        Run an export in the calling task instead of queueing it.
+        
+        Args:
+            tenant_id: Tenant identifier
+            data_type: Type of data to export
+            format: Export format
+            filters: Optional data filters
+            date_range: Optional date range filter
+            partition_by_date: Split Parquet output into one directory per day
+            
+        Returns:
+            ExportRequest: Finished export request (completed or failed)
+        """
+        now = datetime.utcnow()
+        values = self._job_values(tenant_id, data_type, format, filters, date_range, partition_by_date, 0)
+        job = await self.job_store.create({
+            **values,
+            "status": ExportJobStatus.PROCESSING,
+            "worker_id": f"{self.worker_pool.worker_id}:inline",
+            "attempts": 1,
+            "started_at": now,
+            "heartbeat_at": now
+        })
+        return await self._run_export_job(job)
+    
+    def _job_values(
+        self,
+        tenant_id: uuid.UUID,
+        data_type: DataType,
+        format: ExportFormat,
+        filters: Optional[Dict[str, Any]],
+        date_range: Optional[Dict[str, datetime]],
+        partition_by_date: bool,
+        priority: int
+    ) -> Dict[str, Any]:
+        """Column values for a new export job."""
+        # Set default date range if not provided
+        if not date_range:
+            end_date = datetime.utcnow()
+            start_date = end_date - timedelta(days=30)
+            date_range = {"start": start_date, "end": end_date}
+        
+        return {
+            "tenant_id": tenant_id,
+            "data_type": data_type.value,
+            "format": format.value,
+            "filters": filters or {},
+            "date_start": date_range["start"],
+            "date_end": date_range["end"],
+            "partition_by_date": partition_by_date,
+            "priority": priority,
+            "status": ExportJobStatus.PENDING
+        }
+    
     async def get_export_request(
         self,
         request_id: str,
@@ -186,16 +373,12 @@ class DataExportService:
             ExportRequest or None if not found
         """
         try:
-            if request_id not in self.export_requests:
-                return None
-            
-            export_request = self.export_requests[request_id]
-            
-            # Verify tenant ownership
-            if export_request.tenant_id != tenant_id:
-                return None
+            active = self.active_exports.get(request_id)
+            if active is not None:
+                return active if active.tenant_id == tenant_id else None
             
-            return export_request
+            job = await self.job_store.get(uuid.UUID(request_id), tenant_id)
+            return ExportRequest.from_job(job) if job else None
             
         except Exception as e:
             self.logger.error("Failed to get export request", error=str(e))
@@ -216,286 +399,461 @@ class DataExportService:
             offset: Number of requests to skip
             
         Returns:
-            List of export requests
+            List of export requests, newest first
         """
         try:
-            tenant_requests = [
-                req for req in self.export_requests.values()
-                if req.tenant_id == tenant_id
+            jobs = await self.job_store.list(tenant_id, limit, offset)
+            return [
+                self.active_exports.get(str(job["id"])) or ExportRequest.from_job(job)
+                for job in jobs
             ]
             
-            # Sort by creation date (newest first)
-            tenant_requests.sort(key=lambda x: x.created_at, reverse=True)
-            
-            # Apply pagination
-            return tenant_requests[offset:offset + limit]
-            
         except Exception as e:
             self.logger.error("Failed to list export requests", error=str(e))
             return []
     
-    async def _process_export_queue(self):
-        """Process export requests in the queue."""
-        self.processing_exports = True
+    async def cancel_export_request(
+        self,
+        request_id: str,
+        tenant_id: uuid.UUID
+    ) -> Optional[ExportRequest]:
+        """
+        Cancel an export.
+        
+        Queued exports are cancelled at once. Running exports stop at
+        their next chunk if they run in this process, or at their next
+        checkpoint otherwise.
         
+        Args:
+            request_id: Export request ID
+            tenant_id: Tenant identifier for access control
+            
+        Returns:
+            ExportRequest after the request, or None if not found
+        """
         try:
-            while self.export_queue:
-                request_id = self.export_queue.pop(0)
-                
-                if request_id in self.export_requests:
-                    await self._process_export_request(request_id)
-                
-                # Small delay between processing
-                await asyncio.sleep(0.1)
-                
-        except Exception as e:
-            self.logger.error("Error processing export queue", error=str(e))
-        finally:
-            self.processing_exports = False
+            job_id = uuid.UUID(request_id)
+        except ValueError:
+            return None
+        
+        job = await self.job_store.request_cancel(job_id, tenant_id)
+        if job is None:
+            return None
+        
+        active = self.active_exports.get(request_id)
+        if active is not None:
+            active.cancel_requested = True
+            return active
+        return ExportRequest.from_job(job)
     
-    async def _process_export_request(self, request_id: str):
-        """Process a single export request."""
+    async def _run_export_job(self, job: Dict[str, Any]) -> ExportRequest:
+        """
+        Run a claimed export job to completion.
+        
+        Text exports resume from the job's checkpoint; Parquet exports
+        start over. Cancellation removes the output. Task cancellation
+        (pool shutdown) propagates with the output and checkpoint kept.
+        """
+        export_request = ExportRequest.from_job(job)
+        request_id = export_request.id
+        self.active_exports[request_id] = export_request
+        file_path = None
         try:
-            export_request = self.export_requests[request_id]
-            export_request.status = "processing"
-            
             self.logger.info(
                 "Processing export request",
                 request_id=request_id,
-                data_type=export_request.data_type.value
+                data_type=export_request.data_type.value,
+                attempt=job["attempts"],
+                resume_from_row=export_request.rows_exported if job["resume_key"] else 0
             )
             
-            # Extract data based on type
-            data = await self._extract_data(export_request)
-            
-            # Convert to requested format
-            exported_data = await self._format_data(data, export_request.format)
+            query, fields = self._build_export_query(export_request)
+            os.makedirs(self.export_directory, exist_ok=True)
+            base_path = os.path.join(self.export_directory, f"export_{request_id}")
             
-            # Store exported data (in production, save to file system or cloud storage)
-            file_path = f"/tmp/export_{request_id}.{export_request.format.value}"
-            file_size = len(exported_data.encode('utf-8'))
+            if export_request.format == ExportFormat.PARQUET:
+                writer = self._create_parquet_writer(export_request, query, base_path)
+                file_path = writer.output_path
+                await self._stream_parquet_export(export_request, job, query, writer)
+                content_type, compressed = writer.content_type, False
+            else:
+                encoder = create_encoder(export_request.format.value, fields)
+                file_path = f"{base_path}.{encoder.extension}" + (".gz" if self.compress else "")
+                await self._stream_export(export_request, job, query, fields, encoder, file_path)
+                content_type, compressed = encoder.content_type, self.compress
             
             # Update request status
-            export_request.status = "completed"
+            export_request.status = ExportJobStatus.COMPLETED
             export_request.completed_at = datetime.utcnow()
             export_request.file_path = file_path
-            export_request.file_size = file_size
+            export_request.content_type = content_type
+            export_request.compressed = compressed
+            await self._finish(job, export_request)
             
             self.logger.info(
                 "Export request completed",
                 request_id=request_id,
-                file_size=file_size
+                rows=export_request.rows_exported,
+                bytes_encoded=export_request.bytes_encoded,
+                file_size=export_request.file_size
             )
+        
+        except ExportJobLost as e:
+            # Another worker owns the job and its output now
+            self.logger.warning("Export request taken over", request_id=request_id, error=str(e))
+        
+        except ExportJobCancelled:
+            export_request.status = ExportJobStatus.CANCELLED
+            export_request.completed_at = datetime.utcnow()
+            self._remove_output(file_path)
+            await self._finish(job, export_request)
+            
+            self.logger.info("Export request cancelled", request_id=request_id)
             
         except Exception as e:
             # Update request with error
-            export_request.status = "failed"
+            export_request.status = ExportJobStatus.FAILED
             export_request.error_message = str(e)
             export_request.completed_at = datetime.utcnow()
+            self._remove_output(file_path)
+            await self._finish(job, export_request)
             
             self.logger.error(
                 "Export request failed",
                 request_id=request_id,
                 error=str(e)
             )
+        
+        finally:
+            self.active_exports.pop(request_id, None)
+        
+        return export_request
     
-    async def _extract_data(self, export_request: ExportRequest) -> List[Dict[str, Any]]:
-        """Extract data based on export request."""
+    async def _finish(self, job: Dict[str, Any], export_request: ExportRequest) -> None:
+        """Store the outcome of a job."""
         try:
-            async with get_db_session() as session:
-                await set_tenant_context(session, export_request.tenant_id)
-                
-                if export_request.data_type == DataType.CALLS:
-                    return await self._extract_calls_data(session, export_request)
-                elif export_request.data_type == DataType.AGENTS:
-                    return await self._extract_agents_data(session, export_request)
-                elif export_request.data_type == DataType.ANALYTICS:
-                    return await self._extract_analytics_data(session, export_request)
-                elif export_request.data_type == DataType.TRANSCRIPTS:
-                    return await self._extract_transcripts_data(session, export_request)
-                else:
-                    # For other data types, return empty list for now
-                    return []
-                    
+            await self.job_store.finish(job["id"], job["worker_id"], export_request.status, {
+                "file_path": export_request.file_path,
+                "file_size": export_request.file_size,
+                "content_type": export_request.content_type,
+                "compressed": export_request.compressed,
+                "total_rows": export_request.total_rows,
+                "rows_exported": export_request.rows_exported,
+                "bytes_encoded": export_request.bytes_encoded,
+                "error_message": export_request.error_message,
+                "resume_key": None,
+                "checkpoint_offset": 0
+            })
         except Exception as e:
-            self.logger.error("Failed to extract data", error=str(e))
-            raise
+            self.logger.error("Failed to store export outcome", request_id=export_request.id, error=str(e))
     
-    async def _extract_calls_data(self, session, export_request: ExportRequest) -> List[Dict[str, Any]]:
-        """Extract calls data."""
-        try:
-            query = select(Call).where(
-                and_(
-                    Call.tenant_id == export_request.tenant_id,
-                    Call.created_at >= export_request.date_range["start"],
-                    Call.created_at <= export_request.date_range["end"]
-                )
-            ).options(selectinload(Call.agent))
-            
-            # Apply filters
-            if "status" in export_request.filters:
-                query = query.where(Call.status == export_request.filters["status"])
-            
-            if "agent_id" in export_request.filters:
-                query = query.where(Call.agent_id == export_request.filters["agent_id"])
+    @staticmethod
+    def _remove_output(file_path: Optional[str]) -> None:
+        if file_path and os.path.exists(file_path):
+            os.remove(file_path)
+    
+    def _checkpoint_due(self, export_request: ExportRequest, since_rows: int, since: float) -> bool:
+        return (
+            export_request.rows_exported - since_rows >= self.checkpoint_rows
+            or time.monotonic() - since >= self.heartbeat_seconds
+        )
+    
+    async def _checkpoint(
+        self,
+        job: Dict[str, Any],
+        export_request: ExportRequest,
+        offset: int = 0,
+        resume_key: Optional[List[Any]] = None
+    ) -> None:
+        """
+        Record progress and heartbeat, and stop if cancellation was requested.
+        
+        Raises:
+            ExportJobCancelled: If the export was cancelled
+            ExportJobLost: If another worker took the job over
+        """
+        cancel_requested = await self.job_store.checkpoint(job["id"], job["worker_id"], {
+            "total_rows": export_request.total_rows,
+            "rows_exported": export_request.rows_exported,
+            "bytes_encoded": export_request.bytes_encoded,
+            "checkpoint_offset": offset,
+            "resume_key": resume_key
+        })
+        if cancel_requested:
+            export_request.cancel_requested = True
+        self._check_cancelled(export_request)
+    
+    @staticmethod
+    def _check_cancelled(export_request: ExportRequest) -> None:
+        if export_request.cancel_requested:
+            raise ExportJobCancelled(export_request.id)
+    
+    async def _export_chunks(
+        self,
+        export_request: ExportRequest,
+        query: Select,
+        after: Optional[Sequence[Any]] = None
+    ) -> AsyncIterator[Sequence[Any]]:
+        """
+        Yield the export's rows one chunk at a time from a server-side cursor.
+        
+        Sets ``total_rows`` before the first chunk.
+        
+        Args:
+            export_request: Export being run
+            query: Export query
+            after: Resume key; only rows sorting after it are yielded
+        """
+        async with get_read_session() as session:
+            await set_tenant_context(session, export_request.tenant_id)
             
-            result = await session.execute(query)
-            calls = result.scalars().all()
+            export_request.total_rows = (await session.execute(
+                select(func.count()).select_from(query.order_by(None).subquery())
+            )).scalar()
             
-            return [
-                {
-                    "id": str(call.id),
-                    "phone_number": call.phone_number,
-                    "caller_name": call.caller_name,
-                    "status": call.status,
-                    "duration": call.duration,
-                    "agent_name": call.agent.name if call.agent else None,
-                    "created_at": call.created_at.isoformat(),
-                    "ended_at": call.ended_at.isoformat() if call.ended_at else None,
-                    "call_type": call.call_type,
-                    "is_spam": call.is_spam,
-                    "transcript": call.transcript
-                }
-                for call in calls
-            ]
+            if after is not None:
+                query = query.where(_after_key(query, self._resume_fields(export_request, query), after))
             
-        except Exception as e:
-            self.logger.error("Failed to extract calls data", error=str(e))
-            raise
+            result = await session.stream(query.execution_options(yield_per=self.chunk_size))
+            async for partition in result.partitions():
+                yield partition
+    
+    def _resume_fields(self, export_request: ExportRequest, query: Select) -> Sequence[str]:
+        """Sort key columns of the export query, or () if it cannot resume."""
+        fields = RESUME_KEYS.get(export_request.data_type, ())
+        columns = query.selected_columns
+        return fields if all(field in columns for field in fields) else ()
     
-    async def _extract_agents_data(self, session, export_request: ExportRequest) -> List[Dict[str, Any]]:
-        """Extract agents data."""
+    async def _encode(self, export_request: ExportRequest, fields: List[str], rows: List[tuple]) -> Tuple[bytes, int]:
+        """Encode one chunk in the process pool if configured, else a thread."""
+        args = (
+            export_request.format.value,
+            fields,
+            rows,
+            export_request.rows_exported > 0,
+            self.compression_level if self.compress else None
+        )
+        if self._process_pool is not None:
+            return await asyncio.get_running_loop().run_in_executor(self._process_pool, encode_chunk, *args)
+        return await asyncio.to_thread(encode_chunk, *args)
+    
+    async def _stream_export(
+        self,
+        export_request: ExportRequest,
+        job: Dict[str, Any],
+        query: Select,
+        fields: List[str],
+        encoder,
+        file_path: str
+    ):
+        """
+        Stream query results through an encoder into a file.
+        
+        Encoding and compression run in a worker thread or process, so
+        the event loop only waits on the database. Checkpoints record
+        the file length and the last row's sort key; a rerun truncates
+        the file to that length and continues after that key.
+        """
+        resume_fields = self._resume_fields(export_request, query)
+        resume_key = job["resume_key"] if resume_fields else None
+        offset = job["checkpoint_offset"] if resume_key is not None else 0
+        if offset and (not os.path.exists(file_path) or os.path.getsize(file_path) < offset):
+            offset, resume_key = 0, None
+        if not offset:
+            export_request.rows_exported = export_request.bytes_encoded = 0
+        
+        writer = ExportFileWriter(file_path, compress=self.compress, compression_level=self.compression_level)
+        await asyncio.to_thread(writer.open, offset)
+        writer.bytes_encoded = export_request.bytes_encoded
         try:
-            query = select(Agent).where(Agent.tenant_id == export_request.tenant_id)
+            if not offset:
+                await asyncio.to_thread(writer.write, encoder.begin())
+            
+            since_rows, since = export_request.rows_exported, time.monotonic()
+            async with aclosing(self._export_chunks(export_request, query, resume_key)) as chunks:
+                async for partition in chunks:
+                    self._check_cancelled(export_request)
+                    data, size = await self._encode(export_request, fields, [tuple(row) for row in partition])
+                    await asyncio.to_thread(writer.append, data, size)
+                    export_request.rows_exported += len(partition)
+                    export_request.bytes_encoded = writer.bytes_encoded
+                    export_request.file_size = writer.bytes_written
+                    
+                    if self._checkpoint_due(export_request, since_rows, since):
+                        offset = await asyncio.to_thread(writer.sync)
+                        key = [export_value(partition[-1]._mapping[field]) for field in resume_fields]
+                        await self._checkpoint(job, export_request, offset, key if resume_fields else None)
+                        since_rows, since = export_request.rows_exported, time.monotonic()
+            
+            if export_request.rows_exported:
+                encoder.resume()
+            await asyncio.to_thread(writer.write, encoder.end())
+        finally:
+            await asyncio.to_thread(writer.close)
+        
+        export_request.bytes_encoded = writer.bytes_encoded
+        export_request.file_size = writer.bytes_written
+    
+    def _create_parquet_writer(
+        self,
+        export_request: ExportRequest,
+        query: Select,
+        base_path: str
+    ) -> ParquetExportWriter:
+        """Create a Parquet writer for the query's columns."""
+        partition_field = None
+        if export_request.partition_by_date:
+            partition_field = PARTITION_FIELDS.get(export_request.data_type)
+            if partition_field is None:
+                raise ValueError(
+                    f"Date partitioning not available for data type: {export_request.data_type.value}"
+                )
+        
+        return ParquetExportWriter(
+            base_path,
+            arrow_schema(query.selected_columns, PARQUET_DICTIONARY_FIELDS),
+            row_group_size=self.parquet_row_group_size,
+            compression=self.parquet_compression,
+            partition_field=partition_field
+        )
+    
+    async def _stream_parquet_export(
+        self,
+        export_request: ExportRequest,
+        job: Dict[str, Any],
+        query: Select,
+        writer: ParquetExportWriter
+    ):
+        """
+        Stream query results into Parquet row groups.
+        
+        Each chunk becomes an Arrow record batch; conversion and writes
+        run in a worker thread. Parquet files cannot be appended to, so
+        checkpoints only record progress and a rerun starts over.
+        """
+        export_request.rows_exported = export_request.bytes_encoded = 0
+        await asyncio.to_thread(writer.open)
+        try:
+            since_rows, since = 0, time.monotonic()
+            async with aclosing(self._export_chunks(export_request, query)) as chunks:
+                async for partition in chunks:
+                    self._check_cancelled(export_request)
+                    await asyncio.to_thread(writer.write_rows, partition)
+                    export_request.rows_exported += len(partition)
+                    export_request.bytes_encoded = writer.bytes_encoded
+                    
+                    if self._checkpoint_due(export_request, since_rows, since):
+                        await self._checkpoint(job, export_request)
+                        since_rows, since = export_request.rows_exported, time.monotonic()
+        finally:
+            await asyncio.to_thread(writer.close)
+        
+        export_request.bytes_encoded = writer.bytes_encoded
+        export_request.file_size = writer.bytes_written
+    
+    def _build_export_query(self, export_request: ExportRequest) -> Tuple[Select, List[str]]:
+        """
+        Build the column query for an export.
+        
+        Returns:
+            The select statement and its output column names
+        """
+        data_type = export_request.data_type
+        tenant_id = export_request.tenant_id
+        start = export_request.date_range["start"]
+        end = export_request.date_range["end"]
+        filters = export_request.filters
+        
+        if data_type == DataType.CALLS:
+            query = select(
+                Call.id.label("id"),
+                Call.from_number.label("phone_number"),
+                Call.caller_name.label("caller_name"),
+                Call.status.label("status"),
+                Call.direction.label("direction"),
+                Call.department_id.label("department_id"),
+                Call.duration.label("duration"),
+                Agent.name.label("agent_name"),
+                Call.created_at.label("created_at"),
+                Call.ended_at.label("ended_at"),
+                Call.call_type.label("call_type"),
+                (Call.call_type == CallType.SPAM).label("is_spam"),
+                Call.transcript.label("transcript"),
+            ).outerjoin(Agent, Call.agent_id == Agent.id).where(
+                and_(
+                    Call.tenant_id == tenant_id,
+                    Call.created_at >= start,
+                    Call.created_at <= end
+                )
+            )
             
             # Apply filters
-            if "department" in export_request.filters:
-                query = query.where(Agent.department == export_request.filters["department"])
+            if "status" in filters:
+                query = query.where(Call.status == filters["status"])
             
-            if "status" in export_request.filters:
-                query = query.where(Agent.status == export_request.filters["status"])
+            if "agent_id" in filters:
+                query = query.where(Call.agent_id == filters["agent_id"])
             
-            result = await session.execute(query)
-            agents = result.scalars().all()
+            query = query.order_by(Call.created_at, Call.id)
+        
+        elif data_type == DataType.AGENTS:
+            query = select(
+                Agent.id.label("id"),
+                Agent.name.label("name"),
+                Agent.email.label("email"),
+                Agent.extension.label("extension"),
+                Agent.department_id.label("department_id"),
+                Agent.status.label("status"),
+                (Agent.status == AgentStatus.AVAILABLE).label("is_available"),
+                Agent.created_at.label("created_at"),
+                Agent.last_status_change.label("last_activity"),
+            ).where(Agent.tenant_id == tenant_id)
             
-            return [
-                {
-                    "id": str(agent.id),
-                    "name": agent.name,
-                    "email": agent.email,
-                    "extension": agent.extension,
-                    "department": agent.department,
-                    "status": agent.status,
-                    "is_available": agent.is_available,
-                    "created_at": agent.created_at.isoformat(),
-                    "last_activity": agent.last_activity.isoformat() if agent.last_activity else None
-                }
-                for agent in agents
-            ]
+            # Apply filters
+            if "department" in filters:
+                query = query.where(Agent.department_id == filters["department"])
             
-        except Exception as e:
-            self.logger.error("Failed to extract agents data", error=str(e))
-            raise
-    
-    async def _extract_analytics_data(self, session, export_request: ExportRequest) -> List[Dict[str, Any]]:
-        """Extract analytics data."""
-        try:
-            # Get call statistics
-            call_stats_query = select(
+            if "status" in filters:
+                query = query.where(Agent.status == filters["status"])
+            
+            query = query.order_by(Agent.created_at, Agent.id)
+        
+        elif data_type == DataType.ANALYTICS:
+            day = func.date(Call.created_at, type_=Date)
+            query = select(
+                day.label("date"),
                 func.count(Call.id).label("total_calls"),
-                func.avg(Call.duration).label("avg_duration"),
-                func.sum(func.case((Call.is_spam == True, 1), else_=0)).label("spam_calls"),
-                func.date(Call.created_at).label("date")
+                func.coalesce(func.avg(Call.duration), 0, type_=Float).label("average_duration"),
+                func.sum(case((Call.call_type == CallType.SPAM, 1), else_=0)).label("spam_calls"),
             ).where(
                 and_(
-                    Call.tenant_id == export_request.tenant_id,
-                    Call.created_at >= export_request.date_range["start"],
-                    Call.created_at <= export_request.date_range["end"]
+                    Call.tenant_id == tenant_id,
+                    Call.created_at >= start,
+                    Call.created_at <= end
                 )
-            ).group_by(func.date(Call.created_at))
-            
-            result = await session.execute(call_stats_query)
-            stats = result.all()
-            
-            return [
-                {
-                    "date": stat.date.isoformat(),
-                    "total_calls": stat.total_calls,
-                    "average_duration": float(stat.avg_duration) if stat.avg_duration else 0,
-                    "spam_calls": stat.spam_calls
-                }
-                for stat in stats
-            ]
-            
-        except Exception as e:
-            self.logger.error("Failed to extract analytics data", error=str(e))
-            raise
-    
-    async def _extract_transcripts_data(self, session, export_request: ExportRequest) -> List[Dict[str, Any]]:
-        """Extract transcripts data."""
-        try:
-            query = select(Call).where(
+            ).group_by(day).order_by(day)
+        
+        elif data_type == DataType.TRANSCRIPTS:
+            query = select(
+                Call.id.label("call_id"),
+                Call.from_number.label("phone_number"),
+                Call.transcript.label("transcript"),
+                Call.duration.label("duration"),
+                Call.created_at.label("created_at"),
+            ).where(
                 and_(
-                    Call.tenant_id == export_request.tenant_id,
+                    Call.tenant_id == tenant_id,
                     Call.transcript.isnot(None),
-                    Call.created_at >= export_request.date_range["start"],
-                    Call.created_at <= export_request.date_range["end"]
+                    Call.transcript != "",
+                    Call.created_at >= start,
+                    Call.created_at <= end
                 )
-            )
-            
-            result = await session.execute(query)
-            calls = result.scalars().all()
-            
-            return [
-                {
-                    "call_id": str(call.id),
-                    "phone_number": call.phone_number,
-                    "transcript": call.transcript,
-                    "duration": call.duration,
-                    "created_at": call.created_at.isoformat()
-                }
-                for call in calls if call.transcript
-            ]
-            
-        except Exception as e:
-            self.logger.error("Failed to extract transcripts data", error=str(e))
-            raise
-    
-    async def _format_data(self, data: List[Dict[str, Any]], format: ExportFormat) -> str:
-        """Format data in the requested format."""
-        try:
-            if format == ExportFormat.JSON:
-                return json.dumps(data, indent=2, default=str)
-            
-            elif format == ExportFormat.CSV:
-                if not data:
-                    return ""
-                
-                output = io.StringIO()
-                writer = csv.DictWriter(output, fieldnames=data[0].keys())
-                writer.writeheader()
-                writer.writerows(data)
-                return output.getvalue()
-            
-            elif format == ExportFormat.XML:
-                # Simple XML format
-                xml_lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<data>']
-                
-                for item in data:
-                    xml_lines.append('  <record>')
-                    for key, value in item.items():
-                        xml_lines.append(f'    <{key}>{value}</{key}>')
-                    xml_lines.append('  </record>')
-                
-                xml_lines.append('</data>')
-                return '\n'.join(xml_lines)
-            
-            else:
-                raise ValueError(f"Unsupported format: {format}")
-                
-        except Exception as e:
-            self.logger.error("Failed to format data", error=str(e))
-            raise
+            ).order_by(Call.created_at, Call.id)
+        
+        else:
+            raise ValueError(f"Export not available for data type: {data_type.value}")
+        
+        return query, [str(column.name) for column in query.selected_columns]
     
     # Integration Endpoints Management
     
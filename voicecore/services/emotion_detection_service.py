@@ -7,18 +7,20 @@ and emotion-based routing per Requirement 8.6.
 
 import uuid
 import asyncio
-import re
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, Callable, Awaitable
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from enum import Enum
-from sqlalchemy import select, and_, func, desc
+from sqlalchemy import select, and_, case, func, desc
 from sqlalchemy.orm import selectinload
 
 from voicecore.database import get_db_session, set_tenant_context
 from voicecore.models import Call, Agent
 from voicecore.logging import get_logger
 from voicecore.config import get_settings
+from voicecore.services.emotion_lexicon import LexiconEngine, LexiconScores, normalize_text
+from voicecore.services.emotion_store import EmotionAggregate, EmotionAnalysisStore
+from voicecore.services.emotion_stream import CallEmotionStream, EscalationEvent
 
 
 logger = get_logger(__name__)
@@ -57,6 +59,16 @@ class EscalationLevel(Enum):
     URGENT = "urgent"
 
 
+# Escalation levels ordered by severity
+ESCALATION_RANK = {
+    EscalationLevel.NONE: 0,
+    EscalationLevel.LOW: 1,
+    EscalationLevel.MEDIUM: 2,
+    EscalationLevel.HIGH: 3,
+    EscalationLevel.URGENT: 4,
+}
+
+
 @dataclass
 class EmotionAnalysis:
     """Emotion analysis result."""
@@ -107,8 +119,24 @@ class EmotionDetectionService:
     def __init__(self):
         self.logger = logger
         
-        # Emotion analysis storage
-        self.emotion_analyses: Dict[str, EmotionAnalysis] = {}
+        # Emotion analysis storage: per-tenant aggregates in hourly buckets
+        # for two days and daily ones for a month, plus full analyses for
+        # the last hour; older ones spill to the database, which serves
+        # periods before the aggregates
+        self.emotion_analyses = EmotionAnalysisStore(
+            bucket_seconds=3600,
+            fine_buckets=48,
+            coarse_seconds=86400,
+            coarse_buckets=31,
+            recent_window_seconds=3600,
+            max_recent=50000,
+            max_buckets=100000
+        )
+        self._spill_tasks: set = set()
+        
+        # Live per-call analyzers fed with transcript chunks
+        self.streams: Dict[str, CallEmotionStream] = {}
+        self._escalation_handlers: List[Callable[[EscalationEvent], Awaitable[Any]]] = []
         
         # Emotion keywords and patterns
         self.emotion_keywords = {
@@ -150,17 +178,17 @@ class EmotionDetectionService:
             ]
         }
         
-        # Sentiment patterns
-        self.positive_patterns = [
-            r"\b(love|like|enjoy|appreciate|thank|grateful)\b",
-            r"\b(good|great|excellent|amazing|wonderful|fantastic)\b",
-            r"\b(happy|pleased|satisfied|delighted)\b"
+        # Sentiment words
+        self.positive_words = [
+            "love", "like", "enjoy", "appreciate", "thank", "grateful",
+            "good", "great", "excellent", "amazing", "wonderful", "fantastic",
+            "happy", "pleased", "satisfied", "delighted"
         ]
         
-        self.negative_patterns = [
-            r"\b(hate|dislike|terrible|awful|horrible|disgusting)\b",
-            r"\b(bad|poor|worst|useless|pathetic)\b",
-            r"\b(angry|mad|frustrated|annoyed|upset)\b"
+        self.negative_words = [
+            "hate", "dislike", "terrible", "awful", "horrible", "disgusting",
+            "bad", "poor", "worst", "useless", "pathetic",
+            "angry", "mad", "frustrated", "annoyed", "upset"
         ]
         
         # Escalation triggers
@@ -175,13 +203,23 @@ class EmotionDetectionService:
             ]
         }
         
+        # All vocabularies compiled once into a single token trie
+        self.lexicon = LexiconEngine(
+            emotion_keywords=self.emotion_keywords,
+            positive_words=self.positive_words,
+            negative_words=self.negative_words,
+            escalation_keywords=self.escalation_keywords
+        )
+        
         # Configuration
         self.config = {
             "min_confidence_threshold": 0.6,
             "escalation_sentiment_threshold": -0.7,
             "high_emotion_intensity_threshold": 0.8,
             "enable_emotion_routing": True,
-            "enable_sentiment_tracking": True
+            "enable_sentiment_tracking": True,
+            "stream_window_chunks": 6,
+            "stream_idle_timeout_seconds": 7200
         }
     
     async def analyze_text_emotion(
@@ -202,59 +240,21 @@ class EmotionDetectionService:
             EmotionAnalysis object
         """
         try:
-            analysis_id = str(uuid.uuid4())
-            
-            # Clean and normalize text
             normalized_text = self._normalize_text(text)
-            
-            # Detect emotions
-            emotion_scores = self._calculate_emotion_scores(normalized_text)
-            primary_emotion = max(emotion_scores.items(), key=lambda x: x[1])[0]
-            
-            # Calculate sentiment
-            sentiment_score = self._calculate_sentiment_score(normalized_text)
-            sentiment_polarity = self._determine_sentiment_polarity(sentiment_score)
-            
-            # Determine escalation level
-            escalation_level = self._determine_escalation_level(
-                normalized_text, primary_emotion, sentiment_score
-            )
-            
-            # Extract keywords
-            keywords_detected = self._extract_emotion_keywords(normalized_text)
-            
-            # Calculate overall confidence
-            confidence = self._calculate_confidence(emotion_scores, sentiment_score)
-            
-            analysis = EmotionAnalysis(
-                id=analysis_id,
-                text=text,
-                primary_emotion=primary_emotion,
-                emotion_scores=emotion_scores,
-                sentiment_polarity=sentiment_polarity,
-                sentiment_score=sentiment_score,
-                confidence=confidence,
-                escalation_level=escalation_level,
-                keywords_detected=keywords_detected,
-                timestamp=datetime.utcnow(),
-                call_id=call_id,
-                tenant_id=tenant_id
+            analysis = self._build_analysis(
+                text, self.lexicon.score(normalized_text), call_id, tenant_id
             )
             
             # Store analysis
-            self.emotion_analyses[analysis_id] = analysis
-            
-            # Store in database if tenant provided
-            if tenant_id:
-                await self._store_analysis_in_database(analysis)
+            self._record_analysis(analysis)
             
             self.logger.info(
                 "Emotion analysis completed",
-                analysis_id=analysis_id,
-                primary_emotion=primary_emotion.value,
-                sentiment_polarity=sentiment_polarity.value,
-                escalation_level=escalation_level.value,
-                confidence=confidence
+                analysis_id=analysis.id,
+                primary_emotion=analysis.primary_emotion.value,
+                sentiment_polarity=analysis.sentiment_polarity.value,
+                escalation_level=analysis.escalation_level.value,
+                confidence=analysis.confidence
             )
             
             return analysis
@@ -295,24 +295,29 @@ class EmotionDetectionService:
             List of EmotionAnalysis objects
         """
         try:
-            analyses = []
+            caller_segments = [
+                (i, segment) for i, segment in enumerate(conversation_segments)
+                if segment.get("speaker") == "caller" and segment.get("text")
+            ]
             
-            for i, segment in enumerate(conversation_segments):
-                if segment.get("speaker") == "caller" and segment.get("text"):
-                    analysis = await self.analyze_text_emotion(
-                        text=segment["text"],
-                        call_id=call_id,
-                        tenant_id=tenant_id
-                    )
-                    
-                    # Add segment metadata
-                    analysis.metadata = {
-                        "segment_index": i,
-                        "timestamp_in_call": segment.get("timestamp"),
-                        "speaker": segment.get("speaker")
-                    }
-                    
-                    analyses.append(analysis)
+            # Score every caller segment in one batch
+            batch_scores = self.lexicon.score_many(
+                segment["text"] for _, segment in caller_segments
+            )
+            
+            analyses = []
+            for (i, segment), scores in zip(caller_segments, batch_scores):
+                analysis = self._build_analysis(segment["text"], scores, call_id, tenant_id)
+                
+                # Add segment metadata
+                analysis.metadata = {
+                    "segment_index": i,
+                    "timestamp_in_call": segment.get("timestamp"),
+                    "speaker": segment.get("speaker")
+                }
+                
+                self._record_analysis(analysis)
+                analyses.append(analysis)
             
             # Analyze emotion progression
             if len(analyses) > 1:
@@ -336,6 +341,118 @@ class EmotionDetectionService:
             self.logger.error("Failed to analyze conversation emotion", error=str(e))
             return []
     
+    def on_escalation(self, handler: Callable[[EscalationEvent], Awaitable[Any]]) -> None:
+        """
+        Register a coroutine called when a live call's escalation level rises.
+        
+        Args:
+            handler: Async callable receiving an EscalationEvent
+        """
+        self._escalation_handlers.append(handler)
+    
+    async def ingest_transcript_chunk(
+        self,
+        call_id: str,
+        tenant_id: uuid.UUID,
+        text: str,
+        speaker: str = "caller"
+    ) -> Optional[EmotionAnalysis]:
+        """
+        Analyze a live transcript chunk against the call's rolling window.
+        
+        Args:
+            call_id: Call ID
+            tenant_id: Tenant ID
+            text: Transcript chunk, ending on a word boundary
+            speaker: Speaker of the chunk; only caller speech is scored
+            
+        Returns:
+            EmotionAnalysis over the rolling window, or None if the chunk
+            was not scored
+        """
+        if speaker != "caller" or not text:
+            return None
+        
+        stream = self.streams.get(call_id)
+        if stream is None:
+            self._expire_idle_streams()
+            stream = self.streams[call_id] = CallEmotionStream(
+                call_id, tenant_id, self.lexicon,
+                window_chunks=self.config["stream_window_chunks"]
+            )
+        elif stream.tenant_id != tenant_id:
+            raise ValueError("Call belongs to another tenant")
+        
+        analysis = self._build_analysis(text, stream.ingest(text), call_id, tenant_id)
+        analysis.metadata = {"stream_chunk": stream.chunks, "window_chunks": len(stream.window)}
+        stream.current_analysis = analysis
+        
+        previous = stream.escalation_level or EscalationLevel.NONE
+        if ESCALATION_RANK[analysis.escalation_level] > ESCALATION_RANK[previous]:
+            stream.escalation_level = analysis.escalation_level
+            await self._emit_escalation(EscalationEvent(
+                call_id=call_id,
+                tenant_id=tenant_id,
+                previous_level=previous,
+                level=analysis.escalation_level,
+                primary_emotion=analysis.primary_emotion,
+                sentiment_score=analysis.sentiment_score,
+                keywords=analysis.keywords_detected,
+                chunk_index=stream.chunks
+            ))
+        
+        return analysis
+    
+    async def end_transcript_stream(self, call_id: str) -> Optional[EmotionAnalysis]:
+        """
+        Close a call's live analyzer and record a whole-call analysis.
+        
+        Args:
+            call_id: Call ID
+            
+        Returns:
+            EmotionAnalysis over every chunk of the call, or None if the
+            call had no live analyzer
+        """
+        stream = self.streams.pop(call_id, None)
+        if stream is None:
+            return None
+        
+        analysis = self._build_analysis("", stream.call_scores(), call_id, stream.tenant_id)
+        analysis.metadata = {
+            "stream_chunks": stream.chunks,
+            "peak_escalation_level": (stream.escalation_level or EscalationLevel.NONE).value
+        }
+        self._record_analysis(analysis)
+        return analysis
+    
+    def get_live_escalation(self, call_id: str) -> Optional[EscalationLevel]:
+        """Highest escalation level reached so far by a live call, if any."""
+        stream = self.streams.get(call_id)
+        return stream.escalation_level if stream is not None else None
+    
+    async def _emit_escalation(self, event: EscalationEvent) -> None:
+        """Notify escalation handlers; a failing handler does not stop the others."""
+        self.logger.warning(
+            "Live call emotion escalation",
+            call_id=event.call_id,
+            tenant_id=str(event.tenant_id),
+            previous_level=event.previous_level.value,
+            level=event.level.value,
+            primary_emotion=event.primary_emotion.value
+        )
+        for handler in self._escalation_handlers:
+            try:
+                await handler(event)
+            except Exception as e:
+                self.logger.error("Escalation handler failed", call_id=event.call_id, error=str(e))
+    
+    def _expire_idle_streams(self) -> None:
+        """Drop analyzers of calls that never ended their stream."""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.config["stream_idle_timeout_seconds"])
+        for call_id in [c for c, stream in self.streams.items() if stream.updated_at < cutoff]:
+            del self.streams[call_id]
+    
     async def get_emotion_based_routing_recommendation(
         self,
         analysis: EmotionAnalysis,
@@ -352,9 +469,16 @@ class EmotionDetectionService:
             Dict containing routing recommendation
         """
         try:
+            # A live call may have escalated since this analysis was made
+            escalation_level = analysis.escalation_level
+            live_level = self.get_live_escalation(analysis.call_id) if analysis.call_id else None
+            if live_level is not None and ESCALATION_RANK[live_level] > ESCALATION_RANK[escalation_level]:
+                escalation_level = live_level
+            
             recommendation = {
                 "should_escalate": False,
-                "escalation_level": analysis.escalation_level.value,
+                "escalation_level": escalation_level.value,
+                "live_escalation_level": live_level.value if live_level else None,
                 "recommended_action": "continue",
                 "target_department": None,
                 "priority_level": "normal",
@@ -362,12 +486,12 @@ class EmotionDetectionService:
             }
             
             # Check for escalation triggers
-            if analysis.escalation_level in [EscalationLevel.HIGH, EscalationLevel.URGENT]:
+            if escalation_level in [EscalationLevel.HIGH, EscalationLevel.URGENT]:
                 recommendation["should_escalate"] = True
                 recommendation["recommended_action"] = "escalate"
                 recommendation["target_department"] = "management"
                 
-                if analysis.escalation_level == EscalationLevel.URGENT:
+                if escalation_level == EscalationLevel.URGENT:
                     recommendation["priority_level"] = "urgent"
                 else:
                     recommendation["priority_level"] = "high"
@@ -424,46 +548,32 @@ class EmotionDetectionService:
             List of EmotionTrend objects
         """
         try:
-            cutoff_date = datetime.utcnow() - timedelta(days=days)
-            
-            # Get analyses for the period
-            analyses = [
-                analysis for analysis in self.emotion_analyses.values()
-                if (analysis.tenant_id == tenant_id and 
-                    analysis.timestamp > cutoff_date)
-            ]
+            now = datetime.utcnow()
+            period = await self._period_aggregate(tenant_id, now - timedelta(days=days))
             
-            if not analyses:
+            if not period.total:
                 return []
             
+            # Analyses less than days // 2 full days old count as recent
+            recent = self.emotion_analyses.aggregate(
+                tenant_id, now - timedelta(days=days // 2 + 1)
+            )
+            
             trends = []
             
             for emotion in EmotionType:
-                emotion_analyses = [
-                    a for a in analyses 
-                    if a.primary_emotion == emotion
-                ]
+                frequency = period.emotion_counts.get(emotion, 0)
                 
-                if emotion_analyses:
-                    frequency = len(emotion_analyses)
-                    average_intensity = sum(
-                        a.emotion_scores.get(emotion, 0.0) 
-                        for a in emotion_analyses
-                    ) / frequency
+                if frequency:
+                    average_intensity = period.intensity_sums.get(emotion, 0.0) / frequency
                     
                     # Calculate trend direction (simplified)
-                    recent_analyses = [
-                        a for a in emotion_analyses
-                        if (datetime.utcnow() - a.timestamp).days <= days // 2
-                    ]
-                    older_analyses = [
-                        a for a in emotion_analyses
-                        if (datetime.utcnow() - a.timestamp).days > days // 2
-                    ]
+                    recent_count = recent.emotion_counts.get(emotion, 0)
+                    older_count = frequency - recent_count
                     
-                    if len(recent_analyses) > len(older_analyses):
+                    if recent_count > older_count:
                         trend_direction = "increasing"
-                    elif len(recent_analyses) < len(older_analyses):
+                    elif recent_count < older_count:
                         trend_direction = "decreasing"
                     else:
                         trend_direction = "stable"
@@ -487,6 +597,90 @@ class EmotionDetectionService:
             self.logger.error("Failed to track emotion trends", error=str(e))
             return []
     
+    async def _period_aggregate(self, tenant_id: uuid.UUID, since: datetime) -> EmotionAggregate:
+        """
+        Aggregate a tenant's analyses from ``since`` until now.
+
+        The in-memory buckets cover the recent part of the period; any
+        part before their horizon is read from the calls the analyses
+        were spilled to.
+        """
+        horizon = self.emotion_analyses.horizon()
+        period = self.emotion_analyses.aggregate(tenant_id, max(since, horizon))
+        if since < horizon:
+            period.merge(await self._stored_aggregate(tenant_id, since, horizon))
+        return period
+    
+    async def _stored_aggregate(
+        self,
+        tenant_id: uuid.UUID,
+        since: datetime,
+        until: datetime
+    ) -> EmotionAggregate:
+        """
+        Aggregate the analyses stored on a tenant's calls in a period.
+        
+        Only the latest analysis of each call is stored, so stored
+        periods count calls rather than individual analyses, and carry
+        no emotion intensities.
+        
+        Args:
+            tenant_id: Tenant ID
+            since: Start of the period
+            until: End of the period (exclusive)
+            
+        Returns:
+            EmotionAggregate for the period
+        """
+        calls = Call.__table__
+        polarity = case(
+            (calls.c.sentiment_score >= 0.6, SentimentPolarity.VERY_POSITIVE.value),
+            (calls.c.sentiment_score >= 0.2, SentimentPolarity.POSITIVE.value),
+            (calls.c.sentiment_score >= -0.2, SentimentPolarity.NEUTRAL.value),
+            (calls.c.sentiment_score >= -0.6, SentimentPolarity.NEGATIVE.value),
+            else_=SentimentPolarity.VERY_NEGATIVE.value
+        ).label("polarity")
+        query = (
+            select(
+                calls.c.emotion_detected,
+                polarity,
+                calls.c.escalation_triggered,
+                func.count().label("analyses"),
+                func.sum(calls.c.sentiment_score).label("sentiment_sum")
+            )
+            .where(
+                calls.c.tenant_id == tenant_id,
+                calls.c.created_at >= since,
+                calls.c.created_at < until,
+                calls.c.emotion_detected.isnot(None),
+                calls.c.sentiment_score.isnot(None)
+            )
+            .group_by(calls.c.emotion_detected, polarity, calls.c.escalation_triggered)
+        )
+        
+        total = EmotionAggregate()
+        try:
+            async with get_db_session() as session:
+                await set_tenant_context(session, str(tenant_id))
+                rows = (await session.execute(query)).all()
+        except Exception as e:
+            self.logger.error("Failed to load stored emotion analyses", tenant_id=str(tenant_id), error=str(e))
+            return total
+        
+        emotions = {emotion.value: emotion for emotion in EmotionType}
+        for row in rows:
+            emotion = emotions.get(row.emotion_detected)
+            if emotion is None:
+                continue
+            total.add_many(
+                row.analyses,
+                row.sentiment_sum or 0.0,
+                emotion,
+                SentimentPolarity(row.polarity),
+                EscalationLevel.HIGH if row.escalation_triggered else EscalationLevel.NONE
+            )
+        return total
+    
     async def generate_sentiment_report(
         self,
         tenant_id: uuid.UUID,
@@ -503,16 +697,11 @@ class EmotionDetectionService:
             SentimentReport object
         """
         try:
-            cutoff_date = datetime.utcnow() - timedelta(days=days)
-            
-            # Get analyses for the period
-            analyses = [
-                analysis for analysis in self.emotion_analyses.values()
-                if (analysis.tenant_id == tenant_id and 
-                    analysis.timestamp > cutoff_date)
-            ]
+            period = await self._period_aggregate(
+                tenant_id, datetime.utcnow() - timedelta(days=days)
+            )
             
-            if not analyses:
+            if not period.total:
                 return SentimentReport(
                     total_analyses=0,
                     sentiment_distribution={},
@@ -524,25 +713,25 @@ class EmotionDetectionService:
                 )
             
             # Calculate sentiment distribution
-            sentiment_distribution = {}
-            for polarity in SentimentPolarity:
-                count = len([a for a in analyses if a.sentiment_polarity == polarity])
-                sentiment_distribution[polarity] = count
+            sentiment_distribution = {
+                polarity: period.polarity_counts.get(polarity, 0)
+                for polarity in SentimentPolarity
+            }
             
             # Calculate emotion distribution
-            emotion_distribution = {}
-            for emotion in EmotionType:
-                count = len([a for a in analyses if a.primary_emotion == emotion])
-                emotion_distribution[emotion] = count
+            emotion_distribution = {
+                emotion: period.emotion_counts.get(emotion, 0)
+                for emotion in EmotionType
+            }
             
             # Calculate average sentiment score
-            average_sentiment = sum(a.sentiment_score for a in analyses) / len(analyses)
+            average_sentiment = period.sentiment_sum / period.total
             
             # Count escalation triggers
-            escalation_triggers = len([
-                a for a in analyses 
-                if a.escalation_level in [EscalationLevel.HIGH, EscalationLevel.URGENT]
-            ])
+            escalation_triggers = (
+                period.escalation_counts.get(EscalationLevel.HIGH, 0) +
+                period.escalation_counts.get(EscalationLevel.URGENT, 0)
+            )
             
             # Get most common emotions
             emotion_counts = [(emotion, count) for emotion, count in emotion_distribution.items() if count > 0]
@@ -550,7 +739,7 @@ class EmotionDetectionService:
             most_common_emotions = emotion_counts[:5]
             
             return SentimentReport(
-                total_analyses=len(analyses),
+                total_analyses=period.total,
                 sentiment_distribution=sentiment_distribution,
                 average_sentiment_score=average_sentiment,
                 emotion_distribution=emotion_distribution,
@@ -591,12 +780,10 @@ class EmotionDetectionService:
             
             # Get recent high-priority analyses
             recent_analyses = [
-                analysis for analysis in self.emotion_analyses.values()
-                if (analysis.tenant_id == tenant_id and 
-                    analysis.timestamp > cutoff_time and
-                    (analysis.escalation_level in [EscalationLevel.HIGH, EscalationLevel.URGENT] or
-                     analysis.sentiment_score < -0.7 or
-                     analysis.primary_emotion in [EmotionType.ANGER, EmotionType.FRUSTRATION]))
+                analysis for analysis in self.emotion_analyses.recent(tenant_id, cutoff_time)
+                if (analysis.escalation_level in [EscalationLevel.HIGH, EscalationLevel.URGENT] or
+                    analysis.sentiment_score < -0.7 or
+                    analysis.primary_emotion in [EmotionType.ANGER, EmotionType.FRUSTRATION])
             ]
             
             alerts = []
@@ -631,52 +818,60 @@ class EmotionDetectionService:
     
     def _normalize_text(self, text: str) -> str:
         """Normalize text for analysis."""
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        return normalize_text(text)
+    
+    def _build_analysis(
+        self,
+        text: str,
+        scores: LexiconScores,
+        call_id: Optional[str],
+        tenant_id: Optional[uuid.UUID]
+    ) -> EmotionAnalysis:
+        """Build an EmotionAnalysis from lexicon scores."""
+        emotion_scores = self._calculate_emotion_scores(scores)
+        primary_emotion = max(emotion_scores.items(), key=lambda x: x[1])[0]
         
-        # Remove special characters but keep punctuation that affects sentiment
-        text = re.sub(r'[^\w\s!?.,;:-]', '', text)
+        sentiment_score = self._calculate_sentiment_score(scores)
         
-        return text
+        return EmotionAnalysis(
+            id=str(uuid.uuid4()),
+            text=text,
+            primary_emotion=primary_emotion,
+            emotion_scores=emotion_scores,
+            sentiment_polarity=self._determine_sentiment_polarity(sentiment_score),
+            sentiment_score=sentiment_score,
+            confidence=self._calculate_confidence(emotion_scores, sentiment_score),
+            escalation_level=self._determine_escalation_level(
+                scores.escalation, primary_emotion, sentiment_score
+            ),
+            keywords_detected=scores.keywords,
+            timestamp=datetime.utcnow(),
+            call_id=call_id,
+            tenant_id=tenant_id
+        )
     
-    def _calculate_emotion_scores(self, text: str) -> Dict[EmotionType, float]:
-        """Calculate emotion scores based on keyword matching."""
-        scores = {emotion: 0.0 for emotion in EmotionType}
+    def _calculate_emotion_scores(self, scores: LexiconScores) -> Dict[EmotionType, float]:
+        """Calculate emotion scores from keyword match counts."""
+        emotion_scores = {emotion: 0.0 for emotion in EmotionType}
         
-        words = text.split()
-        total_words = len(words)
+        if scores.word_count == 0:
+            emotion_scores[EmotionType.NEUTRAL] = 1.0
+            return emotion_scores
         
-        if total_words == 0:
-            scores[EmotionType.NEUTRAL] = 1.0
-            return scores
-        
-        for emotion, keywords in self.emotion_keywords.items():
-            matches = 0
-            for keyword in keywords:
-                matches += len(re.findall(r'\b' + re.escape(keyword) + r'\b', text))
-            
+        for emotion, matches in scores.emotion_matches.items():
             # Calculate score as ratio of matches to total words
-            scores[emotion] = min(matches / total_words * 10, 1.0)  # Scale and cap at 1.0
+            emotion_scores[emotion] = min(matches / scores.word_count * 10, 1.0)  # Scale and cap at 1.0
         
         # If no emotions detected, set neutral
-        if all(score == 0.0 for score in scores.values()):
-            scores[EmotionType.NEUTRAL] = 1.0
+        if all(score == 0.0 for score in emotion_scores.values()):
+            emotion_scores[EmotionType.NEUTRAL] = 1.0
         
-        return scores
+        return emotion_scores
     
-    def _calculate_sentiment_score(self, text: str) -> float:
+    def _calculate_sentiment_score(self, scores: LexiconScores) -> float:
         """Calculate sentiment score from -1.0 (very negative) to 1.0 (very positive)."""
-        positive_matches = 0
-        negative_matches = 0
-        
-        for pattern in self.positive_patterns:
-            positive_matches += len(re.findall(pattern, text, re.IGNORECASE))
-        
-        for pattern in self.negative_patterns:
-            negative_matches += len(re.findall(pattern, text, re.IGNORECASE))
+        positive_matches = scores.positive_matches
+        negative_matches = scores.negative_matches
         
         # Simple sentiment calculation
         total_matches = positive_matches + negative_matches
@@ -701,20 +896,14 @@ class EmotionDetectionService:
     
     def _determine_escalation_level(
         self,
-        text: str,
+        keyword_escalation: Optional[EscalationLevel],
         primary_emotion: EmotionType,
         sentiment_score: float
     ) -> EscalationLevel:
         """Determine escalation level based on text analysis."""
-        # Check for urgent keywords
-        for keyword in self.escalation_keywords[EscalationLevel.URGENT]:
-            if keyword in text:
-                return EscalationLevel.URGENT
-        
-        # Check for high escalation keywords
-        for keyword in self.escalation_keywords[EscalationLevel.HIGH]:
-            if keyword in text:
-                return EscalationLevel.HIGH
+        # Urgent or high escalation keywords take precedence
+        if keyword_escalation is not None:
+            return keyword_escalation
         
         # Check emotion and sentiment combination
         if primary_emotion == EmotionType.ANGER and sentiment_score < -0.6:
@@ -731,17 +920,6 @@ class EmotionDetectionService:
         
         return EscalationLevel.NONE
     
-    def _extract_emotion_keywords(self, text: str) -> List[str]:
-        """Extract emotion-related keywords from text."""
-        keywords = []
-        
-        for emotion, emotion_keywords in self.emotion_keywords.items():
-            for keyword in emotion_keywords:
-                if re.search(r'\b' + re.escape(keyword) + r'\b', text):
-                    keywords.append(keyword)
-        
-        return keywords
-    
     def _calculate_confidence(
         self,
         emotion_scores: Dict[EmotionType, float],
@@ -809,6 +987,37 @@ class EmotionDetectionService:
         
         return "; ".join(reasons) if reasons else "Emotion threshold exceeded"
     
+    def _record_analysis(self, analysis: EmotionAnalysis) -> None:
+        """Add an analysis to the store and spill evicted ones in the background."""
+        evicted = self.emotion_analyses.add(analysis)
+        if not evicted:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._spill_analyses(evicted))
+        self._spill_tasks.add(task)
+        task.add_done_callback(self._spill_tasks.discard)
+    
+    async def _spill_analyses(self, analyses: List[EmotionAnalysis]) -> None:
+        """Persist analyses leaving the in-memory window."""
+        # Each write replaces the call's stored analysis, so only the
+        # latest analysis per call is written
+        latest: Dict[Tuple[uuid.UUID, str], EmotionAnalysis] = {}
+        for analysis in analyses:
+            if analysis.tenant_id and analysis.call_id:
+                latest[(analysis.tenant_id, analysis.call_id)] = analysis
+        
+        for analysis in latest.values():
+            await self._store_analysis_in_database(analysis)
+    
+    async def flush_analyses(self) -> None:
+        """Persist every analysis still held in memory, e.g. on shutdown."""
+        if self._spill_tasks:
+            await asyncio.gather(*self._spill_tasks, return_exceptions=True)
+        await self._spill_analyses(self.emotion_analyses.drain())
+    
     async def _store_analysis_in_database(self, analysis: EmotionAnalysis):
         """Store emotion analysis in database."""
         try:
@@ -831,6 +1040,13 @@ class EmotionDetectionService:
                     call = result.scalar_one_or_none()
                     
                     if call:
+                        # Columns read back for periods before the
+                        # in-memory aggregates
+                        call.emotion_detected = analysis.primary_emotion.value
+                        call.sentiment_score = analysis.sentiment_score
+                        if analysis.escalation_level in [EscalationLevel.HIGH, EscalationLevel.URGENT]:
+                            call.escalation_triggered = True
+                        
                         # Add emotion analysis to call metadata
                         metadata = call.metadata or {}
                         metadata["emotion_analysis"] = {
@@ -0,0 +1,187 @@
+"""
+Precompiled lexicon scoring engine for emotion detection.
+
+Emotion keywords, sentiment words and escalation phrases are compiled
+once into a token trie mapping each word or phrase to its weights
+(emotion counts, polarity and escalation level). Scoring a text is one
+tokenization pass plus one trie walk per token, instead of one regex
+scan per keyword.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence
+
+
+WHITESPACE = re.compile(r'\s+')
+STRIPPED_CHARACTERS = re.compile(r'[^\w\s!?.,;:-]')
+TOKEN = re.compile(r'\w+')
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for lexicon matching.
+
+    Lowercases, collapses whitespace and removes characters other than
+    word characters and sentiment-bearing punctuation.
+    """
+    text = WHITESPACE.sub(' ', text.lower()).strip()
+    return STRIPPED_CHARACTERS.sub('', text)
+
+
+@dataclass
+class LexiconEntry:
+    """Weights attached to one word or phrase."""
+    emotions: List[int] = field(default_factory=list)
+    polarity: int = 0
+    escalation_rank: int = 0
+    escalation: Optional[Hashable] = None
+    keyword_positions: List[int] = field(default_factory=list)
+
+
+@dataclass
+class LexiconScores:
+    """Result of scoring one text."""
+    emotion_matches: Dict[Hashable, int]
+    word_count: int
+    positive_matches: int
+    negative_matches: int
+    escalation: Optional[Hashable]
+    keywords: List[str]
+    escalation_rank: int = 0
+
+
+# Key marking a node that completes a word or phrase
+_TERMINAL = ""
+
+
+class LexiconEngine:
+    """
+    Token trie over emotion, sentiment and escalation vocabularies.
+
+    A phrase matches when its words appear in order separated by single
+    spaces in the normalized text, which is what a ``\\bphrase\\b``
+    regex over normalized text would match.
+
+    Args:
+        emotion_keywords: Keywords per emotion label, in reporting order
+        positive_words: Words counted as positive sentiment
+        negative_words: Words counted as negative sentiment
+        escalation_keywords: Phrases per escalation label, ordered from
+            least to most severe
+    """
+
+    def __init__(
+        self,
+        emotion_keywords: Dict[Hashable, Sequence[str]],
+        positive_words: Iterable[str],
+        negative_words: Iterable[str],
+        escalation_keywords: Dict[Hashable, Sequence[str]]
+    ):
+        self.emotions: List[Hashable] = list(emotion_keywords)
+        self.keywords: List[str] = []
+        self._root: Dict[str, Any] = {}
+        self.max_phrase_length = 1
+
+        for index, (emotion, keywords) in enumerate(emotion_keywords.items()):
+            for keyword in keywords:
+                entry = self._entry(keyword)
+                entry.emotions.append(index)
+                entry.keyword_positions.append(len(self.keywords))
+                self.keywords.append(keyword)
+
+        for word in positive_words:
+            self._entry(word).polarity += 1
+        for word in negative_words:
+            self._entry(word).polarity -= 1
+
+        for rank, (level, phrases) in enumerate(escalation_keywords.items(), start=1):
+            for phrase in phrases:
+                entry = self._entry(phrase)
+                if rank > entry.escalation_rank:
+                    entry.escalation_rank = rank
+                    entry.escalation = level
+
+    def _entry(self, phrase: str) -> LexiconEntry:
+        """Return the entry for a phrase, adding it to the trie if needed."""
+        tokens = TOKEN.findall(normalize_text(phrase))
+        if not tokens:
+            raise ValueError(f"Lexicon phrase has no words: {phrase!r}")
+        self.max_phrase_length = max(self.max_phrase_length, len(tokens))
+
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        entry = node.get(_TERMINAL)
+        if entry is None:
+            entry = node[_TERMINAL] = LexiconEntry()
+        return entry
+
+    def score(self, text: str) -> LexiconScores:
+        """
+        Score normalized text in one pass.
+
+        Args:
+            text: Text already passed through ``normalize_text``
+
+        Returns:
+            LexiconScores with per-emotion match counts, sentiment word
+            counts, the most severe escalation label and matched keywords
+        """
+        emotion_counts = [0] * len(self.emotions)
+        positive = negative = 0
+        escalation_rank = 0
+        escalation = None
+        positions = set()
+
+        matches = list(TOKEN.finditer(text))
+        root = self._root
+        for start, match in enumerate(matches):
+            node = root.get(match.group())
+            index = start
+            while node is not None:
+                entry = node.get(_TERMINAL)
+                if entry is not None:
+                    for emotion_index in entry.emotions:
+                        emotion_counts[emotion_index] += 1
+                    if entry.polarity > 0:
+                        positive += entry.polarity
+                    elif entry.polarity < 0:
+                        negative -= entry.polarity
+                    if entry.escalation_rank > escalation_rank:
+                        escalation_rank = entry.escalation_rank
+                        escalation = entry.escalation
+                    if entry.keyword_positions:
+                        positions.update(entry.keyword_positions)
+
+                # Extend the phrase only across a single space
+                index += 1
+                children = len(node) - (entry is not None)
+                if not children or index >= len(matches):
+                    break
+                previous_end = matches[index - 1].end()
+                if matches[index].start() != previous_end + 1 or text[previous_end] != ' ':
+                    break
+                node = node.get(matches[index].group())
+
+        return LexiconScores(
+            emotion_matches=dict(zip(self.emotions, emotion_counts)),
+            word_count=len(text.split()),
+            positive_matches=positive,
+            negative_matches=negative,
+            escalation=escalation,
+            keywords=[self.keywords[position] for position in sorted(positions)],
+            escalation_rank=escalation_rank,
+        )
+
+    def score_many(self, texts: Iterable[str]) -> List[LexiconScores]:
+        """
+        Normalize and score a batch of texts.
+
+        Args:
+            texts: Raw texts
+
+        Returns:
+            LexiconScores for each text, in order
+        """
+        return [self.score(normalize_text(text)) for text in texts]
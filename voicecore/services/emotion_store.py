@@ -0,0 +1,359 @@
+"""
+Bounded, time-indexed storage for emotion analyses.
+
+Each tenant has a ring of time buckets holding running counts and
+intensity sums per emotion, sentiment polarity and escalation level, so
+trend and report queries cost O(buckets) instead of a scan over every
+analysis. Fine (hourly) buckets are kept for a short window and then
+rolled up into coarse (daily) ones, which are kept for a bounded
+retention; older periods must be read from where the analyses were
+persisted. A global bucket cap drops the least recently active tenants.
+
+Full analyses are kept only for a short recent window (for real-time
+alerts and lookups by ID); older ones are evicted and handed back to
+the caller to persist.
+"""
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, Hashable, Iterator, List, Optional
+
+
+EPOCH = datetime(1970, 1, 1)
+
+
+@dataclass
+class EmotionAggregate:
+    """Running totals over a set of analyses."""
+    total: int = 0
+    sentiment_sum: float = 0.0
+    emotion_counts: Dict[Hashable, int] = field(default_factory=dict)
+    intensity_sums: Dict[Hashable, float] = field(default_factory=dict)
+    polarity_counts: Dict[Hashable, int] = field(default_factory=dict)
+    escalation_counts: Dict[Hashable, int] = field(default_factory=dict)
+
+    def add(self, analysis: Any) -> None:
+        """Fold one analysis into the totals."""
+        emotion = analysis.primary_emotion
+        self.total += 1
+        self.sentiment_sum += analysis.sentiment_score
+        self.emotion_counts[emotion] = self.emotion_counts.get(emotion, 0) + 1
+        self.intensity_sums[emotion] = (
+            self.intensity_sums.get(emotion, 0.0) + analysis.emotion_scores.get(emotion, 0.0)
+        )
+        polarity = analysis.sentiment_polarity
+        self.polarity_counts[polarity] = self.polarity_counts.get(polarity, 0) + 1
+        level = analysis.escalation_level
+        self.escalation_counts[level] = self.escalation_counts.get(level, 0) + 1
+
+    def add_many(
+        self,
+        count: int,
+        sentiment_sum: float,
+        emotion: Hashable,
+        polarity: Hashable,
+        level: Hashable
+    ) -> None:
+        """Fold ``count`` analyses sharing an emotion, polarity and escalation level."""
+        self.total += count
+        self.sentiment_sum += sentiment_sum
+        self.emotion_counts[emotion] = self.emotion_counts.get(emotion, 0) + count
+        self.polarity_counts[polarity] = self.polarity_counts.get(polarity, 0) + count
+        self.escalation_counts[level] = self.escalation_counts.get(level, 0) + count
+
+    def merge(self, other: "EmotionAggregate") -> None:
+        """Add another aggregate's totals to this one."""
+        self.total += other.total
+        self.sentiment_sum += other.sentiment_sum
+        for target, source in (
+            (self.emotion_counts, other.emotion_counts),
+            (self.intensity_sums, other.intensity_sums),
+            (self.polarity_counts, other.polarity_counts),
+            (self.escalation_counts, other.escalation_counts),
+        ):
+            for key, value in source.items():
+                target[key] = target.get(key, 0) + value
+
+
+@dataclass
+class EmotionBucket:
+    """Aggregate for one time bucket."""
+    index: int
+    aggregate: EmotionAggregate = field(default_factory=EmotionAggregate)
+
+
+def _bucket_at(buckets: Deque[EmotionBucket], index: int) -> EmotionBucket:
+    """Find or insert the bucket with an index in a deque ordered by index."""
+    if buckets and buckets[-1].index == index:
+        return buckets[-1]
+
+    if not buckets or buckets[-1].index < index:
+        bucket = EmotionBucket(index)
+        buckets.append(bucket)
+        return bucket
+
+    # Out-of-order timestamp: find or insert its bucket
+    for position in range(len(buckets) - 1, -1, -1):
+        existing = buckets[position]
+        if existing.index == index:
+            return existing
+        if existing.index < index:
+            bucket = EmotionBucket(index)
+            buckets.insert(position + 1, bucket)
+            return bucket
+    bucket = EmotionBucket(index)
+    buckets.appendleft(bucket)
+    return bucket
+
+
+class TenantEmotionRing:
+    """
+    Time buckets for one tenant, oldest first.
+
+    Analyses are counted in fine buckets. A fine bucket that falls out of
+    the last ``fine_buckets`` is merged into the coarse bucket containing
+    it, and coarse buckets older than ``coarse_buckets`` are dropped, so a
+    tenant never holds more than ``fine_buckets + coarse_buckets`` buckets.
+
+    Args:
+        fine_buckets: Fine buckets kept before rolling up
+        coarse_buckets: Coarse buckets kept
+        ratio: Fine buckets per coarse bucket
+    """
+
+    def __init__(self, fine_buckets: int, coarse_buckets: int, ratio: int):
+        self.fine_buckets = fine_buckets
+        self.coarse_buckets = coarse_buckets
+        self.ratio = ratio
+        self.buckets: Deque[EmotionBucket] = deque()
+        self.coarse: Deque[EmotionBucket] = deque()
+
+    def add(self, index: int, analysis: Any) -> None:
+        """Record an analysis in the fine bucket with the given index."""
+        if self.buckets and index <= self.buckets[-1].index - self.fine_buckets:
+            bucket = self._coarse_bucket(index // self.ratio)
+            if bucket is not None:
+                bucket.aggregate.add(analysis)
+            return
+
+        bucket = _bucket_at(self.buckets, index)
+        while self.buckets[0].index <= self.buckets[-1].index - self.fine_buckets:
+            expired = self.buckets.popleft()
+            coarse = self._coarse_bucket(expired.index // self.ratio)
+            if coarse is not None:
+                coarse.aggregate.merge(expired.aggregate)
+        bucket.aggregate.add(analysis)
+
+    def _coarse_bucket(self, index: int) -> Optional[EmotionBucket]:
+        if self.coarse and index <= self.coarse[-1].index - self.coarse_buckets:
+            # Past retention
+            return None
+
+        bucket = _bucket_at(self.coarse, index)
+        while self.coarse[0].index <= self.coarse[-1].index - self.coarse_buckets:
+            self.coarse.popleft()
+        return bucket
+
+    def since(self, first_index: int) -> Iterator[EmotionBucket]:
+        """
+        Iterate buckets from a fine index onwards, newest first.
+
+        Coarse buckets are included whole if they contain ``first_index``.
+        """
+        for bucket in reversed(self.buckets):
+            if bucket.index < first_index:
+                return
+            yield bucket
+
+        if self.buckets and first_index > self.buckets[-1].index - self.fine_buckets:
+            # Coarse buckets only hold indexes before the fine window
+            return
+
+        first_coarse = first_index // self.ratio
+        for bucket in reversed(self.coarse):
+            if bucket.index < first_coarse:
+                return
+            yield bucket
+
+    def __len__(self) -> int:
+        return len(self.buckets) + len(self.coarse)
+
+
+class EmotionAnalysisStore:
+    """
+    Per-tenant bucketed aggregates plus a bounded window of recent analyses.
+
+    Supports ``in``, ``[]`` and ``get`` by analysis ID for analyses that
+    are still in the recent window.
+
+    Args:
+        bucket_seconds: Width of a fine aggregate bucket
+        fine_buckets: Fine buckets kept per tenant before rolling up
+        coarse_seconds: Width of a coarse bucket, a multiple of bucket_seconds
+        coarse_buckets: Coarse buckets kept per tenant
+        recent_window_seconds: How long full analyses are kept
+        max_recent: Maximum full analyses kept across all tenants
+        max_buckets: Maximum buckets kept across all tenants; the least
+            recently active tenants are dropped beyond it
+    """
+
+    def __init__(
+        self,
+        bucket_seconds: int = 3600,
+        fine_buckets: int = 48,
+        coarse_seconds: int = 86400,
+        coarse_buckets: int = 31,
+        recent_window_seconds: int = 3600,
+        max_recent: int = 50000,
+        max_buckets: int = 100000
+    ):
+        self.bucket_seconds = bucket_seconds
+        self.fine_buckets = fine_buckets
+        self.coarse_seconds = coarse_seconds
+        self.coarse_buckets = coarse_buckets
+        self.recent_window = timedelta(seconds=recent_window_seconds)
+        self.max_recent = max_recent
+        self.max_buckets = max_buckets
+
+        # Least recently active tenant first
+        self._rings: "OrderedDict[Any, TenantEmotionRing]" = OrderedDict()
+        self._bucket_count = 0
+        self._recent: "OrderedDict[str, Any]" = OrderedDict()
+        self._recent_by_tenant: Dict[Any, Deque[Any]] = {}
+
+    def bucket_index(self, timestamp: datetime) -> int:
+        """Bucket index of a naive UTC timestamp."""
+        return int((timestamp - EPOCH).total_seconds()) // self.bucket_seconds
+
+    def add(self, analysis: Any, now: Optional[datetime] = None) -> List[Any]:
+        """
+        Record an analysis.
+
+        Args:
+            analysis: EmotionAnalysis to record
+            now: Current time, for eviction (defaults to utcnow)
+
+        Returns:
+            Analyses evicted from the recent window, oldest first
+        """
+        ring = self._rings.get(analysis.tenant_id)
+        if ring is None:
+            ring = self._rings[analysis.tenant_id] = TenantEmotionRing(
+                self.fine_buckets, self.coarse_buckets, self.coarse_seconds // self.bucket_seconds
+            )
+        else:
+            self._rings.move_to_end(analysis.tenant_id)
+        buckets = len(ring)
+        ring.add(self.bucket_index(analysis.timestamp), analysis)
+        self._bucket_count += len(ring) - buckets
+
+        while self._bucket_count > self.max_buckets and len(self._rings) > 1:
+            _, idle = self._rings.popitem(last=False)
+            self._bucket_count -= len(idle)
+
+        self._recent[analysis.id] = analysis
+        tenant_recent = self._recent_by_tenant.get(analysis.tenant_id)
+        if tenant_recent is None:
+            tenant_recent = self._recent_by_tenant[analysis.tenant_id] = deque()
+        tenant_recent.append(analysis)
+
+        return self.evict(now)
+
+    def horizon(self, now: Optional[datetime] = None) -> datetime:
+        """
+        Start of the oldest period whose aggregates are kept in memory.
+
+        Analyses before it have been rolled out of every ring, so periods
+        starting earlier must be completed from persisted analyses.
+        Tenants dropped under the bucket cap have no aggregates at all.
+        """
+        first = self.bucket_index(now or datetime.utcnow()) * self.bucket_seconds // self.coarse_seconds
+        return EPOCH + timedelta(seconds=(first - self.coarse_buckets + 1) * self.coarse_seconds)
+
+    def evict(self, now: Optional[datetime] = None) -> List[Any]:
+        """
+        Drop full analyses that are past the recent window or over capacity.
+
+        Returns:
+            Evicted analyses, oldest first
+        """
+        cutoff = (now or datetime.utcnow()) - self.recent_window
+        evicted = []
+        while self._recent:
+            oldest = next(iter(self._recent.values()))
+            if len(self._recent) <= self.max_recent and oldest.timestamp >= cutoff:
+                break
+            self._recent.popitem(last=False)
+            self._forget_recent(oldest)
+            evicted.append(oldest)
+        return evicted
+
+    def drain(self) -> List[Any]:
+        """Remove and return every analysis in the recent window."""
+        evicted = list(self._recent.values())
+        self._recent.clear()
+        self._recent_by_tenant.clear()
+        return evicted
+
+    def _forget_recent(self, analysis: Any) -> None:
+        tenant_recent = self._recent_by_tenant.get(analysis.tenant_id)
+        if tenant_recent and tenant_recent[0] is analysis:
+            tenant_recent.popleft()
+        elif tenant_recent:
+            tenant_recent.remove(analysis)
+        if not tenant_recent:
+            self._recent_by_tenant.pop(analysis.tenant_id, None)
+
+    def aggregate(self, tenant_id: Any, since: datetime) -> EmotionAggregate:
+        """
+        Sum the buckets of a tenant from ``since`` onwards.
+
+        Args:
+            tenant_id: Tenant ID
+            since: Start of the period, rounded down to its bucket; to
+                its coarse bucket once it is past the fine window
+
+        Returns:
+            EmotionAggregate for the period
+        """
+        total = EmotionAggregate()
+        ring = self._rings.get(tenant_id)
+        if ring is not None:
+            for bucket in ring.since(self.bucket_index(since)):
+                total.merge(bucket.aggregate)
+        return total
+
+    def recent(self, tenant_id: Any, since: datetime) -> List[Any]:
+        """
+        Full analyses of a tenant newer than ``since``, newest first.
+
+        Only analyses still inside the recent window are available.
+        """
+        results = []
+        for analysis in reversed(self._recent_by_tenant.get(tenant_id, ())):
+            if analysis.timestamp <= since:
+                break
+            results.append(analysis)
+        return results
+
+    def __contains__(self, analysis_id: str) -> bool:
+        return analysis_id in self._recent
+
+    def __getitem__(self, analysis_id: str) -> Any:
+        return self._recent[analysis_id]
+
+    def get(self, analysis_id: str, default: Any = None) -> Any:
+        """Return a recent analysis by ID."""
+        return self._recent.get(analysis_id, default)
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    def stats(self) -> Dict[str, int]:
+        """Return store sizes."""
+        return {
+            "recent_analyses": len(self._recent),
+            "tenants": len(self._rings),
+            "buckets": self._bucket_count,
+        }
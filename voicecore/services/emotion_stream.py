@@ -0,0 +1,168 @@
+"""
+Incremental emotion scoring over live transcript chunks.
+
+A CallEmotionStream keeps rolling lexicon counts for the last few
+chunks of a call, plus running totals for the whole call. Each update
+scores only the new chunk, so the work is O(chunk) regardless of how
+long the call has been going.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, Hashable, List, Optional
+
+from voicecore.services.emotion_lexicon import TOKEN, LexiconEngine, LexiconScores, normalize_text
+
+
+@dataclass
+class EscalationEvent:
+    """Raised when a call's live escalation level goes up."""
+    call_id: str
+    tenant_id: Any
+    previous_level: Any
+    level: Any
+    primary_emotion: Any
+    sentiment_score: float
+    keywords: List[str]
+    chunk_index: int
+    timestamp: datetime = field(default_factory=datetime.utcnow)
+
+
+class _RunningScores:
+    """Mutable lexicon totals that chunks can be added to and removed from."""
+
+    def __init__(self, emotions: List[Hashable]):
+        self.emotion_matches: Dict[Hashable, int] = {emotion: 0 for emotion in emotions}
+        self.word_count = 0
+        self.positive_matches = 0
+        self.negative_matches = 0
+
+    def add(self, scores: LexiconScores, sign: int = 1) -> None:
+        for emotion, count in scores.emotion_matches.items():
+            self.emotion_matches[emotion] += sign * count
+        self.word_count += sign * scores.word_count
+        self.positive_matches += sign * scores.positive_matches
+        self.negative_matches += sign * scores.negative_matches
+
+    def snapshot(self, chunks: List[LexiconScores]) -> LexiconScores:
+        """Totals as LexiconScores, taking escalation and keywords from ``chunks``."""
+        escalation, escalation_rank = None, 0
+        keywords: Dict[str, None] = {}
+        for chunk in chunks:
+            if chunk.escalation_rank > escalation_rank:
+                escalation, escalation_rank = chunk.escalation, chunk.escalation_rank
+            keywords.update(dict.fromkeys(chunk.keywords))
+        return LexiconScores(
+            emotion_matches=dict(self.emotion_matches),
+            word_count=self.word_count,
+            positive_matches=self.positive_matches,
+            negative_matches=self.negative_matches,
+            escalation=escalation,
+            keywords=list(keywords),
+            escalation_rank=escalation_rank,
+        )
+
+
+class CallEmotionStream:
+    """
+    Rolling lexicon scores for one call.
+
+    Chunks are expected to end on word boundaries, as ASR partial results
+    do. The last words of the previous chunk are kept as context so that
+    phrases split across two chunks still match; matches lying entirely
+    in the context are subtracted so nothing is counted twice.
+
+    Args:
+        call_id: Call ID
+        tenant_id: Tenant ID
+        lexicon: Compiled lexicon
+        window_chunks: Number of recent chunks in the rolling window
+    """
+
+    def __init__(
+        self,
+        call_id: str,
+        tenant_id: Any,
+        lexicon: LexiconEngine,
+        window_chunks: int = 6
+    ):
+        self.call_id = call_id
+        self.tenant_id = tenant_id
+        self.lexicon = lexicon
+        self.window_chunks = window_chunks
+
+        self.window: Deque[LexiconScores] = deque()
+        self._window_totals = _RunningScores(lexicon.emotions)
+        self._call_totals = _RunningScores(lexicon.emotions)
+        self._call_peak: Optional[LexiconScores] = None
+        self._call_keywords: Dict[str, None] = {}
+        self._context = ""
+        self._context_scores: Optional[LexiconScores] = None
+
+        self.chunks = 0
+        self.escalation_level: Any = None
+        self.current_analysis: Any = None
+        self.started_at = datetime.utcnow()
+        self.updated_at = self.started_at
+
+    def _score_chunk(self, text: str) -> LexiconScores:
+        """Score a normalized chunk, using the previous chunk's tail as context."""
+        if not self._context:
+            return self.lexicon.score(text)
+
+        combined = self.lexicon.score(f"{self._context} {text}")
+        base = self._context_scores
+        return LexiconScores(
+            emotion_matches={
+                emotion: count - base.emotion_matches[emotion]
+                for emotion, count in combined.emotion_matches.items()
+            },
+            word_count=len(text.split()),
+            positive_matches=combined.positive_matches - base.positive_matches,
+            negative_matches=combined.negative_matches - base.negative_matches,
+            escalation=combined.escalation,
+            keywords=combined.keywords,
+            escalation_rank=combined.escalation_rank,
+        )
+
+    def _update_context(self, text: str) -> None:
+        """Keep the tail of ``text`` long enough to complete any phrase."""
+        tail = self.lexicon.max_phrase_length - 1
+        matches = list(TOKEN.finditer(text))[-tail:] if tail else []
+        self._context = text[matches[0].start():] if matches else ""
+        self._context_scores = self.lexicon.score(self._context) if self._context else None
+
+    def ingest(self, text: str) -> LexiconScores:
+        """
+        Add a transcript chunk.
+
+        Args:
+            text: Raw chunk text
+
+        Returns:
+            Scores over the rolling window, including this chunk
+        """
+        normalized = normalize_text(text)
+        scores = self._score_chunk(normalized)
+        self._update_context(normalized)
+
+        self.window.append(scores)
+        self._window_totals.add(scores)
+        if len(self.window) > self.window_chunks:
+            self._window_totals.add(self.window.popleft(), sign=-1)
+
+        self._call_totals.add(scores)
+        if self._call_peak is None or scores.escalation_rank > self._call_peak.escalation_rank:
+            self._call_peak = scores
+        self._call_keywords.update(dict.fromkeys(scores.keywords))
+
+        self.chunks += 1
+        self.updated_at = datetime.utcnow()
+        return self._window_totals.snapshot(list(self.window))
+
+    def call_scores(self) -> LexiconScores:
+        """Scores over every chunk of the call so far."""
+        scores = self._call_totals.snapshot([self._call_peak] if self._call_peak else [])
+        scores.keywords = list(self._call_keywords)
+        return scores
@@ -0,0 +1,566 @@
+"""
+Streaming export encoders and file writers.
+
+Rows arrive in chunks from a server-side cursor. Text formats encode
+each chunk, compress it and append it to the export file; Parquet turns
+each chunk into an Arrow record batch and writes it out in fixed-size
+row groups. Either way memory holds about one chunk (or row group) at a
+time however large the export is.
+
+Each compressed text chunk is a complete gzip member. Concatenated
+members form a valid gzip file, so an interrupted export can be
+truncated back to any chunk boundary and resumed from there.
+"""
+
+import csv
+import enum
+import io
+import itertools
+import json
+import os
+import shutil
+import uuid
+import zipfile
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+from sqlalchemy.sql import sqltypes
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pq = None
+
+
+def export_value(value: Any) -> Any:
+    """Convert a database value to a JSON/CSV/XML friendly scalar."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _json_line(row: Dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(row, default=str).decode()
+    return json.dumps(row, default=str)
+
+
+class ExportEncoder:
+    """
+    Encode rows as a stream of text pieces.
+
+    ``begin`` and ``end`` return the document prologue and epilogue;
+    ``encode`` returns the text for one chunk of rows.
+
+    Args:
+        fields: Column names, in output order
+    """
+
+    content_type = "application/octet-stream"
+    extension = "dat"
+
+    def __init__(self, fields: Sequence[str]):
+        self.fields = list(fields)
+
+    def begin(self) -> str:
+        return ""
+
+    def resume(self) -> None:
+        """Continue a document whose earlier rows were encoded elsewhere."""
+
+    def encode(self, rows: List[Dict[str, Any]]) -> str:
+        raise NotImplementedError
+
+    def end(self) -> str:
+        return ""
+
+
+class CSVEncoder(ExportEncoder):
+    """CSV with a header row."""
+
+    content_type = "text/csv"
+    extension = "csv"
+
+    def __init__(self, fields: Sequence[str]):
+        super().__init__(fields)
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def begin(self) -> str:
+        return self._take([self.fields])
+
+    def encode(self, rows: List[Dict[str, Any]]) -> str:
+        return self._take([[row.get(field) for field in self.fields] for row in rows])
+
+    def _take(self, rows: List[List[Any]]) -> str:
+        self._writer.writerows(rows)
+        text = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return text
+
+
+class NDJSONEncoder(ExportEncoder):
+    """One JSON object per line."""
+
+    content_type = "application/x-ndjson"
+    extension = "ndjson"
+
+    def encode(self, rows: List[Dict[str, Any]]) -> str:
+        return "".join(_json_line(row) + "\n" for row in rows)
+
+
+class JSONArrayEncoder(ExportEncoder):
+    """A single JSON array, written element by element."""
+
+    content_type = "application/json"
+    extension = "json"
+
+    def __init__(self, fields: Sequence[str]):
+        super().__init__(fields)
+        self._first = True
+
+    def begin(self) -> str:
+        return "["
+
+    def resume(self) -> None:
+        self._first = False
+
+    def encode(self, rows: List[Dict[str, Any]]) -> str:
+        if not rows:
+            return ""
+        separator = "\n" if self._first else ",\n"
+        self._first = False
+        return separator + ",\n".join(_json_line(row) for row in rows)
+
+    def end(self) -> str:
+        return "]" if self._first else "\n]"
+
+
+class XMLEncoder(ExportEncoder):
+    """``<data>`` document with one ``<record>`` per row."""
+
+    content_type = "application/xml"
+    extension = "xml"
+
+    def begin(self) -> str:
+        return '<?xml version="1.0" encoding="UTF-8"?>\n<data>\n'
+
+    def encode(self, rows: List[Dict[str, Any]]) -> str:
+        parts = []
+        for row in rows:
+            parts.append("  <record>\n")
+            for field in self.fields:
+                value = row.get(field)
+                if value is None:
+                    parts.append(f"    <{field}/>\n")
+                else:
+                    parts.append(f"    <{field}>{escape(str(value))}</{field}>\n")
+            parts.append("  </record>\n")
+        return "".join(parts)
+
+    def end(self) -> str:
+        return "</data>\n"
+
+
+ENCODERS = {
+    "csv": CSVEncoder,
+    "ndjson": NDJSONEncoder,
+    "json": JSONArrayEncoder,
+    "xml": XMLEncoder,
+}
+
+
+def create_encoder(format_name: str, fields: Sequence[str]) -> ExportEncoder:
+    """
+    Create the encoder for an export format.
+
+    Args:
+        format_name: Export format value (``ExportFormat.value``)
+        fields: Column names, in output order
+
+    Returns:
+        ExportEncoder for the format
+
+    Raises:
+        ValueError: If the format has no streaming encoder
+    """
+    encoder_class = ENCODERS.get(format_name)
+    if encoder_class is None:
+        raise ValueError(f"Unsupported format: {format_name}")
+    return encoder_class(fields)
+
+
+def gzip_member(data: bytes, compression_level: int = 6) -> bytes:
+    """Compress data into one self-contained gzip member."""
+    # wbits=31 selects the gzip container
+    compressor = zlib.compressobj(compression_level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def encode_chunk(
+    format_name: str,
+    fields: Sequence[str],
+    rows: Sequence[Sequence[Any]],
+    continuing: bool,
+    compression_level: Optional[int] = None
+) -> Tuple[bytes, int]:
+    """
+    Encode one chunk of rows into a self-contained piece of an export file.
+
+    A module-level function of plain arguments, so it can run in a
+    worker process.
+
+    Args:
+        format_name: Export format value
+        fields: Column names, in row order
+        rows: Row tuples
+        continuing: Rows have already been written before this chunk
+        compression_level: gzip level, or None to leave uncompressed
+
+    Returns:
+        The bytes to append and the uncompressed size
+    """
+    encoder = create_encoder(format_name, fields)
+    if continuing:
+        encoder.resume()
+    data = encoder.encode([
+        {field: export_value(value) for field, value in zip(fields, row)}
+        for row in rows
+    ]).encode("utf-8")
+    if compression_level is None:
+        return data, len(data)
+    return gzip_member(data, compression_level), len(data)
+
+
+class ExportFileWriter:
+    """
+    Append encoded text to a file, optionally gzip-compressed.
+
+    Every write is compressed as its own gzip member, so the file is
+    valid gzip after each write and can be truncated back to any earlier
+    write to resume. Methods are blocking; callers on the event loop run
+    them in a worker thread.
+
+    Args:
+        path: Destination file
+        compress: Write a gzip stream
+        compression_level: zlib level, 1 (fast) to 9 (small)
+    """
+
+    def __init__(self, path: str, compress: bool = True, compression_level: int = 6):
+        self.path = path
+        self.compress = compress
+        self.compression_level = compression_level
+        self.bytes_encoded = 0
+        self.bytes_written = 0
+        self._file: Optional[io.BufferedWriter] = None
+
+    def open(self, offset: int = 0) -> None:
+        """
+        Open the file for appending.
+
+        Args:
+            offset: Keep this many bytes of an existing file and append
+                after them; 0 starts a new file
+        """
+        if offset:
+            self._file = open(self.path, "r+b")
+            self._file.truncate(offset)
+            self._file.seek(offset)
+        else:
+            self._file = open(self.path, "wb")
+        self.bytes_written = offset
+
+    def write(self, text: str) -> int:
+        """
+        Append text.
+
+        Returns:
+            Number of uncompressed bytes appended
+        """
+        if not text:
+            return 0
+        data = text.encode("utf-8")
+        self.append(gzip_member(data, self.compression_level) if self.compress else data, len(data))
+        return len(data)
+
+    def append(self, data: bytes, encoded_size: int) -> None:
+        """Append bytes produced by ``encode_chunk``."""
+        if data:
+            self._file.write(data)
+            self.bytes_written += len(data)
+        self.bytes_encoded += encoded_size
+
+    def sync(self) -> int:
+        """
+        Flush written bytes to disk.
+
+        Returns:
+            File length, a safe offset to resume from
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self.bytes_written
+
+    def close(self) -> None:
+        """Close the file."""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+
+
+HIVE_DEFAULT_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise RuntimeError("pyarrow is required for Parquet exports")
+
+
+def _arrow_type(sql_type) -> "pa.DataType":
+    if isinstance(sql_type, sqltypes.Boolean):
+        return pa.bool_()
+    if isinstance(sql_type, sqltypes.Integer):
+        return pa.int64()
+    if isinstance(sql_type, (sqltypes.Numeric, sqltypes.Float)):
+        return pa.float64()
+    if isinstance(sql_type, sqltypes.DateTime):
+        return pa.timestamp("us", tz="UTC" if sql_type.timezone else None)
+    if isinstance(sql_type, sqltypes.Date):
+        return pa.date32()
+    # Strings, enums, UUIDs and anything else are exported as text
+    return pa.string()
+
+
+def arrow_schema(columns: Iterable[Any], dictionary_fields: Iterable[str] = ()) -> "pa.Schema":
+    """
+    Derive an Arrow schema from the columns of a select.
+
+    Args:
+        columns: ``Select.selected_columns``
+        dictionary_fields: Text columns to dictionary-encode
+
+    Returns:
+        Arrow schema with one field per column
+    """
+    _require_pyarrow()
+    dictionary_fields = set(dictionary_fields)
+    fields = []
+    for column in columns:
+        arrow_type = _arrow_type(column.type)
+        if column.name in dictionary_fields and pa.types.is_string(arrow_type):
+            arrow_type = pa.dictionary(pa.int32(), pa.string())
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields)
+
+
+def _text_value(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, enum.Enum):
+        return str(value.value)
+    return str(value)
+
+
+def _float_value(value: Any) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def _arrow_converter(arrow_type) -> Optional[Callable[[Any], Any]]:
+    """Per-value conversion needed before ``pa.array``, if any."""
+    if pa.types.is_string(arrow_type) or pa.types.is_dictionary(arrow_type):
+        return _text_value
+    if pa.types.is_floating(arrow_type):
+        return _float_value
+    return None
+
+
+class ParquetExportWriter:
+    """
+    Write row chunks as Parquet, optionally partitioned by date.
+
+    Rows are converted column by column into Arrow record batches and
+    buffered until a full row group is available, so row groups have a
+    fixed size however the database chunks the rows. Dictionary-typed
+    columns are dictionary-encoded in the file; other columns are
+    written plain.
+
+    With ``partition_field`` set, output is a Hive-style directory
+    (``date=YYYY-MM-DD/part-00000.parquet``) packed into a zip archive on
+    close. Rows are expected in partition order, as the export queries
+    return them, so only one partition file is open at a time.
+
+    Methods are blocking; callers on the event loop run them in a worker
+    thread.
+
+    Args:
+        path: Destination file, without extension
+        schema: Arrow schema of the rows (see ``arrow_schema``)
+        row_group_size: Rows per Parquet row group
+        compression: Parquet codec (zstd, snappy, gzip or none)
+        partition_field: Date or timestamp column to partition on
+    """
+
+    def __init__(
+        self,
+        path: str,
+        schema: "pa.Schema",
+        row_group_size: int = 100_000,
+        compression: str = "zstd",
+        partition_field: Optional[str] = None
+    ):
+        _require_pyarrow()
+        self.schema = schema
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.partition_field = partition_field
+        self.bytes_encoded = 0
+        self.bytes_written = 0
+        self.files: List[str] = []
+
+        if partition_field is None:
+            self.output_path = f"{path}.parquet"
+            self.content_type = "application/vnd.apache.parquet"
+            self._parts_directory = None
+        else:
+            self.output_path = f"{path}.zip"
+            self.content_type = "application/zip"
+            self._parts_directory = f"{path}.parts"
+            self._partition_index = schema.get_field_index(partition_field)
+
+        self._converters = [_arrow_converter(field.type) for field in schema]
+        self._dictionary_columns = [
+            field.name for field in schema if pa.types.is_dictionary(field.type)
+        ]
+        self._writer = None
+        self._partition: Any = None
+        self._part_counts: Dict[Any, int] = {}
+        self._pending: List["pa.RecordBatch"] = []
+        self._pending_rows = 0
+
+    def open(self) -> None:
+        if self._parts_directory is None:
+            self._writer = self._new_writer(self.output_path)
+        else:
+            # Parquet files cannot be appended to; a rerun starts over
+            shutil.rmtree(self._parts_directory, ignore_errors=True)
+            os.makedirs(self._parts_directory)
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> int:
+        """
+        Append one chunk of rows.
+
+        Args:
+            rows: Row tuples in schema order
+
+        Returns:
+            Number of rows appended
+        """
+        if not rows:
+            return 0
+        if self._parts_directory is None:
+            self._append(rows)
+        else:
+            for day, run in itertools.groupby(rows, key=self._partition_key):
+                if self._writer is None or day != self._partition:
+                    self._close_partition()
+                    self._open_partition(day)
+                self._append(list(run))
+        return len(rows)
+
+    def close(self) -> None:
+        """Flush the last row group and finish the output file."""
+        self._close_partition()
+        if self._parts_directory is not None and os.path.isdir(self._parts_directory):
+            try:
+                # Parquet pages are already compressed
+                with zipfile.ZipFile(self.output_path, "w", zipfile.ZIP_STORED) as archive:
+                    for file_path in self.files:
+                        archive.write(file_path, os.path.relpath(file_path, self._parts_directory))
+            finally:
+                shutil.rmtree(self._parts_directory, ignore_errors=True)
+        if os.path.exists(self.output_path):
+            self.bytes_written = os.path.getsize(self.output_path)
+
+    def _partition_key(self, row: Sequence[Any]) -> Optional[date]:
+        value = row[self._partition_index]
+        return value.date() if isinstance(value, datetime) else value
+
+    def _open_partition(self, day: Optional[date]) -> None:
+        label = day.isoformat() if day is not None else HIVE_DEFAULT_PARTITION
+        directory = os.path.join(self._parts_directory, f"date={label}")
+        os.makedirs(directory, exist_ok=True)
+
+        # A partition seen again (unordered input) gets a new part file
+        part = self._part_counts.get(day, 0)
+        self._part_counts[day] = part + 1
+        file_path = os.path.join(directory, f"part-{part:05d}.parquet")
+
+        self._writer = self._new_writer(file_path)
+        self._partition = day
+
+    def _close_partition(self) -> None:
+        if self._writer is None:
+            return
+        try:
+            self._flush(final=True)
+        finally:
+            self._writer.close()
+            self._writer = None
+
+    def _new_writer(self, file_path: str):
+        self.files.append(file_path)
+        return pq.ParquetWriter(
+            file_path,
+            self.schema,
+            compression=self.compression,
+            use_dictionary=self._dictionary_columns or False
+        )
+
+    def _append(self, rows: Sequence[Sequence[Any]]) -> None:
+        columns = []
+        for index, field in enumerate(self.schema):
+            convert = self._converters[index]
+            values = [row[index] for row in rows]
+            if convert is not None:
+                values = [convert(value) for value in values]
+            columns.append(pa.array(values, type=field.type))
+
+        batch = pa.RecordBatch.from_arrays(columns, schema=self.schema)
+        self.bytes_encoded += batch.nbytes
+        self._pending.append(batch)
+        self._pending_rows += batch.num_rows
+        if self._pending_rows >= self.row_group_size:
+            self._flush()
+
+    def _flush(self, final: bool = False) -> None:
+        """Write buffered rows as whole row groups, keeping any remainder."""
+        if not self._pending_rows:
+            return
+        table = pa.Table.from_batches(self._pending, schema=self.schema)
+        size = table.num_rows if final else table.num_rows - table.num_rows % self.row_group_size
+        if size:
+            self._writer.write_table(
+                table.slice(0, size).unify_dictionaries(),
+                row_group_size=self.row_group_size
+            )
+        remainder = table.slice(size)
+        self._pending = remainder.to_batches()
+        self._pending_rows = remainder.num_rows
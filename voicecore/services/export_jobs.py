@@ -0,0 +1,417 @@
+"""
+Durable export job queue and worker pool.
+
+Export jobs are rows in ``export_jobs``. Workers claim pending jobs for
+the tenant with the fewest jobs running, skipping tenants that already
+have their share, so one tenant's large export cannot hold up everyone
+else's. A job's priority only orders it among its own tenant's jobs.
+A running job heartbeats each time it records a checkpoint; jobs whose
+worker stopped heartbeating are put back in the queue and resume from
+their last checkpoint.
+
+Job rows are handled as plain mappings through Core statements on the
+table, as the audit writer does; they are small records passed between
+the API, the pool and the export runner.
+"""
+
+import os
+import time
+import uuid
+import socket
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, func, insert, select, update
+
+from voicecore.database import get_db_session
+from voicecore.models.export_job import ExportJob, ExportJobStatus
+from voicecore.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+export_jobs = ExportJob.__table__
+
+
+class ExportJobCancelled(Exception):
+    """Raised inside a running export once its cancellation is requested."""
+
+
+class ExportJobLost(Exception):
+    """Raised inside a running export that another worker has taken over."""
+
+
+class ExportJobStore:
+    """Persistence and claiming for export jobs."""
+
+    async def create(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Insert a job.
+
+        Args:
+            values: Column values; status defaults to pending
+
+        Returns:
+            The stored job row
+        """
+        now = datetime.utcnow()
+        row = {"id": uuid.uuid4(), "created_at": now, "updated_at": now, **values}
+        async with get_db_session(independent=True) as session:
+            result = await session.execute(insert(export_jobs).values(row).returning(*export_jobs.c))
+            return dict(result.mappings().one())
+
+    async def get(self, job_id: uuid.UUID, tenant_id: Optional[uuid.UUID] = None) -> Optional[Dict[str, Any]]:
+        """Fetch a job, optionally only if it belongs to ``tenant_id``."""
+        query = select(export_jobs).where(export_jobs.c.id == job_id)
+        if tenant_id is not None:
+            query = query.where(export_jobs.c.tenant_id == tenant_id)
+        async with get_db_session() as session:
+            row = (await session.execute(query)).mappings().first()
+        return dict(row) if row else None
+
+    async def list(self, tenant_id: uuid.UUID, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """List a tenant's jobs, newest first."""
+        query = (
+            select(export_jobs)
+            .where(export_jobs.c.tenant_id == tenant_id)
+            .order_by(export_jobs.c.created_at.desc(), export_jobs.c.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        async with get_db_session() as session:
+            return [dict(row) for row in (await session.execute(query)).mappings()]
+
+    async def claim(self, worker_id: str, max_jobs_per_tenant: int) -> Optional[Dict[str, Any]]:
+        """
+        Claim the next job to run.
+
+        The tenant with the fewest jobs running goes first, ties going to
+        the tenant that has waited longest. Within that tenant, jobs go
+        by priority, then oldest first. Priority is chosen by the client,
+        so it never moves a job ahead of another tenant's.
+
+        Tenants already running ``max_jobs_per_tenant`` jobs are skipped.
+        The running count is read without locking the tenant, so workers
+        claiming at the same moment can each see the last free slot; the
+        cap may then be exceeded by at most the number of concurrent
+        claimers, until those jobs finish.
+
+        Args:
+            worker_id: Identifier recorded on the claimed job
+            max_jobs_per_tenant: Running jobs allowed per tenant
+
+        Returns:
+            The claimed job row, or None if nothing is runnable
+        """
+        running = (
+            select(export_jobs.c.tenant_id, func.count().label("jobs"))
+            .where(export_jobs.c.status == ExportJobStatus.PROCESSING)
+            .group_by(export_jobs.c.tenant_id)
+            .subquery()
+        )
+        waiting = (
+            select(export_jobs.c.tenant_id, func.min(export_jobs.c.created_at).label("since"))
+            .where(export_jobs.c.status == ExportJobStatus.PENDING)
+            .group_by(export_jobs.c.tenant_id)
+            .subquery()
+        )
+        running_jobs = func.coalesce(running.c.jobs, 0)
+        candidate = (
+            select(export_jobs.c.id)
+            .select_from(
+                export_jobs
+                .join(waiting, waiting.c.tenant_id == export_jobs.c.tenant_id)
+                .outerjoin(running, running.c.tenant_id == export_jobs.c.tenant_id)
+            )
+            .where(export_jobs.c.status == ExportJobStatus.PENDING, running_jobs < max_jobs_per_tenant)
+            .order_by(
+                running_jobs,
+                waiting.c.since,
+                export_jobs.c.tenant_id,
+                export_jobs.c.priority.desc(),
+                export_jobs.c.created_at,
+                export_jobs.c.id
+            )
+            .limit(1)
+            .with_for_update(of=export_jobs, skip_locked=True)
+        )
+
+        now = datetime.utcnow()
+        async with get_db_session(independent=True) as session:
+            job_id = (await session.execute(candidate)).scalar()
+            if job_id is None:
+                return None
+            row = (await session.execute(
+                update(export_jobs)
+                .where(export_jobs.c.id == job_id, export_jobs.c.status == ExportJobStatus.PENDING)
+                .values(
+                    status=ExportJobStatus.PROCESSING,
+                    worker_id=worker_id,
+                    attempts=export_jobs.c.attempts + 1,
+                    heartbeat_at=now,
+                    started_at=func.coalesce(export_jobs.c.started_at, now)
+                )
+                .returning(*export_jobs.c)
+            )).mappings().first()
+        return dict(row) if row else None
+
+    async def checkpoint(self, job_id: uuid.UUID, worker_id: str, values: Dict[str, Any]) -> bool:
+        """
+        Record progress and heartbeat for a running job.
+
+        Args:
+            job_id: Job ID
+            worker_id: Worker that claimed the job
+            values: Progress columns to store
+
+        Returns:
+            Whether cancellation has been requested
+
+        Raises:
+            ExportJobLost: If the job is no longer claimed by ``worker_id``
+        """
+        async with get_db_session(independent=True) as session:
+            cancel_requested = (await session.execute(
+                update(export_jobs)
+                .where(
+                    export_jobs.c.id == job_id,
+                    export_jobs.c.worker_id == worker_id,
+                    export_jobs.c.status == ExportJobStatus.PROCESSING
+                )
+                .values(heartbeat_at=datetime.utcnow(), **values)
+                .returning(export_jobs.c.cancel_requested)
+            )).scalar()
+        if cancel_requested is None:
+            raise ExportJobLost(f"Export job {job_id} is no longer claimed by {worker_id}")
+        return cancel_requested
+
+    async def finish(self, job_id: uuid.UUID, worker_id: str, status: str, values: Dict[str, Any]) -> bool:
+        """
+        Record the outcome of a job this worker ran.
+
+        Returns:
+            False if the job had been taken over by another worker
+        """
+        async with get_db_session(independent=True) as session:
+            result = await session.execute(
+                update(export_jobs)
+                .where(export_jobs.c.id == job_id, export_jobs.c.worker_id == worker_id)
+                .values(status=status, worker_id=None, completed_at=datetime.utcnow(), **values)
+            )
+        return result.rowcount == 1
+
+    async def release(self, job_id: uuid.UUID, worker_id: str) -> None:
+        """Put an interrupted job back in the queue, keeping its checkpoint."""
+        async with get_db_session(independent=True) as session:
+            await session.execute(
+                update(export_jobs)
+                .where(
+                    export_jobs.c.id == job_id,
+                    export_jobs.c.worker_id == worker_id,
+                    export_jobs.c.status == ExportJobStatus.PROCESSING
+                )
+                .values(status=ExportJobStatus.PENDING, worker_id=None)
+            )
+
+    async def request_cancel(self, job_id: uuid.UUID, tenant_id: uuid.UUID) -> Optional[Dict[str, Any]]:
+        """
+        Cancel a job.
+
+        Pending jobs are cancelled at once; running jobs are flagged and
+        stop at their next chunk or checkpoint. Finished jobs are left
+        as they are.
+
+        Returns:
+            The job row after the request, or None if not found
+        """
+        async with get_db_session(independent=True) as session:
+            row = (await session.execute(
+                update(export_jobs)
+                .where(
+                    export_jobs.c.id == job_id,
+                    export_jobs.c.tenant_id == tenant_id,
+                    export_jobs.c.status == ExportJobStatus.PENDING
+                )
+                .values(status=ExportJobStatus.CANCELLED, completed_at=datetime.utcnow())
+                .returning(*export_jobs.c)
+            )).mappings().first()
+            if row is None:
+                row = (await session.execute(
+                    update(export_jobs)
+                    .where(
+                        export_jobs.c.id == job_id,
+                        export_jobs.c.tenant_id == tenant_id,
+                        export_jobs.c.status == ExportJobStatus.PROCESSING
+                    )
+                    .values(cancel_requested=True)
+                    .returning(*export_jobs.c)
+                )).mappings().first()
+        if row is None:
+            return await self.get(job_id, tenant_id)
+        return dict(row)
+
+    async def recover_stale(self, stale_after_seconds: float, max_attempts: int) -> Dict[str, int]:
+        """
+        Requeue running jobs whose worker stopped heartbeating.
+
+        Jobs that have already been claimed ``max_attempts`` times are
+        failed instead, so an export that keeps killing its worker does
+        not loop forever.
+
+        Returns:
+            Counts of requeued and failed jobs
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=stale_after_seconds)
+        stale = and_(
+            export_jobs.c.status == ExportJobStatus.PROCESSING,
+            export_jobs.c.heartbeat_at < cutoff
+        )
+        async with get_db_session(independent=True) as session:
+            failed = (await session.execute(
+                update(export_jobs)
+                .where(stale, export_jobs.c.attempts >= max_attempts)
+                .values(
+                    status=ExportJobStatus.FAILED,
+                    worker_id=None,
+                    completed_at=datetime.utcnow(),
+                    error_message="Export interrupted too many times"
+                )
+            )).rowcount
+            requeued = (await session.execute(
+                update(export_jobs)
+                .where(stale)
+                .values(status=ExportJobStatus.PENDING, worker_id=None)
+            )).rowcount
+        return {"requeued": requeued, "failed": failed}
+
+
+class ExportWorkerPool:
+    """
+    Runs export jobs from the store with bounded concurrency.
+
+    Each worker coroutine claims a job, runs it to completion and claims
+    the next; idle workers wait for ``notify`` or the poll interval.
+    Stopping the pool cancels running jobs and returns them to the queue
+    with their checkpoints, so they resume on the next start.
+
+    Args:
+        store: Job store
+        run_job: Coroutine function running one claimed job row
+        concurrency: Jobs this process runs at once
+        max_jobs_per_tenant: Jobs one tenant may have running across all workers
+        poll_interval: Seconds between queue polls while idle
+        stale_after: Seconds without a heartbeat before a running job is requeued
+        max_attempts: Claims before a repeatedly interrupted job is failed
+    """
+
+    def __init__(
+        self,
+        store: ExportJobStore,
+        run_job: Callable[[Dict[str, Any]], Awaitable[None]],
+        concurrency: int = 4,
+        max_jobs_per_tenant: int = 1,
+        poll_interval: float = 5.0,
+        stale_after: float = 300.0,
+        max_attempts: int = 3
+    ):
+        self.store = store
+        self.run_job = run_job
+        self.concurrency = concurrency
+        self.max_jobs_per_tenant = max_jobs_per_tenant
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.running: Dict[str, Dict[str, Any]] = {}
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._claim_lock: Optional[asyncio.Lock] = None
+        self._last_recovery = float("-inf")
+
+    @property
+    def started(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self) -> None:
+        """Requeue stale jobs and start the workers."""
+        if self._workers:
+            return
+        self._wakeup = asyncio.Event()
+        self._claim_lock = asyncio.Lock()
+        await self._recover()
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"export-worker-{index}")
+            for index in range(self.concurrency)
+        ]
+        logger.info(
+            "Export worker pool started",
+            worker_id=self.worker_id,
+            concurrency=self.concurrency,
+            max_jobs_per_tenant=self.max_jobs_per_tenant
+        )
+
+    async def stop(self) -> None:
+        """Stop the workers, returning running jobs to the queue."""
+        if not self._workers:
+            return
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info("Export worker pool stopped", worker_id=self.worker_id)
+
+    def notify(self) -> None:
+        """Wake idle workers to claim newly queued jobs."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _work(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                job = await self._claim()
+            except Exception as e:
+                logger.error("Failed to claim export job", error=str(e))
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._run(job)
+
+    async def _claim(self) -> Optional[Dict[str, Any]]:
+        # Claims from this process are serialized so the per-tenant
+        # running count is current when the next claim reads it
+        async with self._claim_lock:
+            if time.monotonic() - self._last_recovery >= self.stale_after / 2:
+                await self._recover()
+            return await self.store.claim(self.worker_id, self.max_jobs_per_tenant)
+
+    async def _recover(self) -> None:
+        self._last_recovery = time.monotonic()
+        try:
+            counts = await self.store.recover_stale(self.stale_after, self.max_attempts)
+        except Exception as e:
+            logger.error("Failed to recover stale export jobs", error=str(e))
+            return
+        if counts["requeued"] or counts["failed"]:
+            logger.warning("Recovered stale export jobs", **counts)
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        job_id = str(job["id"])
+        self.running[job_id] = job
+        try:
+            await self.run_job(job)
+        except asyncio.CancelledError:
+            await asyncio.shield(self.store.release(job["id"], job["worker_id"]))
+            raise
+        except Exception as e:
+            logger.error("Export job crashed", job_id=job_id, error=str(e))
+        finally:
+            self.running.pop(job_id, None)
@@ -15,11 +15,12 @@ from enum import Enum
 from sqlalchemy import select, and_, func, desc
 from sqlalchemy.orm import selectinload
 
-from voicecore.database import get_db_session, set_tenant_context
+from voicecore.database import get_db_session, get_pool_stats, get_session_stats, set_tenant_context
 from voicecore.models import SystemMetrics, MetricType, Call, Agent
 from voicecore.services.analytics_service import AnalyticsService
 from voicecore.logging import get_logger
 from voicecore.config import get_settings
+from voicecore.utils.query_profiler import query_profiler
 
 
 logger = get_logger(__name__)
@@ -550,16 +551,17 @@ class PerformanceMonitoringService:
         self,
         tenant_id: Optional[uuid.UUID]
     ) -> Dict[str, Any]:
-        """Collect database performance metrics."""
+        """Collect database performance metrics from the query profiler and pool."""
         try:
-            # Mock database metrics (would query actual DB stats)
-            return {
-                "avg_query_time_ms": 15.0,
-                "active_connections": 25,
-                "slow_queries": 2,
-                "cache_hit_rate": 0.95,
-                "disk_io_rate": 1024.0  # KB/s
-            }
+            metrics = query_profiler.snapshot(top=5)
+            metrics["requests"] = get_session_stats()
+            metrics.update(get_pool_stats())
+            
+            primary = metrics["pools"].get("primary")
+            if primary:
+                metrics["active_connections"] = primary["checked_out"]
+            
+            return metrics
         except Exception:
             return {}
     
@@ -14,14 +14,26 @@ from sqlalchemy import Column, String, DateTime, JSON, Text, Boolean, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import declarative_base
 
+from voicecore.config import settings
 from voicecore.database import get_db_session, set_tenant_context
+from voicecore.services.audit_writer import AuditLogWriter
 from voicecore.utils.security import SecurityUtils, sanitize_log_data
+from voicecore.utils.encryption import get_encryption_engine
 from voicecore.logging import get_logger
 from voicecore.models.base import BaseModel, TimestampMixin, TenantMixin
 
 
 logger = get_logger(__name__)
 
+# Call record fields encrypted at rest
+SENSITIVE_CALL_FIELDS = [
+    'caller_phone_number',
+    'transcript',
+    'recording_url',
+    'notes',
+    'customer_data'
+]
+
 
 class AuditEventType(Enum):
     """Types of audit events for privacy compliance."""
@@ -46,6 +58,8 @@ class AuditLog(BaseModel, TimestampMixin, TenantMixin):
     or location data is stored per Requirements 5.1 and 5.5.
     """
     
+    __tablename__ = "privacy_audit_logs"
+    
     # Event identification
     event_id = Column(
         UUID(as_uuid=True),
@@ -128,6 +142,18 @@ class AuditLog(BaseModel, TimestampMixin, TenantMixin):
         return f"<AuditLog(event_id={self.event_id}, event_type='{self.event_type}')>"
 
 
+# Shared by every PrivacyService instance; started and flushed from the
+# application lifespan
+audit_writer = AuditLogWriter(
+    AuditLog.__table__,
+    max_queue_size=settings.audit_queue_size,
+    batch_size=settings.audit_batch_size,
+    flush_interval=settings.audit_flush_interval_seconds,
+    journal_dir=settings.audit_journal_dir,
+    journal_fsync=settings.audit_journal_fsync
+)
+
+
 class PrivacyService:
     """
     Privacy compliance service implementing Requirements 5.1, 5.3, 5.5.
@@ -141,6 +167,7 @@ class PrivacyService:
     def __init__(self):
         self.logger = logger
         self.security_utils = SecurityUtils()
+        self.encryption_engine = get_encryption_engine()
     
     async def log_audit_event(
         self,
@@ -179,46 +206,41 @@ class PrivacyService:
             bool: True if audit log was created successfully
         """
         try:
-            async with get_db_session() as session:
-                await set_tenant_context(session, str(tenant_id))
-                
-                # Sanitize all input data to ensure privacy compliance
-                sanitized_event_data = sanitize_log_data(event_data or {})
-                sanitized_error_message = self.security_utils.sanitize_data(error_message) if error_message else None
-                sanitized_user_agent = self._sanitize_user_agent(user_agent) if user_agent else None
-                
-                # Hash user identifiers for privacy
-                hashed_user_id = self.security_utils.hash_phone_number(user_id) if user_id else None
-                hashed_session_id = self.security_utils.hash_phone_number(session_id) if session_id else None
-                
-                # Create audit log entry
-                audit_log = AuditLog(
-                    tenant_id=tenant_id,
-                    event_id=uuid.uuid4(),
-                    event_type=event_type.value,
-                    user_id=hashed_user_id,
-                    session_id=hashed_session_id,
-                    correlation_id=correlation_id or self.security_utils.generate_correlation_id(),
-                    action=action,
-                    resource=resource,
-                    event_data=sanitized_event_data,
-                    success=success,
-                    error_message=sanitized_error_message,
-                    user_agent=sanitized_user_agent
-                )
-                
-                session.add(audit_log)
-                await session.commit()
-                
-                self.logger.info(
-                    "Audit event logged",
+            # Sanitize all input data to ensure privacy compliance
+            sanitized_event_data = sanitize_log_data(event_data or {})
+            sanitized_error_message = self.security_utils.sanitize_data(error_message) if error_message else None
+            sanitized_user_agent = self._sanitize_user_agent(user_agent) if user_agent else None
+            
+            # Fingerprint user identifiers for privacy
+            hashed_user_id = self.security_utils.fingerprint_identifier(user_id) if user_id else None
+            hashed_session_id = self.security_utils.fingerprint_identifier(session_id) if session_id else None
+            
+            # Queue the audit log entry; the writer inserts it in a batch
+            accepted = audit_writer.submit({
+                "id": uuid.uuid4(),
+                "tenant_id": tenant_id if isinstance(tenant_id, uuid.UUID) else uuid.UUID(str(tenant_id)),
+                "event_id": uuid.uuid4(),
+                "event_type": event_type.value,
+                "user_id": hashed_user_id,
+                "session_id": hashed_session_id,
+                "correlation_id": correlation_id or self.security_utils.generate_correlation_id(),
+                "action": action,
+                "resource": resource,
+                "event_data": sanitized_event_data,
+                "success": success,
+                "error_message": sanitized_error_message,
+                "user_agent": sanitized_user_agent
+            })
+            
+            if not accepted:
+                self.logger.warning(
+                    "Audit event dropped, queue full",
                     tenant_id=str(tenant_id),
                     event_type=event_type.value,
-                    action=action,
-                    success=success
+                    action=action
                 )
-                
-                return True
+            
+            return accepted
                 
         except Exception as e:
             self.logger.error(
@@ -229,6 +251,15 @@ class PrivacyService:
             )
             return False
     
+    def get_audit_pipeline_stats(self) -> Dict[str, Any]:
+        """
+        Get audit writer throughput and backpressure metrics.
+        
+        Returns:
+            Dict with queue depth, written/dropped/spilled counts
+        """
+        return audit_writer.stats()
+    
     async def encrypt_call_data(
         self,
         tenant_id: uuid.UUID,
@@ -244,37 +275,51 @@ class PrivacyService:
         Returns:
             Dict with encrypted sensitive fields
         """
-        try:
-            encrypted_data = call_data.copy()
+        encrypted = await self.encrypt_call_records(tenant_id, [call_data])
+        return encrypted[0]
+    
+    async def encrypt_call_records(
+        self,
+        tenant_id: uuid.UUID,
+        records: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Encrypt sensitive fields of a batch of call records per Requirement 5.3.
+        
+        Encryption runs in the engine's thread pool with the tenant's
+        data key, and one audit event is logged for the whole batch.
+        
+        Args:
+            tenant_id: Tenant UUID
+            records: Call records to encrypt
             
-            # Fields that need encryption
-            sensitive_fields = [
-                'caller_phone_number',
-                'transcript',
-                'recording_url',
-                'notes',
-                'customer_data'
-            ]
+        Returns:
+            List of records with encrypted sensitive fields
+        """
+        try:
+            encrypted_records = await self.encryption_engine.encrypt_records(
+                records, SENSITIVE_CALL_FIELDS, tenant_id
+            )
             
-            for field in sensitive_fields:
-                if field in encrypted_data and encrypted_data[field]:
-                    # Encrypt the sensitive data
-                    encrypted_value = self.security_utils.encrypt_sensitive_data(
-                        str(encrypted_data[field])
-                    )
-                    encrypted_data[field] = encrypted_value
-                    
-                    # Log encryption event
-                    await self.log_audit_event(
-                        tenant_id=tenant_id,
-                        event_type=AuditEventType.DATA_MODIFICATION,
-                        action="encrypt_call_data",
-                        resource=f"call_data.{field}",
-                        event_data={"field": field, "encrypted": True},
-                        success=True
-                    )
+            fields = sorted({
+                field for record in records
+                for field in SENSITIVE_CALL_FIELDS if record.get(field)
+            })
+            if fields:
+                await self.log_audit_event(
+                    tenant_id=tenant_id,
+                    event_type=AuditEventType.DATA_MODIFICATION,
+                    action="encrypt_call_data",
+                    resource="call_data",
+                    event_data={
+                        "fields": fields,
+                        "records": len(records),
+                        "encrypted": True
+                    },
+                    success=True
+                )
             
-            return encrypted_data
+            return encrypted_records
             
         except Exception as e:
             self.logger.error(
@@ -310,46 +355,51 @@ class PrivacyService:
         Returns:
             Dict with decrypted sensitive fields
         """
-        try:
-            decrypted_data = encrypted_call_data.copy()
+        decrypted = await self.decrypt_call_records(tenant_id, [encrypted_call_data])
+        return decrypted[0]
+    
+    async def decrypt_call_records(
+        self,
+        tenant_id: uuid.UUID,
+        records: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Decrypt sensitive fields of a batch of call records per Requirement 5.3.
+        
+        Fields that do not decrypt are assumed to be unencrypted and are
+        returned unchanged.
+        
+        Args:
+            tenant_id: Tenant UUID
+            records: Encrypted call records
             
-            # Fields that need decryption
-            sensitive_fields = [
-                'caller_phone_number',
-                'transcript',
-                'recording_url',
-                'notes',
-                'customer_data'
-            ]
+        Returns:
+            List of records with decrypted sensitive fields
+        """
+        try:
+            decrypted_records = await self.encryption_engine.decrypt_records(
+                records, SENSITIVE_CALL_FIELDS, tenant_id
+            )
             
-            for field in sensitive_fields:
-                if field in decrypted_data and decrypted_data[field]:
-                    try:
-                        # Decrypt the sensitive data
-                        decrypted_value = self.security_utils.decrypt_sensitive_data(
-                            decrypted_data[field]
-                        )
-                        decrypted_data[field] = decrypted_value
-                        
-                        # Log decryption event
-                        await self.log_audit_event(
-                            tenant_id=tenant_id,
-                            event_type=AuditEventType.DATA_ACCESS,
-                            action="decrypt_call_data",
-                            resource=f"call_data.{field}",
-                            event_data={"field": field, "decrypted": True},
-                            success=True
-                        )
-                        
-                    except Exception as decrypt_error:
-                        # If decryption fails, the data might not be encrypted
-                        self.logger.warning(
-                            "Failed to decrypt field, assuming unencrypted",
-                            field=field,
-                            error=str(decrypt_error)
-                        )
+            fields = sorted({
+                field for record in records
+                for field in SENSITIVE_CALL_FIELDS if record.get(field)
+            })
+            if fields:
+                await self.log_audit_event(
+                    tenant_id=tenant_id,
+                    event_type=AuditEventType.DATA_ACCESS,
+                    action="decrypt_call_data",
+                    resource="call_data",
+                    event_data={
+                        "fields": fields,
+                        "records": len(records),
+                        "decrypted": True
+                    },
+                    success=True
+                )
             
-            return decrypted_data
+            return decrypted_records
             
         except Exception as e:
             self.logger.error(
@@ -490,7 +540,7 @@ class PrivacyService:
                     query = query.where(AuditLog.event_type == event_type.value)
                 
                 if user_id:
-                    hashed_user_id = self.security_utils.hash_phone_number(user_id)
+                    hashed_user_id = self.security_utils.fingerprint_identifier(user_id)
                     query = query.where(AuditLog.user_id == hashed_user_id)
                 
                 query = query.order_by(AuditLog.created_at.desc()).limit(limit)
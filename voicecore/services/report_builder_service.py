@@ -7,24 +7,37 @@ scheduled reports, and advanced analytics capabilities.
 Implements Requirements 3.3, 3.6: Advanced analytics and custom report builder
 """
 
+import os
+import time
 import uuid
 import json
+import asyncio
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, Any, Optional, List
 from datetime import datetime, date, timedelta
-from sqlalchemy import select, and_, func, or_, text
-from sqlalchemy.orm import selectinload
 
-from voicecore.database import get_db_session, set_tenant_context
-from voicecore.models import (
-    CallAnalytics, AgentMetrics, SystemMetrics,
-    Call, Agent, Department
-)
+from voicecore.config import settings
 from voicecore.services.cache_service import CacheService
+from voicecore.services.report_query_compiler import (
+    output_key,
+    report_query_compiler,
+)
+from voicecore.services.report_renderers import RENDERERS, render_report
+from voicecore.services.report_results import (
+    ReportMaterializer,
+    ReportResult,
+    ReportResultStore,
+    ReportScheduler,
+)
 from voicecore.logging import get_logger
 
 
 logger = get_logger(__name__)
 
+# Default number of days a scheduled report covers
+SCHEDULE_PERIOD_DAYS = {"daily": 1, "weekly": 7, "monthly": 30}
+
 
 class ReportBuilderService:
     """
@@ -39,6 +52,33 @@ class ReportBuilderService:
         self.cache_service = CacheService()
         self._reports = {}  # In-memory storage for demo
         self._schedules = {}  # In-memory storage for demo
+        self.result_store = ReportResultStore()
+        self.materializer = ReportMaterializer(
+            self.result_store,
+            close_after=timedelta(minutes=settings.report_partition_close_after_minutes),
+            late_data_margin=timedelta(seconds=settings.report_late_data_margin_seconds)
+        )
+        self.scheduler = ReportScheduler(
+            self.run_scheduled_report,
+            self._due_schedules,
+            concurrency=settings.report_scheduler_concurrency,
+            poll_interval=settings.report_scheduler_poll_seconds
+        )
+        self.render_process_workers = settings.report_render_process_workers
+        self._render_pool: Optional[ProcessPoolExecutor] = None
+    
+    async def start(self) -> None:
+        """Start running scheduled reports and the render process pool."""
+        if self.render_process_workers > 0 and self._render_pool is None:
+            self._render_pool = ProcessPoolExecutor(max_workers=self.render_process_workers)
+        await self.scheduler.start()
+    
+    async def stop(self) -> None:
+        """Stop running scheduled reports and the render process pool."""
+        await self.scheduler.stop()
+        if self._render_pool is not None:
+            self._render_pool.shutdown(wait=False, cancel_futures=True)
+            self._render_pool = None
     
     async def create_report(
         self,
@@ -155,23 +195,8 @@ class ReportBuilderService:
             if not report:
                 raise ValueError("Report not found")
             
-            # Execute query based on data source
-            data_source = report["data_source"]
-            
-            if data_source == "calls":
-                data = await self._query_calls_data(
-                    tenant_id, report, start_date, end_date
-                )
-            elif data_source == "agents":
-                data = await self._query_agents_data(
-                    tenant_id, report, start_date, end_date
-                )
-            elif data_source == "analytics":
-                data = await self._query_analytics_data(
-                    tenant_id, report, start_date, end_date
-                )
-            else:
-                raise ValueError(f"Unsupported data source: {data_source}")
+            result = await self._run_report(tenant_id, report, start_date, end_date)
+            data = result.rows
             
             # Format output
             if output_format == "json":
@@ -184,14 +209,25 @@ class ReportBuilderService:
                     },
                     "data": data,
                     "row_count": len(data),
+                    "partitions_reused": result.partitions_reused,
+                    "partitions_computed": result.partitions_computed,
                     "generated_at": datetime.utcnow().isoformat()
                 }
-            elif output_format == "csv":
-                return {"data": self._format_as_csv(data, report["columns"])}
-            elif output_format == "excel":
-                return {"data": self._format_as_excel(data, report["columns"])}
-            elif output_format == "pdf":
-                return {"data": self._format_as_pdf(data, report)}
+            elif output_format in RENDERERS:
+                renderer_class = RENDERERS[output_format]
+                file_path = await self._render_file(
+                    output_format,
+                    data,
+                    self._output_columns(report),
+                    report["name"],
+                    f"{start_date.isoformat()} to {end_date.isoformat()}"
+                )
+                return {
+                    "file_path": file_path,
+                    "media_type": renderer_class.media_type,
+                    "filename": f"report_{report_id}_{start_date}_{end_date}.{renderer_class.extension}",
+                    "row_count": len(data)
+                }
             else:
                 raise ValueError(f"Unsupported output format: {output_format}")
             
@@ -313,6 +349,7 @@ class ReportBuilderService:
                 "schedule_time": config["schedule_time"],
                 "recipients": config["recipients"],
                 "format": config.get("format", "pdf"),
+                "period_days": config.get("period_days") or SCHEDULE_PERIOD_DAYS.get(config["schedule_type"], 1),
                 "is_active": config.get("is_active", True),
                 "created_at": datetime.utcnow().isoformat(),
                 "last_run": None,
@@ -397,6 +434,105 @@ class ReportBuilderService:
             )
             raise
     
+    async def run_scheduled_report(self, schedule: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a scheduled report and store its result.
+        
+        The period is the schedule's ``period_days`` complete days ending
+        yesterday (UTC), so consecutive runs share all but one day of
+        materialized partitions.
+        
+        Args:
+            schedule: Schedule configuration
+            
+        Returns:
+            Stored run
+        """
+        tenant_id = uuid.UUID(schedule["tenant_id"])
+        now = datetime.utcnow()
+        end_date = now.date() - timedelta(days=1)
+        start_date = end_date - timedelta(days=schedule.get("period_days", 1) - 1)
+        
+        # Advance the schedule first so a slow run is not picked up again
+        schedule["last_run"] = now.isoformat()
+        schedule["next_run"] = self._calculate_next_run(
+            schedule["schedule_type"],
+            schedule["schedule_time"]
+        ).isoformat()
+        
+        run = {
+            "tenant_id": tenant_id,
+            "schedule_id": schedule["schedule_id"],
+            "report_id": schedule["report_id"],
+            "start_date": start_date,
+            "end_date": end_date,
+        }
+        started = time.perf_counter()
+        try:
+            report = await self.get_report(tenant_id, schedule["report_id"])
+            if not report:
+                raise ValueError("Report not found")
+            
+            result = await self._run_report(tenant_id, report, start_date, end_date)
+            run.update(
+                definition_hash=report_query_compiler.compile(report).definition_hash,
+                status="completed",
+                rows=result.rows,
+                row_count=len(result.rows),
+                partitions_reused=result.partitions_reused,
+                partitions_computed=result.partitions_computed
+            )
+        except Exception as e:
+            self.logger.error(
+                "Scheduled report failed",
+                tenant_id=str(tenant_id),
+                schedule_id=schedule["schedule_id"],
+                error=str(e)
+            )
+            run.update(status="failed", error_message=str(e))
+        
+        run["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        stored = await self.result_store.save_run(run)
+        
+        self.logger.info(
+            "Scheduled report run",
+            tenant_id=str(tenant_id),
+            schedule_id=schedule["schedule_id"],
+            status=run["status"],
+            partitions_reused=run.get("partitions_reused", 0),
+            partitions_computed=run.get("partitions_computed", 0),
+            duration_ms=run["duration_ms"]
+        )
+        
+        return stored
+    
+    async def get_scheduled_report_result(
+        self,
+        tenant_id: uuid.UUID,
+        schedule_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Get the latest stored run of a scheduled report."""
+        run = await self.result_store.latest_run(tenant_id, schedule_id)
+        if not run:
+            return None
+        
+        return {
+            "schedule_id": run["schedule_id"],
+            "report_id": run["report_id"],
+            "status": run["status"],
+            "period": {
+                "start_date": run["start_date"].isoformat(),
+                "end_date": run["end_date"].isoformat()
+            },
+            "data": run["rows"] or [],
+            "row_count": run["row_count"],
+            "partitions_reused": run["partitions_reused"],
+            "partitions_computed": run["partitions_computed"],
+            "duration_ms": run["duration_ms"],
+            "error_message": run["error_message"],
+            "generated_at": run["created_at"].isoformat()
+        }
+    
     async def get_report_templates(self) -> List[Dict[str, Any]]:
         """Get available report templates."""
         return [
@@ -432,21 +568,21 @@ class ReportBuilderService:
                 "data_source": "analytics",
                 "columns": [
                     {"field": "date", "label": "Date", "type": "date"},
-                    {"field": "ai_handled", "label": "AI Handled", "type": "number"},
+                    {"field": "ai_handled_calls", "label": "AI Handled", "type": "number"},
                     {"field": "ai_resolved", "label": "AI Resolved", "type": "number"},
                     {"field": "resolution_rate", "label": "Resolution Rate", "type": "number", "format": "percentage"}
                 ]
             },
             {
-                "template_id": "revenue_analysis",
-                "name": "Revenue Analysis Report",
-                "description": "Revenue and cost analysis",
+                "template_id": "cost_analysis",
+                "name": "Cost Analysis Report",
+                "description": "Telephony cost analysis",
                 "data_source": "analytics",
                 "columns": [
                     {"field": "date", "label": "Date", "type": "date"},
-                    {"field": "total_revenue", "label": "Revenue", "type": "number", "format": "currency"},
+                    {"field": "total_cost", "label": "Cost", "type": "number", "format": "currency"},
                     {"field": "total_calls", "label": "Calls", "type": "number"},
-                    {"field": "revenue_per_call", "label": "Revenue/Call", "type": "number", "format": "currency"}
+                    {"field": "cost_cents", "label": "Cost/Call (cents)", "type": "number", "aggregation": "avg"}
                 ]
             }
         ]
@@ -458,9 +594,6 @@ class ReportBuilderService:
     ) -> Dict[str, Any]:
         """Execute a custom query for advanced users."""
         try:
-            # This is a simplified implementation
-            # In production, this would have more sophisticated query building
-            
             data_source = query_config.get("data_source", "calls")
             start_date = date.fromisoformat(query_config.get("start_date", str(date.today() - timedelta(days=30))))
             end_date = date.fromisoformat(query_config.get("end_date", str(date.today())))
@@ -475,15 +608,7 @@ class ReportBuilderService:
                 "limit": query_config.get("limit")
             }
             
-            # Execute query
-            if data_source == "calls":
-                data = await self._query_calls_data(tenant_id, temp_report, start_date, end_date)
-            elif data_source == "agents":
-                data = await self._query_agents_data(tenant_id, temp_report, start_date, end_date)
-            elif data_source == "analytics":
-                data = await self._query_analytics_data(tenant_id, temp_report, start_date, end_date)
-            else:
-                raise ValueError(f"Unsupported data source: {data_source}")
+            data = await self._query_report_data(tenant_id, temp_report, start_date, end_date)
             
             return {
                 "data": data,
@@ -501,151 +626,59 @@ class ReportBuilderService:
     
     # Private helper methods
     
-    async def _query_calls_data(
+    async def _query_report_data(
         self,
         tenant_id: uuid.UUID,
         report: Dict[str, Any],
         start_date: date,
         end_date: date
     ) -> List[Dict[str, Any]]:
-        """Query calls data based on report configuration."""
-        async with get_db_session() as session:
-            await set_tenant_context(session, str(tenant_id))
-            
-            # Build query
-            query = select(Call).where(
-                and_(
-                    Call.tenant_id == tenant_id,
-                    func.date(Call.created_at) >= start_date,
-                    func.date(Call.created_at) <= end_date
-                )
-            )
-            
-            # Apply filters
-            for filter_config in report.get("filters", []):
-                query = self._apply_filter(query, Call, filter_config)
-            
-            # Apply sorts
-            for sort_config in report.get("sorts", []):
-                query = self._apply_sort(query, Call, sort_config)
-            
-            # Apply limit
-            if report.get("limit"):
-                query = query.limit(report["limit"])
-            
-            result = await session.execute(query)
-            calls = result.scalars().all()
-            
-            # Format data based on columns
-            data = []
-            for call in calls:
-                row = {}
-                for col in report["columns"]:
-                    field = col["field"]
-                    row[field] = getattr(call, field, None)
-                data.append(row)
-            
-            return data
+        """Rows of a report over a date range; see _run_report."""
+        return (await self._run_report(tenant_id, report, start_date, end_date)).rows
     
-    async def _query_agents_data(
+    async def _run_report(
         self,
         tenant_id: uuid.UUID,
         report: Dict[str, Any],
         start_date: date,
         end_date: date
-    ) -> List[Dict[str, Any]]:
-        """Query agents data based on report configuration."""
-        async with get_db_session() as session:
-            await set_tenant_context(session, str(tenant_id))
-            
-            # Get agent metrics
-            result = await session.execute(
-                select(AgentMetrics).where(
-                    and_(
-                        AgentMetrics.tenant_id == tenant_id,
-                        AgentMetrics.date >= start_date,
-                        AgentMetrics.date <= end_date
-                    )
-                )
-            )
-            metrics = result.scalars().all()
-            
-            # Format data
-            data = []
-            for metric in metrics:
-                row = {}
-                for col in report["columns"]:
-                    field = col["field"]
-                    row[field] = getattr(metric, field, None)
-                data.append(row)
-            
-            return data
-    
-    async def _query_analytics_data(
-        self,
-        tenant_id: uuid.UUID,
-        report: Dict[str, Any],
-        start_date: date,
-        end_date: date
-    ) -> List[Dict[str, Any]]:
-        """Query analytics data based on report configuration."""
-        async with get_db_session() as session:
-            await set_tenant_context(session, str(tenant_id))
-            
-            # Get call analytics
-            result = await session.execute(
-                select(CallAnalytics).where(
-                    and_(
-                        CallAnalytics.tenant_id == tenant_id,
-                        CallAnalytics.date >= start_date,
-                        CallAnalytics.date <= end_date
-                    )
-                )
-            )
-            analytics = result.scalars().all()
-            
-            # Format data
-            data = []
-            for analytic in analytics:
-                row = {}
-                for col in report["columns"]:
-                    field = col["field"]
-                    row[field] = getattr(analytic, field, None)
-                data.append(row)
-            
-            return data
-    
-    def _apply_filter(self, query, model, filter_config: Dict[str, Any]):
-        """Apply filter to query."""
-        field = getattr(model, filter_config["field"])
-        operator = filter_config["operator"]
-        value = filter_config["value"]
+    ) -> ReportResult:
+        """
+        Run a report definition in SQL, reusing materialized days.
         
-        if operator == "equals":
-            return query.where(field == value)
-        elif operator == "not_equals":
-            return query.where(field != value)
-        elif operator == "contains":
-            return query.where(field.contains(value))
-        elif operator == "greater_than":
-            return query.where(field > value)
-        elif operator == "less_than":
-            return query.where(field < value)
-        elif operator == "between":
-            value2 = filter_config.get("value2")
-            return query.where(and_(field >= value, field <= value2))
+        Projection, grouping and aggregation happen in the database; see
+        report_query_compiler for the fields each data source allows and
+        report_results for which reports are materialized per day.
         
-        return query
+        Args:
+            tenant_id: Tenant identifier
+            report: Report definition
+            start_date: First day of the report, inclusive
+            end_date: Last day of the report, inclusive
+            
+        Returns:
+            ReportResult with one dict per row, keyed by output column
+            
+        Raises:
+            ValueError: If the definition is invalid
+        """
+        compiled = report_query_compiler.compile(report)
+        return await self.materializer.run(tenant_id, compiled, start_date, end_date)
     
-    def _apply_sort(self, query, model, sort_config: Dict[str, Any]):
-        """Apply sort to query."""
-        field = getattr(model, sort_config["field"])
-        direction = sort_config["direction"]
-        
-        if direction == "desc":
-            return query.order_by(field.desc())
-        else:
-            return query.order_by(field.asc())
+    def _due_schedules(self, now: datetime) -> List[Dict[str, Any]]:
+        """Active schedules whose next run is due."""
+        return [
+            schedule for schedule in self._schedules.values()
+            if schedule["is_active"] and datetime.fromisoformat(schedule["next_run"]) <= now
+        ]
+    
+    @staticmethod
+    def _output_columns(report: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Report columns keyed by their result key."""
+        return [
+            {**column, "field": output_key(column)}
+            for column in report["columns"]
+        ]
     
     def _calculate_next_run(self, schedule_type: str, schedule_time: str) -> datetime:
         """Calculate next run time for scheduled report."""
@@ -673,25 +706,59 @@ class ReportBuilderService:
         
         return next_run
     
-    def _format_as_csv(self, data: List[Dict[str, Any]], columns: List[Dict[str, Any]]) -> bytes:
-        """Format data as CSV."""
-        import csv
-        import io
+    async def _render_file(
+        self,
+        output_format: str,
+        rows: List[Dict[str, Any]],
+        columns: List[Dict[str, Any]],
+        title: str,
+        subtitle: Optional[str] = None
+    ) -> str:
+        """
+        Render report rows to a temporary file off the event loop.
         
-        output = io.StringIO()
-        if data:
-            writer = csv.DictWriter(output, fieldnames=[col["field"] for col in columns])
-            writer.writeheader()
-            writer.writerows(data)
+        Rendering runs in the render process pool when one is configured,
+        otherwise in a worker thread.
         
-        return output.getvalue().encode()
-    
-    def _format_as_excel(self, data: List[Dict[str, Any]], columns: List[Dict[str, Any]]) -> bytes:
-        """Format data as Excel."""
-        # Simplified implementation - would use openpyxl in production
-        return self._format_as_csv(data, columns)
-    
-    def _format_as_pdf(self, data: List[Dict[str, Any]], report: Dict[str, Any]) -> bytes:
-        """Format data as PDF."""
-        # Simplified implementation - would use reportlab in production
-        return self._format_as_csv(data, report["columns"])
+        Args:
+            output_format: csv, excel or pdf
+            rows: Report rows
+            columns: Output columns
+            title: Report title
+            subtitle: Line shown after the title
+            
+        Returns:
+            Path of the rendered file; the caller removes it once sent
+        """
+        os.makedirs(settings.export_directory, exist_ok=True)
+        handle, file_path = tempfile.mkstemp(
+            prefix="report_",
+            suffix=f".{RENDERERS[output_format].extension}",
+            dir=settings.export_directory
+        )
+        os.close(handle)
+        
+        args = (output_format, rows, columns, file_path, title, subtitle)
+        started = time.perf_counter()
+        try:
+            if self._render_pool is not None:
+                await asyncio.get_running_loop().run_in_executor(self._render_pool, render_report, *args)
+            else:
+                await asyncio.to_thread(render_report, *args)
+        except BaseException:
+            os.remove(file_path)
+            raise
+        
+        self.logger.info(
+            "Report rendered",
+            output_format=output_format,
+            row_count=len(rows),
+            file_size=os.path.getsize(file_path),
+            duration_ms=round((time.perf_counter() - started) * 1000, 1)
+        )
+        
+        return file_path
+
+
+# Global service instance
+report_builder_service = ReportBuilderService()
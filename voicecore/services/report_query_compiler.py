@@ -0,0 +1,493 @@
+"""
+Report query compiler for the custom report builder.
+
+Turns a report definition (data source, columns, filters, sorts,
+group_by, limit) into one SQL statement that selects only the requested
+columns and does grouping and aggregation in the database. Fields are
+resolved against a per-source whitelist, so user input never reaches
+SQL other than as bound values. The date range is a half-open range on
+``created_at`` so the index on it is usable.
+
+Compiled statements are cached per report definition; the tenant and
+date range are bind parameters supplied at execution time.
+
+Grouped reports whose result can be assembled from per-day results also
+get a partitioned statement, which returns each day's groups separately
+so closed days can be materialized and reused (see report_results).
+That holds when the report groups by date (each day's groups are final)
+or when every aggregate is additive across days (counts, sums, min and
+max); other reports always run over the whole range.
+"""
+
+import enum
+import json
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from sqlalchemy import Date, Float, Numeric, and_, bindparam, case, extract, func, select
+from sqlalchemy.sql import sqltypes
+
+from voicecore.models.agent import Agent
+from voicecore.models.call import Call, CallStatus
+from voicecore.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+calls = Call.__table__
+agents = Agent.__table__
+
+
+@dataclass(frozen=True)
+class ReportField:
+    """A field a report may select, filter, sort or group on."""
+    expression: Any
+    numeric: bool = False
+    temporal: bool = False
+    measure: bool = False
+    joins_agent: bool = False
+
+
+def _dimension(column, **kwargs) -> ReportField:
+    column_type = column.type
+    return ReportField(
+        column,
+        numeric=isinstance(column_type, (sqltypes.Integer, Numeric, Float)),
+        temporal=isinstance(column_type, (sqltypes.DateTime, sqltypes.Date)),
+        **kwargs
+    )
+
+
+def _ratio(numerator, denominator):
+    return func.coalesce(
+        numerator.cast(Float) / func.nullif(denominator, 0),
+        0.0,
+        type_=Float
+    )
+
+
+def _count_where(condition):
+    return func.sum(case((condition, 1), else_=0))
+
+
+_answered = calls.c.status == CallStatus.COMPLETED
+_missed = calls.c.status.in_([CallStatus.NO_ANSWER, CallStatus.BUSY, CallStatus.CANCELLED])
+_ai_handled = calls.c.ai_handled.is_(True)
+_ai_resolved = and_(_ai_handled, _answered, calls.c.agent_id.is_(None))
+
+FIELDS: Dict[str, ReportField] = {
+    # Call columns
+    **{
+        name: _dimension(calls.c[name])
+        for name in (
+            "id", "from_number", "to_number", "caller_name", "agent_id", "department_id",
+            "status", "direction", "call_type", "created_at", "started_at", "ended_at",
+            "duration", "talk_time", "wait_time", "ai_handled", "ai_duration",
+            "call_quality_score", "customer_satisfaction", "sentiment_score", "spam_score",
+            "is_vip", "is_blocked", "escalation_triggered", "detected_language",
+            "resolution_status", "priority_level", "cost_cents",
+        )
+    },
+    # Derived dimensions
+    "date": ReportField(func.date(calls.c.created_at, type_=Date), temporal=True),
+    "hour": ReportField(extract("hour", calls.c.created_at), numeric=True),
+    "agent_name": ReportField(agents.c.name, joins_agent=True),
+    # Measures
+    "total_calls": ReportField(func.count(calls.c.id), numeric=True, measure=True),
+    "answered_calls": ReportField(_count_where(_answered), numeric=True, measure=True),
+    "missed_calls": ReportField(_count_where(_missed), numeric=True, measure=True),
+    "answer_rate": ReportField(
+        _ratio(_count_where(_answered), func.count(calls.c.id)), numeric=True, measure=True
+    ),
+    "ai_handled_calls": ReportField(_count_where(_ai_handled), numeric=True, measure=True),
+    "ai_resolved": ReportField(_count_where(_ai_resolved), numeric=True, measure=True),
+    "resolution_rate": ReportField(
+        _ratio(_count_where(_ai_resolved), _count_where(_ai_handled)), numeric=True, measure=True
+    ),
+    "calls_handled": ReportField(func.count(calls.c.agent_id), numeric=True, measure=True),
+    "avg_call_duration": ReportField(
+        func.avg(calls.c.duration, type_=Float), numeric=True, measure=True
+    ),
+    "satisfaction_score": ReportField(
+        func.avg(calls.c.customer_satisfaction, type_=Float), numeric=True, measure=True
+    ),
+    "total_cost": ReportField(
+        func.coalesce(func.sum(calls.c.cost_cents), 0) / 100.0, numeric=True, measure=True
+    ),
+}
+
+MEASURES = frozenset(name for name, report_field in FIELDS.items() if report_field.measure)
+
+
+@dataclass(frozen=True)
+class DataSource:
+    """Fields a data source exposes and the rows it covers."""
+    fields: FrozenSet[str]
+    condition: Any = None
+
+
+DATA_SOURCES: Dict[str, DataSource] = {
+    "calls": DataSource(frozenset(FIELDS)),
+    "agents": DataSource(
+        frozenset({"agent_id", "agent_name", "department_id", "date", "status", "direction", "call_type"})
+        | MEASURES,
+        calls.c.agent_id.isnot(None)
+    ),
+    "analytics": DataSource(
+        frozenset({
+            "date", "hour", "department_id", "status", "direction", "call_type", "detected_language",
+        }) | MEASURES
+    ),
+}
+
+# Measures whose per-day values add up to the value over the whole range
+ADDITIVE_MEASURES = frozenset({
+    "total_calls", "answered_calls", "missed_calls", "ai_handled_calls",
+    "ai_resolved", "calls_handled", "total_cost",
+})
+
+# How per-day values of an aggregation combine across days
+MERGE_AGGREGATIONS = {"count": "sum", "sum": "sum", "min": "min", "max": "max"}
+
+PARTITION_KEY = "partition_date"
+
+PERCENTILES = {"median": 0.5, "p50": 0.5, "p75": 0.75, "p90": 0.9, "p95": 0.95, "p99": 0.99}
+
+AGGREGATIONS = frozenset({"count", "count_distinct", "sum", "avg", "min", "max"}) | frozenset(PERCENTILES)
+
+FILTER_OPERATORS = frozenset({
+    "equals", "not_equals", "contains", "greater_than", "less_than", "between", "in",
+})
+
+
+@dataclass
+class ReportPartitioning:
+    """
+    How to assemble a report from per-day results.
+
+    ``statement`` returns the report's groups per day, with the day in a
+    leading ``partition_date`` column and no ordering or limit. With
+    ``merge`` unset, the days' rows are concatenated; otherwise rows with
+    equal group keys (``merge`` value None) are combined column by
+    column with "sum", "min" or "max". ``order`` and ``limit`` are then
+    applied to the assembled rows.
+    """
+    statement: Any
+    merge: Optional[Dict[str, Optional[str]]]
+    order: List[Tuple[str, bool]]
+    limit: Optional[int] = None
+
+
+@dataclass
+class CompiledReport:
+    """A compiled report statement and its output columns, in order."""
+    statement: Any
+    keys: List[str]
+    definition_hash: str
+    grouped: bool = False
+    fields: List[str] = field(default_factory=list)
+    partitioning: Optional[ReportPartitioning] = None
+
+
+def definition_hash(report: Dict[str, Any]) -> str:
+    """Stable hash of the parts of a report definition that shape its query."""
+    definition = {
+        "data_source": report.get("data_source", "calls"),
+        "columns": [
+            {"field": column["field"], "aggregation": column.get("aggregation")}
+            for column in report.get("columns", [])
+        ],
+        "filters": report.get("filters") or [],
+        "sorts": report.get("sorts") or [],
+        "group_by": report.get("group_by") or [],
+        "limit": report.get("limit"),
+    }
+    encoded = json.dumps(definition, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def date_range_params(start_date: date, end_date: date) -> Dict[str, datetime]:
+    """Bind parameters for an inclusive date range, as a half-open timestamp range."""
+    return {
+        "range_start": datetime.combine(start_date, time.min),
+        "range_end": datetime.combine(end_date + timedelta(days=1), time.min),
+    }
+
+
+def output_key(column: Dict[str, Any]) -> str:
+    """Result key of a report column."""
+    aggregation = column.get("aggregation")
+    return f"{column['field']}_{aggregation}" if aggregation else column["field"]
+
+
+class ReportQueryCompiler:
+    """
+    Compiles report definitions into SQL statements, with an LRU cache.
+
+    Args:
+        max_cached: Compiled statements kept
+    """
+
+    def __init__(self, max_cached: int = 512):
+        self.max_cached = max_cached
+        self._cache: "OrderedDict[str, CompiledReport]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def compile(self, report: Dict[str, Any]) -> CompiledReport:
+        """
+        Compile a report definition, reusing a cached statement if possible.
+
+        The statement takes ``tenant_id``, ``range_start`` and
+        ``range_end`` bind parameters (see ``date_range_params``).
+
+        Raises:
+            ValueError: If the definition uses unknown fields, operators
+                or aggregations, or an invalid grouping
+        """
+        key = definition_hash(report)
+        compiled = self._cache.get(key)
+        if compiled is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return compiled
+
+        self.misses += 1
+        compiled = self._build(report, key)
+        self._cache[key] = compiled
+        if len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+        return compiled
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def _build(self, report: Dict[str, Any], key: str) -> CompiledReport:
+        source_name = report.get("data_source", "calls")
+        source = DATA_SOURCES.get(source_name)
+        if source is None:
+            raise ValueError(f"Unsupported data source: {source_name}")
+
+        columns = report.get("columns") or []
+        if not columns:
+            raise ValueError("Report has no columns")
+
+        used_fields = set()
+
+        def resolve(name: str) -> ReportField:
+            if name not in source.fields:
+                raise ValueError(f"Unknown field for {source_name} reports: {name}")
+            used_fields.add(name)
+            return FIELDS[name]
+
+        # Projection
+        selected = []
+        keys = []
+        aggregated = False
+        for column in columns:
+            report_field = resolve(column["field"])
+            aggregation = column.get("aggregation")
+            expression = report_field.expression
+            if aggregation:
+                expression = self._aggregate(column["field"], report_field, aggregation)
+            aggregated = aggregated or bool(aggregation) or report_field.measure
+            name = output_key(column)
+            if name in keys:
+                raise ValueError(f"Duplicate report column: {name}")
+            keys.append(name)
+            selected.append(expression.label(name))
+
+        # Grouping: explicit group_by, else every plain column when any is aggregated
+        plain = [
+            column["field"] for column in columns
+            if not column.get("aggregation") and not FIELDS[column["field"]].measure
+        ]
+        group_by = report.get("group_by") or []
+        for name in group_by:
+            if resolve(name).measure:
+                raise ValueError(f"Cannot group by a measure: {name}")
+        if group_by:
+            ungrouped = [name for name in plain if name not in group_by]
+            if ungrouped:
+                raise ValueError(f"Columns must be grouped or aggregated: {', '.join(ungrouped)}")
+        elif aggregated:
+            group_by = plain
+        grouped = aggregated or bool(group_by)
+
+        # Filters
+        conditions = [
+            calls.c.tenant_id == bindparam("tenant_id"),
+            calls.c.created_at >= bindparam("range_start", type_=calls.c.created_at.type),
+            calls.c.created_at < bindparam("range_end", type_=calls.c.created_at.type),
+        ]
+        if source.condition is not None:
+            conditions.append(source.condition)
+        having = []
+        for filter_config in report.get("filters") or []:
+            report_field = resolve(filter_config["field"])
+            condition = self._filter(report_field, filter_config)
+            (having if report_field.measure else conditions).append(condition)
+
+        from_clause = calls
+        if any(FIELDS[name].joins_agent for name in used_fields):
+            from_clause = calls.outerjoin(agents, calls.c.agent_id == agents.c.id)
+
+        statement = select(*selected).select_from(from_clause).where(*conditions)
+        if group_by:
+            statement = statement.group_by(*(FIELDS[name].expression for name in group_by))
+        if having:
+            statement = statement.having(*having)
+
+        # Sorts: output columns by label; other fields only on ungrouped reports
+        sorts = report.get("sorts") or []
+        order_by = []
+        for sort_config in sorts:
+            name = sort_config["field"]
+            if name in keys:
+                expression = selected[keys.index(name)]
+            elif not grouped:
+                expression = resolve(name).expression
+            else:
+                raise ValueError(f"Grouped reports can only sort by their columns: {name}")
+            descending = sort_config.get("direction", "asc") == "desc"
+            order_by.append(expression.desc() if descending else expression.asc())
+        if not order_by and group_by:
+            order_by = [FIELDS[name].expression for name in group_by]
+        if order_by:
+            statement = statement.order_by(*order_by)
+
+        limit = int(report["limit"]) if report.get("limit") else None
+        if limit:
+            statement = statement.limit(limit)
+
+        partitioning = None
+        if grouped:
+            partitioning = self._partitioning(
+                columns, keys, selected, group_by, sorts, having, from_clause, conditions, limit
+            )
+
+        logger.debug(
+            "Report query compiled",
+            data_source=source_name,
+            definition_hash=key,
+            grouped=grouped,
+            partitioned=partitioning is not None
+        )
+        return CompiledReport(statement, keys, key, grouped, sorted(used_fields), partitioning)
+
+    def _partitioning(
+        self,
+        columns: List[Dict[str, Any]],
+        keys: List[str],
+        selected: List[Any],
+        group_by: List[str],
+        sorts: List[Dict[str, Any]],
+        having: List[Any],
+        from_clause: Any,
+        conditions: List[Any],
+        limit: Optional[int]
+    ) -> Optional[ReportPartitioning]:
+        """Per-day form of a grouped report, or None if days cannot be combined."""
+        # Group keys must be in the output so days can be matched and sorted
+        if any(name not in keys for name in group_by):
+            return None
+
+        merge = None
+        if "date" not in group_by:
+            if having:
+                return None
+            merge = {}
+            for column, name in zip(columns, keys):
+                aggregation = column.get("aggregation")
+                if name in group_by:
+                    merge[name] = None
+                elif aggregation in MERGE_AGGREGATIONS:
+                    merge[name] = MERGE_AGGREGATIONS[aggregation]
+                elif not aggregation and column["field"] in ADDITIVE_MEASURES:
+                    merge[name] = "sum"
+                else:
+                    return None
+
+        day = FIELDS["date"].expression
+        statement = (
+            select(day.label(PARTITION_KEY), *selected)
+            .select_from(from_clause)
+            .where(*conditions)
+            .group_by(*([] if "date" in group_by else [day]), *(FIELDS[name].expression for name in group_by))
+        )
+        if having:
+            statement = statement.having(*having)
+
+        order = [
+            (sort_config["field"], sort_config.get("direction", "asc") == "desc")
+            for sort_config in sorts
+        ] or [(name, False) for name in group_by]
+        return ReportPartitioning(statement, merge, order, limit)
+
+    def _aggregate(self, name: str, report_field: ReportField, aggregation: str):
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unsupported aggregation: {aggregation}")
+        if report_field.measure:
+            raise ValueError(f"Field is already aggregated: {name}")
+
+        expression = report_field.expression
+        if aggregation == "count":
+            return func.count(expression)
+        if aggregation == "count_distinct":
+            return func.count(expression.distinct())
+        if aggregation in ("min", "max"):
+            if not (report_field.numeric or report_field.temporal):
+                raise ValueError(f"{aggregation} needs a numeric or date field: {name}")
+            return getattr(func, aggregation)(expression)
+        if not report_field.numeric:
+            raise ValueError(f"{aggregation} needs a numeric field: {name}")
+        if aggregation == "sum":
+            return func.sum(expression)
+        if aggregation == "avg":
+            return func.avg(expression, type_=Float)
+        return func.percentile_cont(PERCENTILES[aggregation]).within_group(expression.asc())
+
+    def _filter(self, report_field: ReportField, filter_config: Dict[str, Any]):
+        operator = filter_config["operator"]
+        if operator not in FILTER_OPERATORS:
+            raise ValueError(f"Unsupported filter operator: {operator}")
+
+        expression = report_field.expression
+        value = self._coerce(expression, filter_config.get("value"))
+        if operator == "equals":
+            return expression == value
+        if operator == "not_equals":
+            return expression != value
+        if operator == "contains":
+            return expression.contains(str(filter_config["value"]), autoescape=True)
+        if operator == "greater_than":
+            return expression > value
+        if operator == "less_than":
+            return expression < value
+        if operator == "in":
+            return expression.in_([self._coerce(expression, item) for item in filter_config["value"]])
+        value2 = self._coerce(expression, filter_config.get("value2"))
+        return and_(expression >= value, expression <= value2)
+
+    @staticmethod
+    def _coerce(expression, value: Any) -> Any:
+        """Convert a JSON filter value to the field's Python type."""
+        if value is None or isinstance(value, (list, tuple)):
+            return value
+        column_type = expression.type
+        enum_class = getattr(column_type, "enum_class", None)
+        if enum_class is not None and not isinstance(value, enum.Enum):
+            return enum_class(value)
+        if isinstance(value, str):
+            if isinstance(column_type, sqltypes.DateTime):
+                return datetime.fromisoformat(value)
+            if isinstance(column_type, sqltypes.Date):
+                return date.fromisoformat(value)
+        return value
+
+
+# Shared compiler so the cache outlives per-request service instances
+report_query_compiler = ReportQueryCompiler()
@@ -0,0 +1,372 @@
+"""
+Streaming file renderers for report output.
+
+Each renderer writes a report's rows to a file as it iterates them, so
+memory holds about one row (one page for PDF) whatever the report size:
+
+- CSV is written straight to the file.
+- XLSX uses openpyxl's write-only worksheets, which stream rows to disk;
+  reports past Excel's row limit continue on further sheets.
+- PDF is written object by object with a small built-in writer. Each
+  page's content stream is emitted once the page fills up, and the page
+  tree and cross-reference table are written at the end.
+
+Renderers are synchronous; ReportBuilderService runs them in a worker
+thread or process.
+"""
+
+import csv
+import zlib
+from datetime import date, datetime
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Sequence
+
+try:
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+    from openpyxl.styles import Font
+    from openpyxl.utils import get_column_letter
+except ImportError:  # pragma: no cover - optional dependency
+    Workbook = None
+
+
+XLSX_MAX_ROWS = 1048576
+
+XLSX_NUMBER_FORMATS = {
+    "percentage": "0.0%",
+    "currency": "$#,##0.00",
+    "duration": "#,##0",
+    "rating": "0.00",
+}
+
+
+def _label(column: Dict[str, Any]) -> str:
+    return column.get("label") or column["field"]
+
+
+def _is_number(column: Dict[str, Any]) -> bool:
+    return column.get("type") == "number" or column.get("format") in XLSX_NUMBER_FORMATS
+
+
+def format_value(column: Dict[str, Any], value: Any) -> str:
+    """Display text for a value, following the column's format."""
+    if value is None:
+        return ""
+    column_format = column.get("format")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if column_format == "percentage":
+            return f"{value:.1%}"
+        if column_format == "currency":
+            return f"${value:,.2f}"
+        if column_format == "duration":
+            minutes, seconds = divmod(int(value), 60)
+            return f"{minutes}:{seconds:02d}"
+        if column_format == "rating" or isinstance(value, float):
+            return f"{value:,.2f}"
+        return f"{value:,}"
+    return str(value)
+
+
+class ReportRenderer:
+    """
+    Base class for report renderers.
+
+    Args:
+        columns: Output columns with ``field`` and optional ``label``,
+            ``type`` and ``format``
+        title: Report title, for formats that show one
+        subtitle: Line shown after the title, such as the report period
+    """
+
+    extension = ""
+    media_type = "application/octet-stream"
+
+    def __init__(self, columns: Sequence[Dict[str, Any]], title: str = "Report", subtitle: Optional[str] = None):
+        self.columns = list(columns)
+        self.fields = [column["field"] for column in self.columns]
+        self.title = title
+        self.subtitle = subtitle
+
+    def render(self, rows: Iterable[Dict[str, Any]], path: str) -> int:
+        """
+        Write rows to a file.
+
+        Returns:
+            Number of rows written
+        """
+        raise NotImplementedError
+
+
+class CSVReportRenderer(ReportRenderer):
+    """CSV with one header line of field names."""
+
+    extension = "csv"
+    media_type = "text/csv"
+
+    def render(self, rows: Iterable[Dict[str, Any]], path: str) -> int:
+        count = 0
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(self.fields)
+            for row in rows:
+                writer.writerow([row.get(field) for field in self.fields])
+                count += 1
+        return count
+
+
+class XLSXReportRenderer(ReportRenderer):
+    """XLSX written through openpyxl write-only worksheets."""
+
+    extension = "xlsx"
+    media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+    def __init__(self, columns: Sequence[Dict[str, Any]], title: str = "Report", subtitle: Optional[str] = None):
+        if Workbook is None:
+            raise RuntimeError("openpyxl is required for Excel reports")
+        super().__init__(columns, title, subtitle)
+        self._bold = Font(bold=True)
+        self._converters = [self._converter(column) for column in self.columns]
+
+    def render(self, rows: Iterable[Dict[str, Any]], path: str) -> int:
+        workbook = Workbook(write_only=True)
+        sheet = None
+        sheet_rows = XLSX_MAX_ROWS
+        count = 0
+
+        for row in rows:
+            if sheet_rows == XLSX_MAX_ROWS:
+                sheet = self._new_sheet(workbook, len(workbook.worksheets) + 1)
+                sheet_rows = 1
+            sheet.append([
+                convert(sheet, row.get(field))
+                for convert, field in zip(self._converters, self.fields)
+            ])
+            sheet_rows += 1
+            count += 1
+
+        if sheet is None:
+            self._new_sheet(workbook, 1)
+        workbook.save(path)
+        return count
+
+    def _new_sheet(self, workbook, number: int):
+        # Sheet titles are limited to 31 characters and a few symbols
+        title = "".join(ch for ch in self.title if ch not in "[]:*?/\\")[:25] or "Report"
+        sheet = workbook.create_sheet(title if number == 1 else f"{title} ({number})")
+        for index, column in enumerate(self.columns, start=1):
+            sheet.column_dimensions[get_column_letter(index)].width = max(10, min(len(_label(column)) + 4, 40))
+        sheet.freeze_panes = "A2"
+
+        header = []
+        for column in self.columns:
+            cell = WriteOnlyCell(sheet, value=_label(column))
+            cell.font = self._bold
+            header.append(cell)
+        sheet.append(header)
+        return sheet
+
+    @staticmethod
+    def _converter(column: Dict[str, Any]) -> Callable[[Any, Any], Any]:
+        """Per-column value conversion; formatted columns get styled cells."""
+        number_format = XLSX_NUMBER_FORMATS.get(column.get("format"))
+        is_date = column.get("type") == "date"
+
+        def convert(sheet, value):
+            if isinstance(value, str):
+                if is_date:
+                    try:
+                        value = (date if len(value) == 10 else datetime).fromisoformat(value)
+                    except ValueError:
+                        pass
+                else:
+                    return ILLEGAL_CHARACTERS_RE.sub("", value)
+            if isinstance(value, datetime) and value.tzinfo is not None:
+                # Excel has no time zones
+                value = value.replace(tzinfo=None)
+            if number_format and isinstance(value, (int, float)):
+                cell = WriteOnlyCell(sheet, value=value)
+                cell.number_format = number_format
+                return cell
+            return value
+
+        return convert
+
+
+class _PDFFile:
+    """Writes numbered PDF objects and records their offsets."""
+
+    def __init__(self, file: BinaryIO):
+        self._file = file
+        self._position = 0
+        self._offsets: Dict[int, int] = {}
+        self._next = 1
+
+    def reserve(self) -> int:
+        number = self._next
+        self._next += 1
+        return number
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+        self._position += len(data)
+
+    def object(self, number: int, body: str) -> None:
+        self._offsets[number] = self._position
+        self.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+
+    def stream(self, number: int, data: bytes) -> None:
+        self._offsets[number] = self._position
+        self.write(f"{number} 0 obj\n<< /Length {len(data)} /Filter /FlateDecode >>\nstream\n".encode("latin-1"))
+        self.write(data)
+        self.write(b"\nendstream\nendobj\n")
+
+    def finish(self, root: int) -> None:
+        xref = self._position
+        lines = [f"xref\n0 {self._next}\n", "0000000000 65535 f \n"]
+        lines.extend(
+            f"{self._offsets[number]:010d} 00000 n \n" if number in self._offsets
+            else "0000000000 65535 f \n"
+            for number in range(1, self._next)
+        )
+        lines.append(f"trailer\n<< /Size {self._next} /Root {root} 0 R >>\nstartxref\n{xref}\n%%EOF\n")
+        self.write("".join(lines).encode("latin-1"))
+
+
+def _pdf_text(text: str) -> str:
+    text = text.encode("cp1252", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+class PDFReportRenderer(ReportRenderer):
+    """
+    Paginated PDF table in landscape Letter.
+
+    Rows are set in Courier so columns line up as fixed-width text; cells
+    longer than their column are truncated. The title and column header
+    repeat on every page.
+    """
+
+    extension = "pdf"
+    media_type = "application/pdf"
+
+    page_width = 792
+    page_height = 612
+    margin = 36
+    font_size = 7.5
+    row_height = 10.5
+    header_size = 12
+
+    def __init__(self, columns: Sequence[Dict[str, Any]], title: str = "Report", subtitle: Optional[str] = None):
+        super().__init__(columns, title, subtitle)
+        self.widths = self._column_widths()
+        self.table_top = self.page_height - self.margin - 2.2 * self.header_size
+        self.rows_per_page = int((self.table_top - self.margin - 2 * self.row_height) // self.row_height)
+
+    def render(self, rows: Iterable[Dict[str, Any]], path: str) -> int:
+        count = 0
+        with open(path, "wb") as file:
+            pdf = _PDFFile(file)
+            catalog, pages_root, title_font, body_font = (pdf.reserve() for _ in range(4))
+            pdf.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+            pdf.object(title_font, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+            pdf.object(body_font, "<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>")
+            resources = f"<< /Font << /F1 {title_font} 0 R /F2 {body_font} 0 R >> >>"
+
+            pages: List[int] = []
+            page_rows: List[str] = []
+
+            def emit_page():
+                content, page = pdf.reserve(), pdf.reserve()
+                pdf.stream(content, zlib.compress(self._page_content(page_rows, len(pages) + 1), 6))
+                pdf.object(page, (
+                    f"<< /Type /Page /Parent {pages_root} 0 R /MediaBox [0 0 {self.page_width} {self.page_height}] "
+                    f"/Resources {resources} /Contents {content} 0 R >>"
+                ))
+                pages.append(page)
+                page_rows.clear()
+
+            for row in rows:
+                page_rows.append(self._line([row.get(field) for field in self.fields]))
+                count += 1
+                if len(page_rows) == self.rows_per_page:
+                    emit_page()
+            if page_rows or not pages:
+                emit_page()
+
+            kids = " ".join(f"{page} 0 R" for page in pages)
+            pdf.object(pages_root, f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>")
+            pdf.object(catalog, f"<< /Type /Catalog /Pages {pages_root} 0 R >>")
+            pdf.finish(catalog)
+        return count
+
+    def _column_widths(self) -> List[int]:
+        """Column widths in characters; text columns get twice the share of numbers."""
+        characters = int((self.page_width - 2 * self.margin) / (0.6 * self.font_size))
+        weights = [1 if _is_number(column) else 2 for column in self.columns] or [1]
+        gaps = len(weights) - 1
+        unit = (characters - gaps) / sum(weights)
+        return [max(4, int(unit * weight)) for weight in weights]
+
+    def _line(self, values: Sequence[Any]) -> str:
+        cells = []
+        for column, width, value in zip(self.columns, self.widths, values):
+            text = format_value(column, value).replace("\n", " ")
+            if len(text) > width:
+                text = text[:width - 1] + "…"
+            cells.append(text.rjust(width) if _is_number(column) else text.ljust(width))
+        return " ".join(cells).rstrip()
+
+    def _page_content(self, lines: Sequence[str], number: int) -> bytes:
+        left = self.margin
+        title = self.title if not self.subtitle else f"{self.title}  -  {self.subtitle}"
+        header_y = self.table_top
+        rule_y = header_y - 0.35 * self.row_height
+        header = self._line([_label(column) for column in self.columns])
+        parts = [
+            f"BT /F1 {self.header_size} Tf {left} {self.page_height - self.margin - self.header_size} Td ({_pdf_text(title)}) Tj ET",
+            f"BT /F1 {self.font_size} Tf {left} {header_y} Td ({_pdf_text(header)}) Tj ET",
+            f"0.5 w {left} {rule_y:.2f} m {self.page_width - left} {rule_y:.2f} l S",
+            f"BT /F2 {self.font_size} Tf {self.row_height} TL {left} {header_y - self.row_height * 1.2:.2f} Td",
+        ]
+        parts.extend(f"({_pdf_text(line)}) '" if index else f"({_pdf_text(line)}) Tj" for index, line in enumerate(lines))
+        parts.append("ET")
+        parts.append(f"BT /F1 7 Tf {self.page_width - left - 30} {self.margin / 2} Td (Page {number}) Tj ET")
+        return "\n".join(parts).encode("latin-1")
+
+
+RENDERERS = {
+    "csv": CSVReportRenderer,
+    "excel": XLSXReportRenderer,
+    "pdf": PDFReportRenderer,
+}
+
+
+def create_renderer(
+    format_name: str,
+    columns: Sequence[Dict[str, Any]],
+    title: str = "Report",
+    subtitle: Optional[str] = None
+) -> ReportRenderer:
+    """Create the renderer for an output format."""
+    try:
+        renderer_class = RENDERERS[format_name]
+    except KeyError:
+        raise ValueError(f"Unsupported output format: {format_name}")
+    return renderer_class(columns, title, subtitle)
+
+
+def render_report(
+    format_name: str,
+    rows: Iterable[Dict[str, Any]],
+    columns: Sequence[Dict[str, Any]],
+    path: str,
+    title: str = "Report",
+    subtitle: Optional[str] = None
+) -> int:
+    """
+    Render rows to a file; a module-level function so process pools can run it.
+
+    Returns:
+        Number of rows written
+    """
+    return create_renderer(format_name, columns, title, subtitle).render(rows, path)
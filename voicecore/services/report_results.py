@@ -0,0 +1,507 @@
+"""
+Materialized report results and the scheduled report worker pool.
+
+Partitionable reports (see report_query_compiler) are computed one day
+at a time. Days that have closed are stored in
+``report_result_partitions`` under the report's definition hash and
+reused by later runs, so a rolling "last 30 days" report only computes
+the days it has not seen. Open days are always computed.
+
+A stored day is invalidated when calls in it change after it was
+computed: each run looks up, through the calls (tenant_id, updated_at)
+index, the days whose calls were updated since the oldest partition it
+is about to reuse. ``late_data_margin`` widens that window to cover
+transactions still open, or replicas still behind, when the partition
+was computed.
+"""
+
+import time
+import uuid
+import asyncio
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import Date, delete, func, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from voicecore.database import get_db_session, get_read_session, set_tenant_context
+from voicecore.models.report_result import ReportResultPartition, ReportRun
+from voicecore.services.export_encoders import export_value
+from voicecore.services.report_query_compiler import (
+    PARTITION_KEY,
+    CompiledReport,
+    ReportPartitioning,
+    calls,
+    date_range_params,
+)
+from voicecore.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+partitions_table = ReportResultPartition.__table__
+runs_table = ReportRun.__table__
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _days(start_date: date, end_date: date) -> List[date]:
+    return [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+
+
+def _runs(days: List[date]) -> List[List[date]]:
+    """Split sorted days into runs of consecutive days."""
+    runs: List[List[date]] = []
+    for day in days:
+        if runs and (day - runs[-1][-1]).days == 1:
+            runs[-1].append(day)
+        else:
+            runs.append([day])
+    return runs
+
+
+def _merge_value(how: str, current: Any, value: Any) -> Any:
+    if current is None:
+        return value
+    if value is None:
+        return current
+    if how == "sum":
+        if isinstance(current, float) or isinstance(value, float):
+            # Money columns arrive as floats; add them as the database
+            # adds numerics so merged totals match a whole-range query
+            return float(Decimal(str(current)) + Decimal(str(value)))
+        return current + value
+    if how == "min":
+        return min(current, value)
+    return max(current, value)
+
+
+def assemble_rows(
+    partitioning: ReportPartitioning,
+    days: Iterable[List[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """
+    Combine per-day rows into the report's result.
+
+    Rows are concatenated or merged by group key as the partitioning
+    says, then sorted and limited. NULLs sort last ascending and first
+    descending, as in PostgreSQL.
+    """
+    if partitioning.merge is None:
+        rows = [dict(row) for day_rows in days for row in day_rows]
+    else:
+        group_keys = [key for key, how in partitioning.merge.items() if how is None]
+        merged: Dict[tuple, Dict[str, Any]] = {}
+        for day_rows in days:
+            for row in day_rows:
+                group = tuple(row.get(key) for key in group_keys)
+                current = merged.get(group)
+                if current is None:
+                    merged[group] = dict(row)
+                    continue
+                for key, how in partitioning.merge.items():
+                    if how is not None:
+                        current[key] = _merge_value(how, current.get(key), row.get(key))
+        rows = list(merged.values())
+
+    for key, descending in reversed(partitioning.order):
+        rows.sort(key=lambda row: (row.get(key) is None, row.get(key)), reverse=descending)
+
+    if partitioning.limit:
+        rows = rows[:partitioning.limit]
+    return rows
+
+
+@dataclass
+class ReportResult:
+    """Rows of a report run and how many days came from stored partitions."""
+    rows: List[Dict[str, Any]]
+    partitions_reused: int = 0
+    partitions_computed: int = 0
+
+
+class ReportResultStore:
+    """Persistence for report result partitions and scheduled runs."""
+
+    async def load_partitions(
+        self,
+        tenant_id: uuid.UUID,
+        definition_hash: str,
+        first_day: date,
+        last_day: date
+    ) -> Dict[date, Dict[str, Any]]:
+        """Stored partitions of a definition between two days, by day."""
+        query = select(
+            partitions_table.c.partition_date,
+            partitions_table.c.rows,
+            partitions_table.c.computed_at,
+        ).where(
+            partitions_table.c.tenant_id == tenant_id,
+            partitions_table.c.definition_hash == definition_hash,
+            partitions_table.c.partition_date >= first_day,
+            partitions_table.c.partition_date <= last_day
+        )
+        async with get_db_session() as session:
+            await set_tenant_context(session, tenant_id)
+            result = await session.execute(query)
+            return {
+                row.partition_date: {"rows": row.rows, "computed_at": _naive_utc(row.computed_at)}
+                for row in result
+            }
+
+    async def save_partitions(
+        self,
+        tenant_id: uuid.UUID,
+        definition_hash: str,
+        partitions: Dict[date, List[Dict[str, Any]]],
+        computed_at: datetime
+    ) -> None:
+        """Replace the stored partitions of the given days."""
+        if not partitions:
+            return
+        now = datetime.utcnow()
+        try:
+            async with get_db_session(independent=True) as session:
+                await set_tenant_context(session, tenant_id)
+                await session.execute(
+                    delete(partitions_table).where(
+                        partitions_table.c.tenant_id == tenant_id,
+                        partitions_table.c.definition_hash == definition_hash,
+                        partitions_table.c.partition_date.in_(list(partitions))
+                    )
+                )
+                await session.execute(insert(partitions_table), [
+                    {
+                        "id": uuid.uuid4(),
+                        "tenant_id": tenant_id,
+                        "definition_hash": definition_hash,
+                        "partition_date": day,
+                        "rows": rows,
+                        "row_count": len(rows),
+                        "computed_at": computed_at,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for day, rows in partitions.items()
+                ])
+        except IntegrityError:
+            # A concurrent run stored the same days first
+            logger.info(
+                "Report partitions already stored",
+                tenant_id=str(tenant_id),
+                definition_hash=definition_hash
+            )
+
+    async def invalidate(
+        self,
+        tenant_id: uuid.UUID,
+        first_day: Optional[date] = None,
+        last_day: Optional[date] = None
+    ) -> int:
+        """
+        Drop a tenant's stored partitions, optionally only between two days.
+
+        For changes the updated_at check cannot see, such as deleted
+        calls or bulk imports that set updated_at themselves.
+
+        Returns:
+            Number of partitions dropped
+        """
+        statement = delete(partitions_table).where(partitions_table.c.tenant_id == tenant_id)
+        if first_day is not None:
+            statement = statement.where(partitions_table.c.partition_date >= first_day)
+        if last_day is not None:
+            statement = statement.where(partitions_table.c.partition_date <= last_day)
+        async with get_db_session(independent=True) as session:
+            await set_tenant_context(session, tenant_id)
+            return (await session.execute(statement)).rowcount
+
+    async def save_run(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Store the outcome of a scheduled run."""
+        now = datetime.utcnow()
+        row = {"id": uuid.uuid4(), "created_at": now, "updated_at": now, **values}
+        async with get_db_session(independent=True) as session:
+            await set_tenant_context(session, values["tenant_id"])
+            await session.execute(insert(runs_table).values(row))
+        return row
+
+    async def latest_run(self, tenant_id: uuid.UUID, schedule_id: str) -> Optional[Dict[str, Any]]:
+        """Most recent run of a schedule."""
+        query = (
+            select(runs_table)
+            .where(runs_table.c.tenant_id == tenant_id, runs_table.c.schedule_id == schedule_id)
+            .order_by(runs_table.c.created_at.desc())
+            .limit(1)
+        )
+        async with get_db_session() as session:
+            await set_tenant_context(session, tenant_id)
+            row = (await session.execute(query)).mappings().first()
+        return dict(row) if row else None
+
+
+class ReportMaterializer:
+    """
+    Runs compiled reports, reusing stored partitions for closed days.
+
+    Args:
+        store: Partition store
+        close_after: How long after midnight UTC a day counts as closed
+        late_data_margin: Slack when comparing call updates with partition
+            computation times
+    """
+
+    def __init__(
+        self,
+        store: ReportResultStore,
+        close_after: timedelta = timedelta(hours=1),
+        late_data_margin: timedelta = timedelta(minutes=5)
+    ):
+        self.store = store
+        self.close_after = close_after
+        self.late_data_margin = late_data_margin
+
+    async def run(
+        self,
+        tenant_id: uuid.UUID,
+        compiled: CompiledReport,
+        start_date: date,
+        end_date: date
+    ) -> ReportResult:
+        """
+        Run a report over a date range.
+
+        Reports without a partitioned form run as one statement.
+
+        Args:
+            tenant_id: Tenant identifier
+            compiled: Compiled report
+            start_date: First day, inclusive
+            end_date: Last day, inclusive
+
+        Returns:
+            ReportResult with the rows and partition counts
+        """
+        partitioning = compiled.partitioning
+        if partitioning is None:
+            rows = await self._execute(tenant_id, compiled.statement, compiled.keys, start_date, end_date)
+            return ReportResult(rows)
+
+        started_at = datetime.utcnow()
+        days = _days(start_date, end_date)
+        closed_before = (started_at - self.close_after).date()
+        closed = [day for day in days if day < closed_before]
+
+        cached: Dict[date, Dict[str, Any]] = {}
+        if closed:
+            cached = await self.store.load_partitions(
+                tenant_id, compiled.definition_hash, closed[0], closed[-1]
+            )
+            for day in await self._changed_days(tenant_id, cached):
+                cached.pop(day, None)
+
+        missing = [day for day in days if day not in cached]
+        computed = await self._compute(tenant_id, partitioning, compiled.keys, missing)
+        await self.store.save_partitions(
+            tenant_id,
+            compiled.definition_hash,
+            {day: computed[day] for day in missing if day < closed_before},
+            started_at
+        )
+
+        rows = assemble_rows(
+            partitioning,
+            (cached[day]["rows"] if day in cached else computed[day] for day in days)
+        )
+        logger.debug(
+            "Report materialized",
+            tenant_id=str(tenant_id),
+            definition_hash=compiled.definition_hash,
+            partitions_reused=len(cached),
+            partitions_computed=len(missing)
+        )
+        return ReportResult(rows, len(cached), len(missing))
+
+    async def _changed_days(self, tenant_id: uuid.UUID, cached: Dict[date, Dict[str, Any]]) -> List[date]:
+        """Cached days whose calls changed after the partition was computed."""
+        if not cached:
+            return []
+        since = min(entry["computed_at"] for entry in cached.values()) - self.late_data_margin
+        day = func.date(calls.c.created_at, type_=Date)
+        query = (
+            select(day.label("day"), func.max(calls.c.updated_at).label("last_update"))
+            .where(
+                calls.c.tenant_id == tenant_id,
+                calls.c.updated_at > since,
+                calls.c.created_at >= datetime.combine(min(cached), datetime.min.time()),
+                calls.c.created_at < datetime.combine(max(cached) + timedelta(days=1), datetime.min.time())
+            )
+            .group_by(day)
+        )
+        async with get_read_session() as session:
+            await set_tenant_context(session, tenant_id)
+            result = await session.execute(query)
+            changed = [
+                row.day for row in result
+                if row.day in cached
+                and _naive_utc(row.last_update) > cached[row.day]["computed_at"] - self.late_data_margin
+            ]
+
+        if changed:
+            logger.info(
+                "Report partitions invalidated by late data",
+                tenant_id=str(tenant_id),
+                days=[day.isoformat() for day in changed]
+            )
+        return changed
+
+    async def _compute(
+        self,
+        tenant_id: uuid.UUID,
+        partitioning: ReportPartitioning,
+        keys: List[str],
+        days: List[date]
+    ) -> Dict[date, List[Dict[str, Any]]]:
+        """Compute the given days, one statement per run of consecutive days."""
+        computed: Dict[date, List[Dict[str, Any]]] = {day: [] for day in days}
+        if not days:
+            return computed
+
+        async with get_read_session() as session:
+            await set_tenant_context(session, tenant_id)
+            for run in _runs(days):
+                result = await session.execute(
+                    partitioning.statement,
+                    {"tenant_id": tenant_id, **date_range_params(run[0], run[-1])}
+                )
+                for row in result:
+                    day = row[0]
+                    if isinstance(day, str):
+                        day = date.fromisoformat(day)
+                    computed.setdefault(day, []).append(
+                        {key: export_value(value) for key, value in zip(keys, row[1:])}
+                    )
+        return computed
+
+    async def _execute(
+        self,
+        tenant_id: uuid.UUID,
+        statement: Any,
+        keys: List[str],
+        start_date: date,
+        end_date: date
+    ) -> List[Dict[str, Any]]:
+        async with get_read_session() as session:
+            await set_tenant_context(session, tenant_id)
+            result = await session.execute(
+                statement,
+                {"tenant_id": tenant_id, **date_range_params(start_date, end_date)}
+            )
+            return [
+                {key: export_value(value) for key, value in zip(keys, row)}
+                for row in result
+            ]
+
+
+class ReportScheduler:
+    """
+    Runs due scheduled reports on a pool of worker tasks.
+
+    A ticker enqueues schedules that are due; ``concurrency`` workers
+    run them. A schedule is not enqueued again while it is queued or
+    running.
+
+    Args:
+        run_schedule: Coroutine function running one schedule
+        due_schedules: Returns the schedules due at a given time
+        concurrency: Reports run at once
+        poll_interval: Seconds between checks for due schedules
+    """
+
+    def __init__(
+        self,
+        run_schedule: Callable[[Dict[str, Any]], Awaitable[Any]],
+        due_schedules: Callable[[datetime], Iterable[Dict[str, Any]]],
+        concurrency: int = 2,
+        poll_interval: float = 60.0
+    ):
+        self.run_schedule = run_schedule
+        self.due_schedules = due_schedules
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending: Set[str] = set()
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def started(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        """Start the ticker and workers."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._tick(), name="report-scheduler")] + [
+            asyncio.create_task(self._work(), name=f"report-worker-{index}")
+            for index in range(self.concurrency)
+        ]
+        logger.info("Report scheduler started", concurrency=self.concurrency)
+
+    async def stop(self) -> None:
+        """Stop the ticker and workers; queued runs are picked up on the next tick after restart."""
+        if not self._tasks:
+            return
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._pending.clear()
+        logger.info("Report scheduler stopped")
+
+    def enqueue_due(self, now: Optional[datetime] = None) -> int:
+        """Queue schedules due at ``now``; returns how many were queued."""
+        queued = 0
+        for schedule in self.due_schedules(now or datetime.utcnow()):
+            schedule_id = schedule["schedule_id"]
+            if schedule_id in self._pending:
+                continue
+            self._pending.add(schedule_id)
+            self._queue.put_nowait(schedule)
+            queued += 1
+        return queued
+
+    async def _tick(self) -> None:
+        while True:
+            try:
+                self.enqueue_due()
+            except Exception as e:
+                logger.error("Failed to check scheduled reports", error=str(e))
+            await asyncio.sleep(self.poll_interval)
+
+    async def _work(self) -> None:
+        while True:
+            schedule = await self._queue.get()
+            started = time.perf_counter()
+            try:
+                await self.run_schedule(schedule)
+            except Exception as e:
+                logger.error(
+                    "Scheduled report crashed",
+                    schedule_id=schedule["schedule_id"],
+                    error=str(e)
+                )
+            finally:
+                self._pending.discard(schedule["schedule_id"])
+                self._queue.task_done()
+                logger.debug(
+                    "Scheduled report finished",
+                    schedule_id=schedule["schedule_id"],
+                    duration_ms=round((time.perf_counter() - started) * 1000, 1)
+                )
@@ -0,0 +1,426 @@
+"""
+Envelope encryption engine for VoiceCore AI.
+
+Sensitive fields are encrypted with per-tenant data keys (AES-256-GCM).
+Data keys are wrapped by a versioned master key held in a keyring, and
+every token carries the master key version and its wrapped data key, so
+tokens stay readable across restarts and master key rotation. Master
+keys are derived once per process and version; unwrapped data keys are
+cached, so encrypting a field costs one AES-GCM operation.
+
+Token format::
+
+    vc1$<master key version>$<wrapped data key>$<nonce + ciphertext>
+
+Tokens without the ``vc1$`` prefix are treated as legacy Fernet tokens
+produced before the engine existed and are still decrypted.
+"""
+
+import os
+import base64
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+from voicecore.config import settings
+from voicecore.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+TOKEN_PREFIX = "vc1"
+TOKEN_SEPARATOR = "$"
+NONCE_SIZE = 12
+
+# Salt used by the original per-call PBKDF2 derivation; kept so legacy
+# tokens remain readable
+LEGACY_SALT = b'voicecore_salt_2024'
+MASTER_KEY_SALT = b'voicecore_master_key_v1'
+KDF_ITERATIONS = 100000
+
+# Associated data used for values not bound to a tenant
+GLOBAL_SCOPE = "global"
+
+TenantRef = Optional[Any]
+
+
+class KeyNotFoundError(KeyError):
+    """Raised when a token references an unknown master key version."""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+@lru_cache(maxsize=32)
+def _derive_master_key(secret: str, version: int) -> bytes:
+    """Derive the master key for a secret and version (once per process)."""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=MASTER_KEY_SALT + str(version).encode(),
+        iterations=KDF_ITERATIONS,
+    )
+    return kdf.derive(secret.encode())
+
+
+@lru_cache(maxsize=4)
+def _legacy_fernet(secret: str) -> Fernet:
+    """Fernet instance for tokens written by the pre-engine encryptor."""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=LEGACY_SALT,
+        iterations=KDF_ITERATIONS,
+    )
+    return Fernet(base64.urlsafe_b64encode(kdf.derive(secret.encode())))
+
+
+def parse_master_secrets(spec: Optional[str], default_secret: str) -> Dict[int, str]:
+    """
+    Parse a ``"version:secret,version:secret"`` master key specification.
+
+    Args:
+        spec: Comma-separated version/secret pairs, or None
+        default_secret: Secret used for version 1 when not listed
+
+    Returns:
+        Dict mapping master key version to secret
+    """
+    secrets_by_version: Dict[int, str] = {}
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        version, _, secret = item.partition(":")
+        if not secret:
+            raise ValueError("Master keys must be given as version:secret")
+        secrets_by_version[int(version)] = secret
+
+    secrets_by_version.setdefault(1, default_secret)
+    return secrets_by_version
+
+
+class LocalKeyring:
+    """
+    In-process keyring holding versioned master keys.
+
+    Stands in for a Vault transit backend: it wraps and unwraps data keys
+    but never hands out master keys. A Vault-backed keyring only needs to
+    provide the same ``active_version``, ``wrap_key`` and ``unwrap_key``.
+    """
+
+    def __init__(self, master_secrets: Dict[int, str], active_version: int):
+        if active_version not in master_secrets:
+            raise ValueError(f"Active master key version {active_version} is not configured")
+
+        self._master_secrets = dict(master_secrets)
+        self.active_version = active_version
+
+    @classmethod
+    def from_settings(cls) -> "LocalKeyring":
+        """Create the keyring from application settings."""
+        return cls(
+            parse_master_secrets(settings.encryption_master_keys, settings.secret_key),
+            settings.encryption_active_key_version
+        )
+
+    @property
+    def versions(self) -> List[int]:
+        """Configured master key versions."""
+        return sorted(self._master_secrets)
+
+    def _master_key(self, version: int) -> AESGCM:
+        secret = self._master_secrets.get(version)
+        if secret is None:
+            raise KeyNotFoundError(f"Unknown master key version {version}")
+        return AESGCM(_derive_master_key(secret, version))
+
+    def wrap_key(self, data_key: bytes, scope: str) -> Tuple[int, bytes]:
+        """
+        Encrypt a data key under the active master key.
+
+        Args:
+            data_key: Raw data key
+            scope: Tenant scope the data key belongs to
+
+        Returns:
+            Tuple of (master key version, wrapped key)
+        """
+        nonce = os.urandom(NONCE_SIZE)
+        wrapped = self._master_key(self.active_version).encrypt(nonce, data_key, scope.encode())
+        return self.active_version, nonce + wrapped
+
+    def unwrap_key(self, version: int, wrapped_key: bytes, scope: str) -> bytes:
+        """
+        Decrypt a data key wrapped by ``wrap_key``.
+
+        Args:
+            version: Master key version used to wrap the key
+            wrapped_key: Wrapped key bytes
+            scope: Tenant scope the data key belongs to
+
+        Returns:
+            Raw data key
+        """
+        nonce, wrapped = wrapped_key[:NONCE_SIZE], wrapped_key[NONCE_SIZE:]
+        return self._master_key(version).decrypt(nonce, wrapped, scope.encode())
+
+    def legacy_fernet(self) -> Fernet:
+        """Fernet instance for legacy tokens."""
+        return _legacy_fernet(self._master_secrets[1])
+
+
+class EncryptionEngine:
+    """
+    Envelope encryption with cached per-tenant data keys.
+
+    Each tenant gets one data key per process and master key version.
+    Unwrapped data keys from decrypted tokens are cached too, so bulk
+    work over a tenant's records never repeats key derivation.
+    """
+
+    def __init__(
+        self,
+        keyring: Optional[LocalKeyring] = None,
+        max_workers: int = 4,
+        batch_size: int = 256,
+        max_cached_keys: int = 10000
+    ):
+        self.keyring = keyring or LocalKeyring.from_settings()
+        self.batch_size = batch_size
+        self.max_cached_keys = max_cached_keys
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="encryption"
+        )
+        self._lock = threading.Lock()
+        # (scope, version) -> (AESGCM, header)
+        self._active_keys: Dict[Tuple[str, int], Tuple[AESGCM, str]] = {}
+        # (scope, version, wrapped key) -> AESGCM
+        self._unwrapped_keys: Dict[Tuple[str, int, str], AESGCM] = {}
+
+    @staticmethod
+    def _scope(tenant_id: TenantRef) -> str:
+        return str(tenant_id) if tenant_id else GLOBAL_SCOPE
+
+    @staticmethod
+    def is_encrypted(value: Any) -> bool:
+        """Check whether a value is a token produced by this engine."""
+        return isinstance(value, str) and value.startswith(TOKEN_PREFIX + TOKEN_SEPARATOR)
+
+    def _active_key(self, scope: str) -> Tuple[AESGCM, str]:
+        cache_key = (scope, self.keyring.active_version)
+        entry = self._active_keys.get(cache_key)
+        if entry is None:
+            with self._lock:
+                entry = self._active_keys.get(cache_key)
+                if entry is None:
+                    data_key = AESGCM.generate_key(bit_length=256)
+                    version, wrapped = self.keyring.wrap_key(data_key, scope)
+                    header = TOKEN_SEPARATOR.join(
+                        [TOKEN_PREFIX, str(version), _b64encode(wrapped)]
+                    )
+                    entry = (AESGCM(data_key), header)
+                    self._active_keys[cache_key] = entry
+                    self._unwrapped_keys[(scope, version, _b64encode(wrapped))] = entry[0]
+        return entry
+
+    def _key_for_token(self, scope: str, version: int, wrapped_key: str) -> AESGCM:
+        cache_key = (scope, version, wrapped_key)
+        cipher = self._unwrapped_keys.get(cache_key)
+        if cipher is None:
+            data_key = self.keyring.unwrap_key(version, _b64decode(wrapped_key), scope)
+            cipher = AESGCM(data_key)
+            with self._lock:
+                if len(self._unwrapped_keys) >= self.max_cached_keys:
+                    self._unwrapped_keys.clear()
+                self._unwrapped_keys[cache_key] = cipher
+        return cipher
+
+    def encrypt(self, plaintext: str, tenant_id: TenantRef = None) -> str:
+        """
+        Encrypt a string under the tenant's current data key.
+
+        Args:
+            plaintext: Value to encrypt
+            tenant_id: Tenant the value belongs to (None for global data)
+
+        Returns:
+            Encrypted token
+        """
+        scope = self._scope(tenant_id)
+        cipher, header = self._active_key(scope)
+        nonce = os.urandom(NONCE_SIZE)
+        ciphertext = cipher.encrypt(nonce, plaintext.encode(), scope.encode())
+        return f"{header}{TOKEN_SEPARATOR}{_b64encode(nonce + ciphertext)}"
+
+    def decrypt(self, token: str, tenant_id: TenantRef = None) -> str:
+        """
+        Decrypt a token produced by ``encrypt`` or the legacy encryptor.
+
+        Args:
+            token: Encrypted token
+            tenant_id: Tenant the value belongs to (None for global data)
+
+        Returns:
+            Decrypted string
+        """
+        if not self.is_encrypted(token):
+            return self.keyring.legacy_fernet().decrypt(base64.b64decode(token.encode())).decode()
+
+        _, version, wrapped_key, payload = token.split(TOKEN_SEPARATOR, 3)
+        scope = self._scope(tenant_id)
+        cipher = self._key_for_token(scope, int(version), wrapped_key)
+        raw = _b64decode(payload)
+        return cipher.decrypt(raw[:NONCE_SIZE], raw[NONCE_SIZE:], scope.encode()).decode()
+
+    def token_version(self, token: str) -> Optional[int]:
+        """Return the master key version of a token (None for legacy tokens)."""
+        if not self.is_encrypted(token):
+            return None
+        return int(token.split(TOKEN_SEPARATOR, 2)[1])
+
+    def needs_rotation(self, token: str) -> bool:
+        """Check whether a token was written under an older master key."""
+        return self.token_version(token) != self.keyring.active_version
+
+    def rotate(self, token: str, tenant_id: TenantRef = None) -> str:
+        """
+        Re-encrypt a token under the active master key version.
+
+        Args:
+            token: Encrypted token
+            tenant_id: Tenant the value belongs to
+
+        Returns:
+            Token under the active version (unchanged if already current)
+        """
+        if not self.needs_rotation(token):
+            return token
+        return self.encrypt(self.decrypt(token, tenant_id), tenant_id)
+
+    def _transform_records(
+        self,
+        records: List[Dict[str, Any]],
+        fields: Iterable[str],
+        tenant_id: TenantRef,
+        decrypt: bool,
+        strict: bool
+    ) -> List[Dict[str, Any]]:
+        fields = list(fields)
+        results = []
+        for record in records:
+            output = dict(record)
+            for field in fields:
+                value = output.get(field)
+                if not value:
+                    continue
+                if decrypt:
+                    try:
+                        output[field] = self.decrypt(value, tenant_id)
+                    except Exception as e:
+                        if strict:
+                            raise
+                        # Leave values that are not ciphertext as they are
+                        logger.warning(
+                            "Failed to decrypt field, assuming unencrypted",
+                            field=field,
+                            error=type(e).__name__
+                        )
+                else:
+                    output[field] = self.encrypt(str(value), tenant_id)
+            results.append(output)
+        return results
+
+    async def _run_batched(
+        self,
+        records: List[Dict[str, Any]],
+        fields: Iterable[str],
+        tenant_id: TenantRef,
+        decrypt: bool,
+        strict: bool
+    ) -> List[Dict[str, Any]]:
+        fields = list(fields)
+        loop = asyncio.get_running_loop()
+        chunks = [
+            records[start:start + self.batch_size]
+            for start in range(0, len(records), self.batch_size)
+        ]
+        results = await asyncio.gather(*[
+            loop.run_in_executor(
+                self._executor, self._transform_records,
+                chunk, fields, tenant_id, decrypt, strict
+            )
+            for chunk in chunks
+        ])
+        return [record for chunk in results for record in chunk]
+
+    async def encrypt_records(
+        self,
+        records: List[Dict[str, Any]],
+        fields: Iterable[str],
+        tenant_id: TenantRef = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Encrypt the given fields of a batch of records off the event loop.
+
+        Args:
+            records: Records to encrypt (not modified)
+            fields: Field names to encrypt where present and non-empty
+            tenant_id: Tenant the records belong to
+
+        Returns:
+            New records with the fields replaced by tokens
+        """
+        return await self._run_batched(records, fields, tenant_id, decrypt=False, strict=True)
+
+    async def decrypt_records(
+        self,
+        records: List[Dict[str, Any]],
+        fields: Iterable[str],
+        tenant_id: TenantRef = None,
+        strict: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Decrypt the given fields of a batch of records off the event loop.
+
+        Args:
+            records: Records to decrypt (not modified)
+            fields: Field names to decrypt where present and non-empty
+            tenant_id: Tenant the records belong to
+            strict: Raise on undecryptable values instead of leaving them
+
+        Returns:
+            New records with the fields decrypted
+        """
+        return await self._run_batched(records, fields, tenant_id, decrypt=True, strict=strict)
+
+    def shutdown(self) -> None:
+        """Stop the worker threads."""
+        self._executor.shutdown(wait=False)
+
+
+_engine: Optional[EncryptionEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_encryption_engine() -> EncryptionEngine:
+    """Return the process-wide encryption engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = EncryptionEngine(max_workers=settings.encryption_workers)
+    return _engine
@@ -0,0 +1,324 @@
+"""
+SQL statement profiling for the SQLAlchemy engine.
+
+Engine event hooks time every statement and group the timings by a
+normalized form of its SQL, with literals, bind markers and IN-lists
+collapsed, so the number of keys is bounded by the query shapes in the
+code rather than by the data. Timings feed Prometheus histograms for
+``/metrics`` and in-process summaries for performance monitoring.
+Statements slower than a threshold are logged together with their plan.
+"""
+
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from prometheus_client import Counter, Histogram
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from voicecore.config import settings
+from voicecore.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+OTHER_STATEMENTS = "other"
+MAX_LABEL_LENGTH = 200
+
+STATEMENT_SECONDS = Histogram(
+    "voicecore_db_statement_seconds",
+    "SQL statement execution time by normalized statement",
+    ["statement"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+SLOW_STATEMENTS = Counter(
+    "voicecore_db_slow_statements_total",
+    "SQL statements slower than the slow query threshold",
+    ["statement"],
+)
+POOL_CHECKOUT_SECONDS = Histogram(
+    "voicecore_db_pool_checkout_seconds",
+    "Time spent waiting for a pooled connection",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+REQUEST_QUERIES = Histogram(
+    "voicecore_db_queries_per_request",
+    "SQL statements issued per request or unit of work",
+    buckets=(1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144),
+)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_BIND_MARKER = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<![:\w]):\w+|\?")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_ROWS = re.compile(r"(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+")
+_WHITESPACE = re.compile(r"\s+")
+_EXPLAINABLE = re.compile(r"\s*(?:SELECT|WITH)\b", re.IGNORECASE)
+_EXPLAIN_PREFIX = {
+    "postgresql": "EXPLAIN ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+
+
+@lru_cache(maxsize=4096)
+def normalize_sql(statement: str) -> str:
+    """
+    Reduce a SQL statement to its shape.
+
+    Args:
+        statement: SQL as sent to the driver
+
+    Returns:
+        Statement with literals and bind markers replaced by ``?``,
+        IN-lists and multi-row VALUES collapsed, and whitespace squeezed
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _BIND_MARKER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (...)", normalized)
+    normalized = _VALUES_ROWS.sub(r"\1", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+@dataclass
+class StatementStats:
+    """Timing totals for one normalized statement."""
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    slow: int = 0
+
+    def to_dict(self, statement: str) -> Dict[str, Any]:
+        return {
+            "statement": statement,
+            "count": self.count,
+            "total_ms": round(self.total_seconds * 1000, 2),
+            "avg_ms": round(self.total_seconds * 1000 / self.count, 2) if self.count else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 2),
+            "slow": self.slow,
+        }
+
+
+class QueryProfiler:
+    """
+    Per-statement timing, pool checkout wait and slow query logging.
+
+    Args:
+        slow_query_ms: Statements at or above this duration are logged
+        explain_slow_queries: Log the plan of slow SELECT statements
+        explain_interval_seconds: Minimum gap between plans for one statement
+        max_statements: Distinct statements tracked before grouping as "other"
+    """
+
+    def __init__(
+        self,
+        slow_query_ms: float = 200.0,
+        explain_slow_queries: bool = True,
+        explain_interval_seconds: float = 300.0,
+        max_statements: int = 500
+    ):
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.explain_slow_queries = explain_slow_queries
+        self.explain_interval_seconds = explain_interval_seconds
+        self.max_statements = max_statements
+
+        self.statements: Dict[str, StatementStats] = {}
+        self.checkouts: Dict[str, StatementStats] = {}
+        self._last_explained: Dict[str, float] = {}
+        self._request_stats: Optional[Callable[[], Any]] = None
+
+    def install(self, engine, request_stats: Optional[Callable[[], Any]] = None) -> None:
+        """
+        Attach the profiler to an engine.
+
+        Args:
+            engine: Sync engine (``async_engine.sync_engine``)
+            request_stats: Returns the current request's SessionStats, if any
+        """
+        self._request_stats = request_stats
+        if not event.contains(engine, "before_cursor_execute", self._before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        context._profiler_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started = getattr(context, "_profiler_start", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        key = self.record(statement, elapsed)
+
+        stats = self._request_stats() if self._request_stats else None
+        if stats is not None:
+            stats.queries += 1
+            stats.query_time_ms += elapsed * 1000
+
+        if elapsed >= self.slow_query_seconds:
+            self._log_slow_query(conn, statement, parameters, context, executemany, key, elapsed, stats)
+
+    def record(self, statement: str, seconds: float) -> str:
+        """
+        Record one statement execution.
+
+        Args:
+            statement: SQL as sent to the driver
+            seconds: Execution time
+
+        Returns:
+            The key the execution was recorded under
+        """
+        key = normalize_sql(statement)
+        stats = self.statements.get(key)
+        if stats is None:
+            if len(self.statements) >= self.max_statements:
+                key = OTHER_STATEMENTS
+                stats = self.statements.get(key)
+            if stats is None:
+                stats = self.statements[key] = StatementStats()
+
+        stats.count += 1
+        stats.total_seconds += seconds
+        if seconds > stats.max_seconds:
+            stats.max_seconds = seconds
+        if seconds >= self.slow_query_seconds:
+            stats.slow += 1
+            SLOW_STATEMENTS.labels(key[:MAX_LABEL_LENGTH]).inc()
+        STATEMENT_SECONDS.labels(key[:MAX_LABEL_LENGTH]).observe(seconds)
+        return key
+
+    def record_checkout(self, seconds: float, pool: str = "primary") -> None:
+        """Record the time spent waiting for a connection from a pool."""
+        stats = self.checkouts.get(pool)
+        if stats is None:
+            stats = self.checkouts[pool] = StatementStats()
+        stats.count += 1
+        stats.total_seconds += seconds
+        if seconds > stats.max_seconds:
+            stats.max_seconds = seconds
+        POOL_CHECKOUT_SECONDS.labels(pool).observe(seconds)
+
+    def record_request(self, queries: int) -> None:
+        """Record the number of statements one request issued."""
+        REQUEST_QUERIES.observe(queries)
+
+    def _log_slow_query(self, conn, statement, parameters, context, executemany, key, elapsed, stats) -> None:
+        plan = None
+        if self._should_explain(conn, statement, context, executemany, key):
+            plan = self._explain(conn, statement, parameters)
+
+        logger.warning(
+            "Slow query",
+            statement=key,
+            duration_ms=round(elapsed * 1000, 2),
+            correlation_id=getattr(stats, "correlation_id", None),
+            plan=plan
+        )
+
+    def _should_explain(self, conn, statement, context, executemany, key) -> bool:
+        if not self.explain_slow_queries or executemany:
+            return False
+        if conn.dialect.name not in _EXPLAIN_PREFIX:
+            return False
+        if context.execution_options.get("stream_results"):
+            # The server-side cursor is still open on this connection
+            return False
+        if not _EXPLAINABLE.match(statement):
+            return False
+
+        now = time.monotonic()
+        if now - self._last_explained.get(key, float("-inf")) < self.explain_interval_seconds:
+            return False
+        if len(self._last_explained) >= self.max_statements:
+            self._last_explained.clear()
+        self._last_explained[key] = now
+        return True
+
+    def _explain(self, conn, statement: str, parameters) -> Optional[List[str]]:
+        """Fetch the plan of a statement on its own connection and transaction."""
+        savepoint = conn.dialect.name == "postgresql"
+        cursor = conn.connection.cursor()
+        try:
+            if savepoint:
+                # A failed EXPLAIN must not abort the caller's transaction
+                cursor.execute("SAVEPOINT query_profiler_explain")
+            try:
+                cursor.execute(_EXPLAIN_PREFIX[conn.dialect.name] + statement, parameters)
+                plan = [str(row[-1]) for row in cursor.fetchall()]
+            except Exception as e:
+                if savepoint:
+                    cursor.execute("ROLLBACK TO SAVEPOINT query_profiler_explain")
+                logger.debug("Failed to explain slow query", error=str(e))
+                return None
+            if savepoint:
+                cursor.execute("RELEASE SAVEPOINT query_profiler_explain")
+            return plan
+        finally:
+            cursor.close()
+
+    def snapshot(self, top: int = 10) -> Dict[str, Any]:
+        """
+        Summarize recorded executions.
+
+        Args:
+            top: Number of statements to list, by total time
+
+        Returns:
+            dict: Totals, pool checkout wait and the most expensive statements
+        """
+        count = sum(stats.count for stats in self.statements.values())
+        total = sum(stats.total_seconds for stats in self.statements.values())
+        ranked = sorted(self.statements.items(), key=lambda item: item[1].total_seconds, reverse=True)
+        return {
+            "queries": count,
+            "avg_query_time_ms": round(total * 1000 / count, 2) if count else 0.0,
+            "slow_queries": sum(stats.slow for stats in self.statements.values()),
+            "distinct_statements": len(self.statements),
+            "pool_checkouts": {
+                pool: {
+                    "count": stats.count,
+                    "avg_wait_ms": round(stats.total_seconds * 1000 / stats.count, 3),
+                    "max_wait_ms": round(stats.max_seconds * 1000, 3),
+                }
+                for pool, stats in self.checkouts.items()
+            },
+            "top_statements": [stats.to_dict(statement) for statement, stats in ranked[:top]],
+        }
+
+    def reset(self) -> None:
+        """Forget in-process totals (Prometheus series are kept)."""
+        self.statements.clear()
+        self.checkouts.clear()
+        self._last_explained.clear()
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that reports how long each checkout waited.
+
+    Waits are recorded under the pool's logging name (the engine's
+    ``pool_logging_name``), or "primary" if it has none.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            query_profiler.record_checkout(
+                time.perf_counter() - started,
+                self._orig_logging_name or "primary"
+            )
+
+
+# Global profiler instance
+query_profiler = QueryProfiler(
+    slow_query_ms=settings.slow_query_ms,
+    explain_slow_queries=settings.explain_slow_queries,
+    max_statements=settings.query_profiler_max_statements
+)
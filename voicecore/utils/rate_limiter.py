@@ -0,0 +1,231 @@
+"""
+Token-bucket rate limiting for VoiceCore AI.
+
+Provides a distributed token-bucket limiter backed by a single atomic
+Redis Lua script per decision, with O(1) state per key and in-process
+token leases so hot keys do not need a Redis round trip per request.
+"""
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from voicecore.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# Refills the bucket from elapsed time and grants up to ARGV[3] tokens.
+# State is one hash per key ({tokens, ts}) that expires once it would be
+# full again, so memory stays constant no matter how many requests arrive.
+TOKEN_BUCKET_SCRIPT = """
+local key = KEYS[1]
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+
+local state = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate / 1000)
+
+local granted = math.min(requested, math.floor(tokens))
+local retry_after_ms = 0
+if granted < 1 then
+    granted = 0
+    retry_after_ms = math.ceil((1 - tokens) * 1000 / rate)
+else
+    tokens = tokens - granted
+end
+
+redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', key, math.ceil(capacity * 1000 / rate) + 1000)
+
+return {granted, tostring(tokens), retry_after_ms}
+"""
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of a rate limit check."""
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: int = 0
+    source: str = "redis"
+
+
+@dataclass
+class _Lease:
+    """Tokens granted by Redis and spent locally until they expire."""
+    tokens: int = 0
+    expires_at: float = 0.0
+    window_start: float = 0.0
+    window_count: int = 0
+    last_demand: int = 0
+
+
+@dataclass
+class _LocalBucket:
+    """In-process bucket used when Redis is unavailable."""
+    tokens: float
+    updated_at: float
+
+
+class TokenBucketRateLimiter:
+    """
+    Distributed token-bucket rate limiter.
+
+    Each decision is a single EVALSHA of TOKEN_BUCKET_SCRIPT. Keys that
+    receive many requests lease a batch of tokens sized to their recent
+    demand and spend them locally for a short lease period, which bounds
+    over-admission across instances to one lease per instance.
+    If Redis fails the limiter degrades to a per-process bucket instead
+    of letting all traffic through unchecked.
+    """
+
+    def __init__(
+        self,
+        redis_client=None,
+        limit_per_minute: int = 60,
+        burst: int = 10,
+        lease_seconds: float = 1.0,
+        max_lease_tokens: int = 20,
+        max_local_keys: int = 10000,
+    ):
+        self.redis = redis_client
+        self.limit_per_minute = limit_per_minute
+        self.rate_per_second = limit_per_minute / 60.0
+        self.capacity = limit_per_minute + burst
+        self.lease_seconds = lease_seconds
+        # Never lease more than a small slice of the bucket to one instance
+        self.max_lease_tokens = max(1, min(max_lease_tokens, self.capacity // 4 or 1))
+        self.max_local_keys = max_local_keys
+
+        self._script = redis_client.register_script(TOKEN_BUCKET_SCRIPT) if redis_client else None
+        self._leases: Dict[str, _Lease] = {}
+        self._fallback: Dict[str, _LocalBucket] = {}
+
+    async def check(self, key: str) -> RateLimitDecision:
+        """
+        Consume one token for ``key``.
+
+        Args:
+            key: Rate limit key (already namespaced by the caller)
+
+        Returns:
+            RateLimitDecision: Whether the request may proceed
+        """
+        now = time.monotonic()
+        lease = self._get_lease(key, now)
+
+        if lease.tokens > 0 and now < lease.expires_at:
+            lease.tokens -= 1
+            return RateLimitDecision(
+                allowed=True,
+                limit=self.limit_per_minute,
+                remaining=lease.tokens,
+                source="lease",
+            )
+
+        if not self._script:
+            return self._check_local(key, now)
+
+        requested = self._lease_size(lease)
+        try:
+            granted, tokens_left, retry_after_ms = await self._script(
+                keys=[key],
+                args=[self.rate_per_second, self.capacity, requested],
+            )
+        except Exception as e:
+            logger.warning("Redis rate limiting unavailable, using local bucket", error=str(e))
+            return self._check_local(key, now)
+
+        granted = int(granted)
+        if granted < 1:
+            lease.tokens = 0
+            return RateLimitDecision(
+                allowed=False,
+                limit=self.limit_per_minute,
+                remaining=0,
+                retry_after=max(1, math.ceil(int(retry_after_ms) / 1000)),
+            )
+
+        # Spend one token now and keep the rest for subsequent requests
+        lease.tokens = granted - 1
+        lease.expires_at = now + self.lease_seconds
+        return RateLimitDecision(
+            allowed=True,
+            limit=self.limit_per_minute,
+            remaining=int(float(tokens_left)) + lease.tokens,
+        )
+
+    def _get_lease(self, key: str, now: float) -> _Lease:
+        lease = self._leases.get(key)
+        if lease is None:
+            if len(self._leases) >= self.max_local_keys:
+                self._evict_expired_leases(now)
+            lease = self._leases[key] = _Lease(window_start=now)
+
+        # Track demand per lease period to size the next lease
+        if now - lease.window_start >= self.lease_seconds:
+            lease.last_demand = lease.window_count
+            lease.window_start = now
+            lease.window_count = 0
+        lease.window_count += 1
+        return lease
+
+    def _lease_size(self, lease: _Lease) -> int:
+        """Lease as many tokens as the key used in its last lease period."""
+        demand = max(lease.last_demand, lease.window_count)
+        return max(1, min(self.max_lease_tokens, demand))
+
+    def _evict_expired_leases(self, now: float) -> None:
+        expired = [
+            k for k, lease in self._leases.items()
+            if now >= lease.expires_at and now - lease.window_start >= self.lease_seconds
+        ]
+        for k in expired:
+            del self._leases[k]
+        if len(self._leases) >= self.max_local_keys:
+            self._leases.clear()
+
+    def _check_local(self, key: str, now: float) -> RateLimitDecision:
+        bucket = self._fallback.get(key)
+        if bucket is None:
+            if len(self._fallback) >= self.max_local_keys:
+                self._fallback.clear()
+            bucket = self._fallback[key] = _LocalBucket(tokens=self.capacity, updated_at=now)
+
+        bucket.tokens = min(
+            self.capacity,
+            bucket.tokens + (now - bucket.updated_at) * self.rate_per_second
+        )
+        bucket.updated_at = now
+
+        if bucket.tokens < 1:
+            return RateLimitDecision(
+                allowed=False,
+                limit=self.limit_per_minute,
+                remaining=0,
+                retry_after=max(1, math.ceil((1 - bucket.tokens) / self.rate_per_second)),
+                source="local",
+            )
+
+        bucket.tokens -= 1
+        return RateLimitDecision(
+            allowed=True,
+            limit=self.limit_per_minute,
+            remaining=int(bucket.tokens),
+            source="local",
+        )
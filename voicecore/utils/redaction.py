@@ -0,0 +1,226 @@
+"""
+Single-pass PII redaction engine for VoiceCore AI.
+
+Sensitive values are scrubbed with one precompiled regex whose named
+groups select the replacement, instead of one ``re.sub`` per pattern.
+Dictionary keys are classified once per distinct key (LRU cached) and
+nested structures are walked iteratively; flat dictionaries with no
+sensitive keys take a fast path that skips per-value work.
+
+Used by ``SecurityUtils.sanitize_data`` and the structlog processor in
+``voicecore.logging``.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# Value patterns in priority order: where two patterns can match at the
+# same position, the earlier one wins. Location data comes first so it
+# is never partially consumed by a less strict pattern. Each pattern
+# must start with a word boundary.
+VALUE_PATTERNS: List[Tuple[str, str, str]] = [
+    ('ip_address', r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b', '[REDACTED_LOCATION]'),
+    ('ipv6_address', r'\b(?:[0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}\b', '[REDACTED_LOCATION]'),
+    ('coordinates', r'\b-?\d{1,3}\.\d+,\s*-?\d{1,3}\.\d+\b', '[REDACTED_LOCATION]'),
+    ('email', r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', 'user@domain.com'),
+    ('credit_card', r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b', '[REDACTED_CREDIT_CARD]'),
+    ('ssn', r'\b\d{3}-?\d{2}-?\d{4}\b', '[REDACTED_SSN]'),
+    ('phone_number', r'\b\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b', 'XXX-XXX-XXXX'),
+]
+
+REPLACEMENTS: Dict[str, str] = {name: replacement for name, _, replacement in VALUE_PATTERNS}
+
+DIGITS = re.compile(r'[0-9]')
+
+
+def _compile_combined(include: Callable[[str], bool]) -> "re.Pattern":
+    # Every pattern starts at a word boundary; hoisting it out of the
+    # alternation lets the engine skip non-boundary positions at once
+    alternatives = "|".join(
+        f"(?P<{name}>{pattern[2:]})"
+        for name, pattern, _ in VALUE_PATTERNS
+        if include(name)
+    )
+    return re.compile(rf"\b(?:{alternatives})")
+
+
+COMBINED_PATTERN = _compile_combined(lambda name: True)
+
+# Combined pattern variants keyed by (contains '@', contains ':'); the
+# email and IPv6 alternatives are left out for strings that cannot match
+_VARIANTS: Dict[Tuple[bool, bool], "re.Pattern"] = {
+    (has_at, has_colon): _compile_combined(
+        lambda name, has_at=has_at, has_colon=has_colon: (
+            (name != 'email' or has_at) and (name != 'ipv6_address' or has_colon)
+        )
+    )
+    for has_at in (False, True)
+    for has_colon in (False, True)
+}
+
+
+def _replace_match(match: "re.Match") -> str:
+    return REPLACEMENTS[match.lastgroup]
+
+
+def scrub_text(text: str) -> str:
+    """
+    Redact sensitive values in a string in a single regex pass.
+
+    Args:
+        text: Text to scrub
+
+    Returns:
+        Text with IPs, coordinates, emails, card numbers, SSNs and phone
+        numbers replaced
+    """
+    has_at = '@' in text
+    has_colon = ':' in text
+    if not (has_at or has_colon or DIGITS.search(text)):
+        # Every pattern needs a digit, '@' or ':'
+        return text
+    return _VARIANTS[(has_at, has_colon)].sub(_replace_match, text)
+
+
+class RedactionPolicy:
+    """
+    Key rules and value handling for one redaction use.
+
+    Args:
+        key_rules: Ordered (substrings, replacement) pairs; a key whose
+            lowercase form contains any substring is replaced by the
+            first matching rule's replacement
+        scrub_values: Whether string values are scrubbed with the
+            combined value pattern
+        cache_size: Size of the key classification LRU
+    """
+
+    def __init__(
+        self,
+        key_rules: Sequence[Tuple[Sequence[str], str]],
+        scrub_values: bool = True,
+        cache_size: int = 4096
+    ):
+        self.key_rules = [(tuple(substrings), replacement) for substrings, replacement in key_rules]
+        self.scrub_values = scrub_values
+        self.classify: Callable[[Any], Optional[str]] = lru_cache(maxsize=cache_size)(self._classify)
+
+    def _classify(self, key: Any) -> Optional[str]:
+        key_lower = str(key).lower()
+        for substrings, replacement in self.key_rules:
+            if any(substring in key_lower for substring in substrings):
+                return replacement
+        return None
+
+
+class RedactionEngine:
+    """
+    Redacts nested dicts, lists and strings according to a policy.
+
+    Traversal uses an explicit stack, so deep payloads cannot hit the
+    recursion limit, and output containers are always new objects.
+    """
+
+    def __init__(self, policy: RedactionPolicy):
+        self.policy = policy
+
+    def redact(self, data: Any) -> Any:
+        """
+        Return a redacted copy of ``data``.
+
+        Args:
+            data: Dict, list, string or scalar
+
+        Returns:
+            Redacted copy (scalars are returned unchanged)
+        """
+        if isinstance(data, str):
+            return scrub_text(data) if self.policy.scrub_values else data
+        if not isinstance(data, (dict, list)):
+            return data
+
+        classify = self.policy.classify
+        scrub = scrub_text if self.policy.scrub_values else None
+
+        root: List[Any] = [None]
+        stack: List[Tuple[Any, Any, Any]] = [(data, root, 0)]
+
+        while stack:
+            source, parent, slot = stack.pop()
+
+            if isinstance(source, dict):
+                # Fast path: flat dict with no sensitive keys
+                if not any(classify(key) for key in source) and not any(
+                    isinstance(value, (dict, list)) for value in source.values()
+                ):
+                    if scrub is None:
+                        parent[slot] = dict(source)
+                    else:
+                        parent[slot] = {
+                            key: scrub(value) if isinstance(value, str) else value
+                            for key, value in source.items()
+                        }
+                    continue
+
+                target: Any = {}
+                parent[slot] = target
+                for key, value in source.items():
+                    replacement = classify(key)
+                    if replacement is not None:
+                        target[key] = replacement
+                    elif isinstance(value, (dict, list)):
+                        target[key] = None
+                        stack.append((value, target, key))
+                    elif scrub is not None and isinstance(value, str):
+                        target[key] = scrub(value)
+                    else:
+                        target[key] = value
+
+            else:
+                target = [None] * len(source)
+                parent[slot] = target
+                for index, value in enumerate(source):
+                    if isinstance(value, (dict, list)):
+                        stack.append((value, target, index))
+                    elif scrub is not None and isinstance(value, str):
+                        target[index] = scrub(value)
+                    else:
+                        target[index] = value
+
+        return root[0]
+
+
+# Policy used by SecurityUtils.sanitize_data: typed key redaction plus
+# value scrubbing
+SECURITY_POLICY = RedactionPolicy(
+    key_rules=[
+        (
+            ('latitude', 'longitude', 'lat', 'lng', 'coordinates',
+             'geolocation', 'location', 'address', 'city', 'state',
+             'country', 'zip', 'postal', 'gps', 'position'),
+            "[REDACTED_LOCATION]"
+        ),
+        (('ip', 'addr'), "[REDACTED_IP]"),
+        (('password', 'secret', 'token'), "[REDACTED_SECRET]"),
+    ],
+    scrub_values=True
+)
+
+# Policy used for log events: sensitive keys only
+LOG_POLICY = RedactionPolicy(
+    key_rules=[
+        (
+            ('ip', 'ip_address', 'client_ip', 'remote_addr',
+             'geolocation', 'location', 'coordinates', 'lat', 'lng',
+             'password', 'token', 'secret', 'key', 'auth',
+             'ssn', 'social_security', 'credit_card', 'phone_number'),
+            "[REDACTED]"
+        ),
+    ],
+    scrub_values=False
+)
+
+security_redactor = RedactionEngine(SECURITY_POLICY)
+log_redactor = RedactionEngine(LOG_POLICY)
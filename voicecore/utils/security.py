@@ -6,21 +6,30 @@ encryption, and privacy compliance utilities.
 """
 
 import re
+import hmac
 import hashlib
 import secrets
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Union
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base64
 
 from voicecore.config import settings
 from voicecore.logging import get_logger
+from voicecore.utils.encryption import get_encryption_engine
+from voicecore.utils.redaction import (
+    SECURITY_POLICY, VALUE_PATTERNS, security_redactor, scrub_text
+)
 
 
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=65536)
+def _fingerprint_identifier(identifier: str) -> str:
+    digest = hmac.new(settings.secret_key.encode(), identifier.encode(), hashlib.sha256)
+    return digest.hexdigest()
+
+
 class SecurityUtils:
     """
     Security utilities for data protection and privacy compliance.
@@ -29,23 +38,12 @@ class SecurityUtils:
     location data is stored or logged per security requirements.
     """
     
-    # Sensitive data patterns that must be redacted
-    SENSITIVE_PATTERNS = {
-        'ip_address': r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b',
-        'ipv6_address': r'\b(?:[0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}\b',
-        'phone_number': r'\b\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b',
-        'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-        'ssn': r'\b\d{3}-?\d{2}-?\d{4}\b',
-        'credit_card': r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b',
-        'coordinates': r'\b-?\d{1,3}\.\d+,\s*-?\d{1,3}\.\d+\b'
-    }
+    # Sensitive data patterns that must be redacted (scrubbed in one
+    # combined pass by the redaction engine)
+    SENSITIVE_PATTERNS = {name: pattern for name, pattern, _ in VALUE_PATTERNS}
     
     # Location-related keywords that indicate sensitive data
-    LOCATION_KEYWORDS = [
-        'latitude', 'longitude', 'lat', 'lng', 'coordinates',
-        'geolocation', 'location', 'address', 'city', 'state',
-        'country', 'zip', 'postal', 'gps', 'position'
-    ]
+    LOCATION_KEYWORDS = list(SECURITY_POLICY.key_rules[0][0])
     
     @staticmethod
     def sanitize_data(data: Union[Dict, List, str, Any]) -> Union[Dict, List, str, Any]:
@@ -61,34 +59,12 @@ class SecurityUtils:
         Returns:
             Sanitized data with sensitive information redacted
         """
-        if isinstance(data, dict):
-            return SecurityUtils._sanitize_dict(data)
-        elif isinstance(data, list):
-            return [SecurityUtils.sanitize_data(item) for item in data]
-        elif isinstance(data, str):
-            return SecurityUtils._sanitize_string(data)
-        else:
-            return data
+        return security_redactor.redact(data)
     
     @staticmethod
     def _sanitize_dict(data: Dict[str, Any]) -> Dict[str, Any]:
         """Sanitize dictionary data."""
-        sanitized = {}
-        
-        for key, value in data.items():
-            key_lower = key.lower()
-            
-            # Check if key indicates sensitive data
-            if any(keyword in key_lower for keyword in SecurityUtils.LOCATION_KEYWORDS):
-                sanitized[key] = "[REDACTED_LOCATION]"
-            elif 'ip' in key_lower or 'addr' in key_lower:
-                sanitized[key] = "[REDACTED_IP]"
-            elif 'password' in key_lower or 'secret' in key_lower or 'token' in key_lower:
-                sanitized[key] = "[REDACTED_SECRET]"
-            else:
-                sanitized[key] = SecurityUtils.sanitize_data(value)
-        
-        return sanitized
+        return security_redactor.redact(data)
     
     @staticmethod
     def _sanitize_string(text: str) -> str:
@@ -96,23 +72,7 @@ class SecurityUtils:
         if not isinstance(text, str):
             return text
         
-        sanitized = text
-        
-        # Remove sensitive patterns
-        for pattern_name, pattern in SecurityUtils.SENSITIVE_PATTERNS.items():
-            if pattern_name in ['ip_address', 'ipv6_address', 'coordinates']:
-                # These are completely redacted for privacy compliance
-                sanitized = re.sub(pattern, '[REDACTED_LOCATION]', sanitized)
-            elif pattern_name == 'phone_number':
-                # Partially redact phone numbers
-                sanitized = re.sub(pattern, 'XXX-XXX-XXXX', sanitized)
-            elif pattern_name == 'email':
-                # Partially redact emails
-                sanitized = re.sub(pattern, 'user@domain.com', sanitized)
-            else:
-                sanitized = re.sub(pattern, f'[REDACTED_{pattern_name.upper()}]', sanitized)
-        
-        return sanitized
+        return scrub_text(text)
     
     @staticmethod
     def generate_correlation_id() -> str:
@@ -136,57 +96,40 @@ class SecurityUtils:
         return base64.b64encode(hash_obj).decode()
     
     @staticmethod
-    def encrypt_sensitive_data(data: str) -> str:
+    def fingerprint_identifier(identifier: str) -> str:
+        """
+        Create a stable, non-reversible fingerprint of an identifier.
+        
+        Uses a keyed SHA-256 (cached per identifier), which is cheap
+        enough for per-request audit logging.
+        """
+        return _fingerprint_identifier(str(identifier))
+    
+    @staticmethod
+    def encrypt_sensitive_data(data: str, tenant_id: Optional[Any] = None) -> str:
         """
         Encrypt sensitive data for storage.
         
-        Uses Fernet symmetric encryption for secure data storage.
+        Uses envelope encryption with cached per-tenant data keys, so no
+        key derivation happens per call.
         """
         try:
-            # Derive key from settings
-            password = settings.secret_key.encode()
-            salt = b'voicecore_salt_2024'  # In production, use random salt per record
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=salt,
-                iterations=100000,
-            )
-            key = base64.urlsafe_b64encode(kdf.derive(password))
-            
-            # Encrypt data
-            f = Fernet(key)
-            encrypted_data = f.encrypt(data.encode())
-            return base64.b64encode(encrypted_data).decode()
+            return get_encryption_engine().encrypt(data, tenant_id)
             
         except Exception as e:
             logger.error("Failed to encrypt sensitive data", error=str(e))
             raise
     
     @staticmethod
-    def decrypt_sensitive_data(encrypted_data: str) -> str:
+    def decrypt_sensitive_data(encrypted_data: str, tenant_id: Optional[Any] = None) -> str:
         """
         Decrypt sensitive data from storage.
         
-        Decrypts data that was encrypted with encrypt_sensitive_data.
+        Decrypts data that was encrypted with encrypt_sensitive_data,
+        including tokens written before envelope encryption.
         """
         try:
-            # Derive same key
-            password = settings.secret_key.encode()
-            salt = b'voicecore_salt_2024'
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=salt,
-                iterations=100000,
-            )
-            key = base64.urlsafe_b64encode(kdf.derive(password))
-            
-            # Decrypt data
-            f = Fernet(key)
-            decoded_data = base64.b64decode(encrypted_data.encode())
-            decrypted_data = f.decrypt(decoded_data)
-            return decrypted_data.decode()
+            return get_encryption_engine().decrypt(encrypted_data, tenant_id)
             
         except Exception as e:
             logger.error("Failed to decrypt sensitive data", error=str(e))
@@ -251,6 +194,11 @@ class SecurityUtils:
         """Generate a cryptographically secure random token."""
         return secrets.token_urlsafe(length)
     
+    @staticmethod
+    def generate_api_key() -> str:
+        """Generate a new high-entropy API key."""
+        return secrets.token_urlsafe(32)
+    
     @staticmethod
     def constant_time_compare(a: str, b: str) -> bool:
         """